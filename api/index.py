@@ -28,9 +28,14 @@ La aplicación principal es CLI (main.py).
 import os
 import sys
 import json
+import time
+import select
+import itertools
+import threading
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import parse_qs, urlparse
-from typing import Dict, Any, Tuple, Optional
+from functools import partial
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterator, AsyncIterator
 
 # Agregar directorio padre al path para imports
 _parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -38,10 +43,309 @@ if _parent_dir not in sys.path:
     sys.path.insert(0, _parent_dir)
 
 # En Vercel, las variables de entorno ya están cargadas
-# En local, cargarlas desde .env
-if not os.getenv('VERCEL'):
-    from dotenv import load_dotenv
-    load_dotenv(os.path.join(_parent_dir, '.env'))
+# En local, cargarlas desde .env (una sola vez: Settings no lo relee)
+from src.config.settings import cargar_dotenv
+cargar_dotenv()
+
+from src.server.router import Router
+from src.server.streaming import StreamingBody, ENCODERS, LAST_CHUNK, encode_chunk
+from src.server.etag import etag_notas, coincide
+from src.models.contexto import (
+    ContextoAuth, contexto_actual, usar_contexto, iterar_en_contexto, aiterar_en_contexto
+)
+
+
+# ============================================================================
+# TABLA DE RUTAS - Compilada una sola vez al importar el módulo
+# ============================================================================
+
+# (método, patrón, handler, argumentos)
+# Argumentos del handler, en orden:
+# - 'body'        -> body JSON del request
+# - 'path:<name>' -> segmento {name} del patrón
+# - 'query:<name>'-> primer valor de ?name=
+_RUTAS = (
+    ('GET', '/', '_handle_health', ()),
+    ('GET', '/api/health', '_handle_health', ()),
+    ('GET', '/api/warm', '_handle_warm', ()),
+    ('POST', '/api/auth/login', '_handle_login', ('body',)),
+    ('POST', '/api/auth/logout', '_handle_logout', ()),
+    ('GET', '/api/notas', '_handle_listar_notas',
+     ('query:limit', 'query:cursor', 'query:fields', 'query:stream', 'query:ids')),
+    ('POST', '/api/notas', '_handle_crear_nota', ('body',)),
+    ('POST', '/api/notas/bulk', '_handle_crear_muchas', ('body',)),
+    ('PATCH', '/api/notas', '_handle_actualizar_notas', ('body',)),
+    # ?ids=a,b / body {"ids": [...]}; ?id= por compatibilidad
+    ('DELETE', '/api/notas', '_handle_eliminar_notas', ('query:id', 'query:ids', 'body')),
+    ('GET', '/api/notas/{id}', '_handle_obtener_nota', ('path:id', 'query:fields')),
+    ('PUT', '/api/notas/{id}', '_handle_actualizar_nota', ('path:id', 'body')),
+    ('DELETE', '/api/notas/{id}', '_handle_eliminar_nota', ('path:id',)),
+    ('POST', '/api/batch', '_handle_lote', ('body',)),
+)
+
+
+def _compilar_rutas(rutas) -> Router:
+    """
+    Registra las rutas en un Router.
+    
+    El destino de cada ruta es (nombre_handler, ((fuente, clave), ...)):
+    los argumentos se parsean aquí, no en cada request.
+    """
+    router = Router()
+    for method, pattern, handler_name, args in rutas:
+        sources = tuple(
+            (arg.partition(':')[0], arg.partition(':')[2]) for arg in args
+        )
+        router.add(method, pattern, (handler_name, sources))
+    return router
+
+
+_ROUTER = _compilar_rutas(_RUTAS)
+
+# Instante del import (cold start): /api/warm informa el uptime
+_INICIO = time.monotonic()
+
+
+def _parse_limite(limite: Optional[str]) -> Optional[int]:
+    """'20' -> 20; None -> None. RAISES: ValueError si no es entero."""
+    if limite is None or limite == '':
+        return None
+    try:
+        return int(limite)
+    except ValueError:
+        raise ValueError("limit debe ser un entero")
+
+
+def _respuesta_pagina(pagina) -> Dict[str, Any]:
+    """Cuerpo JSON de una página de notas."""
+    return {
+        'success': True,
+        'data': [n.to_dict() for n in pagina.items],
+        'count': len(pagina.items),
+        'next_cursor': pagina.next_cursor
+    }
+
+
+def _respuesta_lote(resultados, incluir_datos: bool = True) -> Dict[str, Any]:
+    """Cuerpo JSON de /api/batch y /api/notas/bulk (un resultado por operación)."""
+    return {
+        'success': True,
+        'results': [r.to_dict(incluir_datos) for r in resultados],
+        'count': len(resultados),
+        'failed': sum(1 for r in resultados if not r.ok)
+    }
+
+
+def _parse_ids(ids: str) -> List[str]:
+    """'a,b,,c' -> ['a', 'b', 'c']."""
+    return [i.strip() for i in ids.split(',') if i.strip()]
+
+
+# GET de notas: el navegador revalida siempre (no-cache + ETag) y
+# ninguna caché compartida (CDN de Vercel) guarda ni mezcla usuarios
+_CACHE_HEADERS = {'Cache-Control': 'private, no-cache', 'Vary': 'Authorization'}
+
+# Headers que un 304 repite de la respuesta 200 (RFC 9110 §15.4.5)
+_HEADERS_304 = ('ETag', 'Cache-Control', 'Vary', 'Age')
+
+
+def _con_frescura(
+    data: Dict[str, Any], lectura=None, etag: Optional[str] = None
+) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+    """
+    (200, data, headers) de un GET de notas.
+    
+    - Siempre Cache-Control/Vary; ETag si se pasa (GET condicional)
+    - De la caché: header Age (segundos desde que se leyó de Supabase)
+    - Vencida (stale-while-revalidate): además stale/age en el body,
+      para que el frontend avise que se está actualizando; sin ETag
+      (el body trae la edad, así que no es el mismo de antes)
+    """
+    headers = dict(_CACHE_HEADERS)
+    if lectura is not None:
+        edad = int(lectura.edad)
+        headers['Age'] = str(edad)
+        if lectura.vencida:
+            data['stale'] = True
+            data['age'] = edad
+            return 200, data, headers
+    if etag is not None:
+        headers['ETag'] = etag
+    return 200, data, headers
+
+
+def _header(headers, nombre: str) -> Optional[str]:
+    """
+    Valor de un header sin importar mayúsculas.
+    
+    headers: dict en minúsculas (WSGI, asyncio), HTTPMessage de
+    BaseHTTPRequestHandler (ya case-insensitive) o None.
+    """
+    if not headers:
+        return None
+    valor = headers.get(nombre)
+    if valor is None:
+        nombre = nombre.lower()
+        valor = next((v for k, v in headers.items() if k.lower() == nombre), None)
+    return valor
+
+
+def _condicional(
+    method: str, headers, result: Tuple[int, Any, Dict[str, str]]
+) -> Tuple[int, Any, Dict[str, str]]:
+    """
+    GET condicional: un 200 cuyo ETag está en If-None-Match pasa a 304
+    sin body (data None).
+    
+    POR QUÉ DESPUÉS DEL HANDLER:
+    - SÍ: El ETag sale de las notas leídas (caché o Supabase); lo que el
+      304 ahorra es serializar y enviar la lista
+    - SÍ: Un solo lugar para todos los handlers y adaptadores
+    """
+    status, _, extra = result
+    etag = extra.get('ETag')
+    if status != 200 or etag is None or method != 'GET':
+        return result
+    if not coincide(_header(headers, 'If-None-Match'), etag):
+        return result
+    return 304, None, {k: v for k, v in extra.items() if k in _HEADERS_304}
+
+
+def _respuesta_login(user, access_token: str, refresh_token: Optional[str]) -> Dict[str, Any]:
+    """Cuerpo JSON del login: el cliente manda access_token como Bearer."""
+    return {
+        'success': True,
+        'user': {'id': user.id, 'email': user.email},
+        'session': {
+            'access_token': access_token,
+            'refresh_token': refresh_token,
+            'token_type': 'bearer'
+        }
+    }
+
+
+def _no_autorizado(error: PermissionError) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+    """401 por un Authorization inválido (RFC 6750)."""
+    return 401, {'error': str(error)}, {'WWW-Authenticate': 'Bearer error="invalid_token"'}
+
+
+def _respuesta_warm(frio: bool, datos: Dict[str, Any]) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+    """
+    Cuerpo de /api/warm: 200 si Supabase respondió, 503 si no.
+    
+    - cold: El cliente Supabase no existía cuando llegó el request
+    - uptime_s: Segundos desde el import (un valor bajo = instancia nueva)
+    """
+    return 200 if datos.get('ok') else 503, {
+        'status': 'warm' if datos.get('ok') else 'error',
+        'cold': frio,
+        'uptime_s': round(time.monotonic() - _INICIO, 1),
+        'supabase': datos
+    }, {'Cache-Control': 'no-store'}
+
+
+def _cerrar_sesion_jwt() -> None:
+    """Logout con Bearer: cierra la sesión del JWT en la tabla de sesiones."""
+    from src.services.session_manager import SessionManager
+    SessionManager().clear()
+
+
+def _stream_en_contexto(
+    contexto: Optional[ContextoAuth], result: Tuple[int, Any, Dict[str, str]]
+) -> Tuple[int, Any, Dict[str, str]]:
+    """Un StreamingBody sigue consultando como el usuario del request."""
+    status, data, extra = result
+    if contexto is None or not isinstance(data, StreamingBody):
+        return result
+    if data.is_async:
+        chunks = aiterar_en_contexto(contexto, data.chunks)
+    else:
+        chunks = iterar_en_contexto(contexto, data.chunks)
+    return status, StreamingBody(chunks, data.content_type), extra
+
+
+def _payload_json(status: int, data: Any) -> Optional[bytes]:
+    """Body JSON; None en un 304 (sin body, Content-Type ni Content-Length)."""
+    if status == 304:
+        return None
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _respuesta_por_ids(notas, faltantes: List[str]) -> Dict[str, Any]:
+    """Cuerpo JSON de GET /api/notas?ids= (orden pedido + faltantes)."""
+    return {
+        'success': True,
+        'data': [n.to_dict() for n in notas],
+        'count': len(notas),
+        'missing': faltantes
+    }
+
+
+def _respuesta_masiva(resultado) -> Dict[str, Any]:
+    """Cuerpo JSON de eliminar/actualizar por conjunto de IDs."""
+    return {'success': True, **resultado.to_dict()}
+
+
+def _parse_trozo(body: Dict[str, Any]) -> Optional[int]:
+    """chunk_size del body (None = default). RAISES: ValueError."""
+    tamano = body.get('chunk_size')
+    if tamano is None:
+        return None
+    if not isinstance(tamano, int) or isinstance(tamano, bool):
+        raise ValueError("chunk_size debe ser un entero")
+    return tamano
+
+
+def _encoder_stream(modo: str):
+    """'ndjson' | 'json' -> encoder nuevo. RAISES: ValueError si no existe."""
+    encoder_cls = ENCODERS.get(modo)
+    if encoder_cls is None:
+        raise ValueError(f"stream debe ser uno de: {', '.join(ENCODERS)}")
+    return encoder_cls()
+
+
+def _stream_paginas(primera, resto: Iterator, encoder) -> Iterator[bytes]:
+    """
+    Serializa las páginas a bloques de bytes a medida que llegan.
+    
+    MEMORIA: una página (dicts + bytes) por vez, sin importar el total.
+    Un error a mitad del stream viaja en el body (el 200 ya se envió).
+    """
+    count = 0
+    try:
+        yield encoder.start()
+        for pagina in itertools.chain((primera,), resto):
+            items = [n.to_dict() for n in pagina.items]
+            count += len(items)
+            yield encoder.batch(items)
+    except Exception as e:
+        yield encoder.error(f'Error al listar: {e}')
+        return
+    yield encoder.end(count)
+
+
+async def _stream_paginas_async(primera, resto: AsyncIterator, encoder) -> AsyncIterator[bytes]:
+    """Igual que _stream_paginas, consumiendo un async generator."""
+    count = len(primera.items)
+    try:
+        yield encoder.start()
+        yield encoder.batch([n.to_dict() for n in primera.items])
+        async for pagina in resto:
+            items = [n.to_dict() for n in pagina.items]
+            count += len(items)
+            yield encoder.batch(items)
+    except Exception as e:
+        yield encoder.error(f'Error al listar: {e}')
+        return
+    yield encoder.end(count)
+
+
+def _con_headers(result: tuple) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+    """Normaliza (status, data) a (status, data, headers_extra)."""
+    if len(result) == 3:
+        return result
+    status, data = result
+    return status, data, {}
 
 
 # ============================================================================
@@ -66,26 +370,109 @@ class VercelBridge:
     """
     
     def __init__(self):
-        """Inicializa dependencias lazy (solo cuando se necesiten)."""
+        """
+        Inicializa dependencias lazy (solo cuando se necesiten).
+        
+        THREAD-SAFE: Los workers del pool piden auth/notas/verificador en
+        paralelo; el Lock (con doble chequeo) crea UNA instancia de cada
+        uno: un NotasService por request tendría su propia caché y su
+        propia tabla de single-flight.
+        """
         self._auth = None
         self._notas = None
+        self._verificador = None
+        self._calentamiento: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
     
     @property
     def auth(self):
         """Lazy loading de AuthService."""
         if self._auth is None:
-            from src.services.auth_service import AuthService
-            self._auth = AuthService()
+            self._esperar_calentamiento()
+            with self._lock:
+                if self._auth is None:
+                    from src.services.auth_service import AuthService
+                    self._auth = AuthService()
         return self._auth
     
     @property
     def notas(self):
         """Lazy loading de NotasService."""
         if self._notas is None:
-            from src.services.notas_service import NotasService
-            self._notas = NotasService()
+            self._esperar_calentamiento()
+            with self._lock:
+                if self._notas is None:
+                    from src.services.notas_service import NotasService
+                    self._notas = NotasService()
         return self._notas
     
+    def precalentar_en_segundo_plano(self) -> None:
+        """
+        Crea SupabaseClient y abre una conexión en un hilo (API_WARMUP=1).
+        
+        POR QUÉ EN SEGUNDO PLANO:
+        - SÍ: En un cold start, create_client + DNS + TLS corren mientras
+          el primer request todavía se recibe y parsea
+        - SÍ: El primer request que necesite Supabase espera al hilo
+          (join) en vez de crear otro cliente en paralelo
+        - NO alternativa (precalentar en el import): El import bloquearía
+          también a /api/health y a los estáticos
+        
+        NUNCA ANTES DE UN FORK: el hijo heredaría un cliente a medio
+        crear, el pool httpx con sockets del padre y quizás locks tomados,
+        y el hilo no sobrevive al fork. En prefork se llama en cada hijo
+        (post_fork); con gunicorn, no combinar API_WARMUP con --preload.
+        """
+        self._calentamiento = threading.Thread(
+            target=self._precalentar, name='precalentar', daemon=True
+        )
+        self._calentamiento.start()
+    
+    def _esperar_calentamiento(self) -> None:
+        """Espera al hilo de precalentamiento (salvo desde el mismo hilo)."""
+        hilo = self._calentamiento
+        if hilo is not None and hilo is not threading.current_thread():
+            hilo.join()
+    
+    def _precalentar(self) -> Dict[str, Any]:
+        """Crea el servicio (y el cliente) y abre una conexión; nunca lanza."""
+        try:
+            return self.notas.precalentar()
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+    
+    @property
+    def verificador(self):
+        """Lazy loading de VerificadorJWT (compartido por sync y async)."""
+        if self._verificador is None:
+            with self._lock:
+                if self._verificador is None:
+                    from src.services.jwt_verifier import VerificadorJWT
+                    self._verificador = VerificadorJWT.desde_settings()
+        return self._verificador
+    
+    def _autenticar(self, headers) -> Optional[ContextoAuth]:
+        """
+        ContextoAuth de "Authorization: Bearer <jwt>" (None si no vino).
+        
+        POR QUÉ EN EL BRIDGE Y NO EN CADA HANDLER:
+        - SÍ: Un solo lugar para todas las rutas y los 4 adaptadores
+        - SÍ: Los servicios no cambian: SessionManager y SupabaseClient
+          leen el contexto (src/models/contexto.py)
+        
+        Sin header, los servicios usan SessionManager (CLI / sin login):
+        en la API eso termina en 401 "No autenticado".
+        
+        RAISES: PermissionError si el header no es válido
+        """
+        valor = _header(headers, 'Authorization')
+        if not valor:
+            return None
+        esquema, _, token = valor.strip().partition(' ')
+        if esquema.lower() != 'bearer' or not token.strip():
+            raise PermissionError("Authorization debe ser 'Bearer <token>'")
+        return self.verificador.verificar(token.strip())
+    
     def handle_request(
         self, 
         method: str, 
@@ -98,7 +485,7 @@ class VercelBridge:
         Router principal - dirige requests a handlers.
         
         PARÁMETROS:
-        - method: GET, POST, PUT, DELETE
+        - method: GET, POST, PUT, PATCH, DELETE
         - path: Ruta sin query string (ej: /api/notas)
         - query: Parámetros de query string
         - body: Cuerpo del request (para POST/PUT)
@@ -107,44 +494,136 @@ class VercelBridge:
         RETORNA:
         - Tuple[status_code, response_dict]
         
-        RUTAS:
-        - GET /api/health → Health check
-        - POST /api/auth/login → Login
-        - POST /api/auth/logout → Logout
-        - GET /api/notas → Listar notas
-        - POST /api/notas → Crear nota
-        - DELETE /api/notas?id=xxx → Eliminar nota
-        """
-        # Health check
-        if path == '/api/health' or path == '/':
-            return 200, {
-                'status': 'ok',
-                'message': 'CRUD Didáctico con Supabase - API funcionando',
-                'version': '1.0.0'
-            }
+        RUTAS: Ver _RUTAS (tabla compilada al importar el módulo)
+        """
+        status, data, _ = self.dispatch(method, path, query, body, headers)
+        return status, data
+    
+    def dispatch(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, list],
+        body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """
+        Igual que handle_request, pero también retorna headers de respuesta.
+        
+        POR QUÉ UN TERCER ELEMENTO:
+        - SÍ: Un 405 debe llevar el header Allow
+        - SÍ: Los adaptadores HTTP (RequestHandler, handler, WSGI,
+          asyncio) lo usan; handle_request mantiene su contrato de 2
+        
+        GET CONDICIONAL: Con If-None-Match igual al ETag de la respuesta,
+        retorna (304, None, headers) -> ver _condicional
+        
+        AUTENTICACIÓN: El handler corre con el ContextoAuth del header
+        Authorization (ver _autenticar); token inválido -> 401 sin
+        ejecutar el handler.
+        
+        RETORNA: (status_code, response_dict, headers_extra)
+        """
+        try:
+            contexto = self._autenticar(headers)
+        except PermissionError as e:
+            return _no_autorizado(e)
+        with usar_contexto(contexto):
+            result = _con_headers(self._resolver(method, path, query, body or {})())
+        return _condicional(method, headers, _stream_en_contexto(contexto, result))
+    
+    def _resolver(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, list],
+        body: Dict[str, Any]
+    ) -> Callable[[], Any]:
+        """
+        Decide qué handler atiende el request (sin ejecutarlo).
         
-        # Auth routes
-        if path == '/api/auth/login' and method == 'POST':
-            return self._handle_login(body or {})
+        POR QUÉ SEPARAR RESOLVER DE EJECUTAR:
+        - SÍ: AsyncVercelBridge reutiliza las mismas rutas y solo
+          cambia los handlers por corrutinas
+        - NO alternativa (duplicar el if-chain): Rutas divergentes
         
-        if path == '/api/auth/logout' and method == 'POST':
-            return self._handle_logout()
+        RETORNA: Callable sin argumentos que ejecuta el handler
         
-        # Notas routes
-        if path == '/api/notas':
-            if method == 'GET':
-                return self._handle_listar_notas()
-            elif method == 'POST':
-                return self._handle_crear_nota(body or {})
-            elif method == 'DELETE':
-                nota_id = query.get('id', [None])[0]
-                return self._handle_eliminar_nota(nota_id)
+        COSTO: Un lookup en la tabla compilada (_ROUTER), independiente
+        de la cantidad de rutas registradas
+        """
+        match = _ROUTER.match(method, path)
         
-        # 404 Not Found
+        if match.target is None:
+            if match.allow:
+                return partial(self._handle_method_not_allowed, method, path, match.allow)
+            return partial(self._handle_not_found, path)
+        
+        handler_name, arg_sources = match.target
+        args = []
+        for source, key in arg_sources:
+            if source == 'body':
+                args.append(body)
+            elif source == 'path':
+                args.append(match.params[key])
+            else:
+                args.append(query.get(key, [None])[0])
+        
+        return partial(getattr(self, handler_name), *args)
+    
+    def _handle_health(self) -> Tuple[int, Dict[str, Any]]:
+        """Handler para health check (+ contadores de la caché de notas)."""
+        data = {
+            'status': 'ok',
+            'message': 'CRUD Didáctico con Supabase - API funcionando',
+            'version': '1.0.0'
+        }
+        if self._notas is not None:  # No crear el servicio solo para esto
+            data['cache'] = self._notas.estadisticas_cache()
+            data['postgrest_pool'] = self._notas.estadisticas_pool()
+            data['http'] = self._notas.estadisticas_http()
+        if self._verificador is not None:
+            from src.services.session_manager import SessionManager
+            data['auth'] = self._verificador.stats()
+            data['sessions'] = SessionManager().sesiones.stats()
+        return 200, data
+    
+    def _handle_warm(self) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """
+        Handler de /api/warm: mantiene la instancia y sus conexiones tibias.
+        
+        Para pingers programados (cron): crea el cliente Supabase si no
+        existe y hace GET /auth/v1/health por el pool, SIN consultar la
+        base ni requerir login. Cache-Control: no-store para que la CDN
+        no responda por la instancia.
+        """
+        frio = self._notas is None
+        self._esperar_calentamiento()
+        return _respuesta_warm(frio, self._precalentar())
+    
+    def _handle_not_found(self, path: str) -> Tuple[int, Dict[str, Any]]:
+        """Handler para rutas inexistentes."""
         return 404, {'error': 'Ruta no encontrada', 'path': path}
     
+    def _handle_method_not_allowed(
+        self, method: str, path: str, allow: Tuple[str, ...]
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """Handler para ruta existente con método no soportado (405)."""
+        return 405, {
+            'error': 'Método no permitido',
+            'method': method,
+            'path': path,
+            'allow': list(allow)
+        }, {'Allow': ', '.join(allow)}
+    
     def _handle_login(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
-        """Handler para login."""
+        """
+        Handler para login (stateless).
+        
+        RESPUESTA: user + session.access_token; el cliente lo manda en
+        cada request como "Authorization: Bearer". No se guarda nada en
+        SessionManager: usuarios concurrentes no se pisan.
+        """
         email = body.get('email', '')
         password = body.get('password', '')
         
@@ -152,11 +631,345 @@ class VercelBridge:
             return 400, {'error': 'Email y password son requeridos'}
         
         try:
-            user = self.auth.login(email, password)
-            return 200, {
+            return 200, _respuesta_login(*self.auth.autenticar(email, password))
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error interno: {e}'}
+    
+    def _handle_logout(self) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handler para logout.
+        
+        Con Bearer: el cliente descarta el token y su session_id queda
+        cerrado en la tabla de sesiones (sin sign_out: el cliente
+        compartido cerraría la sesión de OTRO usuario). Sin Bearer,
+        logout de SessionManager (legacy).
+        """
+        try:
+            if contexto_actual() is None:
+                self.auth.logout()
+            else:
+                _cerrar_sesion_jwt()
+            return 200, {'success': True, 'message': 'Sesión cerrada'}
+        except Exception as e:
+            return 500, {'error': f'Error al cerrar sesión: {e}'}
+    
+    def _handle_listar_notas(
+        self,
+        limite: Optional[str] = None,
+        cursor: Optional[str] = None,
+        campos: Optional[str] = None,
+        stream: Optional[str] = None,
+        ids: Optional[str] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handler para listar notas (una página, todas en streaming o por IDs).
+        
+        QUERY:
+        - limit: Notas por página (default NOTAS_PAGE_SIZE)
+        - cursor: next_cursor de la respuesta anterior
+        - fields: Columnas a incluir (ej: id,title); default todas
+        - stream: 'ndjson' | 'json' -> TODAS las notas desde cursor,
+          escritas página por página (limit = tamaño de cada bloque)
+        - ids: a,b,c -> esas notas en ese orden (una consulta id=in.(...));
+          ignora limit/cursor/stream
+        
+        RESPUESTA: data, count (de esta página) y next_cursor
+        (null en la última página); con ids: data, count y missing
+        
+        HEADERS: ETag (If-None-Match -> 304), Cache-Control, Vary y,
+        si vino de la caché, Age
+        
+        POR QUÉ PEDIR LA PRIMERA PÁGINA AQUÍ (en modo stream):
+        - SÍ: Sesión, cursor y fields inválidos responden 401/400 normales
+          antes de comprometer el status 200
+        """
+        try:
+            if ids is not None:
+                notas, faltantes = self.notas.obtener_muchos(_parse_ids(ids), campos)
+                return _con_frescura(
+                    _respuesta_por_ids(notas, faltantes),
+                    etag=etag_notas(notas, faltantes, campos)
+                )
+            if stream is not None:
+                encoder = _encoder_stream(stream)
+                paginas = self.notas.iterar_paginas(_parse_limite(limite), cursor, campos)
+                primera = next(paginas)
+                return 200, StreamingBody(
+                    _stream_paginas(primera, paginas, encoder), encoder.content_type
+                ), dict(_CACHE_HEADERS)
+            pagina = self.notas.listar_pagina(_parse_limite(limite), cursor, campos)
+            return _con_frescura(
+                _respuesta_pagina(pagina), self.notas.ultima_lectura(),
+                etag_notas(pagina.items, pagina.next_cursor, campos)
+            )
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al listar: {e}'}
+    
+    def _handle_crear_nota(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Handler para crear nota."""
+        titulo = body.get('titulo', body.get('title', ''))
+        contenido = body.get('contenido', body.get('content'))
+        
+        if not titulo:
+            return 400, {'error': 'Título es requerido'}
+        
+        try:
+            nota = self.notas.crear(titulo, contenido)
+            return 201, {
                 'success': True,
-                'user': {'id': user.id, 'email': user.email}
+                'data': nota.to_dict()
             }
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al crear: {e}'}
+    
+    def _handle_crear_muchas(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handler para POST /api/notas/bulk.
+        
+        BODY: {"notes": [{"title": "...", "content": "..."}, ...],
+               "chunk_size": 500}   (chunk_size opcional)
+        
+        RESPUESTA: 200 con results[i] = {index, status, id|error}
+        (sin 'data': el cliente ya tiene el contenido que envió)
+        """
+        notas = body.get('notes', body.get('notas'))
+        if not isinstance(notas, list) or not notas:
+            return 400, {'error': 'notes debe ser una lista no vacía'}
+        
+        try:
+            resultados = self.notas.crear_muchos(notas, _parse_trozo(body))
+            return 200, _respuesta_lote(resultados, incluir_datos=False)
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al crear: {e}'}
+    
+    def _handle_obtener_nota(
+        self, nota_id: str, campos: Optional[str] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Handler para obtener una nota por ID (?fields= opcional; ETag)."""
+        try:
+            nota = self.notas.obtener(nota_id, campos)
+            if nota is None:
+                return 404, {'error': 'Nota no encontrada'}
+            return _con_frescura(
+                {'success': True, 'data': nota.to_dict()}, etag=etag_notas([nota], campos)
+            )
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al obtener: {e}'}
+    
+    def _handle_actualizar_nota(
+        self, nota_id: str, body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Handler para actualizar título y/o contenido de una nota."""
+        titulo = body.get('titulo', body.get('title'))
+        contenido = body.get('contenido', body.get('content'))
+        
+        try:
+            nota = self.notas.actualizar(nota_id, titulo, contenido)
+            if nota is None:
+                return 404, {'error': 'Nota no encontrada'}
+            return 200, {'success': True, 'data': nota.to_dict()}
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al actualizar: {e}'}
+    
+    def _handle_eliminar_nota(self, nota_id: Optional[str]) -> Tuple[int, Dict[str, Any]]:
+        """Handler para eliminar nota."""
+        if not nota_id:
+            return 400, {'error': 'ID de nota es requerido'}
+        
+        try:
+            eliminada = self.notas.eliminar(nota_id)
+            if eliminada:
+                return 200, {'success': True, 'message': 'Nota eliminada'}
+            else:
+                return 404, {'error': 'Nota no encontrada'}
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al eliminar: {e}'}
+    
+    def _handle_eliminar_notas(
+        self,
+        nota_id: Optional[str],
+        ids: Optional[str],
+        body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handler para DELETE /api/notas.
+        
+        FORMAS:
+        - ?ids=a,b,c o body {"ids": [...]} -> eliminar_muchos (un request
+          a Supabase por trozo de IDs, no por nota)
+        - ?id=x -> una nota (compatibilidad)
+        
+        RESPUESTA (conjunto): affected, not_found, count
+        """
+        lista = _parse_ids(ids) if ids is not None else body.get('ids')
+        if lista is None:
+            return self._handle_eliminar_nota(nota_id)
+        
+        try:
+            return 200, _respuesta_masiva(self.notas.eliminar_muchos(lista))
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al eliminar: {e}'}
+    
+    def _handle_actualizar_notas(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handler para PATCH /api/notas (mismos cambios a un conjunto).
+        
+        BODY: {"ids": [...], "title": "...", "content": "..."}
+        RESPUESTA: affected, not_found, count
+        """
+        try:
+            return 200, _respuesta_masiva(self.notas.actualizar_muchos(body.get('ids'), body))
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al actualizar: {e}'}
+    
+    def _handle_lote(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handler para POST /api/batch.
+        
+        BODY: {"operations": [{"op": "create", "title": "..."},
+                              {"op": "update", "id": "...", "content": "..."},
+                              {"op": "delete", "id": "..."},
+                              {"op": "get", "id": "..."}]}
+        
+        RESPUESTA: 200 con results[i] = {index, op, status, id, data|error};
+        el status de cada operación es el que daría su ruta individual.
+        """
+        try:
+            resultados = self.notas.ejecutar_lote(body.get('operations'))
+            return 200, _respuesta_lote(resultados)
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error en el lote: {e}'}
+
+
+# ============================================================================
+# ASYNC VERCEL BRIDGE - Mismas rutas, handlers asíncronos
+# ============================================================================
+
+class AsyncVercelBridge(VercelBridge):
+    """
+    Variante de VercelBridge para el servidor asyncio.
+    
+    POR QUÉ SUBCLASE:
+    - SÍ: Reutiliza _resolver (mismas rutas) y los handlers sin I/O
+      (health, 404, 405)
+    - SÍ: Solo redefine los handlers que hablan con Supabase
+    
+    IMPORTANTE:
+    - Usar handle_request_async (handle_request devolvería corrutinas)
+    - Los servicios son AsyncAuthService / AsyncNotasService
+    """
+    
+    @property
+    def auth(self):
+        """Lazy loading de AsyncAuthService."""
+        if self._auth is None:
+            from src.services.async_auth_service import AsyncAuthService
+            self._auth = AsyncAuthService()
+        return self._auth
+    
+    @property
+    def notas(self):
+        """Lazy loading de AsyncNotasService."""
+        if self._notas is None:
+            from src.services.async_notas_service import AsyncNotasService
+            self._notas = AsyncNotasService()
+        return self._notas
+    
+    async def _handle_warm(self) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """Handler asíncrono de /api/warm (ver VercelBridge._handle_warm)."""
+        frio = self._notas is None
+        try:
+            datos = await self.notas.precalentar()
+        except Exception as e:
+            datos = {'ok': False, 'error': str(e)}
+        return _respuesta_warm(frio, datos)
+    
+    async def handle_request_async(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, list],
+        body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Router asíncrono: mismo contrato que handle_request.
+        
+        Los handlers sin I/O (health, 404) son síncronos y se
+        ejecutan directamente; el resto se esperan con await.
+        """
+        status, data, _ = await self.dispatch_async(method, path, query, body, headers)
+        return status, data
+    
+    async def dispatch_async(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, list],
+        body: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+        """Versión asíncrona de dispatch (status, data, headers_extra)."""
+        from inspect import isawaitable  # Ya cargado por asyncio; no en el cold start
+        
+        try:
+            contexto = self._autenticar(headers)
+        except PermissionError as e:
+            return _no_autorizado(e)
+        with usar_contexto(contexto):
+            result = self._resolver(method, path, query, body or {})()
+            if isawaitable(result):
+                result = await result
+        return _condicional(method, headers, _stream_en_contexto(contexto, _con_headers(result)))
+    
+    async def _handle_login(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para login."""
+        email = body.get('email', '')
+        password = body.get('password', '')
+        
+        if not email or not password:
+            return 400, {'error': 'Email y password son requeridos'}
+        
+        try:
+            return 200, _respuesta_login(*await self.auth.autenticar(email, password))
         except ValueError as e:
             return 400, {'error': str(e)}
         except PermissionError as e:
@@ -164,56 +977,133 @@ class VercelBridge:
         except Exception as e:
             return 500, {'error': f'Error interno: {e}'}
     
-    def _handle_logout(self) -> Tuple[int, Dict[str, Any]]:
-        """Handler para logout."""
+    async def _handle_logout(self) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para logout (ver VercelBridge._handle_logout)."""
         try:
-            self.auth.logout()
+            if contexto_actual() is None:
+                await self.auth.logout()
+            else:
+                _cerrar_sesion_jwt()
             return 200, {'success': True, 'message': 'Sesión cerrada'}
         except Exception as e:
-            return 500, {'error': f'Error al cerrar sesión: {e}'}
+            return 500, {'error': f'Error al cerrar sesión: {e}'}
+    
+    async def _handle_listar_notas(
+        self,
+        limite: Optional[str] = None,
+        cursor: Optional[str] = None,
+        campos: Optional[str] = None,
+        stream: Optional[str] = None,
+        ids: Optional[str] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para listar notas (una página, streaming o por IDs)."""
+        try:
+            if ids is not None:
+                notas, faltantes = await self.notas.obtener_muchos(_parse_ids(ids), campos)
+                return _con_frescura(
+                    _respuesta_por_ids(notas, faltantes),
+                    etag=etag_notas(notas, faltantes, campos)
+                )
+            if stream is not None:
+                encoder = _encoder_stream(stream)
+                paginas = self.notas.iterar_paginas(_parse_limite(limite), cursor, campos)
+                primera = await paginas.__anext__()
+                return 200, StreamingBody(
+                    _stream_paginas_async(primera, paginas, encoder), encoder.content_type
+                ), dict(_CACHE_HEADERS)
+            pagina = await self.notas.listar_pagina(_parse_limite(limite), cursor, campos)
+            return _con_frescura(
+                _respuesta_pagina(pagina), self.notas.ultima_lectura(),
+                etag_notas(pagina.items, pagina.next_cursor, campos)
+            )
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al listar: {e}'}
+    
+    async def _handle_crear_nota(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para crear nota."""
+        titulo = body.get('titulo', body.get('title', ''))
+        contenido = body.get('contenido', body.get('content'))
+        
+        if not titulo:
+            return 400, {'error': 'Título es requerido'}
+        
+        try:
+            nota = await self.notas.crear(titulo, contenido)
+            return 201, {
+                'success': True,
+                'data': nota.to_dict()
+            }
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al crear: {e}'}
+    
+    async def _handle_crear_muchas(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para POST /api/notas/bulk."""
+        notas = body.get('notes', body.get('notas'))
+        if not isinstance(notas, list) or not notas:
+            return 400, {'error': 'notes debe ser una lista no vacía'}
+
+        try:
+            resultados = await self.notas.crear_muchos(notas, _parse_trozo(body))
+            return 200, _respuesta_lote(resultados, incluir_datos=False)
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al crear: {e}'}
     
-    def _handle_listar_notas(self) -> Tuple[int, Dict[str, Any]]:
-        """Handler para listar notas."""
+    async def _handle_obtener_nota(
+        self, nota_id: str, campos: Optional[str] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para obtener una nota por ID."""
         try:
-            notas = self.notas.listar()
-            return 200, {
-                'success': True,
-                'data': [n.to_dict() for n in notas],
-                'count': len(notas)
-            }
+            nota = await self.notas.obtener(nota_id, campos)
+            if nota is None:
+                return 404, {'error': 'Nota no encontrada'}
+            return _con_frescura(
+                {'success': True, 'data': nota.to_dict()}, etag=etag_notas([nota], campos)
+            )
         except PermissionError as e:
             return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
         except Exception as e:
-            return 500, {'error': f'Error al listar: {e}'}
+            return 500, {'error': f'Error al obtener: {e}'}
     
-    def _handle_crear_nota(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
-        """Handler para crear nota."""
-        titulo = body.get('titulo', body.get('title', ''))
+    async def _handle_actualizar_nota(
+        self, nota_id: str, body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para actualizar una nota."""
+        titulo = body.get('titulo', body.get('title'))
         contenido = body.get('contenido', body.get('content'))
         
-        if not titulo:
-            return 400, {'error': 'Título es requerido'}
-        
         try:
-            nota = self.notas.crear(titulo, contenido)
-            return 201, {
-                'success': True,
-                'data': nota.to_dict()
-            }
+            nota = await self.notas.actualizar(nota_id, titulo, contenido)
+            if nota is None:
+                return 404, {'error': 'Nota no encontrada'}
+            return 200, {'success': True, 'data': nota.to_dict()}
         except PermissionError as e:
             return 401, {'error': str(e)}
         except ValueError as e:
             return 400, {'error': str(e)}
         except Exception as e:
-            return 500, {'error': f'Error al crear: {e}'}
+            return 500, {'error': f'Error al actualizar: {e}'}
     
-    def _handle_eliminar_nota(self, nota_id: Optional[str]) -> Tuple[int, Dict[str, Any]]:
-        """Handler para eliminar nota."""
+    async def _handle_eliminar_nota(self, nota_id: Optional[str]) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para eliminar nota."""
         if not nota_id:
             return 400, {'error': 'ID de nota es requerido'}
         
         try:
-            eliminada = self.notas.eliminar(nota_id)
+            eliminada = await self.notas.eliminar(nota_id)
             if eliminada:
                 return 200, {'success': True, 'message': 'Nota eliminada'}
             else:
@@ -222,13 +1112,327 @@ class VercelBridge:
             return 401, {'error': str(e)}
         except Exception as e:
             return 500, {'error': f'Error al eliminar: {e}'}
+    
+    async def _handle_eliminar_notas(
+        self,
+        nota_id: Optional[str],
+        ids: Optional[str],
+        body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para DELETE /api/notas (uno o conjunto)."""
+        lista = _parse_ids(ids) if ids is not None else body.get('ids')
+        if lista is None:
+            return await self._handle_eliminar_nota(nota_id)
+        
+        try:
+            return 200, _respuesta_masiva(await self.notas.eliminar_muchos(lista))
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al eliminar: {e}'}
+    
+    async def _handle_actualizar_notas(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para PATCH /api/notas."""
+        try:
+            resultado = await self.notas.actualizar_muchos(body.get('ids'), body)
+            return 200, _respuesta_masiva(resultado)
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error al actualizar: {e}'}
+    
+    async def _handle_lote(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Handler asíncrono para POST /api/batch."""
+        try:
+            resultados = await self.notas.ejecutar_lote(body.get('operations'))
+            return 200, _respuesta_lote(resultados)
+        except PermissionError as e:
+            return 401, {'error': str(e)}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'Error en el lote: {e}'}
+
+
+# ============================================================================
+# ARCHIVOS ESTÁTICOS - Compartido por los servidores sin BaseHTTPRequestHandler
+# ============================================================================
+
+_CONTENT_TYPES = {
+    '.html': 'text/html',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+    '.json': 'application/json',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.ico': 'image/x-icon',
+    '.svg': 'image/svg+xml'
+}
+
+
+def _leer_estatico(path: str) -> Optional[Tuple[str, bytes]]:
+    """
+    Resuelve un archivo de public/ para la ruta pedida.
+    
+    RETORNA: (content_type, contenido) o None si no es un estático
+    
+    SEGURIDAD: Mismas reglas que RequestHandler._serve_static_file
+    (nunca sirve fuera de public/).
+    """
+    if path.startswith('/api'):
+        return None
+    
+    public_dir = os.path.join(_parent_dir, 'public')
+    
+    if path == '/' or path == '':
+        file_path = os.path.join(public_dir, 'index.html')
+    else:
+        file_path = os.path.join(public_dir, path.lstrip('/'))
+    
+    real_path = os.path.realpath(file_path)
+    if not real_path.startswith(os.path.realpath(public_dir)):
+        return None
+    if not os.path.isfile(real_path):
+        return None
+    
+    ext = os.path.splitext(real_path)[1].lower()
+    content_type = _CONTENT_TYPES.get(ext, 'application/octet-stream')
+    
+    try:
+        with open(real_path, 'rb') as f:
+            return f'{content_type}; charset=utf-8', f.read()
+    except OSError:
+        return None
+
+
+# ============================================================================
+# HTTP/1.1 KEEP-ALIVE - Conexiones persistentes para ambos handlers
+# ============================================================================
+
+# Segundos que una conexión puede quedar ociosa antes de cerrarse
+KEEPALIVE_TIMEOUT = float(os.environ.get('API_KEEPALIVE_TIMEOUT', 5))
+# Requests máximos por conexión (luego se responde Connection: close)
+KEEPALIVE_MAX_REQUESTS = int(os.environ.get('API_KEEPALIVE_MAX', 100))
+
+
+class KeepAliveMixin:
+    """
+    Conexiones persistentes HTTP/1.1 para BaseHTTPRequestHandler.
+    
+    PROBLEMA:
+    - Con protocol_version = 'HTTP/1.0' (default) cada apiCall() del
+      frontend abre una conexión TCP nueva
+    
+    SOLUCIÓN:
+    - protocol_version = 'HTTP/1.1': la conexión sigue abierta salvo
+      'Connection: close' del cliente
+    - timeout: el socket se cierra si queda ocioso KEEPALIVE_TIMEOUT s
+      (libera el worker del pool en modo threaded)
+    - Bajo carga (pool threaded/prefork con conexiones en cola): la
+      respuesta sale con 'Connection: close' y una conexión ociosa suelta
+      su worker en <= idle_poll s, en vez de retenerlo KEEPALIVE_TIMEOUT s.
+      Sin esto, API_WORKERS conexiones ociosas de navegadores frenan a
+      todos los demás clientes detrás de la cola
+    - Tope de requests por conexión: reparte la carga entre workers y
+      procesos (pre-fork) y acota conexiones eternas
+    - TCP_NODELAY: headers y body salen en writes separados; con Nagle +
+      delayed ACK cada respuesta en una conexión reutilizada espera ~40ms
+    
+    IMPORTANTE:
+    - TODA respuesta debe llevar Content-Length (o chunked, ver
+      _send_stream), si no el cliente no sabe dónde termina y la
+      conexión queda trabada
+    - El body del request debe consumirse completo antes de responder
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    disable_nagle_algorithm = True
+    max_requests = KEEPALIVE_MAX_REQUESTS
+    # Cada cuánto una conexión ociosa revisa si hay clientes en cola
+    idle_poll = 0.25
+    
+    def setup(self) -> None:
+        """Inicializa el contador de requests de esta conexión."""
+        super().setup()
+        self._requests_served = 0
+    
+    def end_headers(self) -> None:
+        """
+        Agrega Connection/Keep-Alive antes de cerrar los headers.
+        
+        Se llama una vez por respuesta (incluidos los send_error).
+        """
+        self._requests_served += 1
+        remaining = self.max_requests - self._requests_served
+        if self._hay_cola():
+            self.close_connection = True
+        if self.close_connection or remaining <= 0:
+            self.send_header('Connection', 'close')
+        else:
+            self.send_header('Connection', 'keep-alive')
+            self.send_header('Keep-Alive', f'timeout={int(self.timeout)}, max={remaining}')
+        super().end_headers()
+    
+    def handle(self) -> None:
+        """
+        Como BaseHTTPRequestHandler.handle, pero entre requests la espera
+        es cortable: si hay conexiones en cola, la ociosa se cierra.
+        """
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._esperar_request():
+            self.handle_one_request()
+    
+    def _hay_cola(self) -> bool:
+        """True si el servidor (pool de workers) tiene conexiones esperando."""
+        en_espera = getattr(self.server, 'en_espera', None)
+        return en_espera is not None and en_espera() > 0
+    
+    def _esperar_request(self) -> bool:
+        """
+        Espera el próximo request de esta conexión (hasta self.timeout).
+        
+        RETORNA: True si hay datos (o EOF) para leer; False si venció el
+        timeout o hay conexiones en cola (hay que soltar el worker).
+        """
+        vence = time.monotonic() + self.timeout
+        while True:
+            if self._bytes_pendientes():
+                return True
+            if self._hay_cola():
+                return False
+            restante = vence - time.monotonic()
+            if restante <= 0:
+                return False
+            listos, _, _ = select.select([self.connection], [], [], min(restante, self.idle_poll))
+            if listos:
+                return True
+    
+    def _bytes_pendientes(self) -> bool:
+        """
+        ¿Hay bytes ya en el buffer de rfile (pipelining) o en el socket?
+        
+        peek() con el socket en modo no bloqueante: si no hay nada retorna
+        b'' sin esperar (y sin marcar el archivo como timed out).
+        """
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return True  # Que handle_one_request vea el error y cierre
+        finally:
+            self.connection.settimeout(self.timeout)
+    
+    def _send_body(
+        self,
+        status: int,
+        content_type: str,
+        payload: Optional[bytes],
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Envía una respuesta completa con Content-Length.
+        
+        payload None (304): sin body ni Content-Length; el cliente sabe
+        que un 304 no tiene body, así que keep-alive sigue funcionando.
+        """
+        self.send_response(status)
+        if payload is not None:
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if payload is not None:
+            self.wfile.write(payload)
+    
+    def _send_stream(
+        self,
+        status: int,
+        body: StreamingBody,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Envía un StreamingBody bloque por bloque.
+        
+        FRAMING:
+        - Cliente HTTP/1.1: Transfer-Encoding: chunked (keep-alive sigue)
+        - Cliente HTTP/1.0: sin chunked; el fin del body es el cierre
+        
+        Si el cliente corta a mitad del stream, se cierra el generador
+        (deja de pedir páginas a Supabase) y la conexión.
+        """
+        chunked = self.request_version != 'HTTP/1.0'
+        self.send_response(status)
+        self.send_header('Content-Type', body.content_type)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+        else:
+            self.close_connection = True
+        self.end_headers()
+        
+        chunks = iter(body.chunks)
+        try:
+            for data in chunks:
+                if data:
+                    self.wfile.write(encode_chunk(data) if chunked else data)
+            if chunked:
+                self.wfile.write(LAST_CHUNK)
+        except OSError:
+            self.close_connection = True
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+    
+    def _send_cors_preflight(self) -> None:
+        """Responde al preflight CORS (sin body: Content-Length 0)."""
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, DELETE, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+# ============================================================================
+# BRIDGE COMPARTIDO - Uno por proceso
+# ============================================================================
+
+# Instancia global del bridge (se recrea en cada cold start).
+# POR QUÉ UNA SOLA: RequestHandler, handler y application la comparten,
+# así el precalentamiento (API_WARMUP) calienta el bridge que sirve
+# los requests y el primero espera a ese hilo en vez de competirle
+_bridge = VercelBridge()
+
+
+def _warmup_activado() -> bool:
+    """API_WARMUP=1: precalentar Supabase en segundo plano."""
+    return os.environ.get('API_WARMUP', '').lower() in ('1', 'true')
+
+
+# Opt-in: crear SupabaseClient y abrir una conexión en segundo plano
+# mientras llega el primer request (ver precalentar_en_segundo_plano).
+# Solo al IMPORTAR (Vercel, servidor WSGI); con `python api/index.py`
+# lo arranca __main__ (y en prefork cada hijo, después del fork)
+if _warmup_activado() and __name__ != '__main__':
+    _bridge.precalentar_en_segundo_plano()
 
 
 # ============================================================================
 # HTTP REQUEST HANDLER - Para servidor local
 # ============================================================================
 
-class RequestHandler(BaseHTTPRequestHandler):
+class RequestHandler(KeepAliveMixin, BaseHTTPRequestHandler):
     """
     Handler HTTP que usa VercelBridge.
     
@@ -236,17 +1440,22 @@ class RequestHandler(BaseHTTPRequestHandler):
     - Estándar de Python
     - Sin dependencias externas
     - Suficiente para demostración
+    
+    KEEP-ALIVE: Ver KeepAliveMixin (HTTP/1.1 + Content-Length siempre)
     """
     
-    bridge = VercelBridge()
+    bridge = _bridge  # El mismo que precalienta API_WARMUP
     
-    def _send_json_response(self, status: int, data: Dict[str, Any]) -> None:
-        """Envía respuesta JSON."""
-        self.send_response(status)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode('utf-8'))
+    def _send_json_response(
+        self,
+        status: int,
+        data: Dict[str, Any],
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Envía respuesta JSON (con Content-Length para keep-alive)."""
+        if isinstance(data, StreamingBody):
+            return self._send_stream(status, data, extra_headers)
+        self._send_body(status, 'application/json', _payload_json(status, data), extra_headers)
     
     def _parse_body(self) -> Dict[str, Any]:
         """Parsea el body del request."""
@@ -269,8 +1478,8 @@ class RequestHandler(BaseHTTPRequestHandler):
         
         # API routes
         query = parse_qs(parsed.query)
-        status, data = self.bridge.handle_request('GET', parsed.path, query)
-        self._send_json_response(status, data)
+        status, data, extra = self.bridge.dispatch('GET', parsed.path, query, None, self.headers)
+        self._send_json_response(status, data, extra)
     
     def _serve_static_file(self, path: str) -> bool:
         """
@@ -345,33 +1554,43 @@ class RequestHandler(BaseHTTPRequestHandler):
         parsed = urlparse(self.path)
         query = parse_qs(parsed.query)
         body = self._parse_body()
-        status, data = self.bridge.handle_request('POST', parsed.path, query, body)
-        self._send_json_response(status, data)
+        status, data, extra = self.bridge.dispatch('POST', parsed.path, query, body, self.headers)
+        self._send_json_response(status, data, extra)
+    
+    def do_PUT(self) -> None:
+        """Maneja requests PUT."""
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        body = self._parse_body()
+        status, data, extra = self.bridge.dispatch('PUT', parsed.path, query, body, self.headers)
+        self._send_json_response(status, data, extra)
+    
+    def do_PATCH(self) -> None:
+        """Maneja requests PATCH."""
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        body = self._parse_body()
+        status, data, extra = self.bridge.dispatch('PATCH', parsed.path, query, body, self.headers)
+        self._send_json_response(status, data, extra)
     
     def do_DELETE(self) -> None:
-        """Maneja requests DELETE."""
+        """Maneja requests DELETE (el body puede traer {"ids": [...]})."""
         parsed = urlparse(self.path)
         query = parse_qs(parsed.query)
-        status, data = self.bridge.handle_request('DELETE', parsed.path, query)
-        self._send_json_response(status, data)
+        body = self._parse_body()  # Además, consumirlo no desalinea keep-alive
+        status, data, extra = self.bridge.dispatch('DELETE', parsed.path, query, body, self.headers)
+        self._send_json_response(status, data, extra)
     
     def do_OPTIONS(self) -> None:
         """Maneja CORS preflight."""
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-        self.end_headers()
+        self._send_cors_preflight()
 
 
 # ============================================================================
 # VERCEL HANDLER - Clase compatible con Vercel Serverless
 # ============================================================================
 
-# Instancia global del bridge (se recrea en cada cold start)
-_bridge = VercelBridge()
-
-class handler(BaseHTTPRequestHandler):
+class handler(KeepAliveMixin, BaseHTTPRequestHandler):
     """
     Handler para Vercel Serverless Functions.
     
@@ -382,7 +1601,7 @@ class handler(BaseHTTPRequestHandler):
     
     POR QUÉ BaseHTTPRequestHandler:
     - SÍ: Es el formato esperado por @vercel/python
-    - SÍ: Permite manejar GET, POST, DELETE
+    - SÍ: Permite manejar GET, POST, PUT, PATCH, DELETE
     - NO Flask/Django: Sin frameworks
     """
     
@@ -397,8 +1616,8 @@ class handler(BaseHTTPRequestHandler):
             
             # API routes
             query = parse_qs(parsed.query)
-            status, data = _bridge.handle_request('GET', parsed.path, query)
-            self._send_json(status, data)
+            status, data, extra = _bridge.dispatch('GET', parsed.path, query, None, self.headers)
+            self._send_json(status, data, extra)
             
         except Exception as e:
             self._send_json(500, {'error': str(e)})
@@ -409,8 +1628,32 @@ class handler(BaseHTTPRequestHandler):
             parsed = urlparse(self.path)
             query = parse_qs(parsed.query)
             body = self._parse_body()
-            status, data = _bridge.handle_request('POST', parsed.path, query, body)
-            self._send_json(status, data)
+            status, data, extra = _bridge.dispatch('POST', parsed.path, query, body, self.headers)
+            self._send_json(status, data, extra)
+            
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+    
+    def do_PUT(self):
+        """Maneja requests PUT en Vercel."""
+        try:
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            body = self._parse_body()
+            status, data, extra = _bridge.dispatch('PUT', parsed.path, query, body, self.headers)
+            self._send_json(status, data, extra)
+            
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+    
+    def do_PATCH(self):
+        """Maneja requests PATCH en Vercel."""
+        try:
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            body = self._parse_body()
+            status, data, extra = _bridge.dispatch('PATCH', parsed.path, query, body, self.headers)
+            self._send_json(status, data, extra)
             
         except Exception as e:
             self._send_json(500, {'error': str(e)})
@@ -420,27 +1663,22 @@ class handler(BaseHTTPRequestHandler):
         try:
             parsed = urlparse(self.path)
             query = parse_qs(parsed.query)
-            status, data = _bridge.handle_request('DELETE', parsed.path, query)
-            self._send_json(status, data)
+            body = self._parse_body()  # Puede traer {"ids": [...]}
+            status, data, extra = _bridge.dispatch('DELETE', parsed.path, query, body, self.headers)
+            self._send_json(status, data, extra)
             
         except Exception as e:
             self._send_json(500, {'error': str(e)})
     
     def do_OPTIONS(self):
         """Maneja CORS preflight."""
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, DELETE, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
-        self.end_headers()
+        self._send_cors_preflight()
     
-    def _send_json(self, status: int, data: dict):
-        """Envía respuesta JSON."""
-        self.send_response(status)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode('utf-8'))
+    def _send_json(self, status: int, data: dict, extra_headers: Optional[dict] = None):
+        """Envía respuesta JSON (con Content-Length para keep-alive)."""
+        if isinstance(data, StreamingBody):
+            return self._send_stream(status, data, extra_headers)
+        self._send_body(status, 'application/json', _payload_json(status, data), extra_headers)
     
     def _parse_body(self) -> dict:
         """Parsea el body del request."""
@@ -499,28 +1737,339 @@ class handler(BaseHTTPRequestHandler):
             return False
 
 
+# ============================================================================
+# WSGI APPLICATION - Para Gunicorn, uWSGI, waitress, mod_wsgi...
+# ============================================================================
+
+# Tamaño máximo del body y tamaño de cada lectura de wsgi.input
+_MAX_BODY = 1024 * 1024
+_BODY_CHUNK = 64 * 1024
+
+_CORS_PREFLIGHT_HEADERS = [
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, PUT, PATCH, DELETE, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type, Authorization'),
+    ('Content-Length', '0'),
+]
+
+
+def _wsgi_status(code: int) -> str:
+    """Convierte 404 en '404 Not Found' (formato que exige PEP 3333)."""
+    from http import HTTPStatus
+    try:
+        return f'{code} {HTTPStatus(code).phrase}'
+    except ValueError:
+        return f'{code} Unknown'
+
+
+def _wsgi_headers(environ: Dict[str, Any]) -> Dict[str, str]:
+    """Extrae los headers HTTP del environ (nombres en minúsculas)."""
+    headers = {
+        key[5:].replace('_', '-').lower(): value
+        for key, value in environ.items()
+        if key.startswith('HTTP_')
+    }
+    if environ.get('CONTENT_TYPE'):
+        headers['content-type'] = environ['CONTENT_TYPE']
+    if environ.get('CONTENT_LENGTH'):
+        headers['content-length'] = environ['CONTENT_LENGTH']
+    return headers
+
+
+def _wsgi_read_body(environ: Dict[str, Any]) -> Optional[bytes]:
+    """
+    Lee el body de wsgi.input en bloques de _BODY_CHUNK.
+    
+    POR QUÉ EN BLOQUES:
+    - SÍ: Nunca se pide al servidor un read() gigante de una vez
+    - SÍ: Se corta apenas se supera _MAX_BODY (no se lee todo primero)
+    - SÍ: Soporta uploads chunked (wsgi.input_terminated, sin
+      CONTENT_LENGTH): se lee hasta EOF
+    
+    RETORNA: bytes del body, o None si excede _MAX_BODY
+    """
+    stream = environ.get('wsgi.input')
+    if stream is None:
+        return b''
+    
+    try:
+        remaining = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        remaining = 0
+    until_eof = not remaining and environ.get('wsgi.input_terminated', False)
+    
+    if remaining > _MAX_BODY:
+        return None
+    
+    body = bytearray()
+    while until_eof or remaining > 0:
+        chunk = stream.read(_BODY_CHUNK if until_eof else min(_BODY_CHUNK, remaining))
+        if not chunk:
+            break
+        body += chunk
+        remaining -= len(chunk)
+        if len(body) > _MAX_BODY:
+            return None
+    return bytes(body)
+
+
+def _wsgi_stream(chunks) -> Iterator[bytes]:
+    """Bloques no vacíos (PEP 3333: el servidor llama close() al terminar)."""
+    for data in chunks:
+        if data:
+            yield data
+
+
+def application(environ: Dict[str, Any], start_response: Callable) -> list:
+    """
+    Aplicación WSGI (PEP 3333) sobre el mismo VercelBridge.
+    
+    EJECUCIÓN:
+        gunicorn api.index:application --workers 4
+        waitress-serve --port=8000 api.index:application
+    
+    POR QUÉ WSGI:
+    - SÍ: Cualquier servidor WSGI multi-worker sirve la app sin glue
+    - SÍ: Sigue "sin frameworks": es una función, no Flask
+    - SÍ: Misma lógica que RequestHandler/handler (VercelBridge)
+    
+    RESPUESTAS:
+    - Con Content-Length (el servidor no necesita chunked)
+    - StreamingBody: se retorna el iterable de bloques; el servidor WSGI
+      los envía a medida que se generan (chunked o cierre)
+    - Archivos de public/ para GET que no son /api
+    """
+    method = environ.get('REQUEST_METHOD', 'GET').upper()
+    path = environ.get('PATH_INFO') or '/'
+    
+    if method == 'OPTIONS':
+        start_response(_wsgi_status(200), list(_CORS_PREFLIGHT_HEADERS))
+        return [b'']
+    
+    if method == 'GET':
+        static = _leer_estatico(path)
+        if static is not None:
+            content_type, content = static
+            start_response(_wsgi_status(200), [
+                ('Content-Type', content_type),
+                ('Content-Length', str(len(content))),
+                ('Access-Control-Allow-Origin', '*'),
+            ])
+            return [content]
+    
+    extra: Dict[str, str] = {}
+    raw_body = _wsgi_read_body(environ)
+    if raw_body is None:
+        status, data = 413, {'error': 'Body demasiado grande'}
+    else:
+        try:
+            body = json.loads(raw_body.decode('utf-8')) if raw_body else {}
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            body = {}
+        
+        try:
+            query = parse_qs(environ.get('QUERY_STRING', ''))
+            status, data, extra = _bridge.dispatch(
+                method, path, query, body, _wsgi_headers(environ)
+            )
+        except Exception as e:
+            status, data = 500, {'error': str(e)}
+    
+    if isinstance(data, StreamingBody):
+        start_response(_wsgi_status(status), [
+            ('Content-Type', data.content_type),
+            ('Access-Control-Allow-Origin', '*'),
+        ] + list(extra.items()))
+        return _wsgi_stream(data.chunks)
+    
+    payload = _payload_json(status, data)
+    if payload is None:  # 304 Not Modified: sin body
+        start_response(_wsgi_status(status), [
+            ('Access-Control-Allow-Origin', '*'),
+        ] + list(extra.items()))
+        return []
+    start_response(_wsgi_status(status), [
+        ('Content-Type', 'application/json'),
+        ('Content-Length', str(len(payload))),
+        ('Access-Control-Allow-Origin', '*'),
+    ] + list(extra.items()))
+    return [payload]
+
+
 # ============================================================================
 # EJECUCIÓN LOCAL - if __name__ == "__main__"
 # ============================================================================
 
+def _parse_args(argv=None):
+    """
+    Parsea argumentos de línea de comandos del servidor local.
+    
+    MODOS:
+    - simple: HTTPServer original (un request a la vez)
+    - threaded: Pool de workers con cola de accept acotada
+    - async: Servidor asyncio con servicios asíncronos
+    - prefork: N procesos (uno por CPU) con pool de workers cada uno
+    
+    Los defaults se pueden fijar por variables de entorno
+    (API_MODE, API_WORKERS, API_QUEUE_SIZE, API_PROCESSES, PORT).
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Servidor API local - CRUD Didáctico')
+    parser.add_argument('--mode', choices=['simple', 'threaded', 'async', 'prefork'],
+                        default=os.getenv('API_MODE', 'simple'))
+    parser.add_argument('--host', default=os.getenv('HOST', 'localhost'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', '8000')))
+    # Cada conexión keep-alive ocupa un worker aun ociosa; con conexiones
+    # en cola, las ociosas se cierran enseguida (ver KeepAliveMixin)
+    parser.add_argument('--workers', type=int, default=int(os.getenv('API_WORKERS', '8')),
+                        help='Hilos del pool (modos threaded y prefork); una conexión '
+                             'keep-alive ociosa ocupa uno hasta que haya clientes en cola')
+    parser.add_argument('--queue-size', type=int, default=int(os.getenv('API_QUEUE_SIZE', '64')),
+                        help='Conexiones en espera antes de responder 503 (modo threaded)')
+    parser.add_argument('--processes', type=int, default=int(os.getenv('API_PROCESSES', '0')),
+                        help='Procesos worker (modo prefork, 0 = según CPUs/cgroups)')
+    return parser.parse_args(argv)
+
+
+def _precargar() -> None:
+    """
+    Warmup antes de hacer fork (modo prefork).
+    
+    QUÉ CARGA:
+    - Módulos de servicios (y con ellos el SDK de Supabase)
+    - Singletons Settings y SupabaseClient
+    
+    POR QUÉ EN EL PADRE:
+    - SÍ: Los hijos heredan todo ya importado (arranque instantáneo)
+    - SÍ: Tras gc.freeze() esas páginas se comparten (copy-on-write)
+    - SEGURO: create_client no abre conexiones; cada hijo abre las suyas
+    """
+    from src.config.settings import Settings
+    from src.repositories.supabase_client import SupabaseClient
+    import src.services.auth_service  # noqa: F401
+    import src.services.notas_service  # noqa: F401
+    
+    try:
+        Settings()
+        SupabaseClient()
+    except ValueError as e:
+        # Sin configuración igual servimos health y estáticos
+        print(f"⚠️ Warmup incompleto: {e}")
+
+
+def servir_prefork(
+    host: str,
+    port: int,
+    processes: int = 0,
+    workers: int = 8,
+    queue_size: int = 64
+) -> None:
+    """
+    Ejecuta el modo pre-fork hasta Ctrl+C / SIGTERM.
+    
+    Cada proceso hijo corre un ThreadPoolHTTPServer propio
+    (SO_REUSEPORT reparte las conexiones entre procesos).
+    """
+    from src.server.prefork import PreforkServer
+    from src.server.threaded import ThreadPoolHTTPServer
+    
+    def _post_fork() -> None:
+        # El padre nunca precalienta: cada hijo abre sus propias conexiones
+        if _warmup_activado():
+            _bridge.precalentar_en_segundo_plano()
+    
+    def _factory(address, bind_and_activate=True):
+        return ThreadPoolHTTPServer(
+            address, RequestHandler,
+            workers=workers, queue_size=queue_size,
+            bind_and_activate=bind_and_activate
+        )
+    
+    server = PreforkServer(
+        (host, port), _factory,
+        processes=processes or None, warmup=_precargar, post_fork=_post_fork
+    )
+    print(f"Procesos: {server.processes} (SO_REUSEPORT: {server.reuse_port})")
+    server.serve_forever()
+
+
+def servir_async(host: str, port: int) -> None:
+    """
+    Ejecuta el servidor asyncio hasta Ctrl+C.
+    
+    POR QUÉ FUNCIÓN APARTE:
+    - El servidor asyncio no es un HTTPServer (no tiene serve_forever
+      síncrono); se ejecuta con asyncio.run
+    """
+    import asyncio
+    from src.server.async_server import AsyncHTTPServer
+    
+    bridge = AsyncVercelBridge()
+    server = AsyncHTTPServer(
+        bridge.dispatch_async, host, port, static=_leer_estatico,
+        idle_timeout=KEEPALIVE_TIMEOUT, max_requests=KEEPALIVE_MAX_REQUESTS
+    )
+    asyncio.run(server.serve_forever())
+
+
+def crear_servidor(
+    mode: str,
+    host: str,
+    port: int,
+    workers: int = 8,
+    queue_size: int = 64,
+    handler_class=None
+) -> HTTPServer:
+    """
+    Crea el servidor HTTP local según el modo pedido.
+    
+    POR QUÉ FUNCIÓN SEPARADA:
+    - SÍ: Reutilizable desde benchmarks y tests
+    - SÍ: El bloque __main__ queda solo con el banner
+    """
+    handler_class = handler_class or RequestHandler
+    
+    if mode == 'threaded':
+        from src.server.threaded import ThreadPoolHTTPServer
+        return ThreadPoolHTTPServer(
+            (host, port), handler_class,
+            workers=workers, queue_size=queue_size
+        )
+    
+    return HTTPServer((host, port), handler_class)
+
+
 if __name__ == "__main__":
     """
     Inicia servidor HTTP local para pruebas.
     
     EJECUCIÓN:
         python api/index.py
+        python api/index.py --mode threaded --workers 16 --queue-size 128
+        python api/index.py --mode async
+        python api/index.py --mode prefork --host 0.0.0.0
     
     ENDPOINTS:
         GET  http://localhost:8000/api/health
         POST http://localhost:8000/api/auth/login
         GET  http://localhost:8000/api/notas
     """
-    PORT = 8000
+    args = _parse_args()
+    PORT = args.port
     
     print("=" * 60)
     print("SERVIDOR API LOCAL - CRUD Didáctico")
     print("=" * 60)
-    print(f"Servidor iniciado en: http://localhost:{PORT}")
+    print(f"Servidor iniciado en: http://{args.host}:{PORT}")
+    if args.mode == 'threaded':
+        print(f"Modo: threaded ({args.workers} workers, cola de {args.queue_size})")
+    elif args.mode == 'async':
+        print("Modo: async (event loop + servicios asíncronos)")
+    elif args.mode == 'prefork':
+        print(f"Modo: prefork ({args.workers} workers por proceso)")
+    else:
+        print("Modo: simple (un request a la vez)")
     print(f"\nEndpoints disponibles:")
     print(f"  GET  /api/health     - Health check")
     print(f"  POST /api/auth/login - Login")
@@ -529,8 +2078,31 @@ if __name__ == "__main__":
     print(f"\nPresione Ctrl+C para detener")
     print("=" * 60)
     
+    if args.mode == 'async':
+        try:
+            servir_async(args.host, PORT)
+        except KeyboardInterrupt:
+            print("\n\n👋 Servidor detenido")
+        sys.exit(0)
+    
+    if args.mode == 'prefork':
+        try:
+            servir_prefork(
+                args.host, PORT, processes=args.processes,
+                workers=args.workers, queue_size=args.queue_size
+            )
+        except KeyboardInterrupt:
+            print("\n\n👋 Servidor detenido")
+        sys.exit(0)
+    
+    server = crear_servidor(
+        args.mode, args.host, PORT,
+        workers=args.workers, queue_size=args.queue_size
+    )
+    if _warmup_activado():
+        _bridge.precalentar_en_segundo_plano()
     try:
-        server = HTTPServer(('localhost', PORT), RequestHandler)
         server.serve_forever()
     except KeyboardInterrupt:
+        server.server_close()
         print("\n\n👋 Servidor detenido")
@@ -0,0 +1,3 @@
+"""
+Benchmarks Package Init
+"""
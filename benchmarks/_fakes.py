@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+_FAKES.PY - Backend simulado para benchmarks
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+POR QUÉ BACKEND SIMULADO:
+- SÍ: Los benchmarks miden el servidor, no la red hacia Supabase
+- SÍ: Latencia configurable (simula un PostgREST lento)
+- SÍ: Sin credenciales reales
+============================================================================
+"""
+
+import sys
+import os
+import time
+import uuid
+import bisect
+import threading
+from datetime import datetime, timezone
+from typing import List, Optional
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.models.nota import Nota
+from src.models.pagina import Pagina, decodificar_cursor
+
+
+FAKE_USER_ID = 'bench-user-0000-0000'
+
+
+class FakeNotasService:
+    """
+    Sustituto de NotasService con latencia simulada.
+
+    Expone la misma interfaz que usa VercelBridge.
+    """
+
+    def __init__(self, latency: float = 0.02, notas: int = 10):
+        self.latency = latency
+        self._lock = threading.Lock()
+        now = datetime.now(timezone.utc).isoformat()
+        self._rows = {}
+        for i in range(notas):
+            row = {
+                'id': str(uuid.uuid4()),
+                'user_id': FAKE_USER_ID,
+                'title': f'Nota {i}',
+                'content': f'Contenido de la nota {i}',
+                'created_at': now,
+                'updated_at': now
+            }
+            self._rows[row['id']] = row
+        self._claves = None  # Claves (created_at, id) ascendentes; None = recalcular
+
+    def _ordenadas(self) -> list:
+        """Claves ordenadas (cacheadas: paginar no re-ordena todo)."""
+        with self._lock:
+            if self._claves is None:
+                self._claves = sorted((r['created_at'], r['id']) for r in self._rows.values())
+            return self._claves
+
+    def _wait(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def listar(self) -> List[Nota]:
+        self._wait()
+        with self._lock:
+            rows = list(self._rows.values())
+        return [Nota.from_dict(r) for r in rows]
+
+    def listar_pagina(self, limite: Optional[int] = None, cursor: Optional[str] = None,
+                      campos=None) -> Pagina:
+        self._wait()
+        limite = limite or 50
+        claves = self._ordenadas()
+        fin = bisect.bisect_left(claves, decodificar_cursor(cursor)) if cursor else len(claves)
+        rows = [self._rows[clave[1]] for clave in reversed(claves[max(0, fin - limite - 1):fin])]
+        return Pagina.desde_filas(rows, limite, Nota.from_dict)
+
+    def iterar_paginas(self, limite: Optional[int] = None, cursor: Optional[str] = None,
+                       campos=None):
+        while True:
+            pagina = self.listar_pagina(limite, cursor, campos)
+            yield pagina
+            if pagina.next_cursor is None:
+                return
+            cursor = pagina.next_cursor
+
+    def obtener(self, nota_id: str, campos=None) -> Optional[Nota]:
+        self._wait()
+        row = self._rows.get(nota_id)
+        return Nota.from_dict(row) if row else None
+
+    def crear(self, titulo: str, contenido: Optional[str] = None) -> Nota:
+        self._wait()
+        now = datetime.now(timezone.utc).isoformat()
+        row = {
+            'id': str(uuid.uuid4()),
+            'user_id': FAKE_USER_ID,
+            'title': titulo,
+            'content': contenido,
+            'created_at': now,
+            'updated_at': now
+        }
+        with self._lock:
+            self._rows[row['id']] = row
+            self._claves = None
+        return Nota.from_dict(row)
+
+    def eliminar(self, nota_id: str) -> bool:
+        self._wait()
+        with self._lock:
+            self._claves = None
+            return self._rows.pop(nota_id, None) is not None
+
+    def contar(self) -> int:
+        self._wait()
+        return len(self._rows)
+
+
+class FakePostgrestServer:
+    """
+    PostgREST mínimo en HTTP local (tabla `notas` en memoria).
+
+    POR QUÉ HTTP REAL (y no un mock del builder):
+    - SÍ: Mide también el cliente postgrest-py (serialización, httpx)
+    - SÍ: Cada request paga `latency` como el RTT hacia Supabase
+
+    SOPORTA: POST (insert de un objeto o lista), GET/PATCH/DELETE con
+    filtros id=eq.X / id=in.(a,b). Siempre responde las filas afectadas.
+
+    USO:
+        with FakePostgrestServer(latency=0.02) as fake:
+            client = SyncPostgrestClient(fake.url)
+            client.table('notas').insert([...]).execute()
+            fake.requests   # Requests recibidos
+    """
+
+    def __init__(self, latency: float = 0.02):
+        from http.server import ThreadingHTTPServer
+
+        self.latency = latency
+        self.requests = 0
+        self.rows = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def __enter__(self) -> 'FakePostgrestServer':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _filtrar(self, query: str) -> List[dict]:
+        from urllib.parse import parse_qs
+
+        filtro = parse_qs(query).get('id', [''])[0]
+        if filtro.startswith('eq.'):
+            ids = {filtro[3:]}
+        elif filtro.startswith('in.('):
+            ids = {i.strip('"') for i in filtro[4:-1].split(',')}
+        else:
+            return list(self.rows.values())
+        return [self.rows[i] for i in ids if i in self.rows]
+
+    def _aplicar(self, method: str, query: str, body) -> List[dict]:
+        with self._lock:
+            self.requests += 1
+            if method == 'POST':
+                now = datetime.now(timezone.utc).isoformat()
+                nuevas = []
+                for fila in body if isinstance(body, list) else [body]:
+                    fila = {'id': str(uuid.uuid4()), 'created_at': now, 'updated_at': now, **fila}
+                    self.rows[fila['id']] = fila
+                    nuevas.append(fila)
+                return nuevas
+            filas = self._filtrar(query)
+            if method == 'DELETE':
+                for fila in filas:
+                    del self.rows[fila['id']]
+            elif method == 'PATCH':
+                for fila in filas:
+                    fila.update(body)
+            return [dict(f) for f in filas]
+
+    def _handler_class(self):
+        import json
+        from http.server import BaseHTTPRequestHandler
+
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True  # Sin esto cada request suma ~40ms
+
+            def _responder(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                time.sleep(fake.latency)
+                _, _, query = self.path.partition('?')
+                payload = json.dumps(fake._aplicar(self.command, query, body)).encode()
+                self.send_response(201 if self.command == 'POST' else 200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _responder
+
+            def log_message(self, *args):
+                pass
+
+        return _Handler
+
+
+def make_notas_service(postgrest_url: str):
+    """
+    NotasService real (sesión simulada) contra un FakePostgrestServer.
+
+    Solo se reemplaza el cliente: validación, trozos y mapeo son los reales.
+    """
+    from postgrest import SyncPostgrestClient
+    from src.models.user import User
+    from src.services.notas_service import NotasService
+    from src.services.session_manager import SessionManager
+
+    SessionManager().set_session(User(id=FAKE_USER_ID, email='bench@example.com'), 'token')
+    notas = NotasService()
+    notas._supabase._client = SyncPostgrestClient(postgrest_url)
+    return notas
+
+
+def make_bridge(latency: float = 0.02, notas: int = 10):
+    """Crea un VercelBridge con el backend simulado inyectado."""
+    from api.index import VercelBridge
+
+    bridge = VercelBridge()
+    bridge._notas = FakeNotasService(latency=latency, notas=notas)
+    return bridge
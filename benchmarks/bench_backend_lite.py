@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_BACKEND_LITE.PY - SDK de Supabase vs cliente mínimo (supabase_lite)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE (SUPABASE_BACKEND=sdk vs lite):
+- Import: segundos de un proceso nuevo que importa y crea el cliente
+  (lo que paga cada cold start en Vercel); mediana de --repeticiones
+- Memoria: KB asignados (tracemalloc) al importar + crear el cliente
+- Por llamada: select / insert / update / delete contra un
+  FakePostgrestServer local sin latencia (solo costo del cliente)
+
+EJECUCIÓN:
+    python benchmarks/bench_backend_lite.py
+    python benchmarks/bench_backend_lite.py --llamadas 2000 --repeticiones 9
+============================================================================
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+import subprocess
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+import httpx
+
+from benchmarks._fakes import FakePostgrestServer
+
+
+# Proceso hijo: importar + crear el cliente (y medir memoria)
+_ARRANQUE = """
+import sys, time, tracemalloc
+tracemalloc.start()
+inicio = time.perf_counter()
+from src.repositories.supabase_client import SupabaseClient
+SupabaseClient()
+segundos = time.perf_counter() - inicio
+print(segundos, tracemalloc.get_traced_memory()[1], len(sys.modules))
+"""
+
+
+def _arranque(backend: str, repeticiones: int):
+    """(segundos, KB, módulos) medianos de un proceso nuevo por repetición."""
+    entorno = {
+        **os.environ,
+        'SUPABASE_BACKEND': backend,
+        'SUPABASE_URL': os.environ.get('SUPABASE_URL', 'https://bench.supabase.co'),
+        'SUPABASE_KEY': os.environ.get('SUPABASE_KEY', 'bench-key')
+    }
+    medidas = []
+    for _ in range(repeticiones):
+        salida = subprocess.run(
+            [sys.executable, '-c', _ARRANQUE], capture_output=True, text=True,
+            env=entorno, cwd=_root_dir, check=True
+        ).stdout.split()
+        medidas.append((float(salida[0]), int(salida[1]) / 1024, int(salida[2])))
+    return tuple(statistics.median(m[i] for m in medidas) for i in range(3))
+
+
+def _cliente_postgrest(backend: str, url: str, http: httpx.Client):
+    if backend == 'lite':
+        from src.repositories.supabase_lite import PostgrestLite
+        return PostgrestLite(url, {'apikey': 'anon'}, http)
+    from postgrest import SyncPostgrestClient
+    return SyncPostgrestClient(url, headers={'apikey': 'anon'}, http_client=http)
+
+
+def _por_llamada(backend: str, llamadas: int) -> dict:
+    """Microsegundos por operación (mediana) contra el PostgREST local."""
+    resultados = {}
+    with FakePostgrestServer(latency=0) as fake, httpx.Client() as http:
+        cliente = _cliente_postgrest(backend, fake.url, http)
+        nota_id = cliente.from_('notas').insert({'title': 'x'}).execute().data[0]['id']
+        operaciones = {
+            'select': lambda: cliente.from_('notas').select('*').eq('id', nota_id).execute(),
+            'insert': lambda: cliente.from_('notas').insert({'title': 'y'}).execute(),
+            'update': lambda: cliente.from_('notas').update({'title': 'z'}).eq('id', nota_id).execute(),
+            'delete': lambda: cliente.from_('notas').delete().eq('id', 'no-existe').execute()
+        }
+        for nombre, operacion in operaciones.items():
+            tiempos = []
+            for _ in range(llamadas):
+                start = time.perf_counter()
+                operacion()
+                tiempos.append(time.perf_counter() - start)
+            resultados[nombre] = statistics.median(tiempos) * 1e6
+    return resultados
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--llamadas', type=int, default=500, help='por operación')
+    parser.add_argument('--repeticiones', type=int, default=5, help='procesos por backend')
+    args = parser.parse_args(argv)
+
+    print("=" * 64)
+    print(f"BENCHMARK: SDK vs lite ({args.repeticiones} arranques, "
+          f"{args.llamadas} llamadas por operación)")
+    print("=" * 64)
+    print(f"{'backend':<10}{'import s':>10}{'mem KB':>10}{'módulos':>10}"
+          f"{'select':>9}{'insert':>9}{'update':>9}{'delete':>9}  (µs)")
+
+    for backend in ('sdk', 'lite'):
+        segundos, kb, modulos = _arranque(backend, args.repeticiones)
+        us = _por_llamada(backend, args.llamadas)
+        print(f"{backend:<10}{segundos:>10.3f}{kb:>10.0f}{modulos:>10.0f}"
+              f"{us['select']:>9.0f}{us['insert']:>9.0f}{us['update']:>9.0f}{us['delete']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
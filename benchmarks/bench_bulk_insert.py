@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_BULK_INSERT.PY - crear() en bucle vs crear_muchos() por trozos
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE:
+- Notas/segundo insertando con NotasService real + postgrest-py real
+  contra un PostgREST simulado en HTTP local con latencia por request
+- Requests HTTP necesarios
+
+EJECUCIÓN:
+    python benchmarks/bench_bulk_insert.py
+    python benchmarks/bench_bulk_insert.py --notas 20000 --latencia 0.03
+============================================================================
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+# Settings exige credenciales aunque el backend sea simulado
+os.environ.setdefault('SUPABASE_URL', 'https://bench.supabase.co')
+os.environ.setdefault('SUPABASE_KEY', 'bench-key')
+
+from benchmarks._fakes import FakePostgrestServer, make_notas_service
+
+
+def _notas(cantidad: int) -> list:
+    return [{'title': f'Nota {i}', 'content': f'Contenido migrado {i} ' * 8}
+            for i in range(cantidad)]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--notas', type=int, default=2000)
+    parser.add_argument('--bucle', type=int, default=200,
+                        help='notas a insertar con el bucle (se extrapola)')
+    parser.add_argument('--latencia', type=float, default=0.02)
+    parser.add_argument('--trozos', default='100,500,1000')
+    args = parser.parse_args(argv)
+
+    print("=" * 64)
+    print(f"BENCHMARK: {args.notas} notas, latencia {args.latencia * 1e3:.0f} ms/request")
+    print("=" * 64)
+    print(f"{'modo':<26}{'requests':>10}{'notas/s':>12}{'total s':>12}")
+
+    with FakePostgrestServer(latency=args.latencia) as fake:
+        notas = make_notas_service(fake.url)
+
+        start = time.perf_counter()
+        for nota in _notas(args.bucle):
+            notas.crear(nota['title'], nota['content'])
+        elapsed = time.perf_counter() - start
+        por_segundo = args.bucle / elapsed
+        print(f"{'crear() en bucle':<26}{args.notas:>10}{por_segundo:>12.0f}"
+              f"{args.notas / por_segundo:>11.1f}*")
+
+        for trozo in (int(t) for t in args.trozos.split(',')):
+            antes = fake.requests
+            start = time.perf_counter()
+            resultados = notas.crear_muchos(_notas(args.notas), tamano_lote=trozo)
+            elapsed = time.perf_counter() - start
+            assert all(r.status == 201 for r in resultados)
+            print(f"{f'crear_muchos({trozo})':<26}{fake.requests - antes:>10}"
+                  f"{args.notas / elapsed:>12.0f}{elapsed:>12.2f}")
+
+    print(f"* extrapolado desde {args.bucle} notas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_CACHE.PY - Lecturas con y sin caché de notas por usuario
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE (NotasService real contra PostgREST simulado con latencia):
+- El flujo del menú CLI "editar": listar() x2, obtener(), actualizar()
+  y listar() de nuevo, repetido --rondas veces
+- Requests HTTP y tiempo total con NOTAS_CACHE_TTL=0 vs con caché
+
+EJECUCIÓN:
+    python benchmarks/bench_cache.py
+    python benchmarks/bench_cache.py --notas 500 --rondas 50 --latencia 0.03
+============================================================================
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+# Settings exige credenciales aunque el backend sea simulado
+os.environ.setdefault('SUPABASE_URL', 'https://bench.supabase.co')
+os.environ.setdefault('SUPABASE_KEY', 'bench-key')
+
+from benchmarks._fakes import FakePostgrestServer, make_notas_service
+from src.config.settings import Settings
+
+
+def _flujo_editar(notas, rondas: int) -> None:
+    """Lo que hace Menu._editar_nota, con una edición por ronda."""
+    for ronda in range(rondas):
+        notas.listar()                      # _listar_notas() para mostrar IDs
+        nota = notas.listar()[ronda % 10]   # Búsqueda por prefijo
+        notas.obtener(nota.id)
+        notas.actualizar(nota.id, titulo=f'Editada {ronda}')
+    notas.listar()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--notas', type=int, default=200)
+    parser.add_argument('--rondas', type=int, default=20)
+    parser.add_argument('--latencia', type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    print("=" * 64)
+    print(f"BENCHMARK: {args.notas} notas, {args.rondas} ediciones, "
+          f"latencia {args.latencia * 1e3:.0f} ms/request")
+    print("=" * 64)
+    print(f"{'modo':<20}{'requests':>10}{'total s':>10}{'hits':>8}{'misses':>8}")
+
+    settings = Settings()
+    ttl_original = settings.notas_cache_ttl
+    ttl_cache = ttl_original or 30  # La caché es opt-in (default TTL=0)
+    for nombre, ttl in (('sin caché (TTL=0)', 0), (f'caché (TTL={ttl_cache:g})', ttl_cache)):
+        settings.notas_cache_ttl = ttl
+        with FakePostgrestServer(latency=args.latencia) as fake:
+            notas = make_notas_service(fake.url)
+            notas.crear_muchos([{'title': f'Nota {i}', 'content': 'x' * 200}
+                                for i in range(args.notas)])
+            antes = fake.requests
+
+            start = time.perf_counter()
+            _flujo_editar(notas, args.rondas)
+            elapsed = time.perf_counter() - start
+
+            stats = notas.estadisticas_cache()
+            print(f"{nombre:<20}{fake.requests - antes:>10}{elapsed:>10.2f}"
+                  f"{stats['hits']:>8}{stats['misses']:>8}")
+    settings.notas_cache_ttl = ttl_original
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_COLD_START.PY - Presupuesto de cold start de api/index.py
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE (un proceso nuevo por repetición, como un cold start en Vercel):
+- Import de api/index.py: `python -X importtime` (acumulado del módulo
+  y sus imports directos más caros)
+- Primer request: GET /api/health y un archivo estático de public/
+- Módulos prohibidos: health y estáticos NO deben cargar Supabase
+  (supabase, postgrest, httpx, jwt, dotenv en Vercel, src.services,
+  src.repositories)
+
+FALLA (exit 1) SI:
+- La mediana del import supera --presupuesto-import (ms)
+- La mediana del primer request supera --presupuesto-request (ms)
+- Se cargó algún módulo prohibido
+
+POR QUÉ PRECOMPILAR (--sin-compilar para desactivarlo):
+- Con PYTHONDONTWRITEBYTECODE un archivo editado se recompila en cada
+  proceso: se mediría el compilador y no el import
+
+EJECUCIÓN:
+    python benchmarks/bench_cold_start.py
+    python benchmarks/bench_cold_start.py --repeticiones 21 --presupuesto-import 60
+============================================================================
+"""
+
+import sys
+import os
+import json
+import argparse
+import compileall
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+# Paquetes que /api/health y los estáticos no deben importar
+PROHIBIDOS = ('supabase', 'postgrest', 'gotrue', 'supabase_auth', 'httpx', 'jwt',
+              'dotenv', 'src.services', 'src.repositories')
+
+# Proceso hijo: cold start + primer request; imprime una línea JSON
+_COLD_START = """
+import sys, json, time
+inicio = time.perf_counter()
+import api.index as api
+importado = time.perf_counter()
+status = api._bridge.dispatch('GET', '/api/health', {}, None, {})[0]
+estatico = api._leer_estatico('/index.html')
+fin = time.perf_counter()
+prohibidos = %r
+print(json.dumps({
+    'import_ms': (importado - inicio) * 1e3,
+    'request_ms': (fin - importado) * 1e3,
+    'status': status,
+    'estatico': estatico is not None,
+    'prohibidos': sorted(m for m in sys.modules
+                         if any(m == p or m.startswith(p + '.') for p in prohibidos))
+}))
+""" % (PROHIBIDOS,)
+
+
+def _importtime(stderr: str) -> List[Tuple[str, int]]:
+    """Imports directos de api.index y su acumulado (µs), del más caro al más barato."""
+    subarbol: List[Tuple[int, str, int]] = []
+    for linea in stderr.splitlines():
+        if not linea.startswith('import time:') or 'cumulative' in linea:
+            continue
+        _, acumulado, nombre = linea[len('import time:'):].split('|')
+        profundidad = (len(nombre) - len(nombre.lstrip(' ')) - 1) // 2
+        nombre = nombre.strip()
+        if profundidad == 0:
+            if nombre == 'api.index':
+                break
+            subarbol = []
+        else:
+            subarbol.append((profundidad, nombre, int(acumulado)))
+    directos = [(nombre, us) for profundidad, nombre, us in subarbol if profundidad == 1]
+    return sorted(directos, key=lambda d: -d[1])
+
+
+def medir(repeticiones: int) -> Dict:
+    """Medianas de `repeticiones` cold starts (VERCEL=1, credenciales de prueba)."""
+    entorno = {
+        **os.environ,
+        'VERCEL': '1',
+        'SUPABASE_URL': os.environ.get('SUPABASE_URL', 'https://bench.supabase.co'),
+        'SUPABASE_KEY': os.environ.get('SUPABASE_KEY', 'bench-key')
+    }
+    corridas, detalle = [], []
+    for _ in range(repeticiones):
+        proceso = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', _COLD_START],
+            capture_output=True, text=True, env=entorno, cwd=_root_dir, check=True
+        )
+        corridas.append(json.loads(proceso.stdout.strip().splitlines()[-1]))
+        detalle.append(_importtime(proceso.stderr))
+    return {
+        'import_ms': statistics.median(c['import_ms'] for c in corridas),
+        'request_ms': statistics.median(c['request_ms'] for c in corridas),
+        'status': corridas[-1]['status'],
+        'estatico': corridas[-1]['estatico'],
+        'prohibidos': sorted({m for c in corridas for m in c['prohibidos']}),
+        'mas_caros': detalle[len(detalle) // 2][:8]
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--repeticiones', type=int, default=9)
+    parser.add_argument('--presupuesto-import', type=float, default=80, help='ms')
+    parser.add_argument('--presupuesto-request', type=float, default=20, help='ms')
+    parser.add_argument('--sin-compilar', action='store_true')
+    args = parser.parse_args(argv)
+
+    if not args.sin_compilar:
+        for carpeta in ('api', 'src'):
+            compileall.compile_dir(os.path.join(_root_dir, carpeta), quiet=1)
+
+    resultado = medir(args.repeticiones)
+
+    print("=" * 64)
+    print(f"BENCHMARK: cold start de api/index.py ({args.repeticiones} procesos)")
+    print("=" * 64)
+    print(f"import api.index        {resultado['import_ms']:>8.1f} ms "
+          f"(presupuesto {args.presupuesto_import:.0f})")
+    print(f"primer request          {resultado['request_ms']:>8.1f} ms "
+          f"(presupuesto {args.presupuesto_request:.0f}; health={resultado['status']}, "
+          f"estático={'sí' if resultado['estatico'] else 'no'})")
+    print("imports directos más caros (-X importtime, acumulado):")
+    for nombre, us in resultado['mas_caros']:
+        print(f"  {nombre:<30}{us / 1e3:>8.1f} ms")
+
+    fallas = []
+    if resultado['import_ms'] > args.presupuesto_import:
+        fallas.append(f"import {resultado['import_ms']:.1f} ms > {args.presupuesto_import:.0f} ms")
+    if resultado['request_ms'] > args.presupuesto_request:
+        fallas.append(f"primer request {resultado['request_ms']:.1f} ms > "
+                      f"{args.presupuesto_request:.0f} ms")
+    if resultado['prohibidos']:
+        fallas.append(f"módulos prohibidos: {', '.join(resultado['prohibidos'])}")
+    if resultado['status'] != 200 or not resultado['estatico']:
+        fallas.append("health o estático no respondieron")
+
+    print("=" * 64)
+    for falla in fallas:
+        print(f"❌ {falla}")
+    if not fallas:
+        print("✅ Dentro del presupuesto")
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_KEEPALIVE.PY - Latencia de la secuencia del frontend con keep-alive
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE:
+- Tiempo de la secuencia que hace public/index.html al crear y borrar
+  una nota: listar -> crear -> listar -> eliminar -> listar
+- ANTES: HTTP/1.0, una conexión TCP nueva por apiCall()
+- AHORA: HTTP/1.1 keep-alive, una sola conexión para toda la secuencia
+
+EJECUCIÓN:
+    python benchmarks/bench_keepalive.py
+    python benchmarks/bench_keepalive.py --rounds 500 --latency 0.001
+
+NOTA:
+- Sobre loopback el handshake TCP cuesta decenas de µs; a través de
+  internet cuesta 1 RTT (+ TLS) por request, así que la ganancia real
+  en el navegador es mayor que la medida aquí
+============================================================================
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import threading
+import http.client
+import statistics
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+os.environ.setdefault('SUPABASE_URL', 'https://bench.supabase.co')
+os.environ.setdefault('SUPABASE_KEY', 'bench-key')
+
+from benchmarks._fakes import make_bridge
+from api.index import RequestHandler
+from src.server.threaded import ThreadPoolHTTPServer
+
+
+class _KeepAliveHandler(RequestHandler):
+    max_requests = 10 ** 6
+
+    def log_message(self, *args):
+        pass
+
+
+class _Http10Handler(_KeepAliveHandler):
+    """Comportamiento anterior: una conexión por request."""
+    protocol_version = 'HTTP/1.0'
+
+
+def _secuencia(request) -> None:
+    """listar -> crear -> listar -> eliminar -> listar (como el frontend)."""
+    request('GET', '/api/notas')
+    creada = request('POST', '/api/notas', {'title': 'Bench', 'content': 'x'})
+    request('GET', '/api/notas')
+    request('DELETE', f"/api/notas?id={creada['data']['id']}")
+    request('GET', '/api/notas')
+
+
+def _run(handler_class, persistent: bool, rounds: int, latency: float):
+    """Ejecuta `rounds` secuencias y retorna (tiempos en ms, conexiones)."""
+    handler_class.bridge = make_bridge(latency=latency)
+    server = ThreadPoolHTTPServer(('127.0.0.1', 0), handler_class, workers=2)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    conexiones = 0
+    conn = None
+
+    def request(method, path, body=None):
+        nonlocal conn, conexiones
+        if conn is None or not persistent:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            conexiones += 1
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {'Content-Type': 'application/json'} if payload else {}
+        conn.request(method, path, body=payload, headers=headers)
+        data = json.loads(conn.getresponse().read())
+        if not persistent:
+            conn.close()
+        return data
+
+    tiempos = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _secuencia(request)
+        tiempos.append((time.perf_counter() - start) * 1000)
+
+    if conn is not None:
+        conn.close()
+    server.shutdown()
+    server.server_close()
+    return tiempos, conexiones
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Latencia simulada de Supabase (segundos)')
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("BENCHMARK: listar/crear/listar/eliminar/listar")
+    print(f"rondas={args.rounds} latencia backend={args.latency}s")
+    print("=" * 60)
+    print(f"{'modo':<22}{'p50 ms':>9}{'p95 ms':>9}{'conexiones':>12}")
+
+    for nombre, handler_class, persistent in (
+        ('HTTP/1.0 (antes)', _Http10Handler, False),
+        ('HTTP/1.1 keep-alive', _KeepAliveHandler, True),
+    ):
+        tiempos, conexiones = _run(handler_class, persistent, args.rounds, args.latency)
+        p50 = statistics.median(tiempos)
+        p95 = statistics.quantiles(tiempos, n=20)[-1]
+        print(f"{nombre:<22}{p50:>9.2f}{p95:>9.2f}{conexiones:>12}")
+
+
+if __name__ == "__main__":
+    main()
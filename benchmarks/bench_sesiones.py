@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_SESIONES.PY - Tabla de sesiones con muchos usuarios concurrentes
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE (TablaSesiones en memoria, sin red):
+- Alta de --sesiones sesiones
+- --hilos hilos haciendo tocar() (require_auth de la API) sobre sesiones
+  al azar: 1 shard (un solo Lock) vs --shards shards
+- Costo de purgar() (avanzar la rueda) con la tabla llena
+
+EJECUCIÓN:
+    python benchmarks/bench_sesiones.py
+    python benchmarks/bench_sesiones.py --sesiones 100000 --hilos 16
+============================================================================
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+import threading
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.services.tabla_sesiones import TablaSesiones
+
+
+def _llenar(tabla: TablaSesiones, sesiones: int) -> float:
+    """Abre `sesiones` sesiones; retorna segundos."""
+    start = time.perf_counter()
+    for i in range(sesiones):
+        tabla.tocar(f'sesion-{i}', f'user-{i}', vida=3600)
+    return time.perf_counter() - start
+
+
+def _requests(tabla: TablaSesiones, sesiones: int, hilos: int, por_hilo: int) -> float:
+    """`hilos` hilos x `por_hilo` tocar() al azar; retorna segundos."""
+    barrera = threading.Barrier(hilos)
+
+    def _worker(semilla: int):
+        azar = random.Random(semilla)
+        ids = [azar.randrange(sesiones) for _ in range(por_hilo)]
+        barrera.wait()
+        for i in ids:
+            tabla.tocar(f'sesion-{i}', f'user-{i}', vida=3600)
+
+    grupo = [threading.Thread(target=_worker, args=(n,)) for n in range(hilos)]
+    start = time.perf_counter()
+    for hilo in grupo:
+        hilo.start()
+    for hilo in grupo:
+        hilo.join()
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--sesiones', type=int, default=100_000)
+    parser.add_argument('--hilos', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=50_000, help='por hilo')
+    parser.add_argument('--shards', type=int, default=16)
+    args = parser.parse_args(argv)
+
+    print("=" * 64)
+    print(f"BENCHMARK: {args.sesiones} sesiones, {args.hilos} hilos x "
+          f"{args.requests} tocar()")
+    print("=" * 64)
+    print(f"{'shards':<10}{'alta s':>10}{'tocar s':>10}{'tocar/s':>12}{'purgar ms':>12}")
+
+    for shards in (1, args.shards):
+        tabla = TablaSesiones(timeout=900, shards=shards)
+        alta = _llenar(tabla, args.sesiones)
+        elapsed = _requests(tabla, args.sesiones, args.hilos, args.requests)
+        start = time.perf_counter()
+        tabla.purgar()
+        purga = (time.perf_counter() - start) * 1e3
+        total = args.hilos * args.requests
+        print(f"{shards:<10}{alta:>10.2f}{elapsed:>10.2f}{total / elapsed:>12.0f}{purga:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
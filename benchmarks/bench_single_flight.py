@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_SINGLE_FLIGHT.PY - Lecturas idénticas concurrentes
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE (NotasService real contra PostgREST simulado con latencia):
+- --hilos hilos llaman listar() a la vez, --rondas veces
+- Requests que llegan a "Supabase" con y sin single-flight
+  (la caché se desactiva para aislar el efecto: NOTAS_CACHE_TTL=0)
+
+EJECUCIÓN:
+    python benchmarks/bench_single_flight.py
+    python benchmarks/bench_single_flight.py --hilos 32 --rondas 20
+============================================================================
+"""
+
+import sys
+import os
+import time
+import argparse
+import threading
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+# Settings exige credenciales aunque el backend sea simulado
+os.environ.setdefault('SUPABASE_URL', 'https://bench.supabase.co')
+os.environ.setdefault('SUPABASE_KEY', 'bench-key')
+
+from benchmarks._fakes import FakePostgrestServer, make_notas_service
+from src.config.settings import Settings
+
+
+class _SinCoalescer:
+    """Reemplazo de SingleFlight que no comparte nada (línea base)."""
+
+    compartidas = 0
+
+    def hacer(self, clave, funcion):
+        return funcion()
+
+
+def _rafagas(notas, hilos: int, rondas: int) -> float:
+    """`rondas` ráfagas de `hilos` listar() simultáneos; retorna segundos."""
+    start = time.perf_counter()
+    for _ in range(rondas):
+        barrera = threading.Barrier(hilos)
+
+        def _pestana():
+            barrera.wait()
+            notas.listar()
+
+        grupo = [threading.Thread(target=_pestana) for _ in range(hilos)]
+        for hilo in grupo:
+            hilo.start()
+        for hilo in grupo:
+            hilo.join()
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--hilos', type=int, default=16)
+    parser.add_argument('--rondas', type=int, default=10)
+    parser.add_argument('--notas', type=int, default=100)
+    parser.add_argument('--latencia', type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    Settings().notas_cache_ttl = 0
+
+    print("=" * 64)
+    print(f"BENCHMARK: {args.rondas} ráfagas de {args.hilos} listar() simultáneos, "
+          f"latencia {args.latencia * 1e3:.0f} ms")
+    print("=" * 64)
+    print(f"{'modo':<22}{'requests':>10}{'total s':>10}{'compartidas':>14}")
+
+    for nombre, coalescer in (('sin single-flight', _SinCoalescer()), ('single-flight', None)):
+        with FakePostgrestServer(latency=args.latencia) as fake:
+            notas = make_notas_service(fake.url)
+            if coalescer is not None:
+                notas._vuelos = coalescer
+            notas.crear_muchos([{'title': f'Nota {i}'} for i in range(args.notas)])
+            antes = fake.requests
+
+            elapsed = _rafagas(notas, args.hilos, args.rondas)
+            print(f"{nombre:<22}{fake.requests - antes:>10}{elapsed:>10.2f}"
+                  f"{notas._vuelos.compartidas:>14}")
+
+
+if __name__ == "__main__":
+    main()
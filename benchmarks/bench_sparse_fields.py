@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_SPARSE_FIELDS.PY - select('*') vs ?fields=id,title
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE (por página de notas):
+- Bytes que PostgREST envía (JSON de las filas)
+- Tiempo de json.loads + mapeo a Nota/NotaParcial + to_dict + json.dumps
+  (el trabajo que hace el servidor por cada GET /api/notas)
+
+EJECUCIÓN:
+    python benchmarks/bench_sparse_fields.py
+    python benchmarks/bench_sparse_fields.py --content-size 8000 --rows 200
+============================================================================
+"""
+
+import sys
+import os
+import json
+import time
+import uuid
+import argparse
+from datetime import datetime, timezone
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.models.nota import Nota, NotaParcial, normalizar_campos
+
+
+def _filas(rows: int, content_size: int) -> list:
+    """Filas como las devolvería PostgREST con select('*')."""
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            'id': str(uuid.uuid4()),
+            'user_id': str(uuid.uuid4()),
+            'title': f'Nota {i}',
+            'content': 'x' * content_size,
+            'created_at': now,
+            'updated_at': now
+        }
+        for i in range(rows)
+    ]
+
+
+def _bench(wire: bytes, mapear, repeticiones: int) -> float:
+    """µs por página: decode + mapeo + respuesta JSON."""
+    start = time.perf_counter()
+    for _ in range(repeticiones):
+        notas = [mapear(f) for f in json.loads(wire)]
+        json.dumps({'data': [n.to_dict() for n in notas]}, indent=2)
+    return (time.perf_counter() - start) / repeticiones * 1e6
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--rows', type=int, default=50)
+    parser.add_argument('--content-size', type=int, default=2000)
+    parser.add_argument('--repeticiones', type=int, default=200)
+    parser.add_argument('--fields', default='id,title')
+    args = parser.parse_args(argv)
+
+    filas = _filas(args.rows, args.content_size)
+    campos = normalizar_campos(args.fields) + ('created_at',)
+    full = json.dumps(filas).encode()
+    sparse = json.dumps([{c: f[c] for c in campos} for f in filas]).encode()
+
+    t_full = _bench(full, Nota.from_dict, args.repeticiones)
+    t_sparse = _bench(sparse, NotaParcial, args.repeticiones)
+
+    print("=" * 60)
+    print(f"BENCHMARK: {args.rows} notas de {args.content_size} bytes de contenido")
+    print("=" * 60)
+    print(f"{'select':<22}{'bytes':>10}{'µs/página':>14}")
+    print(f"{'*':<22}{len(full):>10}{t_full:>14.1f}")
+    print(f"{','.join(campos):<22}{len(sparse):>10}{t_sparse:>14.1f}")
+    print(f"Reducción: {len(full) / len(sparse):.1f}x bytes, {t_full / t_sparse:.1f}x tiempo")
+
+
+if __name__ == "__main__":
+    main()
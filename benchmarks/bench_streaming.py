@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_STREAMING.PY - Respuesta completa vs ?stream=ndjson
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE (todas las notas de un usuario, vía la app WSGI en proceso):
+- Pico de memoria (tracemalloc) para armar y consumir la respuesta
+- Tiempo total y tiempo hasta el primer byte
+
+COMPARA:
+- ?limit=N             -> una sola página: lista de dicts + json.dumps
+- ?stream=ndjson       -> páginas de --pagina notas escritas por bloques
+
+EJECUCIÓN:
+    python benchmarks/bench_streaming.py
+    python benchmarks/bench_streaming.py --notas 50000 --pagina 500
+============================================================================
+"""
+
+import sys
+import os
+import time
+import argparse
+import tracemalloc
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from benchmarks._fakes import make_bridge
+
+
+def _medir(application, query: str):
+    """(bytes, segundos, segundos al primer byte, pico de memoria)."""
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': '/api/notas',
+        'QUERY_STRING': query,
+        'CONTENT_LENGTH': '0',
+    }
+    total = 0
+    primer_byte = None
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for chunk in application(environ, lambda status, headers: None):
+        if primer_byte is None:
+            primer_byte = time.perf_counter() - start
+        total += len(chunk)  # El bloque se descarta, como tras escribirlo al socket
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return total, elapsed, primer_byte, peak
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--notas', type=int, default=20000)
+    parser.add_argument('--pagina', type=int, default=500)
+    args = parser.parse_args(argv)
+
+    import api.index as api
+    api._bridge = make_bridge(latency=0, notas=args.notas)
+
+    casos = [
+        (f'completa (limit={args.notas})', f'limit={args.notas}'),
+        (f'ndjson (bloques de {args.pagina})', f'stream=ndjson&limit={args.pagina}'),
+        (f'json (bloques de {args.pagina})', f'stream=json&limit={args.pagina}'),
+    ]
+
+    print("=" * 72)
+    print(f"BENCHMARK: {args.notas} notas")
+    print("=" * 72)
+    print(f"{'modo':<28}{'bytes':>11}{'ms':>9}{'ms 1er byte':>13}{'pico MB':>10}")
+    for nombre, query in casos:
+        total, elapsed, primer_byte, peak = _medir(api.application, query)
+        print(f"{nombre:<28}{total:>11}{elapsed * 1e3:>9.0f}"
+              f"{primer_byte * 1e3:>13.1f}{peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_THREADED_SERVER.PY - Throughput vs cantidad de workers
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE:
+- Requests/segundo de GET /api/notas con un backend simulado lento
+- Modo simple (HTTPServer) vs modo threaded con 1..N workers
+
+EJECUCIÓN:
+    python benchmarks/bench_threaded_server.py
+    python benchmarks/bench_threaded_server.py --latency 0.05 --clients 32
+
+RESULTADO ESPERADO:
+- simple ≈ 1/latencia req/s (un request a la vez)
+- threaded escala casi lineal con los workers hasta llegar a --clients
+============================================================================
+"""
+
+import sys
+import os
+import time
+import argparse
+import threading
+import http.client
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+os.environ.setdefault('SUPABASE_URL', 'https://bench.supabase.co')
+os.environ.setdefault('SUPABASE_KEY', 'bench-key')
+
+from benchmarks._fakes import make_bridge
+from api.index import RequestHandler, crear_servidor
+
+
+def _run(mode: str, workers: int, clients: int, requests: int, latency: float) -> float:
+    """Levanta un servidor, lo carga con `clients` hilos y retorna req/s."""
+    bridge = make_bridge(latency=latency)
+
+    class _Handler(RequestHandler):
+        def log_message(self, *args):
+            pass
+
+    _Handler.bridge = bridge
+
+    server = crear_servidor(mode, '127.0.0.1', 0, workers=workers,
+                            queue_size=clients * 2, handler_class=_Handler)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def _client():
+        for _ in range(requests):
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            conn.request('GET', '/api/notas')
+            conn.getresponse().read()
+            conn.close()
+
+    threads = [threading.Thread(target=_client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    server.shutdown()
+    server.server_close()
+    return clients * requests / elapsed
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--latency', type=float, default=0.02,
+                        help='Latencia simulada de Supabase (segundos)')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=10,
+                        help='Requests por cliente')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("BENCHMARK: Throughput vs workers (backend simulado)")
+    print(f"latencia={args.latency}s clientes={args.clients} "
+          f"requests/cliente={args.requests}")
+    print("=" * 60)
+    print(f"{'modo':<10}{'workers':>8}{'req/s':>12}")
+
+    rps = _run('simple', 1, args.clients, args.requests, args.latency)
+    print(f"{'simple':<10}{1:>8}{rps:>12.1f}")
+
+    for workers in args.workers:
+        rps = _run('threaded', workers, args.clients, args.requests, args.latency)
+        print(f"{'threaded':<10}{workers:>8}{rps:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
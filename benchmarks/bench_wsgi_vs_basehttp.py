@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+BENCH_WSGI_VS_BASEHTTP.PY - Overhead por request: WSGI vs RequestHandler
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: BENCHMARKS
+Fecha: 2025-12-24
+
+QUÉ MIDE:
+- Microsegundos por request de cada adaptador HTTP sobre el MISMO
+  VercelBridge (backend simulado sin latencia)
+- application(environ, start_response) llamado directamente
+- RequestHandler (BaseHTTPRequestHandler) sobre un socket en memoria:
+  incluye parseo de request line + headers y escritura de la respuesta
+
+POR QUÉ EN PROCESO (sin red):
+- SÍ: Aísla el costo del adaptador (sin kernel, sin TCP)
+- SÍ: El servidor WSGI real (Gunicorn...) agrega su propio parseo;
+  esta cifra es el piso de cada camino
+
+EJECUCIÓN:
+    python benchmarks/bench_wsgi_vs_basehttp.py
+    python benchmarks/bench_wsgi_vs_basehttp.py --requests 20000
+============================================================================
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import argparse
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+os.environ.setdefault('SUPABASE_URL', 'https://bench.supabase.co')
+os.environ.setdefault('SUPABASE_KEY', 'bench-key')
+
+import api.index as api_index
+from benchmarks._fakes import make_bridge
+
+
+class _FakeSocket:
+    """Socket en memoria: entrega un request crudo y descarta la respuesta."""
+
+    def __init__(self, raw: bytes):
+        self._raw = raw
+
+    def makefile(self, mode, *args, **kwargs):
+        return io.BytesIO(self._raw)
+
+    def sendall(self, data):
+        pass
+
+
+class _QuietHandler(api_index.RequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def _casos():
+    """(nombre, método, path, body) de los requests a medir."""
+    nota = json.dumps({'title': 'Bench', 'content': 'x' * 200}).encode()
+    return [
+        ('GET /api/health', 'GET', '/api/health', b''),
+        ('GET /api/notas', 'GET', '/api/notas', b''),
+        ('POST /api/notas', 'POST', '/api/notas', nota),
+    ]
+
+
+def _bench_wsgi(method: str, path: str, body: bytes, n: int) -> float:
+    """µs por request llamando application() directamente."""
+    def start_response(status, headers):
+        pass
+
+    base = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+    }
+    start = time.perf_counter()
+    for _ in range(n):
+        environ = dict(base)
+        environ['wsgi.input'] = io.BytesIO(body)
+        for _chunk in api_index.application(environ, start_response):
+            pass
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def _bench_basehttp(method: str, path: str, body: bytes, n: int) -> float:
+    """µs por request pasando por RequestHandler completo."""
+    raw = (
+        f'{method} {path} HTTP/1.1\r\n'
+        'Host: bench\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        '\r\n'
+    ).encode('latin-1') + body
+
+    start = time.perf_counter()
+    for _ in range(n):
+        _QuietHandler(_FakeSocket(raw), ('127.0.0.1', 0), None)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[3])
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    bridge = make_bridge(latency=0)
+    api_index._bridge = bridge
+    _QuietHandler.bridge = bridge
+
+    print("=" * 60)
+    print("BENCHMARK: WSGI vs BaseHTTPRequestHandler (µs/request)")
+    print(f"requests={args.requests} (backend simulado, latencia 0)")
+    print("=" * 60)
+    print(f"{'caso':<20}{'wsgi':>10}{'basehttp':>12}{'ratio':>8}")
+
+    for nombre, method, path, body in _casos():
+        wsgi = _bench_wsgi(method, path, body, args.requests)
+        base = _bench_basehttp(method, path, body, args.requests)
+        print(f"{nombre:<20}{wsgi:>10.1f}{base:>12.1f}{base / wsgi:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
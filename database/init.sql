@@ -67,6 +67,15 @@ CREATE INDEX IF NOT EXISTS idx_notas_user_id
 CREATE INDEX IF NOT EXISTS idx_notas_created_at 
     ON public.notas(created_at DESC);
 
+-- Índice compuesto para paginación keyset (GET /api/notas?cursor=...)
+-- POR QUÉ (user_id, created_at DESC, id DESC):
+-- - Coincide con el filtro de RLS + ORDER BY created_at DESC, id DESC
+-- - WHERE (created_at, id) < (cursor) salta directo a la página
+--   (sin OFFSET: no lee ni descarta filas previas)
+-- - id desempata notas creadas en el mismo instante (orden total)
+CREATE INDEX IF NOT EXISTS idx_notas_user_created_id 
+    ON public.notas(user_id, created_at DESC, id DESC);
+
 -- ============================================================
 -- SECCIÓN 4: ROW LEVEL SECURITY (RLS) - CRÍTICO
 -- ============================================================
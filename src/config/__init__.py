@@ -4,6 +4,6 @@ Módulo de configuración.
 Expone Settings como Singleton para toda la aplicación.
 """
 
-from .settings import Settings
+from .settings import Settings, cargar_dotenv
 
-__all__ = ['Settings']
+__all__ = ['Settings', 'cargar_dotenv']
@@ -24,12 +24,40 @@ POR QUÉ python-dotenv:
 - SÍ: Estándar de la industria para cargar .env
 - SÍ: Soportado en todos los entornos (local, Docker, Vercel)
 - NO alternativa (os.environ directo): Requiere configurar variables manualmente
+
+.env UNA SOLA VEZ (cargar_dotenv):
+- api/index.py lo carga al importarse y Settings lo pedía de nuevo:
+  cargar_dotenv() recuerda que ya se cargó
+- En Vercel las variables vienen del Dashboard: ni se importa dotenv
+  (cold start)
 ============================================================================
 """
 
 import os
+import threading
 from typing import Optional
-from dotenv import load_dotenv
+
+
+_ENV_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.env'
+)
+_dotenv_cargado = False
+
+
+def cargar_dotenv() -> None:
+    """
+    Carga el .env del proyecto la primera vez que se llama.
+    
+    No sobrescribe variables existentes; en Vercel (VERCEL=1) no hace nada.
+    """
+    global _dotenv_cargado
+    if _dotenv_cargado:
+        return
+    _dotenv_cargado = True
+    if os.getenv('VERCEL'):
+        return
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_PATH)
 
 
 class Settings:
@@ -49,6 +77,7 @@ class Settings:
     
     _instance: Optional['Settings'] = None
     _initialized: bool = False
+    _lock = threading.Lock()
     
     def __new__(cls) -> 'Settings':
         """
@@ -60,7 +89,9 @@ class Settings:
         - NO alternativa (decorador): Menos explícito, más "mágico"
         """
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self) -> None:
@@ -71,8 +102,10 @@ class Settings:
         pero _initialized evita que se recargue .env múltiples veces.
         """
         if not Settings._initialized:
-            self._load_env()
-            Settings._initialized = True
+            with Settings._lock:  # Doble chequeo: el pool de workers llega en paralelo
+                if not Settings._initialized:
+                    self._load_env()
+                    Settings._initialized = True
     
     def _load_env(self) -> None:
         """
@@ -87,7 +120,7 @@ class Settings:
         (las de Vercel/Docker tienen prioridad sobre .env local)
         """
         # Cargar .env (no sobrescribe variables existentes del sistema)
-        load_dotenv()
+        cargar_dotenv()
         
         # ============================================
         # SUPABASE - Variables Requeridas
@@ -102,6 +135,93 @@ class Settings:
         self.session_timeout_seconds: int = int(
             os.getenv('SESSION_TIMEOUT_SECONDS', '900')
         )
+        # Shards (Locks independientes) de la tabla de sesiones de la API
+        self.session_table_shards: int = int(
+            os.getenv('SESSION_TABLE_SHARDS', '16')
+        )
+        
+        # ============================================
+        # HTTP - Pool de conexiones a Supabase (PostgREST + GoTrue)
+        # ============================================
+        # HTTP/2 (multiplexa requests en una conexión; requiere h2)
+        self.supabase_http2: bool = os.getenv('SUPABASE_HTTP2', '1').lower() in ('1', 'true')
+        # Conexiones máximas y conexiones ociosas que se mantienen abiertas
+        self.supabase_http_max_connections: int = int(os.getenv('SUPABASE_HTTP_MAX_CONNECTIONS', '100'))
+        self.supabase_http_max_keepalive: int = int(os.getenv('SUPABASE_HTTP_MAX_KEEPALIVE', '20'))
+        # Segundos que una conexión ociosa sigue abierta para reutilizarse
+        self.supabase_http_keepalive_expiry: float = float(os.getenv('SUPABASE_HTTP_KEEPALIVE_EXPIRY', '30'))
+        # Timeout de cada request (segundos)
+        self.supabase_http_timeout: float = float(os.getenv('SUPABASE_HTTP_TIMEOUT', '30'))
+        # Cliente: 'sdk' (supabase-py) o 'lite' (supabase_lite.py: solo lo
+        # que usa la app, sin importar el SDK -> cold start más rápido)
+        self.supabase_backend: str = os.getenv('SUPABASE_BACKEND', 'sdk').strip().lower()
+        
+        # ============================================
+        # CACHÉ EN DISCO (L2) - SQLite en /tmp (ver cache_disco.py)
+        # ============================================
+        # Archivo; en Vercel /tmp sobrevive entre invocaciones tibias.
+        # Por defecto solo en Vercel; vacío = desactivada
+        self.cache_disco_path: str = os.getenv(
+            'CACHE_DISCO_PATH',
+            '/tmp/crud-didactico/cache.sqlite3' if os.getenv('VERCEL') else ''
+        )
+        self.cache_disco_max_bytes: int = int(os.getenv('CACHE_DISCO_MAX_BYTES', str(32 * 1024 * 1024)))
+        
+        # ============================================
+        # AUTH - JWT por request (Authorization: Bearer)
+        # ============================================
+        # JWT secret del proyecto para tokens HS256 (vacío = solo se
+        # aceptan tokens RS256/ES256 verificados con el JWKS)
+        self.supabase_jwt_secret: str = os.getenv('SUPABASE_JWT_SECRET', '')
+        # Tokens ya verificados que se recuerdan hasta su exp (LRU)
+        self.auth_token_cache_max: int = int(os.getenv('AUTH_TOKEN_CACHE_MAX', '1024'))
+        # Segundos que se cachean las claves públicas del JWKS
+        self.auth_jwks_ttl: float = float(os.getenv('AUTH_JWKS_TTL', '600'))
+        # Clientes PostgREST por usuario (uno por token, LRU) y segundos
+        # sin uso tras los que se descartan
+        self.postgrest_pool_max: int = int(os.getenv('POSTGREST_POOL_MAX', '256'))
+        self.postgrest_pool_idle: float = float(os.getenv('POSTGREST_POOL_IDLE', '300'))
+        
+        # ============================================
+        # NOTAS - Paginación (keyset)
+        # ============================================
+        # Notas por página si el cliente no pide un tamaño
+        self.notas_page_size: int = int(os.getenv('NOTAS_PAGE_SIZE', '50'))
+        # Tope para ?limit= (evita páginas gigantes)
+        self.notas_max_page_size: int = int(os.getenv('NOTAS_MAX_PAGE_SIZE', '200'))
+        
+        # ============================================
+        # NOTAS - Lotes (POST /api/batch)
+        # ============================================
+        # Operaciones máximas por lote (acota el body y el largo de in.(...))
+        self.notas_batch_max: int = int(os.getenv('NOTAS_BATCH_MAX', '200'))
+        
+        # ============================================
+        # NOTAS - Carga masiva (crear_muchos / POST /api/notas/bulk)
+        # ============================================
+        # Filas por INSERT (un request a PostgREST por trozo)
+        self.notas_bulk_chunk: int = int(os.getenv('NOTAS_BULK_CHUNK', '500'))
+        # Notas máximas por llamada a crear_muchos
+        self.notas_bulk_max: int = int(os.getenv('NOTAS_BULK_MAX', '5000'))
+        # Largo máximo (caracteres URL) de un filtro id=in.(...); los
+        # conjuntos de IDs más grandes se parten en varios requests
+        self.notas_in_max_length: int = int(os.getenv('NOTAS_IN_MAX_LENGTH', '4000'))
+        
+        # ============================================
+        # NOTAS - Caché de lecturas por usuario
+        # ============================================
+        # Segundos que vale una lectura cacheada (0 = sin caché, default);
+        # acota cuánto tardan en verse cambios hechos por otros clientes.
+        # Opt-in: la invalidación es POR PROCESO, así que con varios
+        # workers (prefork/Gunicorn) o instancias una escritura en uno
+        # no se ve en los demás hasta TTL + NOTAS_CACHE_STALE
+        self.notas_cache_ttl: float = float(os.getenv('NOTAS_CACHE_TTL', '0'))
+        # Tamaño máximo de la caché (bytes de JSON); LRU al superarlo
+        self.notas_cache_max_bytes: int = int(os.getenv('NOTAS_CACHE_MAX_BYTES', str(4 * 1024 * 1024)))
+        # Stale-while-revalidate: segundos DESPUÉS del TTL en que los
+        # listados vencidos se responden al instante (marcados como
+        # stale) y se refrescan en segundo plano (0 = desactivado)
+        self.notas_cache_stale: float = float(os.getenv('NOTAS_CACHE_STALE', '0'))
         
         # ============================================
         # ENTORNO
@@ -137,6 +257,11 @@ class Settings:
                 f"Variables de entorno faltantes: {', '.join(missing)}. "
                 f"Copia .env.example a .env y completa los valores."
             )
+        
+        if self.supabase_backend not in ('sdk', 'lite'):
+            raise ValueError(
+                f"SUPABASE_BACKEND inválido: '{self.supabase_backend}' (usar sdk o lite)"
+            )
     
     def get_masked_key(self) -> str:
         """
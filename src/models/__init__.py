@@ -1,9 +1,37 @@
 # -*- coding: utf-8 -*-
 """
 Módulo de modelos/entidades de dominio.
+
+IMPORTS DIFERIDOS (PEP 562): importar un submódulo (ej: contexto) no
+carga los demás; cada nombre se importa al pedirlo.
 """
 
-from .user import User
-from .nota import Nota
+import importlib
+
+_EXPORTS = {
+    'User': '.user',
+    'ContextoAuth': '.contexto',
+    'contexto_actual': '.contexto',
+    'usar_contexto': '.contexto',
+    'Nota': '.nota',
+    'NotaParcial': '.nota',
+    'CAMPOS_NOTA': '.nota',
+    'normalizar_campos': '.nota',
+    'Pagina': '.pagina',
+    'codificar_cursor': '.pagina',
+    'decodificar_cursor': '.pagina',
+    'OperacionLote': '.lote',
+    'ResultadoOperacion': '.lote',
+    'ResultadoMasivo': '.lote',
+    'OPERACIONES_LOTE': '.lote'
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ['User', 'Nota']
+def __getattr__(nombre: str):
+    if nombre not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(_EXPORTS[nombre], __name__), nombre)
+    globals()[nombre] = valor
+    return valor
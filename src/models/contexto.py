@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+CONTEXTO.PY - Usuario autenticado del request actual (ContextVar)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: MODELS
+Patrón: Context object (contextvars)
+Fecha: 2025-12-24
+
+PROBLEMA:
+- SessionManager es un Singleton con UN usuario para todo el proceso:
+  dos requests concurrentes de usuarios distintos se pisan
+- En Vercel ese estado además se pierde en cada cold start
+
+SOLUCIÓN:
+- El bridge verifica el JWT de "Authorization: Bearer" y guarda un
+  ContextoAuth en una ContextVar mientras atiende ESE request
+- SessionManager y SupabaseClient miran primero el contexto: los
+  servicios no cambian y cada request ve solo a su usuario
+
+POR QUÉ ContextVar (y no threading.local):
+- SÍ: Cada hilo Y cada tarea asyncio tiene su propio valor
+- SÍ: Los hilos/tareas que se lanzan desde el request (refresco de
+  stale-while-revalidate) heredan una copia
+- NO alternativa (pasar el usuario como parámetro): Cambiaría la firma
+  de todos los métodos de los servicios
+
+POR QUÉ EN MODELS:
+- Lo usan services Y repositories; aquí no hay imports circulares
+============================================================================
+"""
+
+import sys
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.models.user import User
+
+
+@dataclass(frozen=True)
+class ContextoAuth:
+    """
+    Identidad verificada de un request.
+
+    CAMPOS:
+    - user: Usuario del claim sub (y email)
+    - access_token: El JWT tal cual (PostgREST lo necesita para RLS)
+    - expira: Claim exp (epoch, segundos)
+    - session_id: Claim session_id de Supabase (timeout de inactividad
+      en SessionManager); None si el token no lo trae
+    """
+
+    user: User
+    access_token: str
+    expira: float
+    session_id: Optional[str] = None
+
+    @property
+    def vigente(self) -> bool:
+        """True mientras no pasó el exp del token."""
+        return time.time() < self.expira
+
+    def __repr__(self) -> str:
+        """SEGURIDAD: Nunca mostrar el token."""
+        return f"ContextoAuth({self.user}, expira={self.expira:.0f})"
+
+
+_contexto: ContextVar[Optional[ContextoAuth]] = ContextVar('contexto_auth', default=None)
+
+
+def contexto_actual() -> Optional[ContextoAuth]:
+    """ContextoAuth del request actual, o None (CLI / sin Authorization)."""
+    return _contexto.get()
+
+
+@contextmanager
+def usar_contexto(contexto: Optional[ContextoAuth]):
+    """
+    Fija el contexto mientras dura el bloque (None = sin contexto).
+
+    USO:
+        with usar_contexto(verificador.verificar(token)):
+            notas.listar()
+    """
+    token = _contexto.set(contexto)
+    try:
+        yield contexto
+    finally:
+        _contexto.reset(token)
+
+
+def iterar_en_contexto(
+    contexto: Optional[ContextoAuth], chunks: Iterable[bytes]
+) -> Iterator[bytes]:
+    """
+    Cada next() de `chunks` corre con el contexto fijado.
+
+    POR QUÉ: Un StreamingBody se consume DESPUÉS de que el handler
+    retornó (y el `with usar_contexto` ya terminó); las páginas
+    siguientes tienen que seguir consultando como ese usuario.
+    """
+    it = iter(chunks)
+    try:
+        while True:
+            with usar_contexto(contexto):
+                try:
+                    data = next(it)
+                except StopIteration:
+                    return
+            yield data
+    finally:
+        close = getattr(it, 'close', None)
+        if close is not None:
+            close()
+
+
+async def aiterar_en_contexto(
+    contexto: Optional[ContextoAuth], chunks: AsyncIterable[bytes]
+) -> AsyncIterator[bytes]:
+    """Versión async de iterar_en_contexto."""
+    it = chunks.__aiter__()
+    try:
+        while True:
+            with usar_contexto(contexto):
+                try:
+                    data = await it.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield data
+    finally:
+        aclose = getattr(it, 'aclose', None)
+        if aclose is not None:
+            await aclose()
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para ContextoAuth.
+
+    EJECUCIÓN:
+        python src/models/contexto.py
+    """
+    import threading
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: ContextoAuth")
+    print("=" * 60)
+
+    ana = ContextoAuth(User(id='u-ana', email='ana@ejemplo.com'), 'jwt-ana', time.time() + 60)
+    vistos = {}
+
+    def _request(nombre, contexto):
+        with usar_contexto(contexto):
+            time.sleep(0.01)
+            vistos[nombre] = contexto_actual()
+
+    hilos = [threading.Thread(target=_request, args=('ana', ana)),
+             threading.Thread(target=_request, args=('anonimo', None))]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert vistos == {'ana': ana, 'anonimo': None}
+    assert contexto_actual() is None
+    print(f"✅ Un contexto por hilo: {vistos}")
+    print("=" * 60)
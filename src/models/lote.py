@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+LOTE.PY - Operaciones en lote (POST /api/batch)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: MODELS (Dominio)
+Patrón: Command / Value Object
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: NOTAS
+- Requisitos: RF-05 (Crear), RF-06 (Listar), RF-07 (Editar), RF-08 (Eliminar)
+- Caso de Uso: CU-02 (Gestionar Notas)
+
+PROBLEMA:
+- Editar/eliminar N notas = N requests HTTP + N llamadas a PostgREST
+
+SOLUCIÓN:
+- El cliente envía una lista ORDENADA de operaciones
+- Las operaciones consecutivas del mismo tipo forman un grupo y cada
+  grupo es UNA llamada a PostgREST:
+    create -> insert([...])          get    -> select().in_('id', ids)
+    delete -> delete().in_('id',ids) update -> update(c).in_('id', ids)
+- Cada operación recibe su propio resultado (status + data/error)
+
+POR QUÉ SOLO CONSECUTIVAS:
+- SÍ: Respeta el orden pedido ("crear, luego borrar" no se invierte)
+- SÍ: Un cliente que agrupa sus operaciones obtiene 1 llamada por tipo
+- update: además deben compartir los mismos cambios (PATCH aplica el
+  mismo body a todas las filas del filtro)
+
+ESTE MÓDULO NO HACE I/O: valida, agrupa y arma resultados.
+La ejecución está en NotasService / AsyncNotasService.
+============================================================================
+"""
+
+import sys
+import os
+from dataclasses import dataclass, field
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+)
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.models.nota import Nota
+
+
+# Operaciones aceptadas en un lote
+OPERACIONES_LOTE: Tuple[str, ...] = ('create', 'update', 'delete', 'get')
+
+T = TypeVar('T')
+
+
+@dataclass
+class OperacionLote:
+    """
+    Una operación validada del lote.
+
+    CAMPOS:
+    - indice: Posición en la lista original (los resultados la conservan)
+    - op: 'create' | 'update' | 'delete' | 'get'
+    - id: Nota afectada (None en create)
+    - cambios: Columnas a escribir (create/update)
+    """
+
+    indice: int
+    op: str
+    id: Optional[str] = None
+    cambios: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ResultadoOperacion:
+    """
+    Resultado de una operación del lote.
+
+    status usa códigos HTTP (201 creada, 200 ok, 400, 404, 500) para
+    que el cliente lo trate igual que la respuesta de la ruta individual.
+    """
+
+    indice: int
+    op: str
+    status: int
+    id: Optional[str] = None
+    nota: Optional[Nota] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True si la operación se aplicó."""
+        return 200 <= self.status < 300
+
+    def to_dict(self, incluir_datos: bool = True) -> Dict[str, Any]:
+        """
+        Formato JSON de la respuesta (solo claves con valor).
+
+        incluir_datos=False omite 'data' (cargas masivas: el cliente ya
+        tiene el contenido, solo necesita el id generado).
+        """
+        result: Dict[str, Any] = {'index': self.indice, 'op': self.op, 'status': self.status}
+        if self.id is not None:
+            result['id'] = self.id
+        if self.nota is not None and incluir_datos:
+            result['data'] = self.nota.to_dict()
+        if self.error is not None:
+            result['error'] = self.error
+        return result
+
+
+@dataclass
+class ResultadoMasivo:
+    """
+    Resultado de eliminar_muchos / actualizar_muchos (por conjunto de IDs).
+
+    CAMPOS:
+    - afectados: IDs eliminados/actualizados (orden pedido)
+    - no_encontrados: IDs sin fila (no existen o RLS los oculta)
+    - fallidos: IDs cuyo trozo falló (error tiene el motivo)
+    """
+
+    afectados: List[str] = field(default_factory=list)
+    no_encontrados: List[str] = field(default_factory=list)
+    fallidos: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @classmethod
+    def desde(
+        cls,
+        ids: List[str],
+        afectados: Iterable[str],
+        fallidos: List[str],
+        error: Optional[str] = None
+    ) -> 'ResultadoMasivo':
+        """Clasifica los IDs pedidos según las filas que devolvió PostgREST."""
+        afectados = set(afectados)
+        sin_fila = set(fallidos) | afectados
+        return cls(
+            afectados=[i for i in ids if i in afectados],
+            no_encontrados=[i for i in ids if i not in sin_fila],
+            fallidos=list(fallidos),
+            error=error
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Formato JSON de la respuesta."""
+        result: Dict[str, Any] = {
+            'affected': self.afectados,
+            'not_found': self.no_encontrados,
+            'count': len(self.afectados)
+        }
+        if self.fallidos:
+            result['failed'] = self.fallidos
+            result['error'] = self.error
+        return result
+
+
+def _texto(op: Dict[str, Any], *claves: str) -> Any:
+    """Primer valor presente entre alias (ej: 'title' / 'titulo')."""
+    for clave in claves:
+        if clave in op:
+            return op[clave]
+    return None
+
+
+def _validar(indice: int, op: Any) -> OperacionLote:
+    """
+    Valida una operación cruda del JSON.
+
+    RAISES: ValueError con el motivo (va al resultado como 400)
+    """
+    if not isinstance(op, dict):
+        raise ValueError("La operación debe ser un objeto")
+
+    tipo = op.get('op')
+    if tipo not in OPERACIONES_LOTE:
+        raise ValueError(f"op debe ser uno de: {', '.join(OPERACIONES_LOTE)}")
+
+    titulo = _texto(op, 'title', 'titulo')
+    contenido = _texto(op, 'content', 'contenido')
+
+    if tipo == 'create':
+        if not isinstance(titulo, str) or not titulo.strip():
+            raise ValueError("El título es obligatorio")
+        return OperacionLote(indice, tipo, cambios={'title': titulo.strip(), 'content': contenido})
+
+    nota_id = op.get('id')
+    if not isinstance(nota_id, str) or not nota_id:
+        raise ValueError("ID de nota es obligatorio")
+
+    cambios = validar_cambios(op) if tipo == 'update' else {}
+    return OperacionLote(indice, tipo, nota_id, cambios)
+
+
+def validar_cambios(datos: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Columnas de un update: title|titulo y/o content|contenido.
+
+    RETORNA: {'title': ..., 'content': ...} (solo las presentes)
+    RAISES: ValueError si el título queda vacío o no hay nada que cambiar
+    """
+    titulo = _texto(datos, 'title', 'titulo')
+    contenido = _texto(datos, 'content', 'contenido')
+
+    cambios: Dict[str, Any] = {}
+    if titulo is not None:
+        if not isinstance(titulo, str) or not titulo.strip():
+            raise ValueError("El título no puede estar vacío")
+        cambios['title'] = titulo.strip()
+    if contenido is not None:
+        cambios['content'] = contenido
+    if not cambios:
+        raise ValueError("update necesita title y/o content")
+    return cambios
+
+
+def validar_ids(ids: Any, maximo: int) -> List[str]:
+    """
+    Lista de IDs sin repetidos (conserva el primer orden).
+
+    RAISES: ValueError si no es una lista no vacía de strings o supera `maximo`
+    """
+    if isinstance(ids, str) or not isinstance(ids, (list, tuple)) or not ids:
+        raise ValueError("ids debe ser una lista no vacía")
+    if not all(isinstance(i, str) and i for i in ids):
+        raise ValueError("Cada id debe ser un string no vacío")
+    unicos = list(dict.fromkeys(ids))
+    if len(unicos) > maximo:
+        raise ValueError(f"Máximo {maximo} ids por operación")
+    return unicos
+
+
+def parsear_lote(
+    operaciones: Any,
+    maximo: int
+) -> Tuple[List[OperacionLote], List[ResultadoOperacion]]:
+    """
+    Valida el lote completo.
+
+    RETORNA: (operaciones válidas, resultados 400 de las inválidas)
+    RAISES: ValueError si el lote en sí es inválido (no es lista, vacío
+    o con más de `maximo` operaciones): eso es un 400 del request entero
+    """
+    if not isinstance(operaciones, list) or not operaciones:
+        raise ValueError("operations debe ser una lista no vacía")
+    if len(operaciones) > maximo:
+        raise ValueError(f"Máximo {maximo} operaciones por lote")
+
+    validas: List[OperacionLote] = []
+    errores: List[ResultadoOperacion] = []
+    for indice, op in enumerate(operaciones):
+        try:
+            validas.append(_validar(indice, op))
+        except ValueError as e:
+            tipo = op.get('op') if isinstance(op, dict) else None
+            nota_id = op.get('id') if isinstance(op, dict) else None
+            errores.append(ResultadoOperacion(
+                indice, str(tipo), 400,
+                id=nota_id if isinstance(nota_id, str) else None, error=str(e)
+            ))
+    return validas, errores
+
+
+def preparar_creaciones(
+    notas: Iterable[Union[Nota, Dict[str, Any]]]
+) -> Tuple[List[OperacionLote], List[ResultadoOperacion]]:
+    """
+    Valida TODAS las notas a crear antes de enviar nada.
+
+    ACEPTA: Nota (se usan title/content) o dict con title|titulo y
+    content|contenido.
+    RETORNA: (creaciones válidas, resultados 400 de las inválidas)
+    """
+    validas: List[OperacionLote] = []
+    errores: List[ResultadoOperacion] = []
+    for indice, nota in enumerate(notas):
+        if isinstance(nota, Nota):
+            nota = {'title': nota.title, 'content': nota.content}
+        try:
+            if not isinstance(nota, dict):
+                raise ValueError("La nota debe ser un objeto")
+            validas.append(_validar(indice, {**nota, 'op': 'create'}))
+        except ValueError as e:
+            errores.append(ResultadoOperacion(indice, 'create', 400, error=str(e)))
+    return validas, errores
+
+
+def en_trozos(items: Sequence[T], tamano: int) -> Iterator[Sequence[T]]:
+    """Parte una secuencia en trozos de `tamano` (el último puede ser menor)."""
+    if tamano < 1:
+        raise ValueError("El tamaño de trozo debe ser >= 1")
+    for inicio in range(0, len(items), tamano):
+        yield items[inicio:inicio + tamano]
+
+
+def ordenar_por_ids(
+    ids: List[str],
+    filas: Iterable[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Filas de un SELECT ... id=in.(...) -> (filas en el orden pedido, faltantes).
+
+    POR QUÉ: PostgREST devuelve las filas en el orden de la tabla, no el
+    de la lista; los faltantes no existen o RLS los oculta.
+    """
+    por_id = {fila['id']: fila for fila in filas}
+    return (
+        [por_id[i] for i in ids if i in por_id],
+        [i for i in ids if i not in por_id]
+    )
+
+
+def trozos_por_largo(
+    items: Iterable[T],
+    largo: Callable[[T], int],
+    maximo: int
+) -> Iterator[List[T]]:
+    """
+    Agrupa items mientras la suma de largo(item) no supere `maximo`.
+
+    USO: Partir un filtro id=in.(...) para que la URL no exceda el
+    límite del proxy (un item más largo que `maximo` va solo).
+    """
+    trozo: List[T] = []
+    total = 0
+    for item in items:
+        n = largo(item)
+        if trozo and total + n > maximo:
+            yield trozo
+            trozo, total = [], 0
+        trozo.append(item)
+        total += n
+    if trozo:
+        yield trozo
+
+
+def agrupar_lote(operaciones: Iterable[OperacionLote]) -> List[List[OperacionLote]]:
+    """
+    Agrupa operaciones CONSECUTIVAS compatibles (una llamada por grupo).
+
+    Compatibles: mismo op y, en update, los mismos cambios.
+    """
+    grupos: List[List[OperacionLote]] = []
+    for op in operaciones:
+        if grupos:
+            previa = grupos[-1][0]
+            if previa.op == op.op and (op.op != 'update' or previa.cambios == op.cambios):
+                grupos[-1].append(op)
+                continue
+        grupos.append([op])
+    return grupos
+
+
+def resolver_grupo(
+    grupo: List[OperacionLote],
+    filas: List[Dict[str, Any]]
+) -> List[ResultadoOperacion]:
+    """
+    Asigna a cada operación del grupo su fila devuelta por PostgREST.
+
+    - create: las filas vuelven en el orden del insert
+    - get/update/delete: por id; sin fila = 404 (no existe o RLS la oculta)
+    - delete repetido en el mismo grupo: solo el primero la eliminó
+    """
+    tipo = grupo[0].op
+    if tipo == 'create':
+        if len(filas) != len(grupo):
+            return [ResultadoOperacion(op.indice, tipo, 500, error="Error al crear la nota")
+                    for op in grupo]
+        return [ResultadoOperacion(op.indice, tipo, 201, fila.get('id'), Nota.from_dict(fila))
+                for op, fila in zip(grupo, filas)]
+
+    por_id = {fila.get('id'): fila for fila in filas}
+    vistos = set()
+    resultados = []
+    for op in grupo:
+        fila = por_id.get(op.id)
+        if fila is None or (tipo == 'delete' and op.id in vistos):
+            resultados.append(ResultadoOperacion(op.indice, tipo, 404, op.id,
+                                                 error='Nota no encontrada'))
+        else:
+            vistos.add(op.id)
+            resultados.append(ResultadoOperacion(op.indice, tipo, 200, op.id,
+                                                 Nota.from_dict(fila)))
+    return resultados
+
+
+def fallo_grupo(grupo: List[OperacionLote], error: Exception) -> List[ResultadoOperacion]:
+    """Todas las operaciones de un grupo fallido reciben el mismo 500."""
+    return [ResultadoOperacion(op.indice, op.op, 500, op.id, error=str(error)) for op in grupo]
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para lotes.
+
+    EJECUCIÓN:
+        python src/models/lote.py
+    """
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: Lote")
+    print("=" * 60)
+
+    crudo = [
+        {'op': 'create', 'title': 'A'},
+        {'op': 'create', 'title': 'B'},
+        {'op': 'delete', 'id': 'n1'},
+        {'op': 'delete', 'id': 'n2'},
+        {'op': 'update', 'id': 'n3', 'title': 'X'},
+        {'op': 'update', 'id': 'n4', 'title': 'X'},
+        {'op': 'update', 'id': 'n5', 'title': 'Y'},
+        {'op': 'borrar', 'id': 'n6'},
+    ]
+    validas, errores = parsear_lote(crudo, maximo=100)
+    grupos = agrupar_lote(validas)
+    print(f"✅ {len(crudo)} operaciones -> {len(grupos)} llamadas a PostgREST")
+    print(f"✅ Inválidas: {[e.to_dict() for e in errores]}")
+
+    resultados = resolver_grupo(grupos[1], [{'id': 'n1', 'user_id': 'u', 'title': 'T'}])
+    print(f"✅ delete n1/n2: {[r.status for r in resultados]}")
+    print("=" * 60)
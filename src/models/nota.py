@@ -26,7 +26,7 @@ import sys
 import os
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, Tuple, Union
 
 # Agregar directorio raíz al path para permitir ejecución directa
 _root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -34,6 +34,45 @@ if _root_dir not in sys.path:
     sys.path.insert(0, _root_dir)
 
 
+# Columnas de la tabla `notas` (orden canónico para ?fields=)
+CAMPOS_NOTA: Tuple[str, ...] = ('id', 'user_id', 'title', 'content', 'created_at', 'updated_at')
+
+
+def normalizar_campos(campos: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    """
+    Valida una proyección de columnas ('id,title' o ['id', 'title']).
+    
+    REGLAS:
+    - Solo columnas de CAMPOS_NOTA (evita inyectar select arbitrarios)
+    - 'id' siempre se incluye (hace falta para cargar el resto después)
+    - Resultado en orden canónico y sin duplicados
+    
+    RAISES: ValueError si hay columnas desconocidas o la lista está vacía
+    """
+    if isinstance(campos, str):
+        campos = campos.split(',')
+    pedidos = {c.strip() for c in campos if c and c.strip()}
+    if not pedidos:
+        raise ValueError("fields no puede estar vacío")
+    
+    desconocidos = pedidos - set(CAMPOS_NOTA)
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+    
+    pedidos.add('id')
+    return tuple(c for c in CAMPOS_NOTA if c in pedidos)
+
+
+def _parse_fecha(value: Any) -> Any:
+    """Convierte un string ISO (con 'Z') a datetime; otros valores sin cambios."""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (ValueError, AttributeError):
+            pass
+    return value
+
+
 @dataclass
 class Nota:
     """
@@ -81,13 +120,7 @@ class Nota:
         
         # Convertir fechas si vienen como string
         for field_name in ['created_at', 'updated_at']:
-            value = getattr(self, field_name)
-            if isinstance(value, str):
-                try:
-                    converted = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                    object.__setattr__(self, field_name, converted)
-                except (ValueError, AttributeError):
-                    pass
+            object.__setattr__(self, field_name, _parse_fecha(getattr(self, field_name)))
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Nota':
@@ -191,6 +224,146 @@ class Nota:
         return self.content[:max_length].rsplit(' ', 1)[0] + "..."
 
 
+# Cargador de campos faltantes: (nota_id, campos) -> dict con esos campos
+CargadorCampos = Callable[[str, Tuple[str, ...]], Dict[str, Any]]
+
+
+class _CampoLazy:
+    """
+    Descriptor de un campo de NotaParcial.
+    
+    POR QUÉ DESCRIPTOR SIN __set__ (non-data):
+    - Si el campo está cargado vive en el __dict__ de la instancia y
+      Python lo encuentra ANTES que al descriptor: acceso sin costo extra
+    - Solo si falta se ejecuta __get__, que dispara la carga lazy
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        instance._cargar_faltantes(self.name)
+        return instance.__dict__[self.name]
+
+
+class NotaParcial(Nota):
+    """
+    Nota con solo algunas columnas cargadas (?fields=id,title).
+    
+    PROBLEMA:
+    - select('*') trae `content` (TEXT) aunque la UI solo muestre títulos
+    
+    SOLUCIÓN:
+    - PostgREST devuelve solo las columnas pedidas
+    - Los campos que faltan se cargan al primer acceso (lazy), con UNA
+      consulta para todos los faltantes
+    
+    POR QUÉ SUBCLASE (y no un flag en Nota):
+    - SÍ: Las Nota completas no cambian en nada
+    - SÍ: isinstance(parcial, Nota) sigue siendo True
+    - NO alternativa (__getattribute__): Encarece TODOS los accesos;
+      con _CampoLazy los campos cargados se leen directo del __dict__
+    
+    IMPORTANTE:
+    - to_dict() serializa SOLO lo cargado, fechas incluidas (no dispara consultas)
+    - Sin cargador, acceder a un campo faltante lanza AttributeError
+    """
+    
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        cargador: Optional[CargadorCampos] = None
+    ):
+        """
+        PARÁMETROS:
+        - data: Fila de PostgREST (debe incluir 'id')
+        - cargador: Función que trae los campos faltantes
+        """
+        if not data.get('id'):
+            raise ValueError("Una nota parcial necesita 'id'")
+        self._cargador = cargador
+        self._asignar(data)
+    
+    def _asignar(self, valores: Dict[str, Any]) -> None:
+        """Guarda columnas conocidas (misma normalización que Nota)."""
+        campos = self.__dict__
+        for name in CAMPOS_NOTA:
+            if name not in valores:
+                continue
+            value = valores[name]
+            if name == 'title':
+                if not value or not str(value).strip():
+                    raise ValueError("El título de la nota no puede estar vacío")
+                value = value.strip()
+            elif name == 'created_at' or name == 'updated_at':
+                value = _parse_fecha(value)
+            campos[name] = value
+    
+    def _cargar_faltantes(self, pedido: str) -> None:
+        """Trae TODOS los campos faltantes en una sola consulta."""
+        if self._cargador is None:
+            raise AttributeError(
+                f"Campo '{pedido}' no cargado (pedir fields={pedido} o usar un cargador)"
+            )
+        self.completar(self._cargador(self.id, self.campos_faltantes))
+    
+    def completar(self, datos: Dict[str, Any]) -> None:
+        """
+        Carga los campos faltantes desde `datos` (fila de PostgREST).
+        
+        Los que no vengan en `datos` quedan en su valor por defecto
+        (None), para no reintentar la consulta en cada acceso.
+        
+        USO ASYNC (sin cargador síncrono):
+            nota.completar(await fetch(nota.id, nota.campos_faltantes))
+        """
+        faltantes = self.campos_faltantes
+        self._asignar({c: datos.get(c) for c in faltantes if c != 'title' or datos.get(c)})
+        for name in faltantes:
+            self.__dict__.setdefault(name, None)
+    
+    @property
+    def campos_cargados(self) -> Tuple[str, ...]:
+        """Columnas disponibles sin consultar a la BD."""
+        return tuple(c for c in CAMPOS_NOTA if c in self.__dict__)
+    
+    @property
+    def campos_faltantes(self) -> Tuple[str, ...]:
+        """Columnas que todavía no se trajeron."""
+        return tuple(c for c in CAMPOS_NOTA if c not in self.__dict__)
+    
+    def to_dict(self, include_id: bool = True) -> Dict[str, Any]:
+        """
+        Serializa TODOS los campos cargados (fechas en ISO 8601).
+        
+        POR QUÉ incluye created_at/updated_at (Nota.to_dict no):
+        - SÍ: Una NotaParcial es una respuesta, no un INSERT; si el
+          cliente pidió ?fields=created_at, lo trajimos para devolverlo
+        """
+        campos = self.__dict__
+        result = {}
+        for name in CAMPOS_NOTA:
+            if name == 'id' or name not in campos:
+                continue
+            value = campos[name]
+            result[name] = value.isoformat() if isinstance(value, datetime) else value
+        if include_id and campos['id']:
+            result['id'] = campos['id']
+        return result
+    
+    def __repr__(self) -> str:
+        """Muestra solo los campos cargados (repr no dispara consultas)."""
+        campos = ', '.join(f'{c}={self.__dict__[c]!r}' for c in self.campos_cargados)
+        return f'NotaParcial({campos})'
+
+
+for _campo in CAMPOS_NOTA:
+    setattr(NotaParcial, _campo, _CampoLazy(_campo))
+del _campo
+
+
 # ============================================================================
 # PRUEBA ATÓMICA - Bloque obligatorio
 # ============================================================================
@@ -261,6 +434,16 @@ if __name__ == "__main__":
         assert nota.title == nota2.title, "Roundtrip falló"
         print("✅ Roundtrip from_dict → to_dict OK")
         
+        # Test 9: Nota parcial con carga lazy
+        consultas = []
+        def _cargador(nota_id, campos):
+            consultas.append(campos)
+            return {c: supabase_response[c] for c in campos}
+        parcial = NotaParcial({'id': nota.id, 'title': 'Solo título'}, _cargador)
+        assert parcial.to_dict() == {'title': 'Solo título', 'id': nota.id}
+        assert parcial.content == supabase_response['content'] and len(consultas) == 1
+        print(f"✅ NotaParcial carga lazy en 1 consulta: {consultas[0]}")
+        
         print("=" * 60)
         print("RESULTADO: TODOS LOS TESTS PASARON")
         print("=" * 60)
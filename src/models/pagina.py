@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+PAGINA.PY - Página de resultados con cursor opaco (keyset pagination)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: MODELS (Dominio)
+Patrón: Value Object
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: NOTAS
+- Requisitos: RF-06 (Listar)
+- HU: HU-05
+
+POR QUÉ KEYSET (y no OFFSET):
+- SÍ: OFFSET N obliga a la BD a leer y descartar N filas en cada página
+- SÍ: Con WHERE (created_at, id) < (cursor) el índice salta directo
+- SÍ: Estable: insertar notas nuevas no desplaza las páginas siguientes
+
+POR QUÉ CURSOR OPACO:
+- SÍ: El cliente no depende del formato interno (created_at + id)
+- SÍ: Podemos cambiar la clave de orden sin romper el frontend
+- NO es secreto: base64 no cifra; RLS sigue protegiendo los datos
+============================================================================
+"""
+
+import sys
+import os
+import json
+import base64
+import binascii
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+def codificar_cursor(created_at: str, nota_id: str) -> str:
+    """
+    Codifica la clave de la última fila como cursor opaco.
+
+    FORMATO: base64 URL-safe (sin '=') de ["created_at", "id"]
+    """
+    raw = json.dumps([created_at, nota_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decodifica un cursor generado por codificar_cursor.
+
+    RETORNA: (created_at, id)
+    RAISES: ValueError si el cursor es inválido
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, nota_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError, ValueError):
+        raise ValueError("Cursor inválido")
+
+    if not isinstance(created_at, str) or not isinstance(nota_id, str):
+        raise ValueError("Cursor inválido")
+    return created_at, nota_id
+
+
+@dataclass
+class Pagina:
+    """
+    Una página de resultados.
+
+    CAMPOS:
+    - items: Elementos de esta página
+    - next_cursor: Cursor para pedir la siguiente (None = última página)
+    """
+
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def tiene_siguiente(self) -> bool:
+        """True si hay más resultados después de esta página."""
+        return self.next_cursor is not None
+
+    @classmethod
+    def desde_filas(
+        cls,
+        filas: List[Dict[str, Any]],
+        limite: int,
+        mapear=lambda fila: fila
+    ) -> 'Pagina':
+        """
+        Arma la página a partir de `limite + 1` filas pedidas a la BD.
+
+        POR QUÉ limite + 1:
+        - SÍ: Si vuelve la fila extra, hay página siguiente (sin COUNT)
+        - SÍ: El cursor sale de la última fila VISIBLE (datos crudos de
+          PostgREST, sin perder precisión del timestamp)
+        """
+        visibles = filas[:limite]
+        next_cursor = None
+        if len(filas) > limite and visibles:
+            ultima = visibles[-1]
+            next_cursor = codificar_cursor(str(ultima['created_at']), str(ultima['id']))
+        return cls(items=[mapear(f) for f in visibles], next_cursor=next_cursor)
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para Pagina y cursores.
+
+    EJECUCIÓN:
+        python src/models/pagina.py
+    """
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: Pagina")
+    print("=" * 60)
+
+    cursor = codificar_cursor('2025-12-24T10:00:00.123456+00:00', 'abc-123')
+    print(f"✅ Cursor opaco: {cursor}")
+    print(f"✅ Decodificado: {decodificar_cursor(cursor)}")
+
+    try:
+        decodificar_cursor('no-es-un-cursor')
+        print("❌ Debería fallar con cursor inválido")
+    except ValueError as e:
+        print(f"✅ Cursor inválido detectado: {e}")
+
+    filas = [{'id': str(i), 'created_at': f'2025-12-{20 - i:02d}'} for i in range(3)]
+    pagina = Pagina.desde_filas(filas, limite=2)
+    print(f"✅ Página de {len(pagina.items)} con siguiente={pagina.tiene_siguiente}")
+    print("=" * 60)
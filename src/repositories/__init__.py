@@ -1,9 +1,27 @@
 # -*- coding: utf-8 -*-
 """
 Módulo de repositorios/infraestructura.
-Expone SupabaseClient como Singleton.
+Expone SupabaseClient y AsyncSupabaseClient como Singletons.
+
+IMPORTS DIFERIDOS (PEP 562): httpx y el SDK se cargan recién al pedir
+un cliente, no al importar el paquete.
 """
 
-from .supabase_client import SupabaseClient
+import importlib
+
+_EXPORTS = {
+    'SupabaseClient': '.supabase_client',
+    'AsyncSupabaseClient': '.async_supabase_client',
+    'PoolPostgrest': '.pool_postgrest',
+    'ClienteLite': '.supabase_lite'
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ['SupabaseClient']
+def __getattr__(nombre: str):
+    if nombre not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(_EXPORTS[nombre], __name__), nombre)
+    globals()[nombre] = valor
+    return valor
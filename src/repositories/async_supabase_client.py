@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+ASYNC_SUPABASE_CLIENT.PY - Cliente Supabase asíncrono (Singleton)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: REPOSITORIES
+Patrón: Singleton
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: CORE / INFRAESTRUCTURA
+- Requisitos: RNF-ARCH-02 (Patrones de diseño)
+- HU: Transversal (operaciones de datos desde el servidor asyncio)
+
+POR QUÉ UN CLIENTE ASÍNCRONO SEPARADO:
+- SÍ: supabase-py expone AsyncClient (httpx.AsyncClient por debajo)
+- SÍ: Un solo proceso puede tener miles de llamadas PostgREST en vuelo
+- SÍ: SupabaseClient (sync) sigue intacto para Menu/CLI
+- NO alternativa (run_in_executor con el cliente sync): Cada llamada en
+  vuelo ocupa un hilo del pool; no escala a miles
+
+POR QUÉ conectar() ASÍNCRONO:
+- acreate_client() es una corrutina: no se puede llamar en __init__
+- conectar() crea el cliente la primera vez y luego es gratis
+============================================================================
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import asyncio
+import sys
+import os
+import time
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.config.settings import Settings
+from src.models.contexto import contexto_actual
+from src.repositories.pool_postgrest import PoolPostgrest, cliente_de_usuario
+from src.repositories.http_pool import EstadisticasHTTP, crear_cliente_http_async, estadisticas_pool
+
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+
+class AsyncSupabaseClient:
+    """
+    Singleton para el cliente Supabase asíncrono.
+
+    USO:
+        supabase = AsyncSupabaseClient()
+        await supabase.conectar()
+        response = await supabase.table('notas').select('*').execute()
+
+    SEGURIDAD:
+    - Igual que SupabaseClient: ANON KEY + RLS
+    """
+
+    _instance: Optional['AsyncSupabaseClient'] = None
+    _initialized: bool = False
+
+    def __new__(cls) -> 'AsyncSupabaseClient':
+        """Implementación del patrón Singleton."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        """Prepara el estado (el cliente se crea en conectar())."""
+        if not AsyncSupabaseClient._initialized:
+            self._client: Optional['AsyncClient'] = None
+            self._lock = asyncio.Lock()
+            self._http_stats = EstadisticasHTTP()
+            self._http = None
+            settings = Settings()
+            self._pool = PoolPostgrest(
+                lambda token: cliente_de_usuario(self.client.postgrest, token),
+                settings.postgrest_pool_max,
+                settings.postgrest_pool_idle
+            )
+            AsyncSupabaseClient._initialized = True
+
+    async def conectar(self) -> 'AsyncClient':
+        """
+        Crea el AsyncClient la primera vez (idempotente).
+
+        POR QUÉ LOCK:
+        - SÍ: Si llegan 1000 requests en frío, solo uno crea el cliente
+        
+        POOL HTTP: Igual que SupabaseClient, un httpx.AsyncClient
+        compartido (se crea aquí: necesita el event loop que lo usa).
+        
+        El SDK se importa recién acá: importar el paquete no lo carga
+        (SUPABASE_BACKEND=lite en el cliente sync).
+        """
+        if self._client is not None:
+            return self._client
+
+        async with self._lock:
+            if self._client is None:
+                from supabase import acreate_client
+                from supabase.lib.client_options import AsyncClientOptions
+                
+                settings = Settings()
+                self._http = crear_cliente_http_async(self._http_stats)
+                self._client = await acreate_client(
+                    supabase_url=settings.supabase_url,
+                    supabase_key=settings.supabase_key,
+                    options=AsyncClientOptions(httpx_client=self._http)
+                )
+        return self._client
+
+    @property
+    def client(self) -> 'AsyncClient':
+        """
+        Acceso al AsyncClient subyacente.
+
+        RAISES: RuntimeError si no se llamó a conectar()
+        """
+        if self._client is None:
+            raise RuntimeError("AsyncSupabaseClient no conectado. Llamar a conectar() primero.")
+        return self._client
+
+    @property
+    def auth(self):
+        """Acceso directo al módulo de autenticación asíncrono."""
+        return self.client.auth
+
+    @property
+    def pool(self) -> PoolPostgrest:
+        """Clientes PostgREST por usuario (comparten el httpx.AsyncClient)."""
+        return self._pool
+
+    def estadisticas_http(self) -> dict:
+        """Ver SupabaseClient.estadisticas_http."""
+        return estadisticas_pool(self._http, self._http_stats)
+
+    async def precalentar(self) -> Dict[str, Any]:
+        """Ver SupabaseClient.precalentar (crea el cliente si hace falta)."""
+        await self.conectar()
+        settings = Settings()
+        inicio = time.perf_counter()
+        response = await self._http.get(
+            f"{settings.supabase_url.rstrip('/')}/auth/v1/health",
+            headers={'apikey': settings.supabase_key}
+        )
+        return {
+            'ok': response.status_code < 500,
+            'status': response.status_code,
+            'ms': round((time.perf_counter() - inicio) * 1e3, 1)
+        }
+
+    def table(self, table_name: str):
+        """
+        Acceso directo a una tabla (el builder se ejecuta con await).
+
+        USO:
+            await supabase.table('notas').select('*').execute()
+
+        JWT POR REQUEST: igual que SupabaseClient.table.
+        """
+        contexto = contexto_actual()
+        if contexto is None:
+            return self.client.table(table_name)
+        return self._pool.obtener(contexto.access_token).from_(table_name)
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para AsyncSupabaseClient.
+
+    EJECUCIÓN:
+        python src/repositories/async_supabase_client.py
+
+    REQUISITOS:
+        - .env configurado con SUPABASE_URL y SUPABASE_KEY
+    """
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: AsyncSupabaseClient (Singleton)")
+    print("=" * 60)
+
+    async def _main():
+        supabase = AsyncSupabaseClient()
+        await supabase.conectar()
+        print("✅ AsyncSupabaseClient conectado")
+
+        if AsyncSupabaseClient() is supabase:
+            print("✅ Singleton verificado: misma instancia")
+
+        try:
+            response = await supabase.table('notas').select('id').limit(1).execute()
+            print(f"✅ Query asíncrona a 'notas' exitosa. Registros: {len(response.data)}")
+        except Exception as e:
+            print(f"❌ Error en query: {e}")
+
+    try:
+        asyncio.run(_main())
+        print("=" * 60)
+    except ValueError as e:
+        print(f"❌ Error de configuración: {e}")
+    except Exception as e:
+        print(f"❌ Error inesperado: {type(e).__name__}: {e}")
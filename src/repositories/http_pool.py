@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+HTTP_POOL.PY - Pool de conexiones HTTP compartido (PostgREST + GoTrue)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: REPOSITORIES
+Patrón: Connection pool (keep-alive, HTTP/2 opcional)
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: CORE / INFRAESTRUCTURA
+- Requisitos: RNF-ARCH-02 (Patrones de diseño), RNF (Rendimiento)
+
+PROBLEMA:
+- create_client() arma un httpx.Client por subcliente (PostgREST,
+  GoTrue, Storage...) con los valores por defecto del SDK: conexiones
+  y handshakes TLS separados, límites que no se pueden ajustar
+
+SOLUCIÓN:
+- UN httpx.Client (o AsyncClient) por proceso, pasado al SDK como
+  ClientOptions(httpx_client=...): todos los subclientes y los
+  clientes PostgREST por usuario (PoolPostgrest) usan sus conexiones
+- Límites desde Settings: SUPABASE_HTTP_MAX_CONNECTIONS,
+  SUPABASE_HTTP_MAX_KEEPALIVE, SUPABASE_HTTP_KEEPALIVE_EXPIRY,
+  SUPABASE_HTTP_TIMEOUT
+- HTTP/2 (SUPABASE_HTTP2): muchos requests en vuelo sobre UNA conexión
+- Estadísticas: requests, conexiones abiertas y handshakes TLS (vía la
+  extensión "trace" de httpcore) + estado actual del pool
+
+POR QUÉ HTTP/2 OPCIONAL:
+- Necesita el paquete h2 (pip install httpx[http2]); si no está
+  instalado se usa HTTP/1.1 con keep-alive, sin fallar
+
+EN VERCEL:
+- El cliente vive en el Singleton SupabaseClient, que vive lo mismo que
+  el _bridge del módulo: las invocaciones "tibias" reutilizan las
+  conexiones; una conexión que el servidor cerró mientras la función
+  estaba congelada se descarta antes de usarse (httpcore)
+============================================================================
+"""
+
+import sys
+import os
+import importlib.util
+import threading
+from typing import Any, Dict
+
+import httpx
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.config.settings import Settings
+
+
+HTTP2_DISPONIBLE = importlib.util.find_spec('h2') is not None
+
+
+class EstadisticasHTTP:
+    """
+    Contadores de un cliente httpx (thread-safe).
+
+    - requests: Requests enviados
+    - conexiones: Conexiones TCP nuevas (lo que el pool debe minimizar)
+    - handshakes_tls: Handshakes TLS (uno por conexión https nueva)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.conexiones = 0
+        self.handshakes_tls = 0
+
+    def evento(self, nombre: str, info: Dict[str, Any]) -> None:
+        """Callback de la extensión trace de httpcore."""
+        if nombre.endswith('connect_tcp.complete'):
+            with self._lock:
+                self.conexiones += 1
+        elif nombre.endswith('start_tls.complete'):
+            with self._lock:
+                self.handshakes_tls += 1
+
+    async def aevento(self, nombre: str, info: Dict[str, Any]) -> None:
+        """Versión async (httpcore exige una corrutina en AsyncClient)."""
+        self.evento(nombre, info)
+
+    def al_enviar(self, request: httpx.Request) -> None:
+        """Hook 'request' de httpx: cuenta y activa el trace."""
+        with self._lock:
+            self.requests += 1
+        request.extensions['trace'] = self.evento
+
+    async def al_enviar_async(self, request: httpx.Request) -> None:
+        """Hook 'request' de httpx.AsyncClient."""
+        with self._lock:
+            self.requests += 1
+        request.extensions['trace'] = self.aevento
+
+
+def _opciones(settings: Settings) -> Dict[str, Any]:
+    """Argumentos comunes de httpx.Client / AsyncClient."""
+    return {
+        'http2': settings.supabase_http2 and HTTP2_DISPONIBLE,
+        'limits': httpx.Limits(
+            max_connections=settings.supabase_http_max_connections,
+            max_keepalive_connections=settings.supabase_http_max_keepalive,
+            keepalive_expiry=settings.supabase_http_keepalive_expiry
+        ),
+        'timeout': httpx.Timeout(settings.supabase_http_timeout),
+        'follow_redirects': True  # Igual que los clientes por defecto del SDK
+    }
+
+
+def crear_cliente_http(estadisticas: EstadisticasHTTP) -> httpx.Client:
+    """httpx.Client compartido con los límites de Settings."""
+    return httpx.Client(
+        event_hooks={'request': [estadisticas.al_enviar]}, **_opciones(Settings())
+    )
+
+
+def crear_cliente_http_async(estadisticas: EstadisticasHTTP) -> httpx.AsyncClient:
+    """httpx.AsyncClient compartido (AsyncSupabaseClient)."""
+    return httpx.AsyncClient(
+        event_hooks={'request': [estadisticas.al_enviar_async]}, **_opciones(Settings())
+    )
+
+
+def estadisticas_pool(cliente: Any, estadisticas: EstadisticasHTTP) -> Dict[str, Any]:
+    """
+    Contadores + estado actual del pool de conexiones.
+
+    IMPORTANTE: El estado sale de httpcore (cliente._transport._pool),
+    que no es API pública: si cambia, solo se omiten esos campos.
+    """
+    settings = Settings()
+    datos: Dict[str, Any] = {
+        'http2': settings.supabase_http2 and HTTP2_DISPONIBLE,
+        'max_connections': settings.supabase_http_max_connections,
+        'max_keepalive': settings.supabase_http_max_keepalive,
+        'requests': estadisticas.requests,
+        'connections_opened': estadisticas.conexiones,
+        'tls_handshakes': estadisticas.handshakes_tls
+    }
+    conexiones = getattr(getattr(getattr(cliente, '_transport', None), '_pool', None),
+                         'connections', None)
+    if conexiones is not None:
+        datos['open_connections'] = len(conexiones)
+        datos['idle_connections'] = sum(1 for c in conexiones if c.is_idle())
+    return datos
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para el pool HTTP (servidor local, sin Supabase).
+
+    EJECUCIÓN:
+        python src/repositories/http_pool.py
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    os.environ.setdefault('SUPABASE_URL', 'https://demo.supabase.co')
+    os.environ.setdefault('SUPABASE_KEY', 'demo-key')
+
+    class _Ok(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+
+        def log_message(self, *args):
+            pass
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: Pool HTTP compartido")
+    print("=" * 60)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Ok)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    estadisticas = EstadisticasHTTP()
+    with crear_cliente_http(estadisticas) as cliente:
+        for _ in range(5):
+            cliente.get(f'http://127.0.0.1:{server.server_address[1]}/')
+        print(f"✅ {estadisticas_pool(cliente, estadisticas)}")
+    assert estadisticas.requests == 5 and estadisticas.conexiones == 1
+    server.shutdown()
+    print("✅ 5 requests, 1 conexión (keep-alive)")
+    print("=" * 60)
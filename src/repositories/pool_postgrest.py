@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+POOL_POSTGREST.PY - Clientes PostgREST por usuario (LRU acotado)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: REPOSITORIES
+Patrón: Object pool (LRU) + Flyweight (comparten el pool HTTP)
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: CORE / INFRAESTRUCTURA
+- Requisitos: RNF-ARCH-02 (Patrones de diseño), RF-04 (RLS por usuario)
+
+PROBLEMA:
+- RLS filtra por el JWT que lleva cada request a PostgREST
+- Un create_client() por usuario es caro (Auth, Storage, un pool de
+  conexiones nuevo); autenticar el cliente compartido mezcla usuarios
+
+SOLUCIÓN:
+- Un SyncPostgrestClient / AsyncPostgrestClient liviano por token: solo
+  headers (Authorization: Bearer <token>), con el http_client del
+  cliente compartido -> todos usan las MISMAS conexiones keep-alive
+- Se guardan en un LRU acotado (POSTGREST_POOL_MAX) por token; los que
+  no se usan hace POSTGREST_POOL_IDLE s se descartan
+
+POR QUÉ DESCARTAR SIN aclose():
+- El http_client es del cliente compartido: cerrarlo cortaría a todos
+- Un cliente del pool no tiene otros recursos (solo un dict de headers)
+
+POR QUÉ EL ORDEN LRU SIRVE PARA LA INACTIVIDAD:
+- El OrderedDict está ordenado por último uso: los inactivos están al
+  principio, así que expulsarlos solo mira los que se van
+============================================================================
+"""
+
+import sys
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Tuple, TypeVar
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+
+C = TypeVar('C')
+
+
+class PoolPostgrest(Generic[C]):
+    """
+    LRU de clientes por token, con expulsión por inactividad.
+
+    PARÁMETROS:
+    - crear: token -> cliente (se llama en un miss, fuera del Lock)
+    - max_clientes: Tope de clientes (<= 0: no guarda, crea siempre)
+    - inactividad: Segundos sin uso tras los que un cliente se descarta
+    - reloj: Fuente de tiempo monotónica (inyectable para tests)
+
+    THREAD-SAFE: Un Lock protege el LRU; sirve igual desde asyncio
+    (ninguna operación espera con el Lock tomado).
+
+    USO:
+        pool = PoolPostgrest(lambda token: cliente_de_usuario(base, token))
+        pool.obtener(token).from_('notas').select('*').execute()
+    """
+
+    def __init__(
+        self,
+        crear: Callable[[str], C],
+        max_clientes: int = 256,
+        inactividad: float = 300,
+        reloj: Callable[[], float] = time.monotonic
+    ):
+        self._crear = crear
+        self.max_clientes = max_clientes
+        self.inactividad = inactividad
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        # token -> (último uso, cliente); orden = uso (LRU)
+        self._clientes: 'OrderedDict[str, Tuple[float, C]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.idle_evictions = 0
+
+    def obtener(self, token: str) -> C:
+        """Cliente autenticado con `token` (reutilizado o nuevo)."""
+        ahora = self._reloj()
+        with self._lock:
+            self._expulsar_inactivos(ahora)
+            entrada = self._clientes.get(token)
+            if entrada is not None:
+                self._clientes[token] = (ahora, entrada[1])
+                self._clientes.move_to_end(token)
+                self.hits += 1
+                return entrada[1]
+            self.misses += 1
+
+        cliente = self._crear(token)
+        if self.max_clientes <= 0:
+            return cliente
+        with self._lock:
+            # Otro hilo pudo crearlo en el medio: gana el primero
+            entrada = self._clientes.get(token)
+            if entrada is not None:
+                return entrada[1]
+            self._clientes[token] = (ahora, cliente)
+            while len(self._clientes) > self.max_clientes:
+                self._clientes.popitem(last=False)
+                self.evictions += 1
+        return cliente
+
+    def limpiar(self) -> None:
+        """Descarta todos los clientes (el pool HTTP sigue abierto)."""
+        with self._lock:
+            self._clientes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para diagnóstico (/api/health)."""
+        with self._lock:
+            self._expulsar_inactivos(self._reloj())
+            return {
+                'clients': len(self._clientes),
+                'max_clients': self.max_clientes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'idle_evictions': self.idle_evictions
+            }
+
+    def _expulsar_inactivos(self, ahora: float) -> None:
+        """Quita del principio del LRU los que pasaron `inactividad` (con Lock)."""
+        while self._clientes:
+            token, (usado, _) = next(iter(self._clientes.items()))
+            if ahora - usado < self.inactividad:
+                return
+            del self._clientes[token]
+            self.idle_evictions += 1
+
+
+def cliente_de_usuario(base: Any, token: str) -> Any:
+    """
+    Cliente PostgREST de un usuario a partir del compartido.
+
+    PARÁMETROS:
+    - base: client.postgrest del cliente Supabase (sync o async)
+    - token: JWT del usuario
+
+    Misma URL, schema y headers que `base`, Authorization del usuario y
+    el MISMO http_client (pool de conexiones).
+    
+    Con SUPABASE_BACKEND=lite `base` es un PostgrestLite, que sabe
+    copiarse con otro token (y postgrest-py no se importa).
+    """
+    if hasattr(base, 'con_token'):
+        return base.con_token(token)
+    from postgrest import AsyncPostgrestClient, SyncPostgrestClient
+    
+    clase = AsyncPostgrestClient if isinstance(base, AsyncPostgrestClient) else SyncPostgrestClient
+    headers = dict(base.headers)  # httpx.Headers -> claves en minúscula
+    headers['authorization'] = f'Bearer {token}'
+    return clase(
+        str(base.base_url),
+        schema=headers.get('accept-profile', 'public'),
+        headers=headers,
+        http_client=base.session
+    )
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para PoolPostgrest.
+
+    EJECUCIÓN:
+        python src/repositories/pool_postgrest.py
+    """
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: PoolPostgrest")
+    print("=" * 60)
+
+    from postgrest import SyncPostgrestClient
+
+    base = SyncPostgrestClient('https://demo.supabase.co/rest/v1', headers={'apikey': 'anon'})
+    ahora = [0.0]
+    pool = PoolPostgrest(lambda token: cliente_de_usuario(base, token),
+                         max_clientes=2, inactividad=60, reloj=lambda: ahora[0])
+
+    ana = pool.obtener('jwt-ana')
+    assert pool.obtener('jwt-ana') is ana
+    assert ana.session is base.session
+    assert ana.headers.get_list('Authorization') == ['Bearer jwt-ana']
+    print("✅ Un cliente por token, mismo pool HTTP")
+
+    pool.obtener('jwt-beto')
+    pool.obtener('jwt-caro')
+    assert pool.stats()['evictions'] == 1
+    print("✅ LRU acotado")
+
+    ahora[0] = 61
+    assert pool.stats()['clients'] == 0
+    print(f"✅ Expulsión por inactividad: {pool.stats()}")
+    print("=" * 60)
@@ -25,12 +25,19 @@ POR QUÉ supabase-py:
 - SÍ: API idéntica al SDK de JavaScript
 - SÍ: Soporta Auth, Database, Storage, Realtime
 - NO alternativa (HTTP requests manuales): Reinventar la rueda
+
+SUPABASE_BACKEND=lite:
+- En vez del SDK se usa ClienteLite (supabase_lite.py): misma interfaz
+  para lo que usa la app (.table(), .auth, .postgrest) y el SDK ni se
+  importa (cold start en Vercel)
 ============================================================================
 """
 
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 import sys
 import os
+import threading
+import time
 
 # Agregar directorio raíz al path para permitir ejecución directa
 # POR QUÉ: Permite ejecutar `python src/repositories/supabase_client.py` directamente
@@ -39,8 +46,14 @@ _root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fi
 if _root_dir not in sys.path:
     sys.path.insert(0, _root_dir)
 
-from supabase import create_client, Client
 from src.config.settings import Settings
+from src.models.contexto import contexto_actual
+from src.repositories.pool_postgrest import PoolPostgrest, cliente_de_usuario
+from src.repositories.http_pool import EstadisticasHTTP, crear_cliente_http, estadisticas_pool
+from src.repositories.supabase_lite import ClienteLite
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 class SupabaseClient:
@@ -60,6 +73,7 @@ class SupabaseClient:
     
     _instance: Optional['SupabaseClient'] = None
     _initialized: bool = False
+    _lock = threading.Lock()
     
     def __new__(cls) -> 'SupabaseClient':
         """
@@ -71,7 +85,9 @@ class SupabaseClient:
         - NO alternativa (módulo global): Menos control, testing difícil
         """
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self) -> None:
@@ -82,8 +98,10 @@ class SupabaseClient:
         La dependencia es: SupabaseClient -> Settings -> .env
         """
         if not SupabaseClient._initialized:
-            self._initialize()
-            SupabaseClient._initialized = True
+            with SupabaseClient._lock:  # Doble chequeo: el pool de workers llega en paralelo
+                if not SupabaseClient._initialized:
+                    self._initialize()
+                    SupabaseClient._initialized = True
     
     def _initialize(self) -> None:
         """
@@ -93,16 +111,37 @@ class SupabaseClient:
         - SÍ: Función oficial de supabase-py
         - SÍ: Configura automáticamente headers, timeouts, etc.
         - NO alternativa (requests.Session): Perderíamos toda la abstracción
+        
+        POOL HTTP: PostgREST, Auth y demás subclientes comparten UN
+        httpx.Client (ver http_pool.py) con los límites de Settings.
+        
+        IMPORT DEL SDK ACÁ ADENTRO: con SUPABASE_BACKEND=lite no se carga.
         """
         settings = Settings()
         
-        self._client: Client = create_client(
-            supabase_url=settings.supabase_url,
-            supabase_key=settings.supabase_key
+        self._http_stats = EstadisticasHTTP()
+        self._http = crear_cliente_http(self._http_stats)
+        if settings.supabase_backend == 'lite':
+            self._client: Union['Client', ClienteLite] = ClienteLite(
+                settings.supabase_url, settings.supabase_key, self._http
+            )
+        else:
+            from supabase import create_client
+            from supabase.lib.client_options import SyncClientOptions
+            
+            self._client = create_client(
+                supabase_url=settings.supabase_url,
+                supabase_key=settings.supabase_key,
+                options=SyncClientOptions(httpx_client=self._http)
+            )
+        self._pool = PoolPostgrest(
+            lambda token: cliente_de_usuario(self._client.postgrest, token),
+            settings.postgrest_pool_max,
+            settings.postgrest_pool_idle
         )
     
     @property
-    def client(self) -> Client:
+    def client(self) -> Union['Client', ClienteLite]:
         """
         Acceso al cliente Supabase subyacente.
         
@@ -126,6 +165,38 @@ class SupabaseClient:
         """
         return self._client.auth
     
+    @property
+    def pool(self) -> PoolPostgrest:
+        """Clientes PostgREST por usuario (stats para /api/health)."""
+        return self._pool
+    
+    def estadisticas_http(self) -> dict:
+        """Requests, conexiones nuevas, handshakes TLS y estado del pool HTTP."""
+        return estadisticas_pool(self._http, self._http_stats)
+    
+    def precalentar(self) -> Dict[str, Any]:
+        """
+        Deja abierta una conexión del pool SIN tocar la base de datos.
+        
+        GET /auth/v1/health (GoTrue) al mismo host que PostgREST: DNS,
+        TCP y TLS quedan hechos y la conexión queda en el pool para la
+        próxima consulta.
+        
+        RETORNA: {'ok', 'status', 'ms'}
+        RAISES: httpx.HTTPError si Supabase no responde
+        """
+        settings = Settings()
+        inicio = time.perf_counter()
+        response = self._http.get(
+            f"{settings.supabase_url.rstrip('/')}/auth/v1/health",
+            headers={'apikey': settings.supabase_key}
+        )
+        return {
+            'ok': response.status_code < 500,
+            'status': response.status_code,
+            'ms': round((time.perf_counter() - inicio) * 1e3, 1)
+        }
+    
     def table(self, table_name: str):
         """
         Acceso directo a una tabla.
@@ -137,8 +208,17 @@ class SupabaseClient:
         POR QUÉ este wrapper:
         - SÍ: Sintaxis más limpia que client.client.table()
         - SÍ: Punto de extensión para logging futuro
+        
+        JWT POR REQUEST: Con un ContextoAuth activo, la consulta sale del
+        cliente PostgREST de ese token (ver PoolPostgrest): lleva
+        "Authorization: Bearer <token del request>" (RLS filtra por ese
+        usuario) y comparte el pool de conexiones del cliente; los
+        headers del cliente compartido no se modifican.
         """
-        return self._client.table(table_name)
+        contexto = contexto_actual()
+        if contexto is None:
+            return self._client.table(table_name)
+        return self._pool.obtener(contexto.access_token).from_(table_name)
 
 
 # ============================================================================
@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+SUPABASE_LITE.PY - Cliente mínimo de PostgREST + GoTrue (sin el SDK)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: REPOSITORIES
+Patrón: Adapter (misma interfaz que usa el código del SDK) + Builder
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: CORE / INFRAESTRUCTURA
+- Requisitos: RNF (Rendimiento: cold start en Vercel)
+
+PROBLEMA:
+- `import supabase` carga Auth, Storage, Realtime, Functions, pydantic,
+  websockets...: en Vercel ese import se paga en CADA cold start, y la
+  app solo usa una parte chica de PostgREST y de Auth
+
+SOLUCIÓN (SUPABASE_BACKEND=lite):
+- Un cliente con httpx (ya es dependencia) que implementa EXACTAMENTE
+  lo que usan NotasService y EmailPasswordStrategy:
+  - table(...).select(cols, count=) / insert / update / delete
+  - filtros eq, in_, or_; order, limit; execute() -> .data / .count
+  - auth.sign_in_with_password / sign_up / sign_out
+- Mismo protocolo que postgrest-py (headers Prefer, columns en inserts
+  masivos, comillas en in.(...)) y mismos nombres: los servicios no
+  cambian
+
+POR QUÉ NO REEMPLAZA AL SDK SIEMPRE:
+- El SDK cubre todo Supabase y lo mantiene la comunidad; este cliente
+  cubre solo lo que la app usa hoy (SUPABASE_BACKEND=sdk por defecto)
+- AsyncSupabaseClient (servidor asyncio) sigue con el SDK
+
+ERRORES:
+- ErrorAPI (como postgrest.APIError): message, code, hint, details
+- ErrorAuth: mensaje de GoTrue (ej: "Invalid login credentials"), que
+  mapear_error_login ya sabe traducir
+============================================================================
+"""
+
+import sys
+import os
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+# Caracteres reservados en valores de filtros (igual que postgrest-py)
+_RESERVADOS = ',:()'
+
+
+class ErrorAPI(Exception):
+    """Error de PostgREST (status >= 400)."""
+
+    def __init__(self, error: Dict[str, Any], status: int = 0):
+        self.message = error.get('message')
+        self.code = error.get('code')
+        self.hint = error.get('hint')
+        self.details = error.get('details')
+        self.status = status
+        super().__init__(self.message or f'HTTP {status}')
+
+
+class ErrorAuth(Exception):
+    """Error de GoTrue (login, registro)."""
+
+    def __init__(self, message: str, status: int = 0):
+        self.message = message
+        self.status = status
+        super().__init__(message)
+
+
+class RespuestaLite(NamedTuple):
+    """Resultado de execute(): filas y, si se pidió, el total."""
+    data: Any
+    count: Optional[int] = None
+
+
+class UsuarioLite(NamedTuple):
+    """Usuario de GoTrue (los campos que usa la app)."""
+    id: str
+    email: Optional[str]
+    created_at: Optional[str]
+
+
+class SesionLite(NamedTuple):
+    """Tokens de un login."""
+    access_token: str
+    refresh_token: Optional[str]
+    expires_in: Optional[int]
+    user: UsuarioLite
+
+
+class RespuestaAuthLite(NamedTuple):
+    """Resultado de sign_in / sign_up (session es None si falta confirmar)."""
+    user: Optional[UsuarioLite]
+    session: Optional[SesionLite]
+
+
+def _valor(valor: Any) -> str:
+    """Valor de filtro con comillas si tiene caracteres reservados."""
+    texto = str(valor)
+    return f'"{texto}"' if any(c in texto for c in _RESERVADOS) else texto
+
+
+def _total(content_range: Optional[str]) -> Optional[int]:
+    """Total de 'Content-Range: 0-9/42' (None si no vino o es '*')."""
+    if not content_range or '/' not in content_range:
+        return None
+    total = content_range.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
+
+
+class ConsultaLite:
+    """
+    Builder de una consulta PostgREST (un request en execute()).
+
+    USO:
+        cliente.table('notas').select('id,title').eq('id', x).execute().data
+    """
+
+    def __init__(self, http: httpx.Client, url: str, headers: Dict[str, str]):
+        self._http = http
+        self._url = url
+        self._headers = dict(headers)
+        self._metodo = 'GET'
+        self._params: List[Tuple[str, str]] = []
+        self._body: Any = None
+        self._prefer: List[str] = []
+
+    # ----- Operaciones -----------------------------------------------------
+
+    def select(self, *columnas: str, count: Optional[str] = None) -> 'ConsultaLite':
+        self._metodo = 'GET'
+        self._params.append(('select', ','.join(columnas) or '*'))
+        if count:
+            self._prefer.append(f'count={count}')
+        return self
+
+    def insert(self, filas: Any) -> 'ConsultaLite':
+        self._mutacion('POST', filas)
+        if isinstance(filas, list):
+            # Inserción masiva: PostgREST necesita la unión de columnas
+            columnas = {clave for fila in filas for clave in fila}
+            self._params.append(('columns', ','.join(f'"{c}"' for c in sorted(columnas))))
+        return self
+
+    def update(self, cambios: Dict[str, Any]) -> 'ConsultaLite':
+        return self._mutacion('PATCH', cambios)
+
+    def delete(self) -> 'ConsultaLite':
+        return self._mutacion('DELETE', None)
+
+    def _mutacion(self, metodo: str, body: Any) -> 'ConsultaLite':
+        self._metodo = metodo
+        self._body = body
+        self._prefer.append('return=representation')
+        return self
+
+    # ----- Filtros y modificadores -----------------------------------------
+
+    def eq(self, columna: str, valor: Any) -> 'ConsultaLite':
+        self._params.append((columna, f'eq.{_valor(valor)}'))
+        return self
+
+    def in_(self, columna: str, valores: Iterable[Any]) -> 'ConsultaLite':
+        self._params.append((columna, f"in.({','.join(_valor(v) for v in valores)})"))
+        return self
+
+    def or_(self, filtros: str) -> 'ConsultaLite':
+        self._params.append(('or', f'({filtros})'))
+        return self
+
+    def order(self, columna: str, desc: bool = False) -> 'ConsultaLite':
+        orden = f"{columna}.{'desc' if desc else 'asc'}"
+        for i, (clave, valor) in enumerate(self._params):
+            if clave == 'order':
+                self._params[i] = ('order', f'{valor},{orden}')
+                return self
+        self._params.append(('order', orden))
+        return self
+
+    def limit(self, cantidad: int) -> 'ConsultaLite':
+        self._params.append(('limit', str(cantidad)))
+        return self
+
+    # ----- Ejecución -------------------------------------------------------
+
+    def execute(self) -> RespuestaLite:
+        """
+        Envía el request.
+
+        RAISES: ErrorAPI si PostgREST responde >= 400
+        """
+        headers = self._headers
+        if self._prefer:
+            headers = {**headers, 'Prefer': ','.join(self._prefer)}
+        response = self._http.request(
+            self._metodo, self._url, params=self._params, headers=headers,
+            json=self._body if self._body is not None else None
+        )
+        if response.status_code >= 400:
+            try:
+                error = response.json()
+            except ValueError:
+                error = {'message': response.text}
+            raise ErrorAPI(error if isinstance(error, dict) else {'message': str(error)},
+                           response.status_code)
+        data = response.json() if response.content else []
+        return RespuestaLite(data, _total(response.headers.get('content-range')))
+
+
+class PostgrestLite:
+    """
+    Cliente PostgREST: URL base + headers (apikey, Authorization).
+
+    con_token(): Copia con el JWT de un usuario (PoolPostgrest) que
+    comparte el mismo httpx.Client.
+    """
+
+    def __init__(self, rest_url: str, headers: Dict[str, str], http: httpx.Client):
+        self.base_url = rest_url.rstrip('/')
+        self.headers = dict(headers)
+        self.session = http
+
+    def from_(self, tabla: str) -> ConsultaLite:
+        return ConsultaLite(self.session, f'{self.base_url}/{tabla}', self.headers)
+
+    table = from_
+
+    def auth(self, token: str) -> 'PostgrestLite':
+        """Autentica ESTE cliente (flujo CLI, como el SDK tras el login)."""
+        self.headers['Authorization'] = f'Bearer {token}'
+        return self
+
+    def con_token(self, token: str) -> 'PostgrestLite':
+        return PostgrestLite(
+            self.base_url, {**self.headers, 'Authorization': f'Bearer {token}'}, self.session
+        )
+
+
+class AuthLite:
+    """
+    Endpoints de GoTrue que usa EmailPasswordStrategy.
+
+    Como el SDK: tras el login, las consultas de `postgrest` llevan el
+    JWT del usuario; tras el logout vuelven a la anon key.
+    """
+
+    def __init__(
+        self,
+        auth_url: str,
+        apikey: str,
+        http: httpx.Client,
+        al_cambiar_token: Callable[[str], None]
+    ):
+        self._url = auth_url.rstrip('/')
+        self._apikey = apikey
+        self._http = http
+        self._al_cambiar_token = al_cambiar_token
+        self._access_token: Optional[str] = None
+
+    def sign_in_with_password(self, credenciales: Dict[str, str]) -> RespuestaAuthLite:
+        datos = self._post('/token?grant_type=password', credenciales)
+        respuesta = _respuesta_auth(datos)
+        self._access_token = respuesta.session.access_token
+        self._al_cambiar_token(self._access_token)
+        return respuesta
+
+    def sign_up(self, credenciales: Dict[str, str]) -> RespuestaAuthLite:
+        return _respuesta_auth(self._post('/signup', credenciales))
+
+    def sign_out(self) -> None:
+        """Revoca la sesión en GoTrue (si hay) y vuelve a la anon key."""
+        token, self._access_token = self._access_token, None
+        self._al_cambiar_token(self._apikey)
+        if token:
+            self._post('/logout', None, token)
+
+    def _post(self, ruta: str, body: Any, token: Optional[str] = None) -> Dict[str, Any]:
+        response = self._http.post(
+            f'{self._url}{ruta}',
+            json=body,
+            headers={'apikey': self._apikey, 'Authorization': f'Bearer {token or self._apikey}'}
+        )
+        datos = response.json() if response.content else {}
+        if response.status_code >= 400:
+            mensaje = (datos.get('msg') or datos.get('error_description')
+                       or datos.get('message') or datos.get('error') or f'HTTP {response.status_code}')
+            raise ErrorAuth(mensaje, response.status_code)
+        return datos
+
+
+def _usuario(datos: Dict[str, Any]) -> UsuarioLite:
+    return UsuarioLite(datos['id'], datos.get('email'), datos.get('created_at'))
+
+
+def _respuesta_auth(datos: Dict[str, Any]) -> RespuestaAuthLite:
+    """
+    GoTrue responde una sesión ({access_token, user, ...}) o, si el
+    registro requiere confirmar el email, solo el usuario.
+    """
+    if 'access_token' in datos:
+        user = _usuario(datos['user'])
+        sesion = SesionLite(datos['access_token'], datos.get('refresh_token'),
+                            datos.get('expires_in'), user)
+        return RespuestaAuthLite(user, sesion)
+    if 'user' in datos:
+        return RespuestaAuthLite(_usuario(datos['user']), None)
+    return RespuestaAuthLite(_usuario(datos) if 'id' in datos else None, None)
+
+
+class ClienteLite:
+    """
+    Reemplazo de supabase.Client para lo que usa la app.
+
+    USO:
+        cliente = ClienteLite(url, anon_key, httpx.Client())
+        cliente.auth.sign_in_with_password({'email': e, 'password': p})
+        cliente.table('notas').select('*').execute().data
+    """
+
+    def __init__(self, supabase_url: str, supabase_key: str, http: httpx.Client):
+        url = supabase_url.rstrip('/')
+        self.postgrest = PostgrestLite(
+            f'{url}/rest/v1',
+            {'apikey': supabase_key, 'Authorization': f'Bearer {supabase_key}'},
+            http
+        )
+        self.auth = AuthLite(f'{url}/auth/v1', supabase_key, http, self.postgrest.auth)
+
+    def table(self, tabla: str) -> ConsultaLite:
+        return self.postgrest.from_(tabla)
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para ClienteLite (PostgREST simulado en local).
+
+    EJECUCIÓN:
+        python src/repositories/supabase_lite.py
+    """
+    from benchmarks._fakes import FakePostgrestServer
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: ClienteLite")
+    print("=" * 60)
+
+    with FakePostgrestServer(latency=0) as fake, httpx.Client() as http:
+        notas = PostgrestLite(fake.url, {'apikey': 'anon'}, http)
+        creadas = notas.from_('notas').insert([{'title': 'A'}, {'title': 'B'}]).execute().data
+        print(f"✅ insert masivo: {len(creadas)} filas")
+
+        ids = [fila['id'] for fila in creadas]
+        leidas = notas.from_('notas').select('*').in_('id', ids).execute().data
+        assert {fila['id'] for fila in leidas} == set(ids)
+        print("✅ select in_")
+
+        editada = notas.from_('notas').update({'title': 'A2'}).eq('id', ids[0]).execute().data
+        assert editada[0]['title'] == 'A2'
+        borradas = notas.from_('notas').delete().in_('id', ids).execute().data
+        assert len(borradas) == 2
+        print("✅ update / delete")
+    print("=" * 60)
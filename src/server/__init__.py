@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de servidores HTTP (infraestructura de transporte).
+Expone el servidor con pool de workers acotado, el servidor asyncio
+el supervisor pre-fork multi-proceso, la tabla de rutas, las
+respuestas en streaming y los ETag de GET condicional.
+
+IMPORTS DIFERIDOS (PEP 562): `from src.server.router import Router`
+no carga asyncio ni los servidores; cada nombre se importa al pedirlo.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'ThreadPoolHTTPServer': '.threaded',
+    'AsyncHTTPServer': '.async_server',
+    'PreforkServer': '.prefork',
+    'cpus_disponibles': '.prefork',
+    'Router': '.router',
+    'RouteMatch': '.router',
+    'StreamingBody': '.streaming',
+    'etag_notas': '.etag',
+    'coincide': '.etag'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(nombre: str):
+    if nombre not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(_EXPORTS[nombre], __name__), nombre)
+    globals()[nombre] = valor
+    return valor
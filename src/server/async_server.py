@@ -0,0 +1,458 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+ASYNC_SERVER.PY - Servidor HTTP/1.1 nativo sobre asyncio
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVER (Infraestructura)
+Patrón: Event Loop / Adapter
+Fecha: 2025-12-24
+
+PROBLEMA:
+- VercelBridge.handle_request es bloqueante
+- Con hilos, cada llamada a PostgREST en vuelo ocupa un hilo entero
+
+SOLUCIÓN:
+- Un event loop (asyncio.start_server) atiende todas las conexiones
+- La aplicación es una corrutina: mientras espera a Supabase, el loop
+  atiende otros requests
+- Un proceso puede mantener miles de llamadas en vuelo
+
+POR QUÉ SIN FRAMEWORK (aiohttp, uvicorn...):
+- SÍ: Requisito del proyecto: "Sin frameworks"
+- SÍ: asyncio es biblioteca estándar
+- SÍ: Solo necesitamos lo que usa el frontend (JSON + estáticos)
+
+CONTRATO DE LA APLICACIÓN:
+    async def app(method, path, query, body, headers) -> (status, data)
+    (o (status, data, headers_extra) para agregar headers, ej: Allow)
+    Si data es un StreamingBody, los bloques se envían a medida que se
+    generan (Transfer-Encoding: chunked)
+============================================================================
+"""
+
+import sys
+import os
+import json
+import asyncio
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlparse
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.server.streaming import StreamingBody, LAST_CHUNK, encode_chunk
+
+
+AsyncApp = Callable[..., Awaitable[Tuple[int, Dict[str, Any]]]]
+StaticResolver = Callable[[str], Optional[Tuple[str, bytes]]]
+
+
+class AsyncHTTPServer:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio.
+
+    PARÁMETROS:
+    - app: Corrutina (method, path, query, body, headers) -> (status, data)
+    - host, port: Dirección de escucha (port=0 para puerto efímero)
+    - static: Función opcional path -> (content_type, bytes) o None
+    - max_body: Tamaño máximo del body en bytes (413 si se excede)
+    - max_header: Tamaño máximo de request line + headers (431)
+    - idle_timeout: Segundos sin un request nuevo antes de cerrar
+    - max_requests: Requests por conexión (el último va con Connection: close)
+
+    USO:
+        server = AsyncHTTPServer(bridge.handle_request_async, 'localhost', 8000)
+        asyncio.run(server.serve_forever())
+
+    SOPORTA:
+    - Keep-alive (HTTP/1.1 por defecto, Connection: close para cortar),
+      con timeout de inactividad y tope de requests por conexión
+    - Content-Length en todas las respuestas
+    - CORS preflight (OPTIONS)
+    """
+
+    def __init__(
+        self,
+        app: AsyncApp,
+        host: str = 'localhost',
+        port: int = 8000,
+        static: Optional[StaticResolver] = None,
+        max_body: int = 1024 * 1024,
+        max_header: int = 64 * 1024,
+        idle_timeout: float = 5.0,
+        max_requests: int = 100
+    ):
+        self._app = app
+        self._host = host
+        self._port = port
+        self._static = static
+        self._max_body = max_body
+        self._max_header = max_header
+        self._idle_timeout = idle_timeout
+        self._max_requests = max_requests
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def port(self) -> int:
+        """Puerto real de escucha (útil con port=0)."""
+        if self._server is None:
+            return self._port
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> 'AsyncHTTPServer':
+        """Abre el socket de escucha (no bloquea)."""
+        self._server = await asyncio.start_server(
+            self._handle_connection,
+            self._host,
+            self._port,
+            limit=self._max_header
+        )
+        return self
+
+    async def serve_forever(self) -> None:
+        """Abre el socket (si hace falta) y atiende hasta ser cancelado."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self) -> None:
+        """Deja de aceptar conexiones nuevas."""
+        if self._server is not None:
+            self._server.close()
+
+    async def wait_closed(self) -> None:
+        """Espera a que el socket quede cerrado."""
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    # ------------------------------------------------------------------
+    # Conexión
+    # ------------------------------------------------------------------
+
+    async def _handle_connection(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Atiende requests de una conexión hasta que se cierre."""
+        try:
+            served = 0
+            keep_alive = True
+            while keep_alive:
+                served += 1
+                last = served >= self._max_requests
+                keep_alive = await self._handle_one(reader, writer, last)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # El cliente cerró la conexión
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_one(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        last: bool = False
+    ) -> bool:
+        """
+        Lee un request, lo despacha y escribe la respuesta.
+
+        PARÁMETROS:
+        - last: Es el último request permitido en esta conexión
+
+        RETORNA: True si la conexión debe seguir abierta
+        """
+        try:
+            head = await asyncio.wait_for(
+                reader.readuntil(b'\r\n\r\n'), self._idle_timeout
+            )
+        except asyncio.TimeoutError:
+            return False  # Conexión ociosa: se cierra sin responder
+        except asyncio.IncompleteReadError as e:
+            if e.partial:
+                await self._write(writer, 400, {'error': 'Request incompleto'}, False)
+            return False
+        except asyncio.LimitOverrunError:
+            await self._write(writer, 431, {'error': 'Headers demasiado grandes'}, False)
+            return False
+
+        try:
+            method, target, version, headers = self._parse_head(head)
+        except ValueError:
+            await self._write(writer, 400, {'error': 'Request mal formado'}, False)
+            return False
+
+        keep_alive = self._wants_keep_alive(version, headers) and not last
+
+        try:
+            length = int(headers.get('content-length', '0') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            await self._write(writer, 400, {'error': 'Content-Length inválido'}, False)
+            return False
+        if length > self._max_body:
+            await self._write(writer, 413, {'error': 'Body demasiado grande'}, False)
+            return False
+        raw_body = await reader.readexactly(length) if length > 0 else b''
+
+        if method == 'OPTIONS':
+            await self._write_cors_preflight(writer, keep_alive)
+            return keep_alive
+
+        parsed = urlparse(target)
+
+        if method == 'GET' and self._static is not None:
+            static = self._static(parsed.path)
+            if static is not None:
+                content_type, content = static
+                await self._write_raw(writer, 200, content, content_type, keep_alive)
+                return keep_alive
+
+        body = self._parse_body(raw_body)
+        extra: Optional[Dict[str, str]] = None
+        try:
+            result = await self._app(
+                method, parsed.path, parse_qs(parsed.query), body, headers
+            )
+            status, data = result[0], result[1]
+            if len(result) > 2:
+                extra = result[2]
+        except Exception as e:
+            status, data = 500, {'error': str(e)}
+
+        if isinstance(data, StreamingBody):
+            return await self._write_stream(
+                writer, status, data, keep_alive, version != 'HTTP/1.0', extra
+            )
+
+        await self._write(writer, status, data, keep_alive, extra)
+        return keep_alive
+
+    # ------------------------------------------------------------------
+    # Parsing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        """
+        Parsea request line + headers.
+
+        RETORNA: (method, target, version, headers en minúsculas)
+        RAISES: ValueError si el formato es inválido
+        """
+        lines = head.decode('latin-1').split('\r\n')
+        method, target, version = lines[0].split(' ', 2)
+        if not version.startswith('HTTP/1.'):
+            raise ValueError(f"Versión no soportada: {version}")
+
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if not line:
+                continue
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return method.upper(), target, version, headers
+
+    @staticmethod
+    def _wants_keep_alive(version: str, headers: Dict[str, str]) -> bool:
+        """HTTP/1.1 mantiene la conexión salvo 'Connection: close'."""
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    @staticmethod
+    def _parse_body(raw: bytes) -> Dict[str, Any]:
+        """Parsea el body JSON (mismo criterio que RequestHandler)."""
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return {}
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    async def _write(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        data: Dict[str, Any],
+        keep_alive: bool,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Serializa `data` como JSON y lo envía (304: solo headers)."""
+        if status == 304:
+            writer.write(self._head(status, None, keep_alive, extra_headers, {}))
+            await writer.drain()
+            return
+        payload = json.dumps(data, indent=2).encode('utf-8')
+        await self._write_raw(
+            writer, status, payload, 'application/json', keep_alive, extra_headers
+        )
+
+    async def _write_raw(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: bytes,
+        content_type: str,
+        keep_alive: bool,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Envía status line, headers (con Content-Length) y body."""
+        head = self._head(status, content_type, keep_alive, extra_headers, {
+            'Content-Length': str(len(payload))
+        })
+        writer.write(head + payload)
+        await writer.drain()
+
+    async def _write_stream(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: StreamingBody,
+        keep_alive: bool,
+        chunked: bool,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """
+        Envía un StreamingBody bloque por bloque.
+
+        POR QUÉ drain() EN CADA BLOQUE:
+        - SÍ: Backpressure: si el cliente lee lento, dejamos de generar
+          (y de pedir páginas a Supabase) en vez de acumular en el buffer
+
+        SIN chunked (cliente HTTP/1.0): el fin del body es el cierre.
+        RETORNA: Si la conexión puede seguir viva
+        """
+        keep_alive = keep_alive and chunked
+        framing = {'Transfer-Encoding': 'chunked'} if chunked else {}
+        writer.write(self._head(status, body.content_type, keep_alive, extra_headers, framing))
+
+        chunks = body.chunks
+        try:
+            if body.is_async:
+                async for data in chunks:
+                    await self._write_chunk(writer, data, chunked)
+            else:
+                for data in chunks:
+                    await self._write_chunk(writer, data, chunked)
+            if chunked:
+                writer.write(LAST_CHUNK)
+            await writer.drain()
+        finally:
+            close = getattr(chunks, 'aclose', None)
+            if close is not None:
+                await close()
+            elif hasattr(chunks, 'close'):
+                chunks.close()
+        return keep_alive
+
+    @staticmethod
+    async def _write_chunk(writer: asyncio.StreamWriter, data: bytes, chunked: bool) -> None:
+        """Escribe un bloque (los vacíos se omiten: cerrarían el body chunked)."""
+        if data:
+            writer.write(encode_chunk(data) if chunked else data)
+            await writer.drain()
+
+    def _head(
+        self,
+        status: int,
+        content_type: Optional[str],
+        keep_alive: bool,
+        extra_headers: Optional[Dict[str, str]],
+        framing: Dict[str, str]
+    ) -> bytes:
+        """
+        Status line + headers (framing = Content-Length o chunked).
+
+        content_type None: respuesta sin body (304).
+        """
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ''
+
+        headers = {
+            **({'Content-Type': content_type} if content_type else {}),
+            **framing,
+            'Access-Control-Allow-Origin': '*',
+            'Connection': 'keep-alive' if keep_alive else 'close'
+        }
+        if keep_alive:
+            headers['Keep-Alive'] = f'timeout={int(self._idle_timeout)}'
+
+        if extra_headers:
+            headers.update(extra_headers)
+
+        head = f'HTTP/1.1 {status} {reason}\r\n'
+        head += ''.join(f'{k}: {v}\r\n' for k, v in headers.items())
+        head += '\r\n'
+        return head.encode('latin-1')
+
+    async def _write_cors_preflight(self, writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        """Responde al preflight CORS (mismos headers que RequestHandler)."""
+        await self._write_raw(writer, 200, b'', 'text/plain', keep_alive, {
+            'Access-Control-Allow-Methods': 'GET, POST, PUT, PATCH, DELETE, OPTIONS',
+            'Access-Control-Allow-Headers': 'Content-Type, Authorization'
+        })
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para AsyncHTTPServer.
+
+    EJECUCIÓN:
+        python src/server/async_server.py
+
+    RESULTADO ESPERADO:
+        ✅ 100 requests lentos concurrentes en ~1 latencia
+    """
+    import time
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: AsyncHTTPServer")
+    print("=" * 60)
+
+    async def _app(method, path, query, body, headers):
+        await asyncio.sleep(0.2)  # Simula PostgREST
+        return 200, {'path': path}
+
+    async def _client(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'GET /x HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n')
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        return data.startswith(b'HTTP/1.1 200')
+
+    async def _main():
+        server = await AsyncHTTPServer(_app, '127.0.0.1', 0).start()
+        start = time.perf_counter()
+        results = await asyncio.gather(*[_client(server.port) for _ in range(100)])
+        elapsed = time.perf_counter() - start
+        server.close()
+        await server.wait_closed()
+
+        if all(results) and elapsed < 1.0:
+            print(f"✅ 100 requests de 0.2s en {elapsed:.2f}s (concurrentes)")
+        else:
+            print(f"❌ Resultado inesperado: ok={all(results)} t={elapsed:.2f}s")
+
+    asyncio.run(_main())
+    print("=" * 60)
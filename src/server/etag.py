@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+ETAG.PY - Validadores para GET condicional (ETag / If-None-Match)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVER (Infraestructura)
+Patrón: Conditional request (RFC 9110 §13)
+Fecha: 2025-12-24
+
+PROBLEMA:
+- El frontend refresca GET /api/notas y recibe la lista COMPLETA aunque
+  no haya cambiado nada desde la vez anterior
+
+SOLUCIÓN:
+- Cada respuesta de notas lleva un ETag fuerte; el navegador lo reenvía
+  en If-None-Match y, si coincide, la respuesta es 304 sin body
+- El ETag sale de lo que el trigger de la BD ya mantiene: (id,
+  updated_at) de cada nota, en orden, más los datos de la respuesta
+  que no son notas (cursor, faltantes, fields)
+
+POR QUÉ updated_at Y NO UN HASH DEL JSON:
+- SÍ: Toda escritura lo cambia (trigger set_updated_at), así que cambia
+  el body <=> cambia el ETag
+- SÍ: No hay que serializar el contenido de cada nota para calcularlo
+- Fallback: una nota sin updated_at cargado (fields=...) aporta su
+  to_dict() completo
+============================================================================
+"""
+
+import sys
+import os
+import json
+import hashlib
+from typing import Any, Iterable, Optional
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+def etag_notas(notas: Iterable[Any], *extra: Any) -> str:
+    """
+    ETag fuerte (entre comillas) de una lista de notas.
+
+    PARÁMETROS:
+    - notas: Nota / NotaParcial, en el orden de la respuesta
+    - extra: Otros datos del body (next_cursor, missing, fields...)
+
+    IMPORTANTE: No dispara la carga lazy de NotaParcial (lee __dict__).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(extra, default=str).encode('utf-8'))
+    for nota in notas:
+        actualizada = vars(nota).get('updated_at')
+        if actualizada is not None:
+            token = f'\n{nota.id}@{actualizada.isoformat()}'
+        else:
+            token = '\n' + json.dumps(nota.to_dict(), sort_keys=True, default=str)
+        digest.update(token.encode('utf-8'))
+    return f'"{digest.hexdigest()}"'
+
+
+def coincide(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    True si If-None-Match incluye el ETag (=> 304).
+
+    Acepta '*' y listas separadas por coma; la comparación es débil
+    (W/"x" coincide con "x"), como pide RFC 9110 para If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaco = etag[2:] if etag.startswith('W/') else etag
+    for candidato in if_none_match.split(','):
+        candidato = candidato.strip()
+        if candidato.startswith('W/'):
+            candidato = candidato[2:]
+        if candidato == opaco:
+            return True
+    return False
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para etag_notas / coincide.
+
+    EJECUCIÓN:
+        python src/server/etag.py
+    """
+    from src.models.nota import Nota
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: ETag")
+    print("=" * 60)
+
+    fila = {'id': 'n1', 'user_id': 'u1', 'title': 'A', 'updated_at': '2025-12-24T15:30:00Z'}
+    etag = etag_notas([Nota.from_dict(fila)], None)
+    assert etag == etag_notas([Nota.from_dict(fila)], None)
+    print(f"✅ Estable: {etag}")
+
+    editada = etag_notas([Nota.from_dict({**fila, 'updated_at': '2025-12-24T15:31:00Z'})], None)
+    assert editada != etag
+    print("✅ Cambia con updated_at")
+
+    assert coincide(f'"otro", W/{etag}', etag) and not coincide('"otro"', etag)
+    print("✅ If-None-Match con lista y W/")
+    print("=" * 60)
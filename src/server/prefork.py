@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+PREFORK.PY - Servidor multi-proceso (pre-fork) con SO_REUSEPORT
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVER (Infraestructura)
+Patrón: Pre-fork / Supervisor
+Fecha: 2025-12-24
+
+PROBLEMA:
+- `python api/index.py` usa un solo núcleo (GIL)
+- Si el proceso muere, el servicio cae hasta que alguien lo reinicie
+
+SOLUCIÓN:
+1. El proceso padre hace el trabajo caro UNA vez (imports, Settings,
+   SupabaseClient) -> warmup
+2. gc.freeze() mueve esos objetos a la generación permanente: el GC de
+   los hijos no los toca y las páginas se comparten (copy-on-write)
+3. fork() de N workers; cada uno abre su socket con SO_REUSEPORT y el
+   kernel reparte las conexiones entre ellos
+4. El padre supervisa: si un worker muere, lanza otro
+
+POR QUÉ SO_REUSEPORT (y no un socket compartido):
+- SÍ: El kernel balancea conexiones entre procesos (sin thundering herd)
+- SÍ: Cada worker tiene su propia cola de accept
+- NO disponible en todas las plataformas: fallback a socket heredado
+
+POR QUÉ CONTAR CPUs DESDE CGROUPS:
+- En Docker/Heroku os.cpu_count() devuelve los núcleos del HOST
+- La cuota real está en cpu.max (cgroup v2) o cpu.cfs_quota_us (v1)
+
+SOLO POSIX: usa os.fork() (no disponible en Windows).
+============================================================================
+"""
+
+import sys
+import os
+import gc
+import math
+import time
+import signal
+import socket
+from typing import Callable, Dict, Optional, Tuple
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+# ============================================================================
+# DETECCIÓN DE CPUs (respetando cgroups)
+# ============================================================================
+
+def _leer(path: str) -> Optional[str]:
+    """Lee un archivo de texto o retorna None si no existe."""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cuota_cgroup(cgroup_root: str = '/sys/fs/cgroup') -> Optional[float]:
+    """
+    Cuota de CPU impuesta por cgroups (en núcleos), o None si no hay.
+
+    FUENTES:
+    - cgroup v2: cpu.max = "<quota> <period>" o "max <period>"
+    - cgroup v1: cpu/cpu.cfs_quota_us y cpu/cpu.cfs_period_us (-1 = sin límite)
+    """
+    v2 = _leer(os.path.join(cgroup_root, 'cpu.max'))
+    if v2:
+        quota, _, period = v2.partition(' ')
+        if quota != 'max' and period:
+            return int(quota) / int(period)
+        return None
+
+    quota = _leer(os.path.join(cgroup_root, 'cpu', 'cpu.cfs_quota_us'))
+    period = _leer(os.path.join(cgroup_root, 'cpu', 'cpu.cfs_period_us'))
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def cpus_disponibles(cgroup_root: str = '/sys/fs/cgroup') -> int:
+    """
+    Núcleos que este proceso puede usar realmente.
+
+    ORDEN:
+    1. Afinidad del proceso (taskset / cpuset)
+    2. Acotado por la cuota de cgroups (redondeo hacia arriba)
+
+    RETORNA: Entero >= 1
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = cuota_cgroup(cgroup_root)
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, cpus)
+
+
+# ============================================================================
+# SERVIDOR PRE-FORK
+# ============================================================================
+
+class PreforkServer:
+    """
+    Supervisor de N procesos worker que comparten un puerto.
+
+    PARÁMETROS:
+    - address: (host, puerto)
+    - server_factory: Callable(address, bind_and_activate) -> HTTPServer
+      (ej: functools.partial(ThreadPoolHTTPServer, handler_class=...))
+    - processes: Cantidad de workers (None = cpus_disponibles())
+    - warmup: Callable sin argumentos que se ejecuta UNA vez en el padre
+    - post_fork: Callable sin argumentos que se ejecuta en CADA hijo, ya
+      después del fork (hilos, conexiones: lo que no sobrevive al fork)
+    - reuse_port: Usar SO_REUSEPORT (None = si la plataforma lo soporta)
+
+    USO:
+        server = PreforkServer(('0.0.0.0', 8000), factory, warmup=precargar)
+        server.serve_forever()   # Bloquea; Ctrl+C / SIGTERM detiene todo
+    """
+
+    # Si un worker muere antes de este tiempo, esperamos antes de relanzar
+    MIN_UPTIME = 1.0
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        server_factory: Callable,
+        processes: Optional[int] = None,
+        warmup: Optional[Callable[[], None]] = None,
+        post_fork: Optional[Callable[[], None]] = None,
+        reuse_port: Optional[bool] = None
+    ):
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("El modo pre-fork requiere un sistema POSIX (os.fork)")
+
+        self.address = address
+        self.processes = processes or cpus_disponibles()
+        self._factory = server_factory
+        self._warmup = warmup
+        self._post_fork = post_fork
+        if reuse_port is None:
+            reuse_port = hasattr(socket, 'SO_REUSEPORT')
+        self.reuse_port = reuse_port
+
+        self._workers: Dict[int, Tuple[int, float]] = {}  # pid -> (slot, inicio)
+        self._stopping = False
+        self._listener = None
+        self.restarts = 0
+
+    # ------------------------------------------------------------------
+    # Padre
+    # ------------------------------------------------------------------
+
+    def _prepare(self) -> None:
+        """
+        Warmup + gc.freeze + reserva del puerto, antes de hacer fork.
+
+        CON SO_REUSEPORT:
+        - El padre hace bind() SIN listen(): reserva el puerto (y resuelve
+          port=0) pero el kernel no le entrega conexiones
+        SIN SO_REUSEPORT:
+        - El padre crea el servidor completo y los hijos heredan el socket
+        """
+        if self._warmup is not None:
+            self._warmup()
+
+        # Todo lo creado hasta aquí es compartido: que el GC no lo toque
+        gc.collect()
+        gc.freeze()
+
+        if self.reuse_port:
+            self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            self._listener.bind(self.address)
+            self.address = self._listener.getsockname()[:2]
+        else:
+            self._listener = self._factory(self.address, bind_and_activate=True)
+            self.address = self._listener.server_address[:2]
+
+    def start(self) -> None:
+        """Prepara y lanza todos los workers (no bloquea)."""
+        self._prepare()
+        for slot in range(self.processes):
+            self._spawn(slot)
+
+    def serve_forever(self) -> None:
+        """Lanza los workers y los supervisa hasta SIGINT/SIGTERM."""
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+        self.start()
+        try:
+            self.supervise()
+        finally:
+            self.stop()
+
+    def supervise(self) -> None:
+        """
+        Espera la muerte de workers y los relanza.
+
+        POR QUÉ os.wait() BLOQUEANTE:
+        - SÍ: Cero consumo de CPU mientras todo funciona
+        - SÍ: Las señales interrumpen la espera (flag _stopping)
+        """
+        while not self._stopping and self._workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            slot, started = self._workers.pop(pid, (None, 0.0))
+            if slot is None or self._stopping:
+                continue
+
+            code = os.waitstatus_to_exitcode(status)
+            print(f"⚠️ Worker {pid} (slot {slot}) terminó con código {code}; relanzando")
+            if time.monotonic() - started < self.MIN_UPTIME:
+                time.sleep(self.MIN_UPTIME)  # Evita un bucle de crash rápido
+            self.restarts += 1
+            self._spawn(slot)
+
+    def stop(self) -> None:
+        """Envía SIGTERM a los workers y espera su salida."""
+        self._stopping = True
+        for pid in list(self._workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in list(self._workers):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self._workers.clear()
+        gc.unfreeze()
+        if self._listener is not None:
+            if hasattr(self._listener, 'server_close'):
+                self._listener.server_close()
+            else:
+                self._listener.close()
+            self._listener = None
+
+    def _on_signal(self, signum, frame) -> None:
+        """SIGINT/SIGTERM en el padre: detener supervisión."""
+        self._stopping = True
+        raise KeyboardInterrupt
+
+    def worker_pids(self):
+        """PIDs de los workers vivos (para monitoreo/tests)."""
+        return list(self._workers)
+
+    # ------------------------------------------------------------------
+    # Hijo
+    # ------------------------------------------------------------------
+
+    def _spawn(self, slot: int) -> None:
+        """Hace fork de un worker en el slot indicado."""
+        pid = os.fork()
+        if pid:
+            self._workers[pid] = (slot, time.monotonic())
+            return
+
+        # --- Proceso hijo ---
+        code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C lo maneja el padre
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if self._post_fork is not None:
+                self._post_fork()
+            server = self._build_worker_server()
+            server.serve_forever()
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _build_worker_server(self):
+        """Crea el servidor del worker (socket propio o heredado)."""
+        if not self.reuse_port:
+            return self._listener
+
+        server = self._factory(self.address, bind_and_activate=False)
+        server.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        try:
+            server.server_bind()
+            server.server_activate()
+        except BaseException:
+            server.server_close()
+            raise
+        return server
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para PreforkServer.
+
+    EJECUCIÓN:
+        python src/server/prefork.py
+
+    RESULTADO ESPERADO:
+        ✅ CPUs detectadas
+        ✅ Workers atienden requests
+        ✅ Worker muerto es relanzado
+    """
+    import threading
+    import urllib.request
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+
+    class _PidHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = str(os.getpid()).encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    def _factory(address, bind_and_activate=True):
+        return HTTPServer(address, _PidHandler, bind_and_activate)
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: PreforkServer")
+    print("=" * 60)
+    print(f"✅ CPUs disponibles: {cpus_disponibles()} (cuota cgroup: {cuota_cgroup()})")
+
+    server = PreforkServer(('127.0.0.1', 0), _factory, processes=2)
+    server.start()
+    supervisor = threading.Thread(target=server.supervise, daemon=True)
+    supervisor.start()
+    time.sleep(0.3)
+
+    url = f'http://127.0.0.1:{server.address[1]}/'
+    pids = {urllib.request.urlopen(url).read().decode() for _ in range(20)}
+    print(f"✅ Workers respondieron desde PIDs: {sorted(pids)}")
+
+    victim = server.worker_pids()[0]
+    os.kill(victim, signal.SIGKILL)
+    time.sleep(server.MIN_UPTIME + 0.5)
+    if server.restarts == 1 and victim not in server.worker_pids():
+        print(f"✅ Worker {victim} relanzado: {server.worker_pids()}")
+    else:
+        print("❌ El worker no fue relanzado")
+
+    server.stop()
+    print("=" * 60)
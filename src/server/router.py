@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+ROUTER.PY - Tabla de rutas compilada con parámetros de path
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVER (Infraestructura)
+Patrón: Registry / Trie de segmentos
+Fecha: 2025-12-24
+
+PROBLEMA:
+- Un if-chain compara el path contra cada ruta en orden: cada endpoint
+  nuevo agrega costo a TODOS los requests
+- Los IDs viajan como ?id=... (no hay parámetros de path)
+- Un método no soportado termina en 404 en vez de 405
+
+SOLUCIÓN:
+- Las rutas se registran UNA vez (al importar el módulo)
+- Rutas estáticas: un dict path -> {método: destino} (lookup O(1))
+- Rutas con parámetros (/api/notas/{id}): trie de segmentos; cada nivel
+  es un dict, así que el costo depende de la profundidad del path,
+  no de la cantidad de rutas
+- Si el path existe pero el método no: 405 + header Allow
+
+POR QUÉ SIN REGEX:
+- SÍ: Una regex por ruta vuelve a ser un recorrido lineal
+- SÍ: Los segmentos {param} son el único patrón que necesitamos
+============================================================================
+"""
+
+import sys
+import os
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+class RouteMatch(NamedTuple):
+    """
+    Resultado de Router.match().
+
+    CASOS:
+    - target != None: Ruta encontrada (params con los valores de {param})
+    - target None y allow vacío: 404
+    - target None y allow con métodos: 405 (allow va al header Allow)
+    """
+    target: Any
+    params: Dict[str, str]
+    allow: Tuple[str, ...]
+
+
+class _Node:
+    """Nivel del trie: hijos estáticos, un hijo {param} y métodos."""
+
+    __slots__ = ('children', 'param', 'methods')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        self.param: Optional[Tuple[str, '_Node']] = None
+        self.methods: Dict[str, Any] = {}
+
+
+def _segments(path: str) -> List[str]:
+    """'/api/notas/1/' -> ['api', 'notas', '1']."""
+    return [s for s in path.split('/') if s]
+
+
+def _normalize(path: str) -> str:
+    """Quita la barra final ('/api/notas/' == '/api/notas')."""
+    if len(path) > 1 and path.endswith('/'):
+        return path.rstrip('/') or '/'
+    return path or '/'
+
+
+class Router:
+    """
+    Registro de rutas método + patrón -> destino.
+
+    El destino es opaco para el Router (VercelBridge guarda el nombre
+    del handler y qué argumentos necesita).
+
+    USO:
+        router = Router()
+        router.add('GET', '/api/notas', 'listar')
+        router.add('DELETE', '/api/notas/{id}', 'eliminar')
+
+        router.match('DELETE', '/api/notas/abc')
+        # RouteMatch(target='eliminar', params={'id': 'abc'}, allow=())
+    """
+
+    def __init__(self):
+        self._static: Dict[str, Dict[str, Any]] = {}
+        self._tree = _Node()
+
+    def add(self, method: str, pattern: str, target: Any) -> None:
+        """
+        Registra una ruta.
+
+        RAISES: ValueError si la ruta ya existe o si dos rutas usan
+        nombres distintos para el mismo segmento {param}
+        """
+        method = method.upper()
+        pattern = _normalize(pattern)
+
+        if '{' not in pattern:
+            methods = self._static.setdefault(pattern, {})
+        else:
+            node = self._tree
+            for segment in _segments(pattern):
+                if segment.startswith('{') and segment.endswith('}'):
+                    name = segment[1:-1]
+                    if node.param is None:
+                        node.param = (name, _Node())
+                    elif node.param[0] != name:
+                        raise ValueError(
+                            f"Parámetro {{{name}}} en conflicto con {{{node.param[0]}}}"
+                        )
+                    node = node.param[1]
+                else:
+                    node = node.children.setdefault(segment, _Node())
+            methods = node.methods
+
+        if method in methods:
+            raise ValueError(f"Ruta duplicada: {method} {pattern}")
+        methods[method] = target
+
+    def match(self, method: str, path: str) -> RouteMatch:
+        """Busca el destino para method + path (ver RouteMatch)."""
+        method = method.upper()
+        path = _normalize(path)
+
+        static = self._static.get(path)
+        if static is not None and method in static:
+            return RouteMatch(static[method], {}, ())
+
+        params: Dict[str, str] = {}
+        node = self._tree
+        for segment in _segments(path):
+            child = node.children.get(segment)
+            if child is not None:
+                node = child
+            elif node.param is not None:
+                params[node.param[0]] = segment
+                node = node.param[1]
+            else:
+                node = None
+                break
+
+        methods = node.methods if node is not None else {}
+        if method in methods:
+            return RouteMatch(methods[method], params, ())
+
+        allow = set(methods)
+        if static is not None:
+            allow.update(static)
+        return RouteMatch(None, {}, tuple(sorted(allow)))
+
+    def routes(self) -> List[Tuple[str, str]]:
+        """Lista (método, patrón) de rutas estáticas (para diagnóstico)."""
+        return [(m, p) for p, methods in self._static.items() for m in methods]
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para Router.
+
+    EJECUCIÓN:
+        python src/server/router.py
+
+    RESULTADO ESPERADO:
+        ✅ Ruta estática, ruta con parámetro, 404 y 405
+    """
+    import timeit
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: Router")
+    print("=" * 60)
+
+    router = Router()
+    router.add('GET', '/api/notas', 'listar')
+    router.add('GET', '/api/notas/{id}', 'obtener')
+    router.add('DELETE', '/api/notas/{id}', 'eliminar')
+
+    print(f"✅ Estática: {router.match('GET', '/api/notas')}")
+    print(f"✅ Parámetro: {router.match('DELETE', '/api/notas/abc')}")
+    print(f"✅ 404: {router.match('GET', '/api/nada')}")
+    print(f"✅ 405: {router.match('POST', '/api/notas/abc')}")
+
+    for extra in range(200):
+        router.add('GET', f'/api/extra{extra}', extra)
+    t = timeit.timeit(lambda: router.match('GET', '/api/notas/abc'), number=100_000)
+    print(f"✅ match con 203 rutas: {t / 100_000 * 1e6:.2f} µs")
+    print("=" * 60)
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+STREAMING.PY - Respuestas en streaming (NDJSON / JSON incremental)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVER (Infraestructura)
+Patrón: Iterator / Strategy (encoder)
+Fecha: 2025-12-24
+
+PROBLEMA:
+- Para responder con Content-Length hay que tener TODO el JSON en memoria
+  (lista de dicts + string de json.dumps): la memoria crece con la
+  cantidad de notas
+
+SOLUCIÓN:
+- El handler retorna un StreamingBody: un iterable de bloques de bytes
+- Cada bloque se escribe al socket apenas se genera (una página de
+  Supabase = un bloque) y se descarta
+- HTTP/1.1: Transfer-Encoding: chunked (la conexión sigue viva)
+- HTTP/1.0 / WSGI: sin Content-Length, fin = cierre de conexión
+  (o el servidor WSGI aplica chunked por su cuenta)
+
+FORMATOS:
+- ndjson: una nota por línea (application/x-ndjson)
+- json:   {"success": true, "data": [...], "count": N} escrito por partes
+
+ERRORES A MITAD DEL STREAM:
+- El status 200 ya se envió: el error viaja en el body
+  (última línea {"error": ...} o campo "error" al cerrar el objeto)
+============================================================================
+"""
+
+import sys
+import os
+import json
+from typing import Any, AsyncIterable, Dict, Iterable, List, Union
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+# Último bloque de una respuesta chunked
+LAST_CHUNK = b'0\r\n\r\n'
+
+
+def encode_chunk(data: bytes) -> bytes:
+    """
+    Enmarca un bloque para Transfer-Encoding: chunked.
+
+    IMPORTANTE: Nunca enviar un bloque vacío (b'0\\r\\n\\r\\n' termina
+    la respuesta); los escritores filtran los bloques vacíos.
+    """
+    return b'%X\r\n%s\r\n' % (len(data), data)
+
+
+class StreamingBody:
+    """
+    Body de respuesta que se genera mientras se envía.
+
+    PARÁMETROS:
+    - chunks: Iterable (o async iterable) de bytes
+    - content_type: Content-Type de la respuesta
+    """
+
+    def __init__(
+        self,
+        chunks: Union[Iterable[bytes], AsyncIterable[bytes]],
+        content_type: str = 'application/json'
+    ):
+        self.chunks = chunks
+        self.content_type = content_type
+
+    @property
+    def is_async(self) -> bool:
+        """True si los bloques se consumen con `async for`."""
+        return hasattr(self.chunks, '__aiter__')
+
+
+class NdjsonEncoder:
+    """Una línea JSON por elemento (application/x-ndjson)."""
+
+    content_type = 'application/x-ndjson'
+
+    def start(self) -> bytes:
+        return b''
+
+    def batch(self, items: List[Dict[str, Any]]) -> bytes:
+        return b''.join(json.dumps(item).encode('utf-8') + b'\n' for item in items)
+
+    def end(self, count: int) -> bytes:
+        return b''
+
+    def error(self, message: str) -> bytes:
+        return json.dumps({'error': message}).encode('utf-8') + b'\n'
+
+
+class JsonArrayEncoder:
+    """
+    El mismo objeto que la respuesta no-streaming, escrito por partes.
+
+    {"success": true, "data": [ ... bloques ... ], "count": N}
+    """
+
+    content_type = 'application/json'
+
+    def __init__(self):
+        self._first = True
+
+    def start(self) -> bytes:
+        return b'{"success": true, "data": ['
+
+    def batch(self, items: List[Dict[str, Any]]) -> bytes:
+        if not items:
+            return b''
+        data = b','.join(json.dumps(item).encode('utf-8') for item in items)
+        if self._first:
+            self._first = False
+            return data
+        return b',' + data
+
+    def end(self, count: int) -> bytes:
+        return b'], "count": %d}' % count
+
+    def error(self, message: str) -> bytes:
+        return b'], "error": ' + json.dumps(message).encode('utf-8') + b'}'
+
+
+# Formatos aceptados en ?stream=
+ENCODERS = {
+    'ndjson': NdjsonEncoder,
+    'json': JsonArrayEncoder,
+}
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para los encoders de streaming.
+
+    EJECUCIÓN:
+        python src/server/streaming.py
+    """
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: Streaming")
+    print("=" * 60)
+
+    lotes = [[{'id': 1}, {'id': 2}], [], [{'id': 3}]]
+
+    encoder = JsonArrayEncoder()
+    body = encoder.start() + b''.join(encoder.batch(l) for l in lotes) + encoder.end(3)
+    assert json.loads(body)['count'] == 3
+    print(f"✅ JSON incremental válido: {body.decode()}")
+
+    encoder = NdjsonEncoder()
+    body = b''.join(encoder.batch(l) for l in lotes)
+    print(f"✅ NDJSON: {len(body.splitlines())} líneas")
+
+    print(f"✅ Bloque chunked: {encode_chunk(b'hola')!r}")
+    print("=" * 60)
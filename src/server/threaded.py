@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+THREADED.PY - Servidor HTTP con Pool de Workers Acotado
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVER (Infraestructura)
+Patrón: Thread Pool / Bounded Queue
+Fecha: 2025-12-24
+
+PROBLEMA:
+- HTTPServer atiende UNA conexión a la vez
+- Una llamada lenta a Supabase (ej: NotasService.listar) bloquea a
+  todos los demás clientes
+
+SOLUCIÓN:
+- El hilo principal solo hace accept() y encola la conexión
+- N workers (hilos) toman conexiones de la cola y las atienden
+- La cola tiene tamaño máximo: si se llena, respondemos 503 enseguida
+
+POR QUÉ POOL FIJO (y no ThreadingHTTPServer):
+- SÍ: ThreadingHTTPServer crea un hilo por conexión, sin límite
+- SÍ: Con un pool fijo la memoria y los hilos están acotados
+- SÍ: La cola acotada da backpressure explícito (503 + Retry-After)
+- NO alternativa (concurrent.futures.ThreadPoolExecutor): Su cola
+  interna es ilimitada, no permite rechazar cuando hay sobrecarga
+
+KEEP-ALIVE Y WORKERS:
+- Una conexión keep-alive ocupa su worker también mientras está ociosa
+  esperando el próximo request: N conexiones ociosas = N workers parados
+- Por eso el handler (KeepAliveMixin en api/index.py) consulta
+  en_espera(): si hay conexiones encoladas, responde con
+  'Connection: close' y suelta las conexiones ociosas de inmediato
+============================================================================
+"""
+
+import sys
+import os
+import json
+import queue
+import threading
+from http.server import HTTPServer
+from typing import Optional, Tuple, Type
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+# Marcador para detener a los workers
+_STOP = object()
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    """
+    HTTPServer concurrente con pool de workers y cola de accept acotada.
+
+    PARÁMETROS:
+    - server_address: (host, puerto)
+    - handler_class: Subclase de BaseHTTPRequestHandler
+    - workers: Cantidad de hilos que atienden requests
+    - queue_size: Conexiones aceptadas que pueden esperar un worker
+
+    USO:
+        server = ThreadPoolHTTPServer(('localhost', 8000), RequestHandler,
+                                      workers=8, queue_size=64)
+        server.serve_forever()
+
+    IMPORTANTE:
+    - El handler debe ser thread-safe (VercelBridge comparte servicios)
+    - server_close() detiene y espera a los workers
+    """
+
+    # Respuesta cuando la cola está llena (sin pasar por el handler)
+    _OVERLOAD_BODY = json.dumps(
+        {'error': 'Servidor saturado, reintente en unos segundos'}
+    ).encode('utf-8')
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        handler_class: Type,
+        workers: int = 8,
+        queue_size: int = 64,
+        bind_and_activate: bool = True
+    ):
+        """
+        Inicializa el servidor y arranca los workers.
+
+        POR QUÉ request_queue_size = queue_size:
+        - SÍ: El backlog del socket también queda acotado
+        - SÍ: Coherente con la cola interna
+        """
+        if workers < 1:
+            raise ValueError("workers debe ser >= 1")
+        if queue_size < 1:
+            raise ValueError("queue_size debe ser >= 1")
+
+        self.request_queue_size = queue_size
+        super().__init__(server_address, handler_class, bind_and_activate)
+
+        self.workers = workers
+        self.queue_size = queue_size
+        self._rejected = 0
+        self._threads = []
+        self._owner_pid = None
+        self._ensure_workers()
+
+    def _ensure_workers(self) -> None:
+        """
+        Arranca los workers si no existen en ESTE proceso.
+
+        POR QUÉ CHEQUEAR EL PID:
+        - Los hilos no sobreviven a fork(): si el servidor se creó en
+          el padre (modo pre-fork sin SO_REUSEPORT), cada hijo debe
+          arrancar su propio pool y su propia cola
+        """
+        if self._owner_pid == os.getpid():
+            return
+
+        self._owner_pid = os.getpid()
+        self._queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._threads = []
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f'http-worker-{i}',
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        """Igual que HTTPServer.serve_forever, garantizando el pool."""
+        self._ensure_workers()
+        super().serve_forever(poll_interval)
+
+    def process_request(self, request, client_address) -> None:
+        """
+        Encola la conexión en vez de atenderla en el hilo de accept.
+
+        Si la cola está llena, responde 503 y cierra la conexión.
+        """
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait((request, client_address))
+        except queue.Full:
+            self._rejected += 1
+            self._reject(request)
+
+    def en_espera(self) -> int:
+        """Conexiones aceptadas que esperan un worker (0 = hay libres)."""
+        return self._queue.qsize()
+
+    def _worker_loop(self) -> None:
+        """Bucle de cada worker: toma conexiones y las atiende."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def _reject(self, request) -> None:
+        """Envía 503 Service Unavailable directamente al socket."""
+        head = (
+            'HTTP/1.1 503 Service Unavailable\r\n'
+            'Content-Type: application/json\r\n'
+            f'Content-Length: {len(self._OVERLOAD_BODY)}\r\n'
+            'Retry-After: 1\r\n'
+            'Connection: close\r\n'
+            '\r\n'
+        ).encode('latin-1')
+        try:
+            request.sendall(head + self._OVERLOAD_BODY)
+        except OSError:
+            pass  # El cliente ya se fue
+        finally:
+            self.shutdown_request(request)
+
+    def stats(self) -> dict:
+        """
+        Estadísticas del pool (para monitoreo/benchmarks).
+
+        RETORNA: workers, tamaño de cola, en cola, rechazados
+        """
+        return {
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'queued': self._queue.qsize(),
+            'rejected': self._rejected
+        }
+
+    def server_close(self) -> None:
+        """Cierra el socket y detiene a los workers."""
+        super().server_close()
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para ThreadPoolHTTPServer.
+
+    EJECUCIÓN:
+        python src/server/threaded.py
+
+    RESULTADO ESPERADO:
+        ✅ Servidor iniciado con pool de workers
+        ✅ Requests concurrentes atendidos en paralelo
+    """
+    import time
+    import urllib.request
+    from http.server import BaseHTTPRequestHandler
+
+    class _SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(0.2)
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+
+        def log_message(self, *args):
+            pass
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: ThreadPoolHTTPServer")
+    print("=" * 60)
+
+    server = ThreadPoolHTTPServer(('127.0.0.1', 0), _SlowHandler, workers=4, queue_size=8)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"✅ Servidor iniciado en puerto {port}: {server.stats()}")
+
+    def _get():
+        urllib.request.urlopen(f'http://127.0.0.1:{port}/').read()
+
+    start = time.perf_counter()
+    clients = [threading.Thread(target=_get) for _ in range(4)]
+    for c in clients:
+        c.start()
+    for c in clients:
+        c.join()
+    elapsed = time.perf_counter() - start
+
+    if elapsed < 0.6:
+        print(f"✅ 4 requests de 0.2s en {elapsed:.2f}s (paralelo)")
+    else:
+        print(f"❌ 4 requests tardaron {elapsed:.2f}s (¿serializados?)")
+
+    server.shutdown()
+    server.server_close()
+    print("=" * 60)
@@ -1,10 +1,35 @@
 # -*- coding: utf-8 -*-
 """
 Módulo de servicios de aplicación.
+
+IMPORTS DIFERIDOS (PEP 562): importar un servicio no carga los demás
+(ni httpx, PyJWT o el SDK que usan); cada nombre se importa al pedirlo.
 """
 
-from .session_manager import SessionManager
-from .auth_service import AuthService, IAuthStrategy, EmailPasswordStrategy
-from .notas_service import NotasService
+import importlib
+
+_EXPORTS = {
+    'SessionManager': '.session_manager',
+    'TablaSesiones': '.tabla_sesiones',
+    'CacheNotas': '.cache',
+    'CacheDisco': '.cache_disco',
+    'VerificadorJWT': '.jwt_verifier',
+    'SingleFlight': '.single_flight',
+    'AsyncSingleFlight': '.single_flight',
+    'AuthService': '.auth_service',
+    'IAuthStrategy': '.auth_service',
+    'EmailPasswordStrategy': '.auth_service',
+    'NotasService': '.notas_service',
+    'AsyncAuthService': '.async_auth_service',
+    'AsyncNotasService': '.async_notas_service'
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ['SessionManager', 'AuthService', 'IAuthStrategy', 'EmailPasswordStrategy', 'NotasService']
+def __getattr__(nombre: str):
+    if nombre not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(_EXPORTS[nombre], __name__), nombre)
+    globals()[nombre] = valor
+    return valor
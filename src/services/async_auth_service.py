@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+ASYNC_AUTH_SERVICE.PY - Servicio de Autenticación asíncrono
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVICES
+Patrón: Adapter
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: AUTH
+- Requisitos: RF-02 (Login), RF-03 (Logout)
+- HU: HU-02, HU-03
+- Caso de Uso: CU-01 (Gestionar Autenticación)
+
+POR QUÉ VARIANTE ASYNC:
+- SÍ: El servidor asyncio no puede bloquear el event loop esperando
+  a GoTrue
+- SÍ: Misma validación y mapeo de errores que AuthService
+  (funciones compartidas en auth_service.py)
+- NO alternativa (reemplazar AuthService): Menu (CLI) es síncrono
+============================================================================
+"""
+
+import sys
+import os
+from typing import Optional, Tuple
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.repositories.async_supabase_client import AsyncSupabaseClient
+from src.models.user import User
+from src.services.session_manager import SessionManager
+from src.services.auth_service import (
+    validar_credenciales,
+    mapear_respuesta_login,
+    mapear_error_login
+)
+
+
+class AsyncAuthService:
+    """
+    Servicio de autenticación con API asíncrona.
+
+    USO:
+        auth = AsyncAuthService()
+        user = await auth.login('email@ejemplo.com', 'password123')
+        await auth.logout()
+    """
+
+    def __init__(self):
+        """Constructor con dependencias internas (igual que AuthService)."""
+        self._supabase = AsyncSupabaseClient()
+        self._session = SessionManager()
+
+    async def login(self, email: str, password: str) -> User:
+        """
+        Autentica al usuario y establece la sesión.
+
+        RETORNA: User autenticado
+        RAISES:
+        - ValueError: Si credenciales vacías/cortas
+        - PermissionError: Si autenticación falla
+        """
+        user, access_token, refresh_token = await self.autenticar(email, password)
+        self._session.set_session(
+            user=user,
+            access_token=access_token,
+            refresh_token=refresh_token
+        )
+        return user
+
+    async def autenticar(self, email: str, password: str) -> Tuple[User, str, Optional[str]]:
+        """
+        Login SIN establecer sesión (API stateless, ver AuthService.autenticar).
+
+        RETORNA: (User, access_token, refresh_token)
+        """
+        validar_credenciales(email, password)
+
+        await self._supabase.conectar()
+        try:
+            response = await self._supabase.auth.sign_in_with_password({
+                'email': email.strip(),
+                'password': password
+            })
+            return mapear_respuesta_login(response)
+        except Exception as e:
+            raise mapear_error_login(e)
+
+    async def logout(self) -> None:
+        """
+        Cierra la sesión actual.
+
+        FLUJO:
+        1. Llama a Supabase signOut (errores ignorados)
+        2. Limpia SessionManager
+        """
+        try:
+            await self._supabase.conectar()
+            await self._supabase.auth.sign_out()
+        except Exception:
+            pass  # Ignorar errores de Supabase (ya estamos saliendo)
+        finally:
+            self._session.clear()
+
+    def get_current_user(self) -> Optional[User]:
+        """Usuario actual si hay sesión válida (no hace I/O)."""
+        if self._session.is_session_valid():
+            return self._session.current_user
+        return None
+
+    def is_authenticated(self) -> bool:
+        """Verifica si hay sesión válida (no hace I/O)."""
+        return self._session.is_session_valid()
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para AsyncAuthService.
+
+    EJECUCIÓN:
+        python src/services/async_auth_service.py
+
+    NOTA: No hace llamadas reales a Supabase, solo validaciones.
+    """
+    import asyncio
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: AsyncAuthService")
+    print("=" * 60)
+
+    async def _main():
+        auth = AsyncAuthService()
+        print("✅ AsyncAuthService creado correctamente")
+
+        try:
+            await auth.login('', 'password123')
+            print("❌ Debería fallar con email vacío")
+        except ValueError as e:
+            print(f"✅ Validación email: {e}")
+
+        await auth.logout()
+        print("✅ Logout sin sesión no causa error")
+
+    try:
+        asyncio.run(_main())
+        print("=" * 60)
+    except Exception as e:
+        print(f"❌ Error inesperado: {type(e).__name__}: {e}")
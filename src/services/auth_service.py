@@ -44,6 +44,48 @@ from src.models.user import User
 from src.services.session_manager import SessionManager
 
 
+# ============================================================================
+# FUNCIONES COMPARTIDAS (sync y async)
+# ============================================================================
+
+def validar_credenciales(email: str, password: str) -> None:
+    """
+    Valida email y password antes de llamar a Supabase.
+    
+    POR QUÉ FUNCIÓN DE MÓDULO:
+    - SÍ: La comparten EmailPasswordStrategy y AsyncAuthService
+    - NO alternativa (copiar en cada clase): Reglas divergentes
+    
+    RAISES: ValueError si los datos son inválidos
+    """
+    if not email or not email.strip():
+        raise ValueError("El email es obligatorio")
+    if not password or len(password) < 6:
+        raise ValueError("La contraseña debe tener al menos 6 caracteres")
+
+
+def mapear_respuesta_login(response) -> Tuple[User, str, Optional[str]]:
+    """
+    Convierte la respuesta de sign_in_with_password en (User, tokens).
+    
+    RETORNA: (User, access_token, refresh_token)
+    """
+    user = User(
+        id=response.user.id,
+        email=response.user.email,
+        created_at=response.user.created_at
+    )
+    return user, response.session.access_token, response.session.refresh_token
+
+
+def mapear_error_login(error: Exception) -> PermissionError:
+    """Mapea errores de Supabase Auth a mensajes amigables."""
+    error_msg = str(error).lower()
+    if 'invalid' in error_msg or 'credentials' in error_msg:
+        return PermissionError("Credenciales incorrectas")
+    return PermissionError(f"Error de autenticación: {error}")
+
+
 # ============================================================================
 # STRATEGY PATTERN: Interfaz base para estrategias de autenticación
 # ============================================================================
@@ -115,10 +157,7 @@ class EmailPasswordStrategy(IAuthStrategy):
         - AuthenticationError: Si autenticación falla
         """
         # Validación de entrada
-        if not email or not email.strip():
-            raise ValueError("El email es obligatorio")
-        if not password or len(password) < 6:
-            raise ValueError("La contraseña debe tener al menos 6 caracteres")
+        validar_credenciales(email, password)
         
         try:
             response = self._supabase.auth.sign_in_with_password({
@@ -126,24 +165,11 @@ class EmailPasswordStrategy(IAuthStrategy):
                 'password': password
             })
             
-            # Mapear respuesta a User
-            user = User(
-                id=response.user.id,
-                email=response.user.email,
-                created_at=response.user.created_at
-            )
-            
-            access_token = response.session.access_token
-            refresh_token = response.session.refresh_token
-            
-            return user, access_token, refresh_token
+            return mapear_respuesta_login(response)
             
         except Exception as e:
             # Mapear errores de Supabase a mensajes amigables
-            error_msg = str(e).lower()
-            if 'invalid' in error_msg or 'credentials' in error_msg:
-                raise PermissionError("Credenciales incorrectas")
-            raise PermissionError(f"Error de autenticación: {e}")
+            raise mapear_error_login(e)
     
     def register(self, email: str, password: str) -> User:
         """
@@ -160,10 +186,7 @@ class EmailPasswordStrategy(IAuthStrategy):
         - PermissionError: Si registro falla (ej: email duplicado)
         """
         # Validación de entrada
-        if not email or not email.strip():
-            raise ValueError("El email es obligatorio")
-        if not password or len(password) < 6:
-            raise ValueError("La contraseña debe tener al menos 6 caracteres")
+        validar_credenciales(email, password)
         
         try:
             response = self._supabase.auth.sign_up({
@@ -236,10 +259,7 @@ class AuthService:
         RETORNA: User autenticado
         RAISES: PermissionError si falla
         """
-        user, access_token, refresh_token = self._strategy.login(
-            email=email, 
-            password=password
-        )
+        user, access_token, refresh_token = self.autenticar(email, password)
         
         # Establecer sesión
         self._session.set_session(
@@ -250,6 +270,18 @@ class AuthService:
         
         return user
     
+    def autenticar(self, email: str, password: str) -> Tuple[User, str, Optional[str]]:
+        """
+        Login SIN establecer sesión en SessionManager (API stateless).
+        
+        El cliente guarda el access_token y lo manda en cada request
+        como "Authorization: Bearer"; ver VerificadorJWT.
+        
+        RETORNA: (User, access_token, refresh_token)
+        RAISES: ValueError / PermissionError (igual que login)
+        """
+        return self._strategy.login(email=email, password=password)
+    
     def register(self, email: str, password: str) -> User:
         """
         Registra un nuevo usuario.
@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+CACHE.PY - Caché de lecturas de notas por usuario (TTL + LRU por bytes)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVICES
+Patrón: Read-through / Write-through cache
+Fecha: 2025-12-24
+
+PROBLEMA:
+- Cada listar()/obtener() viaja a Supabase aunque nada haya cambiado
+- El menú CLI llama listar() dos veces seguidas al editar/eliminar
+
+SOLUCIÓN:
+- NotasService consulta la caché antes de ir a la red (read-through)
+- Las escrituras propias actualizan o invalidan la caché (write-through)
+- TTL: acota cuánto puede durar un dato cambiado POR OTRO cliente
+- LRU por bytes: la memoria queda acotada aunque las notas sean grandes
+- Gracia (stale-while-revalidate): durante `gracia` segundos después
+  del TTL, las lecturas que lo aceptan reciben el dato vencido al
+  instante (con su edad) mientras el servicio lo refresca aparte
+
+QUÉ SE GUARDA:
+- Filas crudas de PostgREST (no entidades): cada lectura arma Nota
+  nuevas, así que modificar una Nota no corrompe la caché
+
+POR QUÉ CLAVES POR USUARIO:
+- SÍ: Un usuario nunca recibe filas cacheadas de otro (RLS no corre
+  sobre la caché)
+- SÍ: Invalidar las listas de un usuario no toca las de los demás
+
+SEGUNDO NIVEL (opcional, `disco`):
+- CacheDisco (SQLite en /tmp): un miss en memoria se busca en disco y,
+  si está, se promueve; guardar/invalidar/limpiar pasan a los dos
+  niveles. Un bridge/servicio reconstruido en una instancia tibia
+  de Vercel sigue respondiendo sin ir a Supabase
+- La generación también vive en el disco: un valor leído antes de una
+  escritura no se guarda en disco después de su invalidación (ni en
+  este proceso ni en otro que comparta el archivo)
+============================================================================
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple
+)
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+if TYPE_CHECKING:
+    from src.services.cache_disco import CacheDisco
+
+
+# Primer elemento de las claves de una nota: ('nota', id, select)
+# Todo lo demás (listar, páginas, contar) es una "lista" del usuario
+CLAVE_NOTA = 'nota'
+
+# Espacio de CacheDisco donde viven las entradas de CacheNotas
+ESPACIO_DISCO = 'notas'
+
+Clave = Tuple[Hashable, ...]
+
+
+class Lectura(NamedTuple):
+    """
+    Resultado de CacheNotas.leer().
+
+    - edad: Segundos desde que se guardó (header Age)
+    - vencida: True si pasó el TTL (servida dentro de la gracia)
+    """
+    valor: Any
+    edad: float
+    vencida: bool
+
+
+class Generacion(NamedTuple):
+    """
+    Resultado de CacheNotas.generacion() (opaco para el servicio).
+
+    - local: Invalidaciones del usuario en este proceso
+    - disco: Las del archivo de CacheDisco (None = sin segundo nivel)
+    """
+    local: int
+    disco: Optional[int]
+
+
+def tamano_valor(valor: Any) -> int:
+    """Bytes aproximados de un valor (largo de su JSON)."""
+    return len(json.dumps(valor, default=str))
+
+
+def _clave_disco(completa: Clave) -> str:
+    """(user_id, *clave) como texto estable para CacheDisco."""
+    return json.dumps(completa, default=str)
+
+
+def _nota_disco(clave: Clave) -> str:
+    """Id de la nota de una clave ('' = una lista del usuario)."""
+    return str(clave[1]) if clave and clave[0] == CLAVE_NOTA else ''
+
+
+class CacheNotas:
+    """
+    Caché acotada de filas de notas, con claves por usuario.
+
+    PARÁMETROS:
+    - ttl: Segundos de vida de cada entrada (<= 0 desactiva la caché)
+    - max_bytes: Tamaño máximo total; se expulsa lo menos usado (LRU)
+    - gracia: Segundos tras el TTL en que leer(aceptar_vencida=True)
+      todavía devuelve la entrada (0 = sin stale-while-revalidate)
+    - reloj: Fuente de tiempo (inyectable para tests)
+    - disco: Segundo nivel CacheDisco (None = solo memoria)
+
+    THREAD-SAFE: Un Lock protege todo (el servidor con hilos comparte
+    el NotasService); ninguna operación hace I/O con el Lock tomado
+    (el disco se consulta afuera; CacheDisco tiene su propio Lock).
+
+    USO:
+        cache = CacheNotas(ttl=30, max_bytes=4 * 1024 * 1024)
+        filas = cache.obtener('user-1', ('listar', '*'))   # None = miss
+        cache.guardar('user-1', ('listar', '*'), filas)
+        cache.invalidar('user-1', ['nota-id'])
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_bytes: int,
+        gracia: float = 0,
+        reloj: Callable[[], float] = time.monotonic,
+        disco: Optional['CacheDisco'] = None
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.gracia = max(gracia, 0)
+        self._reloj = reloj
+        self._disco = disco
+        self._lock = threading.Lock()
+        # (user_id, *clave) -> (guardada, bytes, valor); orden = uso (LRU)
+        self._entradas: 'OrderedDict[Clave, Tuple[float, int, Any]]' = OrderedDict()
+        self._por_usuario: Dict[str, Set[Clave]] = {}
+        # Escrituras por usuario: una lectura que empezó antes de una
+        # escritura no debe guardar su resultado (ya viejo) después
+        self._generaciones: Dict[str, int] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @property
+    def activa(self) -> bool:
+        """False si NOTAS_CACHE_TTL o NOTAS_CACHE_MAX_BYTES son 0."""
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def obtener(self, user_id: str, clave: Clave) -> Optional[Any]:
+        """
+        Valor guardado o None (miss o vencido).
+
+        IMPORTANTE: No se guarda None; una lista vacía sí es un hit.
+        """
+        lectura = self.leer(user_id, clave)
+        return lectura.valor if lectura is not None else None
+
+    def leer(
+        self,
+        user_id: str,
+        clave: Clave,
+        aceptar_vencida: bool = False
+    ) -> Optional[Lectura]:
+        """
+        Lectura con edad; None si es un miss.
+
+        aceptar_vencida: Devuelve también entradas vencidas hace menos de
+        `gracia` segundos (vencida=True); quien la recibe debe refrescarla.
+        """
+        completa = (user_id,) + clave
+        with self._lock:
+            entrada = self._entradas.get(completa)
+            if entrada is not None:
+                edad = self._reloj() - entrada[0]
+                if edad < self.ttl:
+                    self._entradas.move_to_end(completa)
+                    self.hits += 1
+                    return Lectura(entrada[2], edad, False)
+                if edad < self.ttl + self.gracia:
+                    if aceptar_vencida:
+                        self._entradas.move_to_end(completa)
+                        self.stale_hits += 1
+                        return Lectura(entrada[2], edad, True)
+                else:
+                    self._quitar(completa)
+            if self._disco is None or not self.activa:
+                self.misses += 1
+                return None
+            generacion = self._generaciones.get(user_id, 0)
+
+        # Miss en memoria: segundo nivel (fuera del Lock)
+        encontrada = self._disco.obtener(ESPACIO_DISCO, _clave_disco(completa))
+        if encontrada is None or encontrada[1] >= self.ttl:
+            with self._lock:
+                self.misses += 1
+            return None
+        valor, edad = encontrada
+        tamano = tamano_valor(valor)
+        with self._lock:
+            self.disk_hits += 1
+            if tamano <= self.max_bytes and generacion == self._generaciones.get(user_id, 0):
+                self._poner(completa, valor, tamano, self._reloj() - edad)
+        return Lectura(valor, edad, False)
+
+    def generacion(self, user_id: str) -> Generacion:
+        """Contador de invalidaciones del usuario (tomarlo ANTES de leer)."""
+        disco = None
+        if self._disco is not None and self.activa:
+            disco = self._disco.generacion(ESPACIO_DISCO, user_id)
+        return Generacion(self._generaciones.get(user_id, 0), disco)
+
+    def guardar(
+        self,
+        user_id: str,
+        clave: Clave,
+        valor: Any,
+        generacion: Optional[Generacion] = None
+    ) -> None:
+        """
+        Guarda (o reemplaza) una entrada; expulsa LRU si hace falta.
+
+        generacion: la de antes de consultar; si hubo una escritura en
+        el medio, el valor se descarta en vez de guardarse viejo.
+        """
+        if not self.activa or valor is None:
+            return
+        tamano = tamano_valor(valor)
+        if tamano > self.max_bytes:
+            return  # No entra: guardarlo vaciaría la caché entera
+
+        completa = (user_id,) + clave
+        with self._lock:
+            if generacion is not None and generacion.local != self._generaciones.get(user_id, 0):
+                return
+            self._poner(completa, valor, tamano, self._reloj())
+
+        # Fuera del Lock; una invalidación en este hueco la frena la
+        # generación del disco (se compara en la misma transacción)
+        if self._disco is not None:
+            self._disco.guardar(ESPACIO_DISCO, _clave_disco(completa), valor, self.ttl,
+                                usuario=user_id, nota_id=_nota_disco(clave),
+                                generacion=generacion.disco if generacion else None)
+
+    def buscar_notas(
+        self,
+        user_id: str,
+        ids: Iterable[str],
+        select: str
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Multi-get: (filas cacheadas, ids que hay que pedir a Supabase).
+
+        Un id cacheado como inexistente ([]) no se vuelve a pedir.
+        """
+        filas: List[Dict[str, Any]] = []
+        pendientes: List[str] = []
+        for nota_id in ids:
+            cacheadas = self.obtener(user_id, (CLAVE_NOTA, nota_id, select))
+            if cacheadas is None:
+                pendientes.append(nota_id)
+            else:
+                filas.extend(cacheadas)
+        return filas, pendientes
+
+    def guardar_notas(
+        self,
+        user_id: str,
+        ids: Iterable[str],
+        select: str,
+        filas: List[Dict[str, Any]],
+        generacion: Optional[Generacion] = None
+    ) -> None:
+        """Guarda el resultado de un SELECT ... in.(ids), nota por nota."""
+        por_id = {fila['id']: fila for fila in filas}
+        for nota_id in ids:
+            fila = por_id.get(nota_id)
+            self.guardar(
+                user_id, (CLAVE_NOTA, nota_id, select), [fila] if fila else [], generacion
+            )
+
+    def invalidar(self, user_id: str, nota_ids: Iterable[str] = ()) -> None:
+        """
+        Tras una escritura: descarta las listas del usuario (listar,
+        páginas, contar) y las entradas de esas notas (todas sus
+        proyecciones). Las demás notas cacheadas siguen valiendo.
+        """
+        nota_ids = set(nota_ids)
+        with self._lock:
+            self._generaciones[user_id] = self._generaciones.get(user_id, 0) + 1
+            for completa in list(self._por_usuario.get(user_id, ())):
+                if completa[1] != CLAVE_NOTA or completa[2] in nota_ids:
+                    self._quitar(completa)
+
+        if self._disco is not None:
+            self._disco.invalidar(ESPACIO_DISCO, user_id, (str(i) for i in nota_ids))
+
+    def limpiar(self, user_id: Optional[str] = None) -> None:
+        """Descarta todo (o todo lo de un usuario)."""
+        with self._lock:
+            claves = list(self._entradas) if user_id is None \
+                else list(self._por_usuario.get(user_id, ()))
+            for completa in claves:
+                self._quitar(completa)
+
+        if self._disco is not None:
+            self._disco.limpiar(ESPACIO_DISCO, user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para diagnóstico (/api/health)."""
+        with self._lock:
+            datos = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'evictions': self.evictions,
+                'entries': len(self._entradas),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'stale_grace': self.gracia
+            }
+        if self._disco is not None:
+            datos['disk_hits'] = self.disk_hits
+            datos['disk'] = self._disco.stats()
+        return datos
+
+    def _poner(self, completa: Clave, valor: Any, tamano: int, guardada: float) -> None:
+        """Inserta en memoria y expulsa LRU (con el Lock tomado)."""
+        if completa in self._entradas:
+            self._quitar(completa)
+        self._entradas[completa] = (guardada, tamano, valor)
+        self._por_usuario.setdefault(completa[0], set()).add(completa)
+        self._bytes += tamano
+        while self._bytes > self.max_bytes:
+            self._quitar(next(iter(self._entradas)))
+            self.evictions += 1
+
+    def _quitar(self, completa: Clave) -> None:
+        """Quita una entrada (con el Lock tomado)."""
+        _, tamano, _ = self._entradas.pop(completa)
+        self._bytes -= tamano
+        claves = self._por_usuario.get(completa[0])
+        if claves is not None:
+            claves.discard(completa)
+            if not claves:
+                del self._por_usuario[completa[0]]
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para CacheNotas.
+
+    EJECUCIÓN:
+        python src/services/cache.py
+    """
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: CacheNotas")
+    print("=" * 60)
+
+    ahora = [0.0]
+    cache = CacheNotas(ttl=10, max_bytes=200, reloj=lambda: ahora[0])
+
+    cache.guardar('u1', ('listar', '*'), [{'id': 'a', 'title': 'A'}])
+    assert cache.obtener('u1', ('listar', '*')) is not None
+    assert cache.obtener('u2', ('listar', '*')) is None
+    print(f"✅ Claves por usuario: {cache.stats()}")
+
+    ahora[0] = 11
+    assert cache.obtener('u1', ('listar', '*')) is None
+    print("✅ TTL vencido = miss")
+
+    for i in range(10):
+        cache.guardar('u1', (CLAVE_NOTA, str(i), '*'), [{'id': str(i), 'title': 'x' * 20}])
+    print(f"✅ LRU por bytes: {cache.stats()['bytes']} <= 200 "
+          f"({cache.stats()['evictions']} expulsadas)")
+
+    cache.invalidar('u1', ['9'])
+    assert cache.obtener('u1', (CLAVE_NOTA, '9', '*')) is None
+    print("✅ Invalidación por nota")
+    print("=" * 60)
@@ -0,0 +1,559 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+CACHE_DISCO.PY - Segundo nivel de caché en /tmp (SQLite)
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVICES
+Patrón: Cache de dos niveles (L1 en memoria, L2 en disco local)
+Fecha: 2025-12-24
+
+PROBLEMA:
+- En Vercel, /tmp sobrevive entre invocaciones tibias de una instancia,
+  pero VercelBridge, los servicios y sus cachés en memoria se pueden
+  reconstruir (nuevo proceso, módulo recargado): se pierde todo y el
+  request siguiente vuelve a Supabase
+- En modo prefork cada proceso tiene su propia caché en memoria
+
+SOLUCIÓN:
+- Un archivo SQLite en /tmp con entradas (espacio, clave) -> JSON:
+  - 'notas': filas cacheadas por CacheNotas (listas, páginas, notas);
+    el ETag sale de esas filas, así que un If-None-Match repetido
+    también se responde (304) sin ir a Supabase
+  - 'jwt': claims de tokens ya verificados (clave = sha256 del token;
+    el token nunca se escribe en disco)
+- TTL por entrada (columna vence, reloj epoch: sobrevive al proceso)
+- Tope de bytes (CACHE_DISCO_MAX_BYTES): un trigger lleva el total; al
+  pasarse se borran primero las vencidas y luego las próximas a vencer
+- Tolerante a corrupción: si el archivo no es una base válida se borra
+  y se recrea; si no se puede, el nivel se desactiva (solo misses)
+
+INVALIDACIÓN (entre hilos y entre procesos):
+- Generación por (espacio, usuario) en el mismo archivo: invalidar()
+  la incrementa en la misma transacción en que borra las filas, y
+  guardar(generacion=...) solo inserta si sigue siendo la que el
+  llamador leyó ANTES de consultar Supabase. Un resultado viejo que
+  llega tarde no puede quedar en disco después de una invalidación
+- Falla cerrada: una invalidación espera el lock (espera_invalidacion);
+  si igual no puede borrar, el archivo entero se descarta (unlink) y
+  todos los procesos lo notan (cambia el inodo) y abren uno vacío
+
+POR QUÉ SQLITE Y NO mmap A MANO:
+- SÍ: Viene con Python; transacciones y locks entre procesos (WAL)
+- SÍ: Índices para invalidar por usuario y para vencer por fecha
+- NO alternativa (mmap + formato propio): Habría que escribir el
+  manejo de concurrencia, de espacio libre y de archivos truncados
+
+SEGURIDAD:
+- Directorio 0700 y archivo 0600 del usuario del proceso; si el
+  directorio es de otro usuario o lo pueden escribir otros, no se usa
+  (en /tmp compartido otro usuario podría plantar tokens "verificados")
+
+POR QUÉ synchronous=OFF:
+- Es una caché: un corte de luz a lo sumo corrompe el archivo, y eso
+  ya se tolera recreándolo
+============================================================================
+"""
+
+import sys
+import os
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.config.settings import Settings
+
+
+T = TypeVar('T')
+
+_VERSION = 2
+
+_ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS entradas (
+    espacio  TEXT NOT NULL,
+    clave    TEXT NOT NULL,
+    usuario  TEXT NOT NULL,
+    nota_id  TEXT NOT NULL,
+    guardada REAL NOT NULL,
+    vence    REAL NOT NULL,
+    bytes    INTEGER NOT NULL,
+    valor    TEXT NOT NULL,
+    PRIMARY KEY (espacio, clave)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entradas_usuario ON entradas (espacio, usuario);
+CREATE INDEX IF NOT EXISTS entradas_vence ON entradas (vence);
+CREATE TABLE IF NOT EXISTS generaciones (
+    espacio TEXT NOT NULL,
+    usuario TEXT NOT NULL,
+    gen     INTEGER NOT NULL,
+    PRIMARY KEY (espacio, usuario)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS total (
+    id    INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO total VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entradas_alta AFTER INSERT ON entradas
+BEGIN UPDATE total SET bytes = bytes + NEW.bytes; END;
+CREATE TRIGGER IF NOT EXISTS entradas_baja AFTER DELETE ON entradas
+BEGIN UPDATE total SET bytes = bytes - OLD.bytes; END;
+PRAGMA user_version = {_VERSION};
+"""
+
+# Variables por DELETE ... IN (...) (SQLite limita los parámetros)
+_TROZO_IDS = 500
+
+# Reinicios del archivo antes de dar el nivel por perdido
+_MAX_REINICIOS = 3
+
+
+def _directorio_privado(directorio: str) -> None:
+    """
+    Crea el directorio (0700) y verifica que sea solo nuestro.
+
+    RAISES: PermissionError si es de otro usuario o lo escriben otros
+    """
+    os.makedirs(directorio, mode=0o700, exist_ok=True)
+    if not hasattr(os, 'getuid'):
+        return  # Windows: sin uid/modo POSIX
+    info = os.stat(directorio)
+    if info.st_uid != os.getuid() or info.st_mode & 0o022:
+        raise PermissionError(f"{directorio} no es privado del usuario del proceso")
+
+
+@contextmanager
+def _transaccion(db: sqlite3.Connection) -> Iterator[None]:
+    """BEGIN IMMEDIATE ... COMMIT (ROLLBACK si algo falla)."""
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        yield
+    except BaseException:
+        db.execute('ROLLBACK')
+        raise
+    db.execute('COMMIT')
+
+
+class CacheDisco:
+    """
+    Caché (espacio, clave) -> valor JSON en un archivo SQLite.
+
+    PARÁMETROS:
+    - ruta: Archivo SQLite (se crea con su directorio)
+    - max_bytes: Tope del total de valores guardados
+    - reloj: Fuente de tiempo EPOCH (time.time): el archivo sobrevive
+      al proceso, un reloj monotónico no
+
+    THREAD-SAFE: Una conexión por proceso protegida por un Lock; entre
+    procesos, SQLite (WAL). Para leer/guardar, un lock ocupado más de
+    50 ms cuenta como miss: la caché no hace esperar a un request. Las
+    invalidaciones sí esperan (espera_invalidacion) y fallan cerradas.
+
+    USO:
+        disco = CacheDisco('/tmp/app/cache.sqlite3', max_bytes=32 * 1024 * 1024)
+        disco.guardar('notas', clave, filas, ttl=30, usuario='u1')
+        disco.obtener('notas', clave)   # (valor, edad) o None
+    """
+
+    _compartida: Optional['CacheDisco'] = None
+    _lock_compartida = threading.Lock()
+
+    # Segundos que invalidar()/limpiar() esperan un lock ocupado
+    espera_invalidacion = 2.0
+
+    def __init__(self, ruta: str, max_bytes: int, reloj: Callable[[], float] = time.time):
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._inodo: Tuple[int, int] = (0, 0)
+        self.desactivada: Optional[str] = None  # Motivo, si se desactivó
+        self.hits = 0
+        self.misses = 0
+        self.escrituras = 0
+        self.expulsiones = 0
+        self.errores = 0
+        self.reinicios = 0
+        self.descartes = 0
+
+    @classmethod
+    def compartida(cls) -> Optional['CacheDisco']:
+        """
+        Instancia del proceso según Settings (None si está desactivada).
+
+        CACHE_DISCO_PATH: en Vercel /tmp/crud-didactico/cache.sqlite3 por
+        defecto; en local, vacío (desactivada) salvo que se configure.
+        """
+        settings = Settings()
+        if not settings.cache_disco_path or settings.cache_disco_max_bytes <= 0:
+            return None
+        with cls._lock_compartida:
+            if cls._compartida is None or cls._compartida.ruta != settings.cache_disco_path:
+                cls._compartida = cls(settings.cache_disco_path, settings.cache_disco_max_bytes)
+            return cls._compartida
+
+    # ----------------------------------------------------------------------
+    # Operaciones
+    # ----------------------------------------------------------------------
+
+    def obtener(self, espacio: str, clave: str) -> Optional[Tuple[Any, float]]:
+        """(valor, edad en segundos) o None (miss, vencida o ilegible)."""
+        ahora = self._reloj()
+
+        def leer(db: sqlite3.Connection) -> Optional[Tuple[Any, float]]:
+            fila = db.execute(
+                'SELECT guardada, vence, valor FROM entradas WHERE espacio = ? AND clave = ?',
+                (espacio, clave)
+            ).fetchone()
+            if fila is not None and fila[1] > ahora:
+                try:
+                    self.hits += 1
+                    return json.loads(fila[2]), max(0.0, ahora - fila[0])
+                except ValueError:
+                    self.hits -= 1  # Fila ilegible: se borra y es un miss
+            if fila is not None:
+                db.execute('DELETE FROM entradas WHERE espacio = ? AND clave = ?', (espacio, clave))
+            self.misses += 1
+            return None
+
+        return self._ejecutar(leer, None)
+
+    def generacion(self, espacio: str, usuario: str) -> int:
+        """
+        Invalidaciones del usuario en el archivo (tomarla ANTES de leer).
+
+        -1 si no se pudo leer: ningún guardar() con -1 inserta.
+        """
+        def leer(db: sqlite3.Connection) -> int:
+            return self._generacion(db, espacio, usuario)
+
+        return self._ejecutar(leer, -1)
+
+    def guardar(
+        self,
+        espacio: str,
+        clave: str,
+        valor: Any,
+        ttl: float,
+        usuario: str = '',
+        nota_id: str = '',
+        generacion: Optional[int] = None
+    ) -> None:
+        """
+        Guarda (o reemplaza) una entrada que vence en `ttl` segundos.
+
+        - usuario / nota_id: Para invalidar (nota_id '' = una lista)
+        - generacion: La de generacion() antes de consultar; si hubo una
+          invalidación en el medio, no se guarda (chequeo atómico)
+        """
+        if ttl <= 0 or self.desactivada:
+            return
+        texto = json.dumps(valor, default=str)
+        if len(texto) > self.max_bytes:
+            return  # No entra: guardarla vaciaría la caché entera
+        ahora = self._reloj()
+
+        def escribir(db: sqlite3.Connection) -> None:
+            with _transaccion(db):
+                if generacion is not None and \
+                        generacion != self._generacion(db, espacio, usuario):
+                    return
+                db.execute('DELETE FROM entradas WHERE espacio = ? AND clave = ?', (espacio, clave))
+                db.execute(
+                    'INSERT INTO entradas VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (espacio, clave, usuario, nota_id, ahora, ahora + ttl, len(texto), texto)
+                )
+                if self._total(db) > self.max_bytes:
+                    self._recortar(db, ahora)
+            self.escrituras += 1
+
+        self._ejecutar(escribir, None)
+
+    def invalidar(self, espacio: str, usuario: str, nota_ids: Iterable[str] = ()) -> None:
+        """
+        Borra las listas del usuario y las entradas de esas notas, e
+        incrementa su generación. Falla cerrada (ver _ejecutar).
+        """
+        nota_ids = list(nota_ids)
+
+        def borrar(db: sqlite3.Connection) -> None:
+            with _transaccion(db):
+                self._incrementar(db, espacio, usuario)
+                db.execute(
+                    "DELETE FROM entradas WHERE espacio = ? AND usuario = ? AND nota_id = ''",
+                    (espacio, usuario)
+                )
+                for i in range(0, len(nota_ids), _TROZO_IDS):
+                    trozo = nota_ids[i:i + _TROZO_IDS]
+                    db.execute(
+                        f"DELETE FROM entradas WHERE espacio = ? AND usuario = ? "
+                        f"AND nota_id IN ({','.join('?' * len(trozo))})",
+                        (espacio, usuario, *trozo)
+                    )
+
+        self._ejecutar(borrar, None, critica=True)
+
+    def limpiar(self, espacio: Optional[str] = None, usuario: Optional[str] = None) -> None:
+        """
+        Borra todo (o todo un espacio, o lo de un usuario en un espacio)
+        e incrementa las generaciones afectadas. Falla cerrada.
+        """
+        def borrar(db: sqlite3.Connection) -> None:
+            with _transaccion(db):
+                if espacio is None:
+                    db.execute('DELETE FROM entradas')
+                    db.execute('UPDATE generaciones SET gen = gen + 1')
+                elif usuario is None:
+                    db.execute('DELETE FROM entradas WHERE espacio = ?', (espacio,))
+                    db.execute('UPDATE generaciones SET gen = gen + 1 WHERE espacio = ?',
+                               (espacio,))
+                else:
+                    db.execute('DELETE FROM entradas WHERE espacio = ? AND usuario = ?',
+                               (espacio, usuario))
+                    self._incrementar(db, espacio, usuario)
+
+        self._ejecutar(borrar, None, critica=True)
+
+    def purgar(self) -> None:
+        """Borra las entradas vencidas (y recorta si hace falta)."""
+        ahora = self._reloj()
+
+        def borrar(db: sqlite3.Connection) -> None:
+            with _transaccion(db):
+                self._recortar(db, ahora)
+
+        self._ejecutar(borrar, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para diagnóstico (/api/health)."""
+        def contar(db: sqlite3.Connection) -> Tuple[int, int]:
+            return db.execute('SELECT COUNT(*) FROM entradas').fetchone()[0], self._total(db)
+
+        entradas, total = self._ejecutar(contar, (0, 0))
+        return {
+            'enabled': self.desactivada is None,
+            'entries': entradas,
+            'bytes': total,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.escrituras,
+            'evictions': self.expulsiones,
+            'errors': self.errores,
+            'resets': self.reinicios,
+            'discards': self.descartes
+        }
+
+    def cerrar(self) -> None:
+        """Cierra la conexión (se reabre sola en el próximo uso)."""
+        with self._lock:
+            self._cerrar()
+
+    # ----------------------------------------------------------------------
+    # Internos
+    # ----------------------------------------------------------------------
+
+    def _ejecutar(
+        self,
+        operacion: Callable[[sqlite3.Connection], T],
+        por_defecto: T,
+        critica: bool = False
+    ) -> T:
+        """
+        Corre `operacion` con la conexión; nunca lanza.
+
+        - Lock ocupado / error de I/O: cuenta el error y retorna por_defecto
+        - critica (invalidaciones): espera el lock hasta
+          espera_invalidacion s; si igual falla, descarta el archivo entero
+          (un borrado perdido dejaría datos viejos para todos los procesos)
+        - Archivo corrupto: lo recrea (hasta _MAX_REINICIOS veces)
+        - Directorio inseguro o imposible de crear: desactiva el nivel
+        """
+        if self.desactivada:
+            return por_defecto
+        with self._lock:
+            try:
+                db = self._conexion()
+                if not critica:
+                    return operacion(db)
+                db.execute(f'PRAGMA busy_timeout = {int(self.espera_invalidacion * 1000)}')
+                try:
+                    return operacion(db)
+                finally:
+                    db.execute('PRAGMA busy_timeout = 50')
+            except sqlite3.OperationalError:
+                self.errores += 1
+                if critica:
+                    self._descartar()
+            except sqlite3.DatabaseError:
+                self.errores += 1
+                self._recrear()
+            except OSError as e:
+                self.errores += 1
+                self._cerrar()
+                self.desactivada = str(e)
+        return por_defecto
+
+    def _conexion(self) -> sqlite3.Connection:
+        """
+        Conexión de ESTE proceso (se reabre tras un fork).
+
+        También se reabre si el archivo cambió de inodo: otro proceso lo
+        descartó (invalidación fallida) o lo recreó (corrupción).
+        """
+        if self._db is not None and self._pid == os.getpid() and \
+                self._inodo == self._inodo_actual():
+            return self._db
+        self._cerrar()
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            _directorio_privado(directorio)
+        db = sqlite3.connect(self.ruta, timeout=0.05, isolation_level=None,
+                             check_same_thread=False)
+        try:
+            if hasattr(os, 'getuid'):
+                os.chmod(self.ruta, 0o600)
+            db.execute('PRAGMA journal_mode = WAL')
+            db.execute('PRAGMA synchronous = OFF')
+            version = db.execute('PRAGMA user_version').fetchone()[0]
+            if version not in (0, _VERSION):
+                raise sqlite3.DatabaseError(f"Versión de esquema {version} (se esperaba {_VERSION})")
+            if version == 0:
+                db.executescript(_ESQUEMA)  # Archivo nuevo (escribe: solo una vez)
+        except BaseException:
+            db.close()
+            raise
+        self._db, self._pid, self._inodo = db, os.getpid(), self._inodo_actual()
+        return db
+
+    def _inodo_actual(self) -> Tuple[int, int]:
+        """(dispositivo, inodo) del archivo; (0, 0) si no existe."""
+        try:
+            info = os.stat(self.ruta)
+        except OSError:
+            return (0, 0)
+        return (info.st_dev, info.st_ino)
+
+    def _cerrar(self) -> None:
+        if self._db is not None:
+            try:
+                self._db.close()
+            except sqlite3.Error:
+                pass
+            self._db = None
+
+    def _recrear(self) -> None:
+        """Borra el archivo corrupto; la próxima operación lo crea de nuevo."""
+        self.reinicios += 1
+        if self.reinicios > _MAX_REINICIOS:
+            self._cerrar()
+            self.desactivada = 'archivo corrupto repetidamente'
+            return
+        self._borrar_archivos()
+
+    def _descartar(self) -> None:
+        """Invalidación perdida: ningún proceso debe volver a leer este archivo."""
+        self.descartes += 1
+        self._borrar_archivos()
+
+    def _borrar_archivos(self) -> None:
+        """Cierra y borra el archivo (y su -wal/-shm); si no puede, desactiva."""
+        self._cerrar()
+        for sufijo in ('', '-wal', '-shm'):
+            try:
+                os.remove(self.ruta + sufijo)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.desactivada = str(e)
+
+    @staticmethod
+    def _generacion(db: sqlite3.Connection, espacio: str, usuario: str) -> int:
+        fila = db.execute('SELECT gen FROM generaciones WHERE espacio = ? AND usuario = ?',
+                          (espacio, usuario)).fetchone()
+        return fila[0] if fila else 0
+
+    @staticmethod
+    def _incrementar(db: sqlite3.Connection, espacio: str, usuario: str) -> None:
+        db.execute(
+            'INSERT INTO generaciones VALUES (?, ?, 1) '
+            'ON CONFLICT (espacio, usuario) DO UPDATE SET gen = gen + 1',
+            (espacio, usuario)
+        )
+
+    @staticmethod
+    def _total(db: sqlite3.Connection) -> int:
+        return db.execute('SELECT bytes FROM total').fetchone()[0]
+
+    def _recortar(self, db: sqlite3.Connection, ahora: float) -> None:
+        """Vencidas afuera; luego las próximas a vencer hasta entrar en el tope."""
+        db.execute('DELETE FROM entradas WHERE vence <= ?', (ahora,))
+        exceso = self._total(db) - self.max_bytes
+        if exceso > 0:
+            # Acumulado por orden de vencimiento: justo las que liberan `exceso`
+            self.expulsiones += db.execute(
+                'DELETE FROM entradas WHERE (espacio, clave) IN ('
+                ' SELECT espacio, clave FROM ('
+                '  SELECT espacio, clave, bytes,'
+                '   SUM(bytes) OVER (ORDER BY vence, espacio, clave) AS acumulado'
+                '  FROM entradas)'
+                ' WHERE acumulado - bytes < ?)',
+                (exceso,)
+            ).rowcount
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para CacheDisco (archivo temporal).
+
+    EJECUCIÓN:
+        python src/services/cache_disco.py
+    """
+    import tempfile
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: CacheDisco")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, 'cache', 'cache.sqlite3')
+        ahora = [1000.0]
+        disco = CacheDisco(ruta, max_bytes=200, reloj=lambda: ahora[0])
+
+        disco.guardar('notas', 'k1', [{'id': 'a'}], ttl=30, usuario='u1')
+        otra = CacheDisco(ruta, max_bytes=200, reloj=lambda: ahora[0])
+        assert otra.obtener('notas', 'k1') == ([{'id': 'a'}], 0.0)
+        print("✅ Otra instancia (proceso reconstruido) lee lo guardado")
+
+        ahora[0] += 31
+        assert otra.obtener('notas', 'k1') is None
+        print("✅ TTL vencido = miss")
+
+        for i in range(20):
+            disco.guardar('notas', f'k{i}', 'x' * 20, ttl=60 + i)
+        assert disco.stats()['bytes'] <= 200
+        print(f"✅ Tope de bytes: {disco.stats()}")
+
+        disco.cerrar()
+        otra.cerrar()
+        with open(ruta, 'wb') as f:
+            f.write(b'esto no es una base SQLite' * 100)
+        assert disco.obtener('notas', 'k19') is None
+        disco.guardar('notas', 'k1', [1], ttl=30)
+        assert disco.obtener('notas', 'k1') == ([1], 0.0)
+        assert disco.reinicios == 1
+        print(f"✅ Archivo corrupto recreado (resets={disco.reinicios})")
+        disco.cerrar()
+    print("=" * 60)
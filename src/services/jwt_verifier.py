@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+JWT_VERIFIER.PY - Verificación local de los JWT de Supabase Auth
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVICES
+Patrón: Cache-aside (tokens verificados) + claves cacheadas (JWKS)
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: AUTH
+- Requisitos: RF-04 (Protección), RF-15 (Persistir sesión)
+
+PROBLEMA:
+- auth.get_user(token) valida el token con un viaje a GoTrue: un
+  request extra por cada request de la API
+
+SOLUCIÓN:
+- La firma y el exp se verifican aquí, sin red:
+  - HS256 (proyectos con "JWT secret"): SUPABASE_JWT_SECRET
+  - RS256 / ES256 (signing keys asimétricas): la clave pública sale de
+    /auth/v1/.well-known/jwks.json y queda cacheada AUTH_JWKS_TTL s
+- Un token ya verificado se recuerda (LRU de AUTH_TOKEN_CACHE_MAX
+  tokens) hasta su exp: el mismo token no se vuelve a verificar
+- Segundo nivel opcional (CacheDisco en /tmp): los claims verificados
+  sobreviven a un bridge reconstruido; la clave es sha256(token), el
+  token mismo nunca se escribe en disco
+
+POR QUÉ PyJWT:
+- SÍ: Ya viene con supabase (supabase-auth depende de pyjwt[crypto])
+- NO alternativa (verificar HMAC/ECDSA a mano): Fácil equivocarse
+
+LIMITACIÓN (igual que cualquier JWT):
+- Un logout no invalida el access_token: vale hasta su exp (Supabase
+  los emite por 1 hora por defecto)
+============================================================================
+"""
+
+import sys
+import os
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+import jwt
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.config.settings import Settings
+from src.models.user import User
+from src.models.contexto import ContextoAuth
+
+if TYPE_CHECKING:
+    from src.services.cache_disco import CacheDisco
+
+
+# Algoritmos de las signing keys asimétricas de Supabase
+_ALGORITMOS_JWKS = ('RS256', 'ES256')
+
+# Espacio de CacheDisco con los claims de tokens verificados
+ESPACIO_DISCO = 'jwt'
+
+
+class VerificadorJWT:
+    """
+    Convierte "Bearer <jwt>" en un ContextoAuth, sin ir a GoTrue.
+
+    PARÁMETROS:
+    - secreto: JWT secret del proyecto (HS256); '' = no aceptar HS256
+    - jwks_url: Endpoint JWKS (RS256/ES256); '' = no aceptarlos
+    - audiencia: Claim aud esperado ('authenticated' en Supabase)
+    - max_tokens: Tokens verificados que se recuerdan (LRU)
+    - jwks_ttl: Segundos que se cachean las claves públicas
+    - reloj: Fuente de tiempo epoch (inyectable para tests)
+    - disco: Segundo nivel CacheDisco (None = solo memoria)
+
+    THREAD-SAFE: Un Lock protege la caché de tokens; la verificación
+    (y la descarga del JWKS) corre fuera del Lock.
+
+    USO:
+        verificador = VerificadorJWT.desde_settings()
+        contexto = verificador.verificar(token)   # PermissionError si no vale
+    """
+
+    def __init__(
+        self,
+        secreto: str = '',
+        jwks_url: str = '',
+        audiencia: str = 'authenticated',
+        max_tokens: int = 1024,
+        jwks_ttl: float = 600,
+        jwks_headers: Optional[Dict[str, str]] = None,
+        reloj: Callable[[], float] = time.time,
+        disco: Optional['CacheDisco'] = None
+    ):
+        self._secreto = secreto
+        self._audiencia = audiencia
+        self._max_tokens = max_tokens
+        self._reloj = reloj
+        self._disco = disco
+        self._jwks = jwt.PyJWKClient(
+            jwks_url, cache_keys=True, lifespan=jwks_ttl, headers=jwks_headers or {}
+        ) if jwks_url else None
+        self._lock = threading.Lock()
+        self._tokens: 'OrderedDict[str, ContextoAuth]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    @classmethod
+    def desde_settings(cls) -> 'VerificadorJWT':
+        """Verificador configurado con Settings (SUPABASE_JWT_SECRET, AUTH_*)."""
+        from src.services.cache_disco import CacheDisco
+
+        settings = Settings()
+        return cls(
+            secreto=settings.supabase_jwt_secret,
+            jwks_url=f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json",
+            max_tokens=settings.auth_token_cache_max,
+            jwks_ttl=settings.auth_jwks_ttl,
+            jwks_headers={'apikey': settings.supabase_key},
+            disco=CacheDisco.compartida()
+        )
+
+    def verificar(self, token: str) -> ContextoAuth:
+        """
+        Verifica firma, exp y aud; retorna el contexto del usuario.
+
+        RAISES: PermissionError (token mal formado, firma inválida,
+        expirado o algoritmo no configurado)
+        """
+        ahora = self._reloj()
+        with self._lock:
+            contexto = self._tokens.get(token)
+            if contexto is not None:
+                if ahora < contexto.expira:
+                    self._tokens.move_to_end(token)
+                    self.hits += 1
+                    return contexto
+                del self._tokens[token]
+            self.misses += 1
+
+        claims = self._claims_disco(token, ahora)
+        if claims is None:
+            claims = self._decodificar(token)
+            self._guardar_disco(token, claims, ahora)
+        contexto = ContextoAuth(
+            user=User(id=claims['sub'], email=claims.get('email') or ''),
+            access_token=token,
+            expira=float(claims['exp']),
+            session_id=claims.get('session_id')
+        )
+
+        if self._max_tokens > 0:
+            with self._lock:
+                self._tokens[token] = contexto
+                while len(self._tokens) > self._max_tokens:
+                    self._tokens.popitem(last=False)
+        return contexto
+
+    def _claims_disco(self, token: str, ahora: float) -> Optional[Dict[str, Any]]:
+        """Claims ya verificados desde el disco (None = verificar)."""
+        if self._disco is None:
+            return None
+        clave = hashlib.sha256(token.encode()).hexdigest()
+        guardado = self._disco.obtener(ESPACIO_DISCO, clave)
+        if guardado is not None and ahora < guardado[0]['exp']:
+            with self._lock:
+                self.disk_hits += 1
+            return guardado[0]
+        return None
+
+    def _guardar_disco(self, token: str, claims: Dict[str, Any], ahora: float) -> None:
+        """Recuerda en disco solo lo que arma el ContextoAuth, hasta su exp."""
+        if self._disco is not None:
+            self._disco.guardar(
+                ESPACIO_DISCO,
+                hashlib.sha256(token.encode()).hexdigest(),
+                {'sub': claims['sub'], 'email': claims.get('email'),
+                 'exp': claims['exp'], 'session_id': claims.get('session_id')},
+                ttl=float(claims['exp']) - ahora,
+                usuario=str(claims['sub'])
+            )
+
+    def _decodificar(self, token: str) -> Dict[str, Any]:
+        """jwt.decode con la clave que corresponde al alg del header."""
+        try:
+            algoritmo = jwt.get_unverified_header(token).get('alg')
+            if algoritmo == 'HS256' and self._secreto:
+                clave: Any = self._secreto
+            elif algoritmo in _ALGORITMOS_JWKS and self._jwks is not None:
+                clave = self._jwks.get_signing_key_from_jwt(token).key
+            else:
+                raise PermissionError(f"Token no verificable (alg={algoritmo})")
+            return jwt.decode(
+                token,
+                clave,
+                algorithms=[algoritmo],
+                audience=self._audiencia,
+                options={'require': ['exp', 'sub']}
+            )
+        except jwt.ExpiredSignatureError:
+            raise PermissionError("Sesión expirada. Debe iniciar sesión nuevamente.")
+        except (jwt.InvalidTokenError, jwt.PyJWKClientError) as e:
+            raise PermissionError(f"Token inválido: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para diagnóstico (/api/health)."""
+        with self._lock:
+            datos: Dict[str, Any] = {'hits': self.hits, 'misses': self.misses,
+                                     'tokens': len(self._tokens)}
+        if self._disco is not None:
+            datos['disk_hits'] = self.disk_hits
+            datos['disk'] = self._disco.stats()
+        return datos
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para VerificadorJWT (HS256 con un secreto de prueba).
+
+    EJECUCIÓN:
+        python src/services/jwt_verifier.py
+    """
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: VerificadorJWT")
+    print("=" * 60)
+
+    secreto = 'secreto-de-prueba-con-al-menos-32-bytes!'
+    verificador = VerificadorJWT(secreto=secreto)
+    claims = {'sub': 'u-1', 'email': 'ana@ejemplo.com', 'aud': 'authenticated',
+              'exp': int(time.time()) + 60}
+    token = jwt.encode(claims, secreto, algorithm='HS256')
+
+    contexto = verificador.verificar(token)
+    verificador.verificar(token)
+    print(f"✅ Verificado: {contexto} ({verificador.stats()})")
+
+    try:
+        verificador.verificar(jwt.encode(claims, 'otro-secreto-de-32-bytes-o-mas!!!', algorithm='HS256'))
+        print("❌ Debería rechazar otra firma")
+    except PermissionError as e:
+        print(f"✅ Firma inválida: {e}")
+
+    try:
+        verificador.verificar(jwt.encode({**claims, 'exp': 1}, secreto, algorithm='HS256'))
+        print("❌ Debería rechazar un token vencido")
+    except PermissionError as e:
+        print(f"✅ Expirado: {e}")
+    print("=" * 60)
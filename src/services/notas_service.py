@@ -29,16 +29,132 @@ SEGURIDAD:
 
 import sys
 import os
-from typing import List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from urllib.parse import quote
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 # Agregar directorio raíz al path para permitir ejecución directa
 _root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 if _root_dir not in sys.path:
     sys.path.insert(0, _root_dir)
 
+from src.config.settings import Settings
 from src.repositories.supabase_client import SupabaseClient
 from src.services.session_manager import SessionManager
-from src.models.nota import Nota
+from src.services.cache import CLAVE_NOTA, CacheNotas, Lectura
+from src.services.cache_disco import CacheDisco
+from src.services.single_flight import SingleFlight
+from src.models.nota import Nota, NotaParcial, normalizar_campos
+from src.models.pagina import Pagina, decodificar_cursor
+from src.models.lote import (
+    ResultadoMasivo, ResultadoOperacion, agrupar_lote, en_trozos, fallo_grupo,
+    ordenar_por_ids, parsear_lote, preparar_creaciones, resolver_grupo,
+    trozos_por_largo, validar_cambios, validar_ids
+)
+
+
+Campos = Optional[Union[str, Iterable[str]]]
+
+# Última lectura de caché del request/tarea actual (None = fue a la red).
+# ContextVar: cada hilo y cada tarea asyncio ve la suya.
+_ultima_lectura: ContextVar[Optional[Lectura]] = ContextVar('ultima_lectura', default=None)
+
+
+def limite_pagina(limite: Optional[int]) -> int:
+    """
+    Normaliza el tamaño de página pedido.
+    
+    REGLAS:
+    - None -> NOTAS_PAGE_SIZE
+    - Mayor al máximo -> NOTAS_MAX_PAGE_SIZE
+    
+    RAISES: ValueError si limite < 1
+    """
+    settings = Settings()
+    if limite is None:
+        return settings.notas_page_size
+    if limite < 1:
+        raise ValueError("El tamaño de página debe ser >= 1")
+    return min(limite, settings.notas_max_page_size)
+
+
+def columnas_select(campos: Campos, requeridas: Tuple[str, ...] = ()) -> str:
+    """
+    Lista de columnas para select() a partir de ?fields=.
+    
+    PARÁMETROS:
+    - campos: None (todas) o proyección ('id,title' / ['id', 'title'])
+    - requeridas: Columnas que la consulta necesita igual (ej: created_at
+      para armar el cursor)
+    
+    RETORNA: '*' o 'id,title,...' (validado con normalizar_campos)
+    RAISES: ValueError si hay columnas desconocidas
+    """
+    if campos is None:
+        return '*'
+    columnas = normalizar_campos(campos)
+    return ','.join(normalizar_campos(columnas + requeridas))
+
+
+def tamano_trozo(tamano: Optional[int], default: int) -> int:
+    """None -> default. RAISES: ValueError si tamano < 1."""
+    if tamano is None:
+        return default
+    if tamano < 1:
+        raise ValueError("chunk_size debe ser >= 1")
+    return tamano
+
+
+def largo_en_filtro(nota_id: str) -> int:
+    """
+    Caracteres que ocupa un id dentro de id=in.(...) en la URL.
+    
+    Cuenta las comillas que agrega postgrest-py (si hay , : ( ) en el
+    id), el escape %XX y la coma codificada (%2C) como separador.
+    """
+    if any(c in nota_id for c in ',:()'):
+        nota_id = f'"{nota_id}"'
+    return len(quote(nota_id, safe='')) + 3
+
+
+def trozos_de_ids(ids: Iterable[str], max_largo: int) -> List[List[str]]:
+    """Parte un conjunto de IDs en filtros in.(...) de a lo sumo max_largo."""
+    return list(trozos_por_largo(ids, largo_en_filtro, max_largo))
+
+
+def subgrupos_lote(grupo, max_largo: int) -> List[list]:
+    """
+    Grupo del lote -> llamadas a PostgREST.
+    
+    create viaja en el body (un INSERT); get/update/delete llevan los IDs
+    en la URL y se parten por largo del filtro.
+    """
+    if grupo[0].op == 'create':
+        return [grupo]
+    return list(trozos_por_largo(grupo, lambda op: largo_en_filtro(op.id), max_largo))
+
+
+def filtro_cursor(cursor: str) -> str:
+    """
+    Filtro PostgREST 'or' para las filas DESPUÉS del cursor.
+    
+    ORDEN: created_at DESC, id DESC (id desempata notas del mismo instante)
+    
+    EQUIVALE A (SQL):
+        WHERE created_at < :c OR (created_at = :c AND id < :id)
+    
+    POR QUÉ COMILLAS:
+    - El timestamp lleva ':' y '+', reservados en la sintaxis de filtros
+    
+    RAISES: ValueError si el cursor es inválido
+    """
+    created_at, nota_id = decodificar_cursor(cursor)
+    return (
+        f'created_at.lt."{created_at}",'
+        f'and(created_at.eq."{created_at}",id.lt."{nota_id}")'
+    )
 
 
 class NotasService:
@@ -55,6 +171,20 @@ class NotasService:
     1. SessionManager verifica autenticación + timeout
     2. RLS en Supabase filtra por user_id
     
+    CACHÉ (ver src/services/cache.py):
+    - listar / listar_pagina / obtener / obtener_muchos / contar leen
+      primero de una caché por usuario (TTL + LRU por bytes)
+    - Toda escritura hecha por este servicio la actualiza o invalida
+    - Cambios hechos por OTROS clientes (u otros procesos del mismo
+      servidor) se ven al vencer el TTL (NOTAS_CACHE_TTL; 0 = sin
+      caché, el default)
+    - Lecturas idénticas concurrentes (mismo usuario, consulta y
+      parámetros) comparten UNA consulta en vuelo (single-flight)
+    - Stale-while-revalidate (NOTAS_CACHE_STALE > 0): listar /
+      listar_pagina / contar vencidos hace menos de esa gracia se
+      responden al instante y se refrescan en segundo plano;
+      ultima_lectura() dice la edad para avisarle al cliente
+    
     USO:
         notas = NotasService()
         todas = notas.listar()
@@ -69,8 +199,14 @@ class NotasService:
         - En MVP, siempre usamos Supabase real
         - Testing se haría con mocks a otro nivel
         """
+        settings = Settings()
         self._supabase = SupabaseClient()
         self._session = SessionManager()
+        self._cache = CacheNotas(
+            settings.notas_cache_ttl, settings.notas_cache_max_bytes, settings.notas_cache_stale,
+            disco=CacheDisco.compartida()
+        )
+        self._vuelos = SingleFlight()
     
     def _require_auth_and_update(self) -> str:
         """
@@ -92,11 +228,111 @@ class NotasService:
         self._session.update_activity()
         return self._session.get_user_id()
     
-    def listar(self) -> List[Nota]:
+    def _leer(self, user_id: str, clave: Tuple, consultar: Callable[[], Any]) -> Any:
+        """
+        Read-through: valor cacheado, o consultar() y guardarlo.
+        
+        En un miss, los hilos con la misma clave comparten la consulta.
+        La generación va en la clave del vuelo: quien llega después de
+        una escritura no se suma a una consulta que empezó antes.
+        
+        STALE-WHILE-REVALIDATE (solo listas, no notas sueltas): una
+        entrada vencida dentro de la gracia se retorna ya y un hilo la
+        refresca (uno solo por clave, aunque lleguen muchos requests).
+        """
+        lectura = self._cache.leer(user_id, clave, aceptar_vencida=clave[0] != CLAVE_NOTA)
+        _ultima_lectura.set(lectura)
+        if lectura is not None and not lectura.vencida:
+            return lectura.valor
+        
+        generacion = self._cache.generacion(user_id)
+        
+        def cargar() -> Any:
+            cargado = consultar()
+            self._cache.guardar(user_id, clave, cargado, generacion)
+            return cargado
+        
+        if lectura is not None:
+            self._vuelos.en_segundo_plano((user_id, generacion) + clave, cargar)
+            return lectura.valor
+        return self._vuelos.hacer((user_id, generacion) + clave, cargar)
+    
+    def ultima_lectura(self) -> Optional[Lectura]:
+        """
+        Cómo se resolvió la última lectura de ESTE request (hilo/tarea).
+        
+        RETORNA: Lectura(valor, edad, vencida) si salió de la caché,
+        None si fue a Supabase
+        """
+        return _ultima_lectura.get()
+    
+    @contextmanager
+    def _escritura(self, nota_ids: Iterable[str] = ()):
+        """
+        Envuelve una escritura a Supabase: al salir (aunque falle, porque
+        pudo aplicarse igual) invalida las listas y esas notas.
+        """
+        try:
+            yield
+        finally:
+            self._cache.invalidar(self._session.get_user_id(), nota_ids)
+    
+    def _recordar(self, filas: List[Dict[str, Any]]) -> None:
+        """Write-through: filas devueltas por INSERT/UPDATE -> caché."""
+        user_id = self._session.get_user_id()
+        for fila in filas:
+            self._cache.guardar(user_id, (CLAVE_NOTA, fila['id'], '*'), [fila])
+    
+    def estadisticas_cache(self) -> Dict[str, Any]:
+        """Contadores de la caché (hits, misses, evictions, bytes...) y coalesced."""
+        return {**self._cache.stats(), 'coalesced': self._vuelos.compartidas}
+    
+    def estadisticas_pool(self) -> Dict[str, Any]:
+        """Contadores del pool de clientes PostgREST por usuario."""
+        return self._supabase.pool.stats()
+    
+    def estadisticas_http(self) -> Dict[str, Any]:
+        """Contadores del pool de conexiones HTTP a Supabase."""
+        return self._supabase.estadisticas_http()
+    
+    def precalentar(self) -> Dict[str, Any]:
+        """Abre una conexión a Supabase sin consultar notas (ver /api/warm)."""
+        return self._supabase.precalentar()
+    
+    def _mapeador(self, campos: Campos) -> Callable[[Dict[str, Any]], Nota]:
+        """
+        Fila de PostgREST -> Nota (completa) o NotaParcial (con ?fields=).
+        
+        Las parciales cargan lo que falte con _cargar_campos.
+        """
+        if campos is None:
+            return Nota.from_dict
+        return partial(NotaParcial, cargador=self._cargar_campos)
+    
+    def _cargar_campos(self, nota_id: str, campos: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        Carga lazy de NotaParcial: trae solo las columnas faltantes.
+        
+        RETORNA: Fila con esas columnas ({} si la nota ya no existe)
+        """
+        self._require_auth_and_update()
+        
+        response = self._supabase.table('notas') \
+            .select(','.join(campos)) \
+            .eq('id', nota_id) \
+            .execute()
+        
+        return response.data[0] if response.data else {}
+    
+    def listar(self, campos: Campos = None) -> List[Nota]:
         """
         Lista todas las notas del usuario actual.
         
+        PARÁMETROS:
+        - campos: Columnas a traer (None = todas). Ej: 'id,title'
+        
         RETORNA: Lista de Nota ordenadas por created_at DESC
+        (NotaParcial si se pidieron campos)
         
         SEGURIDAD:
         - RLS filtra automáticamente por user_id
@@ -107,42 +343,149 @@ class NotasService:
         - HU-05: Ver mis notas
         - CA-05.4: Ordenadas por fecha
         """
-        self._require_auth_and_update()
+        user_id = self._require_auth_and_update()
+        mapear = self._mapeador(campos)
+        select = columnas_select(campos)
         
-        response = self._supabase.table('notas') \
-            .select('*') \
-            .order('created_at', desc=True) \
-            .execute()
+        filas = self._leer(user_id, ('listar', select), lambda: self._supabase.table('notas')
+                           .select(select)
+                           .order('created_at', desc=True)
+                           .execute().data or [])
         
-        return [Nota.from_dict(nota) for nota in response.data]
+        return [mapear(nota) for nota in filas]
     
-    def obtener(self, nota_id: str) -> Optional[Nota]:
+    def listar_pagina(
+        self,
+        limite: Optional[int] = None,
+        cursor: Optional[str] = None,
+        campos: Campos = None
+    ) -> Pagina:
+        """
+        Lista una página de notas (keyset pagination).
+        
+        PARÁMETROS:
+        - limite: Notas por página (None = NOTAS_PAGE_SIZE)
+        - cursor: next_cursor de la página anterior (None = primera)
+        - campos: Columnas a traer (None = todas); created_at se pide
+          siempre porque forma parte del cursor
+        
+        RETORNA: Pagina con items (Nota) y next_cursor
+        RAISES:
+        - PermissionError: Si no hay sesión
+        - ValueError: Si limite o cursor son inválidos
+        
+        ÍNDICE: idx_notas_user_created_id (user_id, created_at DESC, id DESC)
+        """
+        user_id = self._require_auth_and_update()
+        limite = limite_pagina(limite)
+        mapear = self._mapeador(campos)
+        select = columnas_select(campos, ('created_at',))
+        
+        def consultar() -> List[Dict[str, Any]]:
+            query = self._supabase.table('notas') \
+                .select(select) \
+                .order('created_at', desc=True) \
+                .order('id', desc=True) \
+                .limit(limite + 1)
+            
+            if cursor:
+                query = query.or_(filtro_cursor(cursor))
+            
+            return query.execute().data or []
+        
+        filas = self._leer(user_id, ('pagina', select, limite, cursor or ''), consultar)
+        return Pagina.desde_filas(filas, limite, mapear)
+    
+    def iterar_paginas(
+        self,
+        limite: Optional[int] = None,
+        cursor: Optional[str] = None,
+        campos: Campos = None
+    ) -> Iterator[Pagina]:
+        """
+        Recorre TODAS las notas página por página (generador).
+        
+        POR QUÉ GENERADOR:
+        - SÍ: Solo una página vive en memoria a la vez (streaming)
+        - SÍ: La página siguiente se pide recién cuando se consumió la actual
+        
+        IMPORTANTE: Como todo generador, no ejecuta nada hasta el primer
+        next(); los errores de sesión aparecen ahí.
+        """
+        while True:
+            pagina = self.listar_pagina(limite, cursor, campos)
+            yield pagina
+            if pagina.next_cursor is None:
+                return
+            cursor = pagina.next_cursor
+    
+    def obtener(self, nota_id: str, campos: Campos = None) -> Optional[Nota]:
         """
         Obtiene una nota por su ID.
         
         PARÁMETROS:
         - nota_id: UUID de la nota
+        - campos: Columnas a traer (None = todas)
         
         RETORNA: Nota o None si no existe
         
         SEGURIDAD:
         - RLS bloquea si no es propietario
         """
-        self._require_auth_and_update()
+        user_id = self._require_auth_and_update()
         
         if not nota_id:
             return None
         
-        response = self._supabase.table('notas') \
-            .select('*') \
-            .eq('id', nota_id) \
-            .execute()
+        select = columnas_select(campos)
+        filas = self._leer(user_id, (CLAVE_NOTA, nota_id, select), lambda: self._supabase
+                           .table('notas')
+                           .select(select)
+                           .eq('id', nota_id)
+                           .execute().data or [])
         
-        if response.data and len(response.data) > 0:
-            return Nota.from_dict(response.data[0])
+        if filas:
+            return self._mapeador(campos)(filas[0])
         
         return None
     
+    def obtener_muchos(
+        self,
+        ids: List[str],
+        campos: Campos = None
+    ) -> Tuple[List[Nota], List[str]]:
+        """
+        Obtiene varias notas por ID (SELECT ... id=in.(...)).
+        
+        PARÁMETROS:
+        - ids: UUIDs (los repetidos se ignoran)
+        - campos: Columnas a traer (None = todas)
+        
+        RETORNA: (notas en el orden de ids, ids no encontrados)
+        RAISES:
+        - PermissionError: Si no hay sesión
+        - ValueError: Si ids está vacío o supera NOTAS_BULK_MAX
+        
+        COSTO: Una consulta por trozo de NOTAS_IN_MAX_LENGTH caracteres
+        (una sola para listas normales), no una por ID; los IDs que ya
+        están en caché no viajan.
+        """
+        user_id = self._require_auth_and_update()
+        settings = Settings()
+        ids = validar_ids(ids, settings.notas_bulk_max)
+        select = columnas_select(campos)
+        
+        generacion = self._cache.generacion(user_id)
+        filas, pendientes = self._cache.buscar_notas(user_id, ids, select)
+        for trozo in trozos_de_ids(pendientes, settings.notas_in_max_length):
+            traidas = self._obtener_ids(trozo, select)
+            self._cache.guardar_notas(user_id, trozo, select, traidas, generacion)
+            filas.extend(traidas)
+        
+        encontradas, faltantes = ordenar_por_ids(ids, filas)
+        mapear = self._mapeador(campos)
+        return [mapear(fila) for fila in encontradas], faltantes
+    
     def crear(self, titulo: str, contenido: Optional[str] = None) -> Nota:
         """
         Crea una nueva nota.
@@ -172,15 +515,60 @@ class NotasService:
             content=contenido
         )
         
-        response = self._supabase.table('notas') \
-            .insert(nota.to_dict(include_id=False)) \
-            .execute()
+        with self._escritura():
+            response = self._supabase.table('notas') \
+                .insert(nota.to_dict(include_id=False)) \
+                .execute()
         
         if not response.data or len(response.data) == 0:
             raise RuntimeError("Error al crear la nota")
         
+        self._recordar(response.data)
         return Nota.from_dict(response.data[0])
     
+    def crear_muchos(
+        self,
+        notas: Iterable[Union[Nota, Dict[str, Any]]],
+        tamano_lote: Optional[int] = None
+    ) -> List[ResultadoOperacion]:
+        """
+        Crea muchas notas con INSERTs multi-fila.
+        
+        PARÁMETROS:
+        - notas: Nota o dict {title, content} (user_id sale de la sesión)
+        - tamano_lote: Filas por INSERT (None = NOTAS_BULK_CHUNK)
+        
+        RETORNA: Un ResultadoOperacion por nota, en el orden recibido
+        (201 + id, 400 si no pasó la validación, 500 si falló su trozo)
+        RAISES:
+        - PermissionError: Si no hay sesión
+        - ValueError: Si hay más de NOTAS_BULK_MAX notas o tamano_lote < 1
+        
+        FLUJO:
+        1. Validar TODAS las notas (ninguna viaja si es inválida)
+        2. Enviar las válidas en trozos: 1 request por trozo, no por nota
+        
+        IMPORTANTE: Cada trozo es atómico (un INSERT); el conjunto no.
+        """
+        user_id = self._require_auth_and_update()
+        settings = Settings()
+        notas = list(notas)
+        if len(notas) > settings.notas_bulk_max:
+            raise ValueError(f"Máximo {settings.notas_bulk_max} notas por carga")
+        tamano_lote = tamano_trozo(tamano_lote, settings.notas_bulk_chunk)
+        
+        validas, resultados = preparar_creaciones(notas)
+        for trozo in en_trozos(validas, tamano_lote):
+            try:
+                filas = self._insertar_filas(
+                    [{'user_id': user_id, **op.cambios} for op in trozo]
+                )
+                resultados.extend(resolver_grupo(trozo, filas))
+            except Exception as e:
+                resultados.extend(fallo_grupo(trozo, e))
+        
+        return sorted(resultados, key=lambda r: r.indice)
+    
     def actualizar(
         self, 
         nota_id: str, 
@@ -225,16 +613,77 @@ class NotasService:
             # Nada que actualizar, obtener y retornar existente
             return self.obtener(nota_id)
         
-        response = self._supabase.table('notas') \
-            .update(update_data) \
-            .eq('id', nota_id) \
-            .execute()
+        with self._escritura([nota_id]):
+            response = self._supabase.table('notas') \
+                .update(update_data) \
+                .eq('id', nota_id) \
+                .execute()
         
         if response.data and len(response.data) > 0:
+            self._recordar(response.data)
             return Nota.from_dict(response.data[0])
         
         return None
     
+    def eliminar_muchos(self, ids: List[str]) -> ResultadoMasivo:
+        """
+        Elimina un conjunto de notas (DELETE ... id=in.(...)).
+        
+        PARÁMETROS:
+        - ids: UUIDs (los repetidos se ignoran)
+        
+        RETORNA: ResultadoMasivo con afectados / no_encontrados / fallidos
+        RAISES:
+        - PermissionError: Si no hay sesión (se verifica UNA vez)
+        - ValueError: Si ids está vacío o supera NOTAS_BULK_MAX
+        
+        COSTO: Un request por trozo de NOTAS_IN_MAX_LENGTH caracteres
+        (~100 UUIDs con el default), no uno por nota.
+        """
+        self._require_auth_and_update()
+        return self._por_conjunto(ids, self._eliminar_ids)
+    
+    def actualizar_muchos(self, ids: List[str], cambios: Dict[str, Any]) -> ResultadoMasivo:
+        """
+        Aplica los mismos cambios a un conjunto de notas (PATCH ... id=in.(...)).
+        
+        PARÁMETROS:
+        - ids: UUIDs (los repetidos se ignoran)
+        - cambios: {'title': ..., 'content': ...} (alias titulo/contenido)
+        
+        RETORNA: ResultadoMasivo (igual que eliminar_muchos)
+        RAISES: PermissionError, ValueError (cambios o ids inválidos)
+        """
+        self._require_auth_and_update()
+        cambios = validar_cambios(cambios or {})
+        return self._por_conjunto(ids, lambda trozo: self._actualizar_ids(trozo, cambios))
+    
+    def _por_conjunto(
+        self,
+        ids: List[str],
+        ejecutar: Callable[[List[str]], List[Dict[str, Any]]]
+    ) -> ResultadoMasivo:
+        """
+        Ejecuta una operación por trozos de IDs.
+        
+        Un trozo fallido no detiene al resto (ya no es transaccional:
+        los trozos anteriores quedaron aplicados); sus IDs van a fallidos.
+        """
+        settings = Settings()
+        ids = validar_ids(ids, settings.notas_bulk_max)
+        afectados: List[str] = []
+        fallidos: List[str] = []
+        error = None
+        
+        for trozo in trozos_de_ids(ids, settings.notas_in_max_length):
+            try:
+                afectados.extend(fila['id'] for fila in ejecutar(trozo))
+            except Exception as e:
+                fallidos.extend(trozo)
+                error = str(e)
+        
+        return ResultadoMasivo.desde(ids, afectados, fallidos, error)
+    
     def eliminar(self, nota_id: str) -> bool:
         """
         Elimina una nota.
@@ -257,14 +706,85 @@ class NotasService:
         if not nota_id:
             raise ValueError("ID de nota es obligatorio")
         
-        response = self._supabase.table('notas') \
-            .delete() \
-            .eq('id', nota_id) \
-            .execute()
+        with self._escritura([nota_id]):
+            response = self._supabase.table('notas') \
+                .delete() \
+                .eq('id', nota_id) \
+                .execute()
         
         # Si se eliminó algo, data tendrá el registro eliminado
         return len(response.data) > 0 if response.data else False
     
+    def ejecutar_lote(self, operaciones: List[Dict[str, Any]]) -> List[ResultadoOperacion]:
+        """
+        Ejecuta una lista ordenada de operaciones create/update/delete/get.
+        
+        PARÁMETROS:
+        - operaciones: [{'op': 'create', 'title': ...}, {'op': 'delete', 'id': ...}, ...]
+        
+        RETORNA: Un ResultadoOperacion por operación, en el orden pedido
+        RAISES:
+        - PermissionError: Si no hay sesión (se verifica UNA vez por lote)
+        - ValueError: Si el lote no es una lista o supera NOTAS_BATCH_MAX
+        
+        COSTO: Una llamada a PostgREST por grupo de operaciones
+        consecutivas compatibles (ver src/models/lote.py)
+        
+        IMPORTANTE: No es transaccional; si un grupo falla, sus
+        operaciones reciben 500 y el resto del lote continúa.
+        """
+        user_id = self._require_auth_and_update()
+        settings = Settings()
+        validas, resultados = parsear_lote(operaciones, settings.notas_batch_max)
+        
+        for grupo in agrupar_lote(validas):
+            for llamada in subgrupos_lote(grupo, settings.notas_in_max_length):
+                try:
+                    filas = self._ejecutar_grupo(llamada, user_id)
+                    resultados.extend(resolver_grupo(llamada, filas))
+                except Exception as e:
+                    resultados.extend(fallo_grupo(llamada, e))
+        
+        return sorted(resultados, key=lambda r: r.indice)
+    
+    def _ejecutar_grupo(self, grupo, user_id: str) -> List[Dict[str, Any]]:
+        """Una llamada a PostgREST para un grupo del lote."""
+        tipo = grupo[0].op
+        if tipo == 'create':
+            return self._insertar_filas([{'user_id': user_id, **op.cambios} for op in grupo])
+        
+        ids = [op.id for op in grupo]
+        if tipo == 'get':
+            return self._obtener_ids(ids)
+        if tipo == 'delete':
+            return self._eliminar_ids(ids)
+        return self._actualizar_ids(ids, grupo[0].cambios)
+    
+    def _insertar_filas(self, filas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """INSERT de varias filas (PostgREST las devuelve en el mismo orden)."""
+        with self._escritura():
+            response = self._supabase.table('notas').insert(filas).execute()
+        self._recordar(response.data or [])
+        return response.data or []
+    
+    def _obtener_ids(self, ids: List[str], select: str = '*') -> List[Dict[str, Any]]:
+        """SELECT ... WHERE id IN (ids)."""
+        response = self._supabase.table('notas').select(select).in_('id', ids).execute()
+        return response.data or []
+    
+    def _eliminar_ids(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """DELETE ... WHERE id IN (ids); retorna las filas eliminadas."""
+        with self._escritura(ids):
+            response = self._supabase.table('notas').delete().in_('id', ids).execute()
+        return response.data or []
+    
+    def _actualizar_ids(self, ids: List[str], cambios: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """UPDATE ... SET cambios WHERE id IN (ids); retorna las filas."""
+        with self._escritura(ids):
+            response = self._supabase.table('notas').update(cambios).in_('id', ids).execute()
+        self._recordar(response.data or [])
+        return response.data or []
+    
     def contar(self) -> int:
         """
         Cuenta las notas del usuario actual.
@@ -273,13 +793,11 @@ class NotasService:
         
         ÚTIL PARA: Mostrar estadísticas en UI
         """
-        self._require_auth_and_update()
-        
-        response = self._supabase.table('notas') \
-            .select('id', count='exact') \
-            .execute()
+        user_id = self._require_auth_and_update()
         
-        return response.count or 0
+        return self._leer(user_id, ('contar',), lambda: self._supabase.table('notas')
+                          .select('id', count='exact')
+                          .execute().count or 0)
 
 
 # ============================================================================
@@ -310,7 +828,7 @@ if __name__ == "__main__":
         print("✅ Dependencias inicializadas")
         
         # Test 3: Métodos existen
-        methods = ['listar', 'obtener', 'crear', 'actualizar', 'eliminar', 'contar']
+        methods = ['listar', 'listar_pagina', 'obtener', 'crear', 'actualizar', 'eliminar', 'contar']
         for method in methods:
             assert hasattr(notas, method), f"Método {method} no existe"
         print(f"✅ Métodos CRUD disponibles: {methods}")
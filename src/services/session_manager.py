@@ -22,13 +22,24 @@ POR QUÉ SINGLETON:
 
 ARQUITECTURA STATELESS (SERVERLESS):
 - IMPORTANTE: En Vercel, cada request es independiente
-- Este SessionManager es para CLI/local
-- En serverless, la sesión viene del JWT en el header
+- El estado de este Singleton es para CLI/local
+- En la API, la sesión viene del JWT en el header: si el request
+  actual tiene un ContextoAuth (src/models/contexto.py), TODAS las
+  consultas de abajo responden con él y no tocan el estado compartido
+
+MUCHOS USUARIOS (API):
+- El timeout de inactividad de cada JWT se lleva en una TablaSesiones
+  (src/services/tabla_sesiones.py) por su claim session_id: misma
+  regla de 15 minutos, sin un Lock global y con verificación O(1)
+- La tabla es del proceso: otra instancia (cold start, otro worker)
+  empieza a contar la inactividad desde el primer request que ve
 ============================================================================
 """
 
 import sys
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -39,6 +50,8 @@ if _root_dir not in sys.path:
 
 from src.config.settings import Settings
 from src.models.user import User
+from src.models.contexto import ContextoAuth, contexto_actual
+from src.services.tabla_sesiones import TablaSesiones
 
 
 class SessionManager:
@@ -62,18 +75,23 @@ class SessionManager:
     
     _instance: Optional['SessionManager'] = None
     _initialized: bool = False
+    _lock = threading.Lock()
     
     def __new__(cls) -> 'SessionManager':
         """Implementación del patrón Singleton."""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
     
     def __init__(self) -> None:
         """Inicializa la sesión (solo la primera vez)."""
         if not SessionManager._initialized:
-            self._initialize()
-            SessionManager._initialized = True
+            with SessionManager._lock:  # Doble chequeo: el pool de workers llega en paralelo
+                if not SessionManager._initialized:
+                    self._initialize()
+                    SessionManager._initialized = True
     
     def _initialize(self) -> None:
         """
@@ -89,6 +107,9 @@ class SessionManager:
         # Cargar timeout desde configuración
         settings = Settings()
         self._timeout_seconds: int = settings.session_timeout_seconds
+        self._sesiones = TablaSesiones(
+            settings.session_timeout_seconds, shards=settings.session_table_shards
+        )
     
     def set_session(
         self, 
@@ -116,7 +137,15 @@ class SessionManager:
         Limpia la sesión (logout).
         
         SEGURIDAD: Elimina todos los datos sensibles de memoria
+        
+        Con ContextoAuth cierra SOLO la sesión de ese JWT: el token queda
+        rechazado hasta su exp (en este proceso).
         """
+        contexto = contexto_actual()
+        if contexto is not None:
+            if contexto.session_id:
+                self._sesiones.cerrar(contexto.session_id, _vida(contexto))
+            return
         self._current_user = None
         self._access_token = None
         self._refresh_token = None
@@ -128,8 +157,15 @@ class SessionManager:
         
         LLAMAR: Después de cada acción del usuario
         POR QUÉ: Resetea el contador de 15 minutos
+        
+        Con ContextoAuth: actividad de su sesión en la tabla (las
+        escrituras se agrupan, ver TablaSesiones.tocar).
         """
-        self._last_activity = datetime.now()
+        contexto = contexto_actual()
+        if contexto is None:
+            self._last_activity = datetime.now()
+        elif contexto.session_id:
+            self._tocar(contexto)
     
     def is_authenticated(self) -> bool:
         """
@@ -138,6 +174,8 @@ class SessionManager:
         IMPORTANTE: No verifica el timeout, solo si hay usuario
         Para verificación completa, usar is_session_valid()
         """
+        if contexto_actual() is not None:
+            return True
         return self._current_user is not None
     
     def is_session_valid(self) -> bool:
@@ -151,6 +189,10 @@ class SessionManager:
         
         RETORNA: True si la sesión es válida, False si expiró o no existe
         """
+        contexto = contexto_actual()
+        if contexto is not None:
+            return contexto.vigente and self._restante_inactividad(contexto) > 0
+        
         if not self.is_authenticated():
             return False
         
@@ -171,6 +213,10 @@ class SessionManager:
         - Segundos restantes si hay sesión activa
         - 0 si no hay sesión o ya expiró
         """
+        contexto = contexto_actual()
+        if contexto is not None:
+            return max(0, int(min(_vida(contexto), self._restante_inactividad(contexto))))
+        
         if not self.is_authenticated() or self._last_activity is None:
             return 0
         
@@ -196,6 +242,17 @@ class SessionManager:
         RAISES:
             PermissionError: Si no hay sesión válida (incluye razón)
         """
+        contexto = contexto_actual()
+        if contexto is not None:
+            if not contexto.vigente:
+                raise PermissionError("Sesión expirada. Debe iniciar sesión nuevamente.")
+            if contexto.session_id and not self._tocar(contexto):
+                raise PermissionError(
+                    "Sesión expirada por inactividad (15 minutos). "
+                    "Debe iniciar sesión nuevamente."
+                )
+            return
+        
         if not self.is_authenticated():
             raise PermissionError(
                 "No autenticado. Debe iniciar sesión primero."
@@ -211,11 +268,17 @@ class SessionManager:
     @property
     def current_user(self) -> Optional[User]:
         """Usuario actualmente autenticado (o None)."""
+        contexto = contexto_actual()
+        if contexto is not None:
+            return contexto.user
         return self._current_user
     
     @property
     def access_token(self) -> Optional[str]:
         """Token de acceso actual (o None)."""
+        contexto = contexto_actual()
+        if contexto is not None:
+            return contexto.access_token
         return self._access_token
     
     def get_user_id(self) -> Optional[str]:
@@ -224,9 +287,31 @@ class SessionManager:
         
         RETORNA: UUID del usuario o None si no autenticado
         """
-        if self._current_user:
-            return self._current_user.id
+        user = self.current_user
+        if user:
+            return user.id
         return None
+    
+    @property
+    def sesiones(self) -> TablaSesiones:
+        """Tabla de sesiones de la API (stats para /api/health)."""
+        return self._sesiones
+    
+    def _tocar(self, contexto: ContextoAuth) -> bool:
+        """Actividad de la sesión del JWT (False = cerrada o inactiva)."""
+        return self._sesiones.tocar(contexto.session_id, contexto.user.id, _vida(contexto))
+    
+    def _restante_inactividad(self, contexto: ContextoAuth) -> float:
+        """Segundos de inactividad restantes (timeout completo si no se vio)."""
+        if not contexto.session_id:
+            return self._timeout_seconds
+        restante = self._sesiones.restante(contexto.session_id)
+        return self._timeout_seconds if restante is None else restante
+
+
+def _vida(contexto: ContextoAuth) -> float:
+    """Segundos hasta el exp del JWT."""
+    return contexto.expira - time.time()
 
 
 # ============================================================================
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+SINGLE_FLIGHT.PY - Una sola consulta en vuelo por clave
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVICES
+Patrón: Single-flight (request coalescing)
+Fecha: 2025-12-24
+
+PROBLEMA:
+- Con un servidor concurrente, varias pestañas del mismo usuario piden
+  GET /api/notas a la vez: la caché está vacía (o vencida) para todas y
+  cada una dispara el MISMO listar() contra Supabase
+
+SOLUCIÓN:
+- La primera llamada con una clave (usuario + consulta + parámetros)
+  ejecuta la consulta; las que llegan mientras está en vuelo esperan y
+  reciben el mismo resultado (o la misma excepción)
+- Al terminar, la clave se libera: la siguiente llamada consulta de nuevo
+  (o encuentra el resultado en la caché)
+- en_segundo_plano(): inicia el vuelo sin esperarlo (refresco de
+  stale-while-revalidate); si ya hay uno en curso, no hace nada
+
+VARIANTES:
+- SingleFlight: hilos (servidor threaded / prefork)
+- AsyncSingleFlight: tareas asyncio (servidor async); la consulta corre
+  en su propia tarea, así que cancelar al que la inició no la cancela
+  para los demás
+
+IMPORTANTE: Todos los que comparten un vuelo reciben el MISMO objeto;
+NotasService comparte filas crudas y cada uno arma sus propias Nota.
+============================================================================
+"""
+
+import sys
+import os
+import asyncio
+import contextvars
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+class _Vuelo:
+    """Consulta en curso: los que esperan se bloquean en `listo`."""
+
+    __slots__ = ('listo', 'resultado', 'error')
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalescencia de llamadas concurrentes entre hilos.
+
+    USO:
+        vuelos = SingleFlight()
+        filas = vuelos.hacer(('user-1', 'listar', '*'), consultar)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._vuelos: Dict[Hashable, _Vuelo] = {}
+        self.compartidas = 0  # Llamadas que se ahorraron la consulta
+
+    def hacer(self, clave: Hashable, funcion: Callable[[], Any]) -> Any:
+        """
+        Ejecuta funcion() o espera la que ya está en vuelo con esa clave.
+
+        RAISES: Lo que lance funcion() (a todos los que esperaban)
+        """
+        with self._lock:
+            vuelo = self._vuelos.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._vuelos[clave] = _Vuelo()
+            else:
+                self.compartidas += 1
+
+        if lider:
+            self._ejecutar(clave, vuelo, funcion)
+        else:
+            vuelo.listo.wait()
+        if vuelo.error is not None:
+            raise vuelo.error
+        return vuelo.resultado
+
+    def en_segundo_plano(self, clave: Hashable, funcion: Callable[[], Any]) -> bool:
+        """
+        Ejecuta funcion() en un hilo daemon, salvo que la clave ya esté
+        en vuelo. Los errores quedan en el vuelo (no se propagan).
+
+        RETORNA: True si inició un vuelo nuevo
+
+        POR QUÉ copy_context: El hilo ve las ContextVar del request que
+        lo inició (ej: el usuario autenticado).
+        """
+        with self._lock:
+            if clave in self._vuelos:
+                return False
+            vuelo = self._vuelos[clave] = _Vuelo()
+        threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self._ejecutar, clave, vuelo, funcion),
+            daemon=True
+        ).start()
+        return True
+
+    def _ejecutar(self, clave: Hashable, vuelo: _Vuelo, funcion: Callable[[], Any]) -> None:
+        """Corre la consulta del líder y despierta a los que esperan."""
+        try:
+            vuelo.resultado = funcion()
+        except BaseException as e:
+            vuelo.error = e
+        finally:
+            with self._lock:
+                del self._vuelos[clave]
+            vuelo.listo.set()
+
+
+class AsyncSingleFlight:
+    """
+    Coalescencia de llamadas concurrentes entre tareas asyncio.
+
+    USO:
+        vuelos = AsyncSingleFlight()
+        filas = await vuelos.hacer(('user-1', 'listar', '*'), consultar)
+
+    NOTA: Sin Lock: entre el get y el set del dict no hay await, así que
+    ninguna otra tarea puede intercalarse.
+    """
+
+    def __init__(self):
+        self._vuelos: Dict[Hashable, 'asyncio.Future[Any]'] = {}
+        self.compartidas = 0
+
+    async def hacer(self, clave: Hashable, funcion: Callable[[], Awaitable[Any]]) -> Any:
+        """await funcion() una sola vez por clave en vuelo."""
+        tarea = self._vuelos.get(clave)
+        if tarea is None:
+            tarea = asyncio.ensure_future(funcion())
+            self._vuelos[clave] = tarea
+            tarea.add_done_callback(lambda t: self._terminar(clave, t))
+        else:
+            self.compartidas += 1
+        # shield: si ESTA llamada se cancela, la consulta sigue para el resto
+        return await asyncio.shield(tarea)
+
+    def en_segundo_plano(self, clave: Hashable, funcion: Callable[[], Awaitable[Any]]) -> bool:
+        """Inicia la tarea sin esperarla (salvo que ya esté en vuelo)."""
+        if clave in self._vuelos:
+            return False
+        tarea = asyncio.ensure_future(funcion())
+        self._vuelos[clave] = tarea
+        tarea.add_done_callback(lambda t: self._terminar(clave, t))
+        return True
+
+    def _terminar(self, clave: Hashable, tarea: 'asyncio.Future[Any]') -> None:
+        """Libera la clave; marca la excepción como leída (sin warnings)."""
+        if self._vuelos.get(clave) is tarea:
+            del self._vuelos[clave]
+        if not tarea.cancelled():
+            tarea.exception()
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para SingleFlight / AsyncSingleFlight.
+
+    EJECUCIÓN:
+        python src/services/single_flight.py
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: Single-flight")
+    print("=" * 60)
+
+    llamadas = []
+
+    def consultar():
+        llamadas.append(1)
+        time.sleep(0.05)
+        return ['fila']
+
+    vuelos = SingleFlight()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        resultados = list(pool.map(lambda _: vuelos.hacer('k', consultar), range(8)))
+    print(f"✅ Hilos: 8 llamadas, {len(llamadas)} consulta(s), "
+          f"{vuelos.compartidas} compartidas")
+
+    async def _main():
+        async def consultar_async():
+            llamadas.append(1)
+            await asyncio.sleep(0.05)
+            return ['fila']
+
+        vuelos_async = AsyncSingleFlight()
+        llamadas.clear()
+        await asyncio.gather(*(vuelos_async.hacer('k', consultar_async) for _ in range(8)))
+        print(f"✅ asyncio: 8 llamadas, {len(llamadas)} consulta(s)")
+
+    asyncio.run(_main())
+    print("=" * 60)
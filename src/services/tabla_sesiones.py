@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+TABLA_SESIONES.PY - Sesiones de muchos usuarios con timeout de inactividad
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: SERVICES
+Patrón: Lock striping (shards) + Hashed timer wheel
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: AUTH
+- Requisitos: RF-04 (Protección), RNF (Timeout 15 min de inactividad)
+
+PROBLEMA:
+- SessionManager guarda UN usuario: el timeout de 15 minutos solo
+  existe para el CLI; en la API el JWT vale 1 hora sin importar la
+  inactividad, y un logout no lo invalida
+- Un dict con un solo Lock serializa a todos los requests concurrentes
+
+SOLUCIÓN:
+- Tabla session_id -> sesión, repartida en `shards` (cada uno con su
+  Lock y su dict): dos requests solo compiten si caen en el mismo shard
+- Verificar es O(1): una búsqueda y una resta (reloj monotónico)
+- El vencimiento (liberar memoria) lo hace una rueda de tiempos por
+  shard: `ranuras` conjuntos indexados por tick % ranuras; avanzar la
+  rueda solo mira las ranuras de los ticks que pasaron
+- Escrituras de actividad agrupadas: tocar() no escribe si la última
+  actividad es de hace menos de `resolucion` s, y NUNCA mueve la
+  sesión en la rueda (la ranura se corrige recién cuando le toca)
+
+POR QUÉ LA RUEDA NO DECIDE SI UNA SESIÓN VALE:
+- SÍ: valida/tocar comparan con la hora exacta; la rueda solo limpia,
+  así que un tick de atraso nunca deja pasar una sesión vencida
+- NO alternativa (heap de vencimientos): O(log n) por actividad y
+  reordenar en cada tocar()
+
+SESIONES CERRADAS (logout o inactividad):
+- Quedan como "lápida" hasta que vence el token (`vida`): si se
+  borraran, el mismo JWT volvería a abrir la sesión en el request
+  siguiente
+============================================================================
+"""
+
+import sys
+import os
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Set
+
+# Agregar directorio raíz al path para permitir ejecución directa
+_root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+
+class _Sesion:
+    """Entrada de la tabla (slots: 100k sesiones sin un dict por sesión)."""
+
+    __slots__ = ('user_id', 'actividad', 'hasta', 'cerrada', 'ranura')
+
+    def __init__(self, user_id: str, actividad: float, hasta: float):
+        self.user_id = user_id
+        self.actividad = actividad  # Última actividad (reloj de la tabla)
+        self.hasta = hasta          # Vence el token: se puede olvidar
+        self.cerrada = False
+        self.ranura = -1
+
+
+class _Shard:
+    """Un Lock, sus sesiones, su rueda de tiempos y sus contadores."""
+
+    __slots__ = ('lock', 'sesiones', 'ranuras', 'tick', 'agrupadas', 'vencidas')
+
+    def __init__(self, ranuras: int, tick: int):
+        self.lock = threading.Lock()
+        self.sesiones: Dict[str, _Sesion] = {}
+        self.ranuras: List[Set[str]] = [set() for _ in range(ranuras)]
+        self.tick = tick
+        self.agrupadas = 0   # Actividades que no necesitaron escribir
+        self.vencidas = 0    # Sesiones cerradas por inactividad
+
+
+class TablaSesiones:
+    """
+    Sesiones concurrentes por ID con timeout de inactividad.
+
+    PARÁMETROS:
+    - timeout: Segundos de inactividad permitidos (SESSION_TIMEOUT_SECONDS)
+    - shards: Cantidad de Locks/dicts independientes
+    - resolucion: Segundos por tick de la rueda (y ventana en la que
+      las actividades de una sesión se agrupan en una escritura)
+    - ranuras: Ranuras de la rueda de cada shard
+    - reloj: Fuente de tiempo monotónica (inyectable para tests)
+
+    THREAD-SAFE: Cada operación toma solo el Lock de su shard.
+
+    USO:
+        tabla = TablaSesiones(timeout=900)
+        tabla.tocar('sid', 'user-1', vida=3600)   # True = sesión activa
+        tabla.restante('sid')                     # segundos (None = no existe)
+        tabla.cerrar('sid')                       # logout
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        shards: int = 16,
+        resolucion: float = 1.0,
+        ranuras: int = 256,
+        reloj: Callable[[], float] = time.monotonic
+    ):
+        self.timeout = timeout
+        self.resolucion = resolucion
+        self._reloj = reloj
+        tick = self._tick(reloj())
+        self._shards = [_Shard(ranuras, tick) for _ in range(max(1, shards))]
+        self._ranuras = ranuras
+
+    def tocar(self, session_id: str, user_id: str, vida: float) -> bool:
+        """
+        Registra actividad; abre la sesión si no existe.
+
+        PARÁMETROS:
+        - vida: Segundos que le quedan al token (la lápida dura eso)
+
+        RETORNA: False si la sesión está cerrada, venció por inactividad
+        o pertenece a otro usuario
+        """
+        shard = self._shard(session_id)
+        ahora = self._reloj()
+        with shard.lock:
+            self._avanzar(shard, ahora)
+            sesion = shard.sesiones.get(session_id)
+            if sesion is None:
+                sesion = _Sesion(user_id, ahora, ahora + max(vida, 0))
+                shard.sesiones[session_id] = sesion
+                self._programar(shard, session_id, sesion)
+                return True
+            if sesion.cerrada or sesion.user_id != user_id:
+                return False
+            if ahora - sesion.actividad >= self.timeout:
+                self._cerrar(shard, session_id, sesion)
+                shard.vencidas += 1
+                return False
+            if ahora - sesion.actividad < self.resolucion:
+                shard.agrupadas += 1
+            else:
+                sesion.actividad = ahora
+            return True
+
+    def restante(self, session_id: str) -> Optional[float]:
+        """
+        Segundos de inactividad que le quedan a la sesión.
+
+        RETORNA: None si no existe, 0 si está cerrada o vencida
+        """
+        shard = self._shard(session_id)
+        with shard.lock:
+            sesion = shard.sesiones.get(session_id)
+            if sesion is None:
+                return None
+            if sesion.cerrada:
+                return 0
+            return max(0.0, self.timeout - (self._reloj() - sesion.actividad))
+
+    def cerrar(self, session_id: str, vida: float = 0) -> None:
+        """Logout: la sesión queda cerrada (lápida) al menos `vida` s."""
+        shard = self._shard(session_id)
+        ahora = self._reloj()
+        with shard.lock:
+            sesion = shard.sesiones.get(session_id)
+            if sesion is None:
+                sesion = _Sesion('', ahora, ahora)
+                shard.sesiones[session_id] = sesion
+            sesion.hasta = max(sesion.hasta, ahora + vida)
+            self._cerrar(shard, session_id, sesion)
+
+    def purgar(self) -> None:
+        """Avanza la rueda de todos los shards (libera lo vencido)."""
+        ahora = self._reloj()
+        for shard in self._shards:
+            with shard.lock:
+                self._avanzar(shard, ahora)
+
+    def __len__(self) -> int:
+        return sum(len(shard.sesiones) for shard in self._shards)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores para diagnóstico (/api/health)."""
+        return {
+            'sessions': len(self),
+            'shards': len(self._shards),
+            'expired': sum(shard.vencidas for shard in self._shards),
+            'coalesced': sum(shard.agrupadas for shard in self._shards)
+        }
+
+    # ------------------------------------------------------------------
+    # Internos (con el Lock del shard tomado)
+    # ------------------------------------------------------------------
+
+    def _shard(self, session_id: str) -> _Shard:
+        """crc32 y no hash(): estable entre procesos (PYTHONHASHSEED)."""
+        return self._shards[zlib.crc32(session_id.encode('utf-8')) % len(self._shards)]
+
+    def _tick(self, instante: float) -> int:
+        return int(instante // self.resolucion)
+
+    def _vencimiento(self, sesion: _Sesion) -> float:
+        """Cuándo hay que volver a mirar la sesión."""
+        if sesion.cerrada:
+            return sesion.hasta
+        return sesion.actividad + self.timeout
+
+    def _programar(self, shard: _Shard, session_id: str, sesion: _Sesion) -> None:
+        """Ubica la sesión en la ranura de su vencimiento."""
+        ranura = max(self._tick(self._vencimiento(sesion)), shard.tick + 1) % self._ranuras
+        if ranura != sesion.ranura:
+            if sesion.ranura >= 0:
+                shard.ranuras[sesion.ranura].discard(session_id)
+            shard.ranuras[ranura].add(session_id)
+            sesion.ranura = ranura
+
+    def _cerrar(self, shard: _Shard, session_id: str, sesion: _Sesion) -> None:
+        sesion.cerrada = True
+        self._programar(shard, session_id, sesion)
+
+    def _avanzar(self, shard: _Shard, ahora: float) -> None:
+        """
+        Procesa las ranuras de los ticks transcurridos.
+
+        Cada sesión de la ranura: si todavía no vence (otra vuelta de la
+        rueda, o tuvo actividad), se reprograma; si venció por
+        inactividad pasa a lápida; si es una lápida vencida, se borra.
+        """
+        tick = self._tick(ahora)
+        pasos = min(tick - shard.tick, self._ranuras)
+        for paso in range(pasos, 0, -1):
+            ranura = shard.ranuras[(tick - paso + 1) % self._ranuras]
+            for session_id in list(ranura):
+                sesion = shard.sesiones[session_id]
+                if self._tick(self._vencimiento(sesion)) > tick:
+                    self._programar(shard, session_id, sesion)
+                elif not sesion.cerrada:
+                    self._cerrar(shard, session_id, sesion)
+                    shard.vencidas += 1
+                    if self._tick(sesion.hasta) <= tick:
+                        self._olvidar(shard, session_id, sesion)
+                else:
+                    self._olvidar(shard, session_id, sesion)
+        shard.tick = max(shard.tick, tick)
+
+    def _olvidar(self, shard: _Shard, session_id: str, sesion: _Sesion) -> None:
+        shard.ranuras[sesion.ranura].discard(session_id)
+        del shard.sesiones[session_id]
+
+
+# ============================================================================
+# PRUEBA ATÓMICA - Bloque obligatorio
+# ============================================================================
+if __name__ == "__main__":
+    """
+    Prueba de fuego para TablaSesiones.
+
+    EJECUCIÓN:
+        python src/services/tabla_sesiones.py
+    """
+    print("=" * 60)
+    print("PRUEBA DE FUEGO: TablaSesiones")
+    print("=" * 60)
+
+    ahora = [0.0]
+    tabla = TablaSesiones(timeout=900, reloj=lambda: ahora[0])
+
+    assert tabla.tocar('s1', 'u1', vida=3600)
+    assert not tabla.tocar('s1', 'otro', vida=3600)
+    print(f"✅ Sesión abierta: {tabla.restante('s1'):.0f}s restantes")
+
+    ahora[0] = 899
+    assert tabla.tocar('s1', 'u1', vida=3600)
+    ahora[0] = 899 + 901
+    assert not tabla.tocar('s1', 'u1', vida=3600)
+    print("✅ Actividad renueva; 15 min sin actividad la cierran")
+
+    ahora[0] = 4000
+    tabla.purgar()
+    assert len(tabla) == 0
+    print(f"✅ La rueda libera las lápidas vencidas: {tabla.stats()}")
+
+    inicio = time.perf_counter()
+    grande = TablaSesiones(timeout=900)
+    for i in range(100_000):
+        grande.tocar(f's{i}', f'u{i}', vida=3600)
+    print(f"✅ 100k sesiones en {time.perf_counter() - inicio:.2f}s")
+    print("=" * 60)
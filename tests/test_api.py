@@ -65,6 +65,113 @@ class TestVercelBridge:
         assert data['status'] == 'ok'
         assert 'CRUD' in data['message']
     
+    @pytest.mark.unit
+    def test_health_check_reports_cache_stats(self, bridge):
+        """Test: Con el servicio de notas creado, health incluye la caché."""
+        assert 'cache' not in bridge.handle_request('GET', '/api/health', {})[1]
+        bridge.notas.listar  # Crea el servicio
+        
+        status, data = bridge.handle_request('GET', '/api/health', {})
+        
+        assert status == 200
+        assert {'hits', 'misses', 'bytes'} <= set(data['cache'])
+    
+    @pytest.mark.unit
+    def test_warm_opens_connection_without_auth(self, bridge):
+        """Test: GET /api/warm precalienta sin login ni cache de CDN."""
+        bridge._notas = Mock()
+        bridge._notas.precalentar.return_value = {'ok': True, 'status': 200, 'ms': 3.0}
+        
+        status, data, headers = bridge.dispatch('GET', '/api/warm', {})
+        
+        assert status == 200
+        assert (data['status'], data['cold']) == ('warm', False)
+        assert data['supabase']['status'] == 200
+        assert headers['Cache-Control'] == 'no-store'
+    
+    @pytest.mark.unit
+    def test_warm_reports_unreachable_supabase(self, bridge):
+        """Test: Si Supabase no responde, /api/warm retorna 503."""
+        bridge._notas = Mock()
+        bridge._notas.precalentar.side_effect = ConnectionError('sin red')
+        
+        status, data = bridge.handle_request('GET', '/api/warm', {})
+        
+        assert status == 503
+        assert data['supabase'] == {'ok': False, 'error': 'sin red'}
+    
+    @pytest.mark.unit
+    def test_background_warmup_creates_client_once(self, bridge):
+        """Test: El primer request espera al hilo de precalentamiento."""
+        import threading
+        import time
+        hilos = []
+        
+        def _crear():
+            hilos.append(threading.current_thread().name)
+            time.sleep(0.05)
+            servicio = Mock()
+            servicio.precalentar.return_value = {'ok': True}
+            return servicio
+        
+        with patch('src.services.notas_service.NotasService', side_effect=_crear):
+            bridge.precalentar_en_segundo_plano()
+            notas = bridge.notas
+        
+        assert hilos == ['precalentar']
+        notas.precalentar.assert_called_once()
+    
+    @pytest.mark.unit
+    def test_local_servers_serve_the_warmed_bridge(self, mock_env_vars):
+        """Test: RequestHandler usa el bridge que precalientan __main__/post_fork."""
+        import threading
+        import time
+        import api.index as api
+        hilos = []
+        
+        def _crear():
+            hilos.append(threading.current_thread().name)
+            time.sleep(0.05)
+            return Mock()
+        
+        with patch.object(api._bridge, '_notas', None), \
+                patch.object(api._bridge, '_calentamiento', None), \
+                patch('src.services.notas_service.NotasService', side_effect=_crear):
+            api._bridge.precalentar_en_segundo_plano()
+            api.RequestHandler.bridge.notas
+        
+        assert api.RequestHandler.bridge is api._bridge
+        assert hilos == ['precalentar']
+    
+    @pytest.mark.unit
+    def test_concurrent_first_requests_share_one_service(self, bridge):
+        """Test: Workers que piden notas a la vez reciben el MISMO NotasService."""
+        import threading
+        import time
+        creados = []
+        
+        def _crear():
+            time.sleep(0.05)  # Ensancha la ventana de carrera
+            creados.append(Mock())
+            return creados[-1]
+        
+        barrera = threading.Barrier(8)
+        vistos = []
+        
+        def _pedir():
+            barrera.wait()
+            vistos.append(bridge.notas)
+        
+        with patch('src.services.notas_service.NotasService', side_effect=_crear):
+            hilos = [threading.Thread(target=_pedir) for _ in range(8)]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+        
+        assert len(creados) == 1
+        assert all(v is creados[0] for v in vistos)
+    
     @pytest.mark.unit
     def test_health_check_root(self, bridge):
         """Test: GET / también retorna health check."""
@@ -178,12 +285,938 @@ class TestVercelBridge:
         
         assert status == 200
         assert data['success'] == True
+    
+    @pytest.mark.unit
+    def test_path_param_routes_to_handler(self, bridge):
+        """Test: /api/notas/{id} pasa el id del path al servicio."""
+        from src.models.nota import Nota
+        bridge._notas = Mock()
+        bridge._notas.obtener.return_value = Nota(id='n1', user_id='u', title='T')
+        bridge._notas.eliminar.return_value = True
+        
+        status, data = bridge.handle_request('GET', '/api/notas/n1', {})
+        assert status == 200
+        assert data['data']['id'] == 'n1'
+        bridge._notas.obtener.assert_called_once_with('n1', None)
+        
+        status, _ = bridge.handle_request('DELETE', '/api/notas/n1/', {})
+        assert status == 200
+        bridge._notas.eliminar.assert_called_once_with('n1')
+    
+    @pytest.mark.unit
+    def test_listar_returns_next_cursor(self, bridge):
+        """Test: GET /api/notas?limit=&cursor= pagina y expone next_cursor."""
+        from src.models.nota import Nota
+        from src.models.pagina import Pagina
+        bridge._notas = Mock()
+        bridge._notas.listar_pagina.return_value = Pagina(
+            items=[Nota(id='n1', user_id='u', title='T')], next_cursor='abc'
+        )
+        bridge._notas.ultima_lectura.return_value = None  # Fue a Supabase
+        
+        status, data = bridge.handle_request(
+            'GET', '/api/notas', {'limit': ['1'], 'cursor': ['xyz']}
+        )
+        
+        assert status == 200
+        assert data['count'] == 1
+        assert data['next_cursor'] == 'abc'
+        bridge._notas.listar_pagina.assert_called_once_with(1, 'xyz', None)
+    
+    @pytest.mark.unit
+    def test_fields_projection_reaches_service(self, bridge):
+        """Test: ?fields= llega al servicio y solo esos campos se serializan."""
+        from src.models.nota import NotaParcial
+        from src.models.pagina import Pagina
+        bridge._notas = Mock()
+        bridge._notas.listar_pagina.return_value = Pagina(
+            items=[NotaParcial({'id': 'n1', 'created_at': '2024-01-15T10:30:00+00:00'})]
+        )
+        bridge._notas.ultima_lectura.return_value = None  # Fue a Supabase
+        
+        status, data = bridge.handle_request('GET', '/api/notas', {'fields': ['created_at']})
+        
+        assert status == 200
+        assert data['data'] == [{'created_at': '2024-01-15T10:30:00+00:00', 'id': 'n1'}]
+        assert bridge._notas.listar_pagina.call_args[0][2] == 'created_at'
+    
+    @pytest.mark.unit
+    def test_listar_stale_adds_age_header_and_flag(self, bridge):
+        """Test: Una página vencida servida de la caché lleva Age + stale/age."""
+        from src.models.pagina import Pagina
+        from src.services.cache import Lectura
+        bridge._notas = Mock()
+        bridge._notas.listar_pagina.return_value = Pagina()
+        bridge._notas.ultima_lectura.return_value = Lectura([], 42.7, True)
+        
+        status, data, headers = bridge.dispatch('GET', '/api/notas', {})
+        
+        assert status == 200
+        assert data['stale'] is True
+        assert data['age'] == 42
+        assert headers['Age'] == '42'
+        assert 'ETag' not in headers  # El body cambia con la edad
+    
+    @pytest.mark.unit
+    def test_listar_fresh_cache_only_sets_age(self, bridge):
+        """Test: Un hit vigente lleva Age pero no stale en el body."""
+        from src.models.pagina import Pagina
+        from src.services.cache import Lectura
+        bridge._notas = Mock()
+        bridge._notas.listar_pagina.return_value = Pagina()
+        bridge._notas.ultima_lectura.return_value = Lectura([], 3.2, False)
+        
+        _, data, headers = bridge.dispatch('GET', '/api/notas', {})
+        
+        assert 'stale' not in data
+        assert headers['Age'] == '3'
+        assert 'ETag' in headers
+    
+    @pytest.mark.unit
+    def test_listar_etag_and_304(self, bridge):
+        """Test: ETag + Cache-Control/Vary; If-None-Match igual -> 304 sin body."""
+        from src.models.nota import Nota
+        from src.models.pagina import Pagina
+        bridge._notas = Mock()
+        bridge._notas.listar_pagina.return_value = Pagina(
+            items=[Nota.from_dict({'id': 'n1', 'user_id': 'u', 'title': 'T',
+                                   'updated_at': '2025-12-24T15:30:00Z'})]
+        )
+        bridge._notas.ultima_lectura.return_value = None
+        
+        status, _, headers = bridge.dispatch('GET', '/api/notas', {})
+        assert status == 200
+        assert headers['Cache-Control'] == 'private, no-cache'
+        assert headers['Vary'] == 'Authorization'
+        
+        status, data, headers_304 = bridge.dispatch(
+            'GET', '/api/notas', {}, None, {'if-none-match': headers['ETag']}
+        )
+        assert status == 304
+        assert data is None
+        assert headers_304['ETag'] == headers['ETag']
+        
+        bridge._notas.listar_pagina.return_value.items[0].updated_at = None
+        status, _, _ = bridge.dispatch(
+            'GET', '/api/notas', {}, None, {'If-None-Match': headers['ETag']}
+        )
+        assert status == 200
+    
+    @pytest.mark.unit
+    def test_obtener_etag_and_304(self, bridge):
+        """Test: GET /api/notas/{id} también responde 304 con su ETag."""
+        from src.models.nota import Nota
+        bridge._notas = Mock()
+        bridge._notas.obtener.return_value = Nota(id='n1', user_id='u', title='T')
+        
+        _, _, headers = bridge.dispatch('GET', '/api/notas/n1', {})
+        status, _, _ = bridge.dispatch(
+            'GET', '/api/notas/n1', {}, None, {'If-None-Match': headers['ETag']}
+        )
+        
+        assert status == 304
+    
+    @pytest.mark.unit
+    def test_listar_invalid_limit_returns_400(self, bridge):
+        """Test: limit no numérico retorna 400."""
+        bridge._notas = Mock()
+        
+        status, _ = bridge.handle_request('GET', '/api/notas', {'limit': ['diez']})
+        
+        assert status == 400
+    
+    @staticmethod
+    def _paginas():
+        """Dos páginas de notas (la primera con next_cursor)."""
+        from src.models.nota import Nota
+        from src.models.pagina import Pagina
+        return [
+            Pagina(items=[Nota(id='n1', user_id='u', title='A'),
+                          Nota(id='n2', user_id='u', title='B')], next_cursor='c1'),
+            Pagina(items=[Nota(id='n3', user_id='u', title='C')]),
+        ]
+    
+    @pytest.mark.unit
+    def test_stream_ndjson_writes_every_page(self, bridge):
+        """Test: ?stream=ndjson devuelve un StreamingBody con una línea por nota."""
+        import json
+        from src.server.streaming import StreamingBody
+        bridge._notas = Mock()
+        bridge._notas.iterar_paginas.return_value = iter(self._paginas())
+        
+        status, data = bridge.handle_request(
+            'GET', '/api/notas', {'stream': ['ndjson'], 'limit': ['2']}
+        )
+        
+        assert status == 200
+        assert isinstance(data, StreamingBody)
+        assert data.content_type == 'application/x-ndjson'
+        lines = b''.join(data.chunks).splitlines()
+        assert [json.loads(l)['id'] for l in lines] == ['n1', 'n2', 'n3']
+        bridge._notas.iterar_paginas.assert_called_once_with(2, None, None)
+    
+    @pytest.mark.unit
+    def test_stream_json_is_one_document(self, bridge):
+        """Test: ?stream=json arma el mismo objeto que la respuesta normal."""
+        import json
+        bridge._notas = Mock()
+        bridge._notas.iterar_paginas.return_value = iter(self._paginas())
+        
+        status, data = bridge.handle_request('GET', '/api/notas', {'stream': ['json']})
+        body = json.loads(b''.join(data.chunks))
+        
+        assert status == 200
+        assert body['success'] is True
+        assert body['count'] == 3
+        assert [n['title'] for n in body['data']] == ['A', 'B', 'C']
+    
+    @pytest.mark.unit
+    def test_stream_requires_auth_before_status(self, bridge):
+        """Test: Sin sesión el stream responde 401 (no un 200 con error)."""
+        def _sin_sesion(*args):
+            raise PermissionError('Debe iniciar sesión')
+            yield
+        bridge._notas = Mock()
+        bridge._notas.iterar_paginas.side_effect = _sin_sesion
+        
+        status, data = bridge.handle_request('GET', '/api/notas', {'stream': ['ndjson']})
+        
+        assert status == 401
+        assert 'error' in data
+    
+    @pytest.mark.unit
+    def test_stream_error_mid_stream_goes_in_body(self, bridge):
+        """Test: Un fallo en la página 2 termina el body con un error."""
+        import json
+        primera = self._paginas()[0]
+        def _falla(*args):
+            yield primera
+            raise RuntimeError('timeout')
+        bridge._notas = Mock()
+        bridge._notas.iterar_paginas.side_effect = _falla
+        
+        status, data = bridge.handle_request('GET', '/api/notas', {'stream': ['json']})
+        body = json.loads(b''.join(data.chunks))
+        
+        assert status == 200
+        assert len(body['data']) == 2
+        assert 'timeout' in body['error']
+    
+    @pytest.mark.unit
+    def test_stream_unknown_format_returns_400(self, bridge):
+        """Test: ?stream= con formato desconocido retorna 400."""
+        bridge._notas = Mock()
+        
+        status, _ = bridge.handle_request('GET', '/api/notas', {'stream': ['xml']})
+        
+        assert status == 400
+    
+    @pytest.mark.unit
+    def test_batch_returns_result_per_operation(self, bridge):
+        """Test: POST /api/batch responde 200 con un resultado por operación."""
+        from src.models.lote import ResultadoOperacion
+        bridge._notas = Mock()
+        bridge._notas.ejecutar_lote.return_value = [
+            ResultadoOperacion(0, 'delete', 200, 'n1'),
+            ResultadoOperacion(1, 'delete', 404, 'n2', error='Nota no encontrada'),
+        ]
+        operaciones = [{'op': 'delete', 'id': 'n1'}, {'op': 'delete', 'id': 'n2'}]
+        
+        status, data = bridge.handle_request('POST', '/api/batch', {}, {'operations': operaciones})
+        
+        assert status == 200
+        assert data['count'] == 2
+        assert data['failed'] == 1
+        assert [r['status'] for r in data['results']] == [200, 404]
+        bridge._notas.ejecutar_lote.assert_called_once_with(operaciones)
+    
+    @pytest.mark.unit
+    def test_bulk_create_returns_ids_without_data(self, bridge):
+        """Test: POST /api/notas/bulk pasa chunk_size y responde solo ids."""
+        from src.models.nota import Nota
+        from src.models.lote import ResultadoOperacion
+        bridge._notas = Mock()
+        bridge._notas.crear_muchos.return_value = [
+            ResultadoOperacion(0, 'create', 201, 'n1', Nota(id='n1', user_id='u', title='A')),
+        ]
+        
+        status, data = bridge.handle_request(
+            'POST', '/api/notas/bulk', {}, {'notes': [{'title': 'A'}], 'chunk_size': 100}
+        )
+        
+        assert status == 200
+        assert data['results'] == [{'index': 0, 'op': 'create', 'status': 201, 'id': 'n1'}]
+        bridge._notas.crear_muchos.assert_called_once_with([{'title': 'A'}], 100)
+    
+    @pytest.mark.unit
+    def test_bulk_create_invalid_chunk_size_returns_400(self, bridge):
+        """Test: chunk_size no entero retorna 400."""
+        bridge._notas = Mock()
+        
+        status, _ = bridge.handle_request(
+            'POST', '/api/notas/bulk', {}, {'notes': [{'title': 'A'}], 'chunk_size': 'mucho'}
+        )
+        
+        assert status == 400
+        bridge._notas.crear_muchos.assert_not_called()
+    
+    @pytest.mark.unit
+    def test_get_ids_returns_notes_and_missing(self, bridge):
+        """Test: GET /api/notas?ids=a,b usa obtener_muchos y reporta missing."""
+        from src.models.nota import Nota
+        bridge._notas = Mock()
+        bridge._notas.obtener_muchos.return_value = (
+            [Nota(id='b', user_id='u', title='B')], ['a']
+        )
+        
+        status, data = bridge.handle_request(
+            'GET', '/api/notas', {'ids': ['b,a'], 'fields': ['title']}
+        )
+        
+        assert status == 200
+        assert [n['id'] for n in data['data']] == ['b']
+        assert data['missing'] == ['a']
+        bridge._notas.obtener_muchos.assert_called_once_with(['b', 'a'], 'title')
+        bridge._notas.listar_pagina.assert_not_called()
+    
+    @pytest.mark.unit
+    def test_delete_ids_query_uses_eliminar_muchos(self, bridge):
+        """Test: DELETE /api/notas?ids=a,b responde afectados y no encontrados."""
+        from src.models.lote import ResultadoMasivo
+        bridge._notas = Mock()
+        bridge._notas.eliminar_muchos.return_value = ResultadoMasivo(['a'], ['b'])
+        
+        status, data = bridge.handle_request('DELETE', '/api/notas', {'ids': ['a,,b']})
+        
+        assert status == 200
+        assert data == {'success': True, 'affected': ['a'], 'not_found': ['b'], 'count': 1}
+        bridge._notas.eliminar_muchos.assert_called_once_with(['a', 'b'])
+    
+    @pytest.mark.unit
+    def test_delete_single_id_still_supported(self, bridge):
+        """Test: DELETE /api/notas?id=x sigue eliminando una nota."""
+        bridge._notas = Mock()
+        bridge._notas.eliminar.return_value = True
+        
+        status, _ = bridge.handle_request('DELETE', '/api/notas', {'id': ['x']})
+        
+        assert status == 200
+        bridge._notas.eliminar.assert_called_once_with('x')
+    
+    @pytest.mark.unit
+    def test_patch_updates_id_set(self, bridge):
+        """Test: PATCH /api/notas aplica los cambios a body.ids."""
+        from src.models.lote import ResultadoMasivo
+        bridge._notas = Mock()
+        bridge._notas.actualizar_muchos.return_value = ResultadoMasivo(['a', 'b'])
+        body = {'ids': ['a', 'b'], 'title': 'Nuevo'}
+        
+        status, data = bridge.handle_request('PATCH', '/api/notas', {}, body)
+        
+        assert status == 200
+        assert data['count'] == 2
+        bridge._notas.actualizar_muchos.assert_called_once_with(['a', 'b'], body)
+    
+    @pytest.mark.unit
+    def test_bulk_delete_invalid_ids_returns_400(self, bridge):
+        """Test: Un conjunto vacío retorna 400."""
+        bridge._notas = Mock()
+        bridge._notas.eliminar_muchos.side_effect = ValueError("ids debe ser una lista no vacía")
+        
+        status, data = bridge.handle_request('DELETE', '/api/notas', {}, {'ids': []})
+        
+        assert status == 400
+        assert 'ids' in data['error']
+    
+    @pytest.mark.unit
+    def test_batch_without_operations_returns_400(self, bridge):
+        """Test: Un body sin lista de operaciones retorna 400."""
+        from src.models.user import User
+        from src.services.session_manager import SessionManager
+        SessionManager().set_session(User(id='u', email='a@b.com'), 'token')
+        
+        status, data = bridge.handle_request('POST', '/api/batch', {}, {})
+        SessionManager().clear()
+        
+        assert status == 400
+        assert 'operations' in data['error']
+    
+    @pytest.mark.unit
+    def test_put_updates_nota(self, bridge):
+        """Test: PUT /api/notas/{id} actualiza título y contenido."""
+        from src.models.nota import Nota
+        bridge._notas = Mock()
+        bridge._notas.actualizar.return_value = Nota(id='n1', user_id='u', title='Nuevo')
+        
+        status, data = bridge.handle_request(
+            'PUT', '/api/notas/n1', {}, body={'titulo': 'Nuevo', 'contenido': 'C'}
+        )
+        
+        assert status == 200
+        assert data['data']['title'] == 'Nuevo'
+        bridge._notas.actualizar.assert_called_once_with('n1', 'Nuevo', 'C')
+    
+    @pytest.mark.unit
+    def test_put_missing_nota_returns_404(self, bridge):
+        """Test: PUT sobre una nota inexistente retorna 404."""
+        bridge._notas = Mock()
+        bridge._notas.actualizar.return_value = None
+        
+        status, _ = bridge.handle_request('PUT', '/api/notas/x', {}, body={'titulo': 'T'})
+        
+        assert status == 404
+    
+    SECRETO_JWT = 'secreto-de-prueba-con-al-menos-32-bytes!'
+    
+    def _bearer(self, bridge, sub='u-jwt', **claims):
+        """Headers con un JWT HS256 firmado con SECRETO_JWT."""
+        import time
+        import jwt
+        from src.services.jwt_verifier import VerificadorJWT
+        bridge._verificador = VerificadorJWT(secreto=self.SECRETO_JWT)
+        token = jwt.encode(
+            {'sub': sub, 'aud': 'authenticated', 'exp': int(time.time()) + 60, **claims},
+            self.SECRETO_JWT, algorithm='HS256'
+        )
+        return {'authorization': f'Bearer {token}'}
+    
+    @pytest.mark.unit
+    def test_bearer_token_scopes_handler_to_its_user(self, bridge):
+        """Test: Con Bearer válido el handler ve al usuario del token."""
+        from src.models.pagina import Pagina
+        from src.services.session_manager import SessionManager
+        vistos = []
+        bridge._notas = Mock()
+        bridge._notas.listar_pagina.side_effect = \
+            lambda *a: vistos.append(SessionManager().get_user_id()) or Pagina(items=[])
+        bridge._notas.ultima_lectura.return_value = None
+        
+        status, data = bridge.handle_request('GET', '/api/notas', {}, headers=self._bearer(bridge))
+        
+        assert status == 200
+        assert vistos == ['u-jwt']
+        assert SessionManager().get_user_id() != 'u-jwt'
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize('authorization', ['Bearer no-es-jwt', 'Basic abc', 'Bearer '])
+    def test_invalid_authorization_returns_401(self, bridge, authorization):
+        """Test: Authorization inválido -> 401 + WWW-Authenticate, sin handler."""
+        self._bearer(bridge)
+        bridge._notas = Mock()
+        
+        status, data, headers = bridge.dispatch(
+            'GET', '/api/notas', {}, headers={'Authorization': authorization}
+        )
+        
+        assert status == 401
+        assert 'error' in data
+        assert headers['WWW-Authenticate'].startswith('Bearer')
+        bridge._notas.listar_pagina.assert_not_called()
+    
+    @pytest.mark.unit
+    def test_expired_bearer_returns_401(self, bridge):
+        """Test: Un JWT vencido -> 401 'expirada'."""
+        status, data = bridge.handle_request(
+            'GET', '/api/notas', {}, headers=self._bearer(bridge, exp=1)
+        )
+        
+        assert status == 401
+        assert 'expirada' in data['error']
+    
+    @pytest.mark.unit
+    def test_login_returns_session_token(self, bridge):
+        """Test: Login es stateless y devuelve el access_token."""
+        from src.models.user import User
+        bridge._auth = Mock()
+        bridge._auth.autenticar.return_value = (User(id='u1', email='a@b.com'), 'at', 'rt')
+        
+        status, data = bridge.handle_request(
+            'POST', '/api/auth/login', {}, body={'email': 'a@b.com', 'password': 'x'}
+        )
+        
+        assert status == 200
+        assert data['session'] == {'access_token': 'at', 'refresh_token': 'rt', 'token_type': 'bearer'}
+        assert data['user']['id'] == 'u1'
+        bridge._auth.login.assert_not_called()
+    
+    @pytest.mark.unit
+    def test_logout_with_bearer_does_not_sign_out_shared_client(self, bridge):
+        """Test: Con Bearer, logout no llama a sign_out (cliente compartido)."""
+        bridge._auth = Mock()
+        
+        status, data = bridge.handle_request(
+            'POST', '/api/auth/logout', {}, headers=self._bearer(bridge)
+        )
+        
+        assert status == 200
+        bridge._auth.logout.assert_not_called()
+    
+    @pytest.mark.unit
+    def test_logout_closes_jwt_session(self, bridge):
+        """Test: Tras logout, el mismo JWT (session_id) recibe 401."""
+        from src.models.pagina import Pagina
+        from src.services.session_manager import SessionManager
+        SessionManager._instance = None
+        SessionManager._initialized = False
+        headers = self._bearer(bridge, session_id='sess-1')
+        bridge._notas = Mock()
+        bridge._notas.listar_pagina.side_effect = \
+            lambda *a: SessionManager().require_auth() or Pagina(items=[])
+        bridge._notas.ultima_lectura.return_value = None
+        
+        antes, _ = bridge.handle_request('GET', '/api/notas', {}, headers=headers)
+        bridge.handle_request('POST', '/api/auth/logout', {}, headers=headers)
+        despues, data = bridge.handle_request('GET', '/api/notas', {}, headers=headers)
+        
+        assert antes == 200
+        assert despues == 401
+        assert 'expirada' in data['error']
+        assert bridge.handle_request('GET', '/api/health', {})[1]['sessions']['sessions'] == 1
+    
+    @pytest.mark.unit
+    def test_stream_pages_keep_request_context(self, bridge):
+        """Test: Las páginas que se leen al consumir el stream ven al usuario."""
+        from src.models.nota import Nota
+        from src.models.pagina import Pagina
+        from src.models.contexto import contexto_actual
+        vistos = []
+        
+        def _paginas(*args):
+            for i in range(2):
+                vistos.append(contexto_actual().user.id)
+                yield Pagina(items=[Nota(id=f'n{i}', user_id='u', title='A')])
+        
+        bridge._notas = Mock()
+        bridge._notas.iterar_paginas.side_effect = _paginas
+        status, data = bridge.handle_request(
+            'GET', '/api/notas', {'stream': ['ndjson']}, headers=self._bearer(bridge)
+        )
+        b''.join(data.chunks)
+        
+        assert vistos == ['u-jwt', 'u-jwt']
+    
+    @pytest.mark.unit
+    def test_wrong_method_returns_405_with_allow(self, bridge):
+        """Test: Ruta existente con método no soportado retorna 405 + Allow."""
+        status, data, headers = bridge.dispatch('PATCH', '/api/notas/n1', {})
+        
+        assert status == 405
+        assert headers['Allow'] == 'DELETE, GET, PUT'
+        assert data['allow'] == ['DELETE', 'GET', 'PUT']
+    
+    @pytest.mark.unit
+    def test_static_route_wrong_method_returns_405(self, bridge):
+        """Test: GET /api/auth/login (solo POST) retorna 405."""
+        status, _ = bridge.handle_request('GET', '/api/auth/login', {})
+        
+        assert status == 405
+
+
+# ============================================================================
+# TESTS: ASYNC VERCEL BRIDGE
+# ============================================================================
+
+@requires_supabase
+class TestAsyncVercelBridge:
+    """Tests para AsyncVercelBridge (mismas rutas, handlers async)."""
+    
+    @pytest.fixture
+    def bridge(self, mock_env_vars):
+        from api.index import AsyncVercelBridge
+        return AsyncVercelBridge()
+    
+    @pytest.mark.unit
+    def test_health_check(self, bridge):
+        """Test: Health check funciona en el bridge asíncrono."""
+        import asyncio
+        status, data = asyncio.run(bridge.handle_request_async('GET', '/api/health', {}))
+        
+        assert status == 200
+        assert data['status'] == 'ok'
+    
+    @pytest.mark.unit
+    def test_warm(self, bridge):
+        """Test: /api/warm asíncrono crea el cliente y abre una conexión."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        bridge._notas = Mock()
+        bridge._notas.precalentar = AsyncMock(return_value={'ok': True, 'status': 200})
+        
+        status, data = asyncio.run(bridge.handle_request_async('GET', '/api/warm', {}))
+        
+        assert status == 200
+        assert data['status'] == 'warm'
+    
+    @pytest.mark.unit
+    def test_notas_get_requires_auth(self, bridge):
+        """Test: GET /api/notas asíncrono requiere autenticación."""
+        import asyncio
+        from src.services.session_manager import SessionManager
+        SessionManager().clear()
+        
+        status, data = asyncio.run(bridge.handle_request_async('GET', '/api/notas', {}))
+        
+        assert status == 401
+    
+    @pytest.mark.unit
+    def test_unknown_route_returns_404(self, bridge):
+        """Test: Ruta desconocida retorna 404."""
+        import asyncio
+        status, data = asyncio.run(bridge.handle_request_async('GET', '/api/x', {}))
+        
+        assert status == 404
+    
+    @pytest.mark.unit
+    def test_stream_ndjson_async(self, bridge):
+        """Test: ?stream=ndjson consume el async generator del servicio."""
+        import asyncio
+        from src.models.nota import Nota
+        from src.models.pagina import Pagina
+        
+        async def _paginas(*args):
+            yield Pagina(items=[Nota(id='n1', user_id='u', title='A')], next_cursor='c1')
+            yield Pagina(items=[Nota(id='n2', user_id='u', title='B')])
+        
+        async def _main():
+            status, data = await bridge.handle_request_async(
+                'GET', '/api/notas', {'stream': ['ndjson']}
+            )
+            return status, [chunk async for chunk in data.chunks]
+        
+        bridge._notas = Mock()
+        bridge._notas.iterar_paginas.side_effect = _paginas
+        status, chunks = asyncio.run(_main())
+        
+        assert status == 200
+        assert b''.join(chunks).count(b'\n') == 2
 
 
 # ============================================================================
 # TESTS: RESPONSE FORMAT
 # ============================================================================
 
+@requires_supabase
+class TestWsgiApplication:
+    """Tests para la aplicación WSGI (api.index.application)."""
+    
+    @staticmethod
+    def _call(method, path, body=b'', query='', extra=None):
+        """Invoca application() y retorna (status, headers, body)."""
+        import io
+        from api.index import application
+        
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'CONTENT_LENGTH': str(len(body)) if body else '',
+            'CONTENT_TYPE': 'application/json',
+            'wsgi.input': io.BytesIO(body),
+        }
+        environ.update(extra or {})
+        captured = {}
+        
+        def start_response(status, headers):
+            captured['status'] = status
+            captured['headers'] = dict(headers)
+        
+        payload = b''.join(application(environ, start_response))
+        return captured['status'], captured['headers'], payload
+    
+    @pytest.mark.unit
+    def test_health_check(self, mock_env_vars):
+        """GET /api/health responde 200 con Content-Length correcto."""
+        import json
+        status, headers, payload = self._call('GET', '/api/health')
+        
+        assert status == '200 OK'
+        assert headers['Content-Length'] == str(len(payload))
+        assert json.loads(payload)['status'] == 'ok'
+    
+    @pytest.mark.unit
+    def test_login_body_is_read_from_stream(self, mock_env_vars):
+        """El body JSON llega al bridge desde wsgi.input."""
+        import json
+        body = json.dumps({'email': '', 'password': 'x'}).encode()
+        status, _, payload = self._call('POST', '/api/auth/login', body)
+        
+        assert status == '400 Bad Request'
+        assert 'error' in json.loads(payload)
+    
+    @pytest.mark.unit
+    def test_chunked_body_without_content_length(self, mock_env_vars):
+        """Con wsgi.input_terminated se lee hasta EOF."""
+        import io
+        import json
+        body = json.dumps({'email': '', 'password': 'x'}).encode()
+        status, _, _ = self._call('POST', '/api/auth/login', extra={
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.input_terminated': True,
+        })
+        
+        assert status == '400 Bad Request'
+    
+    @pytest.mark.unit
+    def test_body_too_large_returns_413(self, mock_env_vars):
+        """Un Content-Length mayor al límite responde 413."""
+        status, _, _ = self._call('POST', '/api/notas', extra={
+            'CONTENT_LENGTH': str(10 * 1024 * 1024),
+        })
+        
+        assert status == '413 Request Entity Too Large'
+    
+    @pytest.mark.unit
+    def test_serves_static_index(self, mock_env_vars):
+        """GET / sirve public/index.html."""
+        status, headers, payload = self._call('GET', '/')
+        
+        assert status == '200 OK'
+        assert headers['Content-Type'].startswith('text/html')
+        assert headers['Content-Length'] == str(len(payload))
+    
+    @pytest.mark.unit
+    def test_405_sets_allow_header(self, mock_env_vars):
+        """El header Allow del bridge llega a la respuesta WSGI."""
+        status, headers, _ = self._call('POST', '/api/health')
+        
+        assert status == '405 Method Not Allowed'
+        assert headers['Allow'] == 'GET'
+    
+    @pytest.mark.unit
+    def test_stream_returns_iterable_without_content_length(self, mock_env_vars):
+        """?stream= retorna los bloques sin Content-Length (el servidor enmarca)."""
+        import api.index as api
+        from src.models.nota import Nota
+        from src.models.pagina import Pagina
+        notas = Mock()
+        notas.iterar_paginas.return_value = iter([
+            Pagina(items=[Nota(id='n1', user_id='u', title='A')])
+        ])
+        
+        with patch.object(api._bridge, '_notas', notas):
+            status, headers, payload = self._call('GET', '/api/notas', query='stream=ndjson')
+        
+        assert status == '200 OK'
+        assert 'Content-Length' not in headers
+        assert headers['Content-Type'] == 'application/x-ndjson'
+        assert payload.count(b'\n') == 1
+    
+    @pytest.mark.unit
+    def test_if_none_match_returns_304_without_body(self, mock_env_vars):
+        """HTTP_IF_NONE_MATCH con el ETag vigente -> 304 sin body ni Content-Length."""
+        import api.index as api
+        from src.models.nota import Nota
+        from src.models.pagina import Pagina
+        notas = Mock()
+        notas.obtener.return_value = Nota(id='n1', user_id='u', title='A')
+        
+        with patch.object(api._bridge, '_notas', notas):
+            _, headers, _ = self._call('GET', '/api/notas/n1')
+            status, headers_304, payload = self._call(
+                'GET', '/api/notas/n1', extra={'HTTP_IF_NONE_MATCH': headers['ETag']}
+            )
+        
+        assert status == '304 Not Modified'
+        assert payload == b''
+        assert 'Content-Length' not in headers_304
+        assert headers_304['Vary'] == 'Authorization'
+    
+    @pytest.mark.unit
+    def test_options_preflight(self, mock_env_vars):
+        """OPTIONS responde los headers CORS."""
+        status, headers, _ = self._call('OPTIONS', '/api/notas')
+        
+        assert status == '200 OK'
+        assert 'DELETE' in headers['Access-Control-Allow-Methods']
+
+
+@requires_supabase
+class TestKeepAliveHandler:
+    """Tests de conexiones persistentes en RequestHandler."""
+    
+    @pytest.fixture
+    def server(self, mock_env_vars):
+        """Servidor threaded con un RequestHandler silencioso."""
+        import threading
+        from api.index import RequestHandler, VercelBridge
+        from src.server.threaded import ThreadPoolHTTPServer
+        
+        class _Handler(RequestHandler):
+            bridge = VercelBridge()
+            max_requests = 3
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadPoolHTTPServer(('127.0.0.1', 0), _Handler, workers=2)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield server
+        server.shutdown()
+        server.server_close()
+    
+    @pytest.mark.unit
+    def test_reuses_connection_with_content_length(self, server):
+        """Varios requests viajan por el mismo socket."""
+        import http.client
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        
+        conn.request('GET', '/api/health')
+        first = conn.getresponse()
+        body = first.read()
+        sock = conn.sock
+        conn.request('OPTIONS', '/api/notas')
+        second = conn.getresponse()
+        second.read()
+        
+        assert first.version == 11
+        assert first.getheader('Content-Length') == str(len(body))
+        assert first.getheader('Connection') == 'keep-alive'
+        assert second.getheader('Content-Length') == '0'
+        assert conn.sock is sock
+        conn.close()
+    
+    @pytest.mark.unit
+    def test_closes_after_max_requests(self, server):
+        """La respuesta número max_requests lleva Connection: close."""
+        import http.client
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        
+        headers = []
+        for _ in range(3):
+            conn.request('GET', '/api/health')
+            response = conn.getresponse()
+            response.read()
+            headers.append(response.getheader('Connection'))
+        
+        assert headers == ['keep-alive', 'keep-alive', 'close']
+        conn.close()
+    
+    @pytest.mark.unit
+    def test_idle_connections_release_workers_when_queued(self, server):
+        """Con todos los workers en conexiones ociosas, un cliente nuevo no espera el timeout."""
+        import http.client
+        import time
+        ociosas = []
+        for _ in range(server.workers):
+            conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+            conn.request('GET', '/api/health')
+            conn.getresponse().read()
+            ociosas.append(conn)  # Keep-alive: cada una retiene un worker
+        
+        start = time.perf_counter()
+        nueva = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        nueva.request('GET', '/api/health')
+        response = nueva.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - start
+        
+        assert response.status == 200
+        assert elapsed < 2  # KEEPALIVE_TIMEOUT es 5 s
+        for conn in ociosas + [nueva]:
+            conn.close()
+    
+    @pytest.mark.unit
+    def test_stream_is_chunked_and_keeps_connection(self, server):
+        """?stream= usa Transfer-Encoding: chunked y la conexión se reutiliza."""
+        import http.client
+        from src.models.nota import Nota
+        from src.models.pagina import Pagina
+        notas = Mock()
+        notas.iterar_paginas.return_value = iter([
+            Pagina(items=[Nota(id='n1', user_id='u', title='A')], next_cursor='c'),
+            Pagina(items=[Nota(id='n2', user_id='u', title='B')]),
+        ])
+        notas.estadisticas_cache.return_value = {}  # /api/health las incluye
+        notas.estadisticas_pool.return_value = {}
+        notas.estadisticas_http.return_value = {}
+        server.RequestHandlerClass.bridge._notas = notas
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        
+        conn.request('GET', '/api/notas?stream=ndjson')
+        response = conn.getresponse()
+        body = response.read()
+        sock = conn.sock
+        conn.request('GET', '/api/health')
+        conn.getresponse().read()
+        
+        assert response.getheader('Transfer-Encoding') == 'chunked'
+        assert response.getheader('Content-Length') is None
+        assert body.count(b'\n') == 2
+        assert conn.sock is sock
+        conn.close()
+    
+    @pytest.mark.unit
+    def test_not_modified_has_no_body_and_keeps_connection(self, server):
+        """If-None-Match -> 304 sin body; la conexión sigue sirviendo requests."""
+        import http.client
+        from src.models.nota import Nota
+        from src.models.pagina import Pagina
+        notas = Mock()
+        notas.listar_pagina.return_value = Pagina(items=[Nota(id='n1', user_id='u', title='A')])
+        notas.ultima_lectura.return_value = None
+        notas.estadisticas_cache.return_value = {}
+        notas.estadisticas_pool.return_value = {}
+        notas.estadisticas_http.return_value = {}
+        server.RequestHandlerClass.bridge._notas = notas
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        
+        conn.request('GET', '/api/notas')
+        first = conn.getresponse()
+        first.read()
+        etag = first.getheader('ETag')
+        conn.request('GET', '/api/notas', headers={'If-None-Match': etag})
+        second = conn.getresponse()
+        body = second.read()
+        sock = conn.sock
+        conn.request('GET', '/api/health')  # Tercero (max_requests): mismo socket
+        reutilizado = conn.sock is sock
+        third = conn.getresponse()
+        third.read()
+        
+        assert second.status == 304
+        assert body == b''
+        assert second.getheader('Content-Length') is None
+        assert second.getheader('ETag') == etag
+        assert third.status == 200
+        assert reutilizado
+        conn.close()
+
+
+class TestColdStart:
+    """Tests del presupuesto de cold start (imports de api/index.py)."""
+    
+    @pytest.mark.unit
+    def test_health_and_static_do_not_import_supabase(self):
+        """Test: Un cold start que sirve health y un estático no carga Supabase."""
+        import json
+        import subprocess
+        from benchmarks.bench_cold_start import _COLD_START
+        entorno = {**os.environ, 'VERCEL': '1',
+                   'SUPABASE_URL': 'https://test.supabase.co', 'SUPABASE_KEY': 'k'}
+        
+        salida = subprocess.run(
+            [sys.executable, '-c', _COLD_START], capture_output=True, text=True,
+            env=entorno, cwd=_root_dir, check=True
+        ).stdout
+        resultado = json.loads(salida.strip().splitlines()[-1])
+        
+        assert resultado['status'] == 200
+        assert resultado['estatico']
+        assert resultado['prohibidos'] == []
+    
+    @pytest.mark.unit
+    def test_package_exports_load_on_demand(self):
+        """Test: src.server / src.services siguen exportando sus nombres."""
+        import src.server
+        import src.services
+        from src.server.async_server import AsyncHTTPServer
+        
+        assert src.server.AsyncHTTPServer is AsyncHTTPServer
+        assert src.services.TablaSesiones.__name__ == 'TablaSesiones'
+        with pytest.raises(AttributeError):
+            src.server.NoExiste
+
+
 @requires_supabase
 class TestApiResponseFormat:
     """Tests para verificar formato de respuestas."""
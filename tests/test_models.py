@@ -30,7 +30,12 @@ if _root_dir not in sys.path:
     sys.path.insert(0, _root_dir)
 
 from src.models.user import User
-from src.models.nota import Nota
+from src.models.nota import Nota, NotaParcial, normalizar_campos
+from src.models.pagina import Pagina, codificar_cursor, decodificar_cursor
+from src.models.lote import (
+    ResultadoMasivo, agrupar_lote, en_trozos, ordenar_por_ids, parsear_lote,
+    preparar_creaciones, resolver_grupo, trozos_por_largo, validar_ids
+)
 
 
 # ============================================================================
@@ -196,6 +201,237 @@ class TestNota:
         assert 'created_at' in display
 
 
+
+# ============================================================================
+# TESTS: NOTA PARCIAL (?fields=)
+# ============================================================================
+
+class TestNotaParcial:
+    """Tests para NotaParcial y normalizar_campos."""
+    
+    @pytest.mark.unit
+    def test_normalizar_campos(self):
+        """Test: Orden canónico, 'id' siempre incluido."""
+        assert normalizar_campos('title, content') == ('id', 'title', 'content')
+        assert normalizar_campos(['title', 'id', 'title']) == ('id', 'title')
+    
+    @pytest.mark.unit
+    def test_normalizar_campos_invalidos(self):
+        """Test: Columnas desconocidas o lista vacía -> ValueError."""
+        with pytest.raises(ValueError):
+            normalizar_campos('id,password')
+        with pytest.raises(ValueError):
+            normalizar_campos(' , ')
+    
+    @pytest.mark.unit
+    def test_to_dict_solo_campos_cargados(self):
+        """Test: to_dict no incluye ni consulta campos faltantes."""
+        nota = NotaParcial({'id': 'n1', 'title': '  Hola '})
+        
+        assert nota.to_dict() == {'title': 'Hola', 'id': 'n1'}
+        assert nota.campos_faltantes == ('user_id', 'content', 'created_at', 'updated_at')
+        assert isinstance(nota, Nota)
+    
+    @pytest.mark.unit
+    def test_to_dict_incluye_fechas_cargadas(self):
+        """Test: ?fields=created_at devuelve la fecha (ISO), no solo el id."""
+        nota = NotaParcial({
+            'id': 'n1',
+            'created_at': '2024-01-15T10:30:00Z',
+            'updated_at': '2024-01-16T08:00:00+00:00',
+        })
+        
+        assert nota.to_dict() == {
+            'created_at': '2024-01-15T10:30:00+00:00',
+            'updated_at': '2024-01-16T08:00:00+00:00',
+            'id': 'n1',
+        }
+    
+    @pytest.mark.unit
+    def test_carga_lazy_en_una_consulta(self, sample_nota_data):
+        """Test: El primer acceso a un faltante trae todos en una consulta."""
+        llamadas = []
+        
+        def cargador(nota_id, campos):
+            llamadas.append((nota_id, campos))
+            return {c: sample_nota_data[c] for c in campos}
+        
+        nota = NotaParcial({'id': 'n1', 'title': 'T'}, cargador)
+        
+        assert nota.content == sample_nota_data['content']
+        assert isinstance(nota.created_at, datetime)
+        assert nota.user_id == sample_nota_data['user_id']
+        assert llamadas == [('n1', ('user_id', 'content', 'created_at', 'updated_at'))]
+    
+    @pytest.mark.unit
+    def test_sin_cargador_lanza_attribute_error(self):
+        """Test: Sin cargador, un campo faltante es un error explícito."""
+        nota = NotaParcial({'id': 'n1', 'title': 'T'})
+        
+        with pytest.raises(AttributeError):
+            nota.content
+        assert 'NotaParcial(' in repr(nota)
+
+
+# ============================================================================
+# TESTS: PAGINA
+# ============================================================================
+
+class TestPagina:
+    """Tests para Pagina y cursores opacos."""
+    
+    @pytest.mark.unit
+    def test_cursor_roundtrip(self):
+        """Test: El cursor decodifica a la misma clave."""
+        cursor = codificar_cursor('2025-12-24T10:00:00.123456+00:00', 'abc')
+        
+        assert '=' not in cursor
+        assert decodificar_cursor(cursor) == ('2025-12-24T10:00:00.123456+00:00', 'abc')
+    
+    @pytest.mark.unit
+    def test_cursor_invalido(self):
+        """Test: Cursores corruptos lanzan ValueError."""
+        for cursor in ['???', 'eyJhIjoxfQ', codificar_cursor('x', 'y')[:-3]]:
+            with pytest.raises(ValueError):
+                decodificar_cursor(cursor)
+    
+    @pytest.mark.unit
+    def test_desde_filas_con_siguiente(self):
+        """Test: Con limite+1 filas hay next_cursor de la última visible."""
+        filas = [{'id': str(i), 'created_at': f't{i}'} for i in range(3)]
+        
+        pagina = Pagina.desde_filas(filas, limite=2)
+        
+        assert len(pagina.items) == 2
+        assert pagina.tiene_siguiente
+        assert decodificar_cursor(pagina.next_cursor) == ('t1', '1')
+    
+    @pytest.mark.unit
+    def test_desde_filas_ultima_pagina(self):
+        """Test: Sin fila extra no hay next_cursor."""
+        pagina = Pagina.desde_filas([{'id': '1', 'created_at': 't'}], limite=2)
+        
+        assert pagina.next_cursor is None
+
+
+
+# ============================================================================
+# TESTS: LOTE
+# ============================================================================
+
+class TestLote:
+    """Tests para validación, agrupación y resultados de lotes."""
+    
+    @pytest.mark.unit
+    def test_operaciones_invalidas_dan_400_individual(self):
+        """Test: Una operación inválida no invalida el lote."""
+        validas, errores = parsear_lote([
+            {'op': 'create', 'title': 'A'},
+            {'op': 'create', 'title': '  '},
+            {'op': 'delete'},
+            {'op': 'update', 'id': 'n1'},
+            'no-es-objeto',
+        ], maximo=10)
+        
+        assert [op.indice for op in validas] == [0]
+        assert [(e.indice, e.status) for e in errores] == [(1, 400), (2, 400), (3, 400), (4, 400)]
+    
+    @pytest.mark.unit
+    def test_lote_demasiado_grande(self):
+        """Test: Más operaciones que el máximo es un error del request."""
+        with pytest.raises(ValueError):
+            parsear_lote([{'op': 'get', 'id': 'x'}] * 3, maximo=2)
+        with pytest.raises(ValueError):
+            parsear_lote([], maximo=2)
+    
+    @pytest.mark.unit
+    def test_agrupa_consecutivas_compatibles(self):
+        """Test: Solo se agrupan consecutivas del mismo tipo (y mismos cambios)."""
+        validas, _ = parsear_lote([
+            {'op': 'create', 'title': 'A'},
+            {'op': 'create', 'titulo': 'B'},
+            {'op': 'delete', 'id': 'n1'},
+            {'op': 'create', 'title': 'C'},
+            {'op': 'update', 'id': 'n2', 'title': 'X'},
+            {'op': 'update', 'id': 'n3', 'title': 'X'},
+            {'op': 'update', 'id': 'n4', 'title': 'Y'},
+        ], maximo=10)
+        
+        grupos = agrupar_lote(validas)
+        
+        assert [[op.indice for op in g] for g in grupos] == [[0, 1], [2], [3], [4, 5], [6]]
+    
+    @pytest.mark.unit
+    def test_resolver_por_id_y_borrado_repetido(self):
+        """Test: Filas ausentes = 404; el segundo delete del mismo id = 404."""
+        validas, _ = parsear_lote([
+            {'op': 'delete', 'id': 'n1'},
+            {'op': 'delete', 'id': 'n2'},
+            {'op': 'delete', 'id': 'n1'},
+        ], maximo=10)
+        
+        resultados = resolver_grupo(validas, [{'id': 'n1', 'user_id': 'u', 'title': 'T'}])
+        
+        assert [r.status for r in resultados] == [200, 404, 404]
+        assert resultados[1].to_dict() == {
+            'index': 1, 'op': 'delete', 'status': 404, 'id': 'n2', 'error': 'Nota no encontrada'
+        }
+    
+    @pytest.mark.unit
+    def test_preparar_creaciones_acepta_nota_y_dict(self):
+        """Test: Nota y dict se validan igual; los inválidos quedan con 400."""
+        validas, errores = preparar_creaciones([
+            Nota(id='', user_id='u', title='A', content='x'),
+            {'titulo': ' B '},
+            {'content': 'sin título'},
+        ])
+        
+        assert [op.cambios['title'] for op in validas] == ['A', 'B']
+        assert [(e.indice, e.status) for e in errores] == [(2, 400)]
+    
+    @pytest.mark.unit
+    def test_en_trozos(self):
+        """Test: Trozos de tamaño fijo, el último puede ser menor."""
+        assert list(en_trozos([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+        with pytest.raises(ValueError):
+            list(en_trozos([1], 0))
+    
+    @pytest.mark.unit
+    def test_trozos_por_largo(self):
+        """Test: Corta antes de superar el máximo; un item enorme va solo."""
+        trozos = list(trozos_por_largo(['aa', 'bb', 'cccccc', 'd'], len, 4))
+        
+        assert trozos == [['aa', 'bb'], ['cccccc'], ['d']]
+    
+    @pytest.mark.unit
+    def test_validar_ids(self):
+        """Test: Sin repetidos en el orden pedido; vacío/no-lista/excedido = ValueError."""
+        assert validar_ids(['b', 'a', 'b'], maximo=5) == ['b', 'a']
+        for invalido in ([], 'a,b', ['a', ''], ['a', 1]):
+            with pytest.raises(ValueError):
+                validar_ids(invalido, maximo=5)
+        with pytest.raises(ValueError):
+            validar_ids(['a', 'b', 'c'], maximo=2)
+    
+    @pytest.mark.unit
+    def test_ordenar_por_ids(self):
+        """Test: Filas en el orden pedido y faltantes aparte."""
+        filas = [{'id': 'c'}, {'id': 'a'}]
+        
+        assert ordenar_por_ids(['a', 'b', 'c'], filas) == ([{'id': 'a'}, {'id': 'c'}], ['b'])
+    
+    @pytest.mark.unit
+    def test_resultado_masivo_clasifica_ids(self):
+        """Test: afectados / no encontrados / fallidos en el orden pedido."""
+        resultado = ResultadoMasivo.desde(['a', 'b', 'c', 'd'], ['c', 'a'], ['d'], 'timeout')
+        
+        assert resultado.to_dict() == {
+            'affected': ['a', 'c'], 'not_found': ['b'], 'count': 2,
+            'failed': ['d'], 'error': 'timeout'
+        }
+        assert 'failed' not in ResultadoMasivo.desde(['a'], ['a'], []).to_dict()
+
+
 # ============================================================================
 # EJECUCIÓN DIRECTA
 # ============================================================================
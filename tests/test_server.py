@@ -0,0 +1,542 @@
+# -*- coding: utf-8 -*-
+"""
+============================================================================
+TEST_SERVER.PY - Tests para los servidores HTTP
+============================================================================
+Proyecto: CRUD Didáctico con Supabase
+Módulo: TESTS / SERVER
+Fecha: 2025-12-24
+
+TRAZABILIDAD:
+- Módulo: SERVER
+- Prueba: ThreadPoolHTTPServer, AsyncHTTPServer, PreforkServer
+
+SEGURIDAD:
+- Solo sockets locales (127.0.0.1, puerto efímero)
+- Sin llamadas a Supabase
+============================================================================
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import threading
+import http.client
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+# Agregar directorio raíz al path
+_root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root_dir not in sys.path:
+    sys.path.insert(0, _root_dir)
+
+from src.server.threaded import ThreadPoolHTTPServer
+from src.server.async_server import AsyncHTTPServer
+from src.server.prefork import PreforkServer, cpus_disponibles, cuota_cgroup
+from src.server.router import Router
+from src.server.streaming import StreamingBody
+from src.server.etag import etag_notas, coincide
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """Handler que simula una llamada lenta a Supabase."""
+    
+    delay = 0.2
+    
+    def do_GET(self):
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+    
+    def log_message(self, *args):
+        pass
+
+
+def _get(port: int) -> int:
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    conn.request('GET', '/')
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    return response.status
+
+
+def _get_when_ready(port: int, timeout: float = 5.0) -> int:
+    """GET reintentando mientras el worker (otro proceso) abre su socket."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return _get(port)
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.02)
+
+
+# ============================================================================
+# TESTS: THREAD POOL HTTP SERVER
+# ============================================================================
+
+class TestThreadPoolHTTPServer:
+    """Tests para ThreadPoolHTTPServer."""
+    
+    @pytest.fixture
+    def start_server(self):
+        """Factory que levanta servidores y los cierra al final."""
+        servers = []
+        
+        def _start(**kwargs):
+            server = ThreadPoolHTTPServer(('127.0.0.1', 0), _SlowHandler, **kwargs)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            servers.append(server)
+            return server
+        
+        yield _start
+        
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+    
+    @pytest.mark.unit
+    def test_invalid_workers_raises(self):
+        """Test: workers < 1 es un error de configuración."""
+        with pytest.raises(ValueError):
+            ThreadPoolHTTPServer(('127.0.0.1', 0), _SlowHandler, workers=0)
+    
+    @pytest.mark.slow
+    def test_requests_are_served_concurrently(self, start_server):
+        """Test: 4 requests lentos con 4 workers no se serializan."""
+        server = start_server(workers=4, queue_size=8)
+        port = server.server_address[1]
+        
+        statuses = []
+        clients = [
+            threading.Thread(target=lambda: statuses.append(_get(port)))
+            for _ in range(4)
+        ]
+        start = time.perf_counter()
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+        elapsed = time.perf_counter() - start
+        
+        assert statuses == [200] * 4
+        assert elapsed < 4 * _SlowHandler.delay
+    
+    @pytest.mark.slow
+    def test_full_queue_returns_503(self, start_server):
+        """Test: Con la cola llena, las conexiones extra reciben 503."""
+        server = start_server(workers=1, queue_size=1)
+        port = server.server_address[1]
+        
+        statuses = []
+        clients = [
+            threading.Thread(target=lambda: statuses.append(_get(port)))
+            for _ in range(6)
+        ]
+        for c in clients:
+            c.start()
+        for c in clients:
+            c.join()
+        
+        assert 503 in statuses
+        assert 200 in statuses
+        assert server.stats()['rejected'] >= 1
+
+
+# ============================================================================
+# TESTS: ASYNC HTTP SERVER
+# ============================================================================
+
+class TestAsyncHTTPServer:
+    """Tests para AsyncHTTPServer."""
+    
+    @staticmethod
+    async def _echo_app(method, path, query, body, headers):
+        await asyncio.sleep(0.05)
+        return 200, {'method': method, 'path': path, 'query': query, 'body': body}
+    
+    @staticmethod
+    async def _request(port, raw: bytes) -> bytes:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(raw)
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        return data
+    
+    @pytest.mark.unit
+    def test_dispatches_json_body(self):
+        """Test: El body JSON y la query llegan a la aplicación."""
+        async def _main():
+            server = await AsyncHTTPServer(self._echo_app, '127.0.0.1', 0).start()
+            body = b'{"titulo": "Hola"}'
+            raw = (b'POST /api/notas?x=1 HTTP/1.1\r\nHost: t\r\nConnection: close\r\n'
+                   b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body)
+            data = await self._request(server.port, raw)
+            server.close()
+            await server.wait_closed()
+            return data
+        
+        response = asyncio.run(_main())
+        head, _, payload = response.partition(b'\r\n\r\n')
+        
+        assert head.startswith(b'HTTP/1.1 200')
+        assert b'Content-Length: ' + str(len(payload)).encode() in head
+        assert json.loads(payload) == {
+            'method': 'POST', 'path': '/api/notas',
+            'query': {'x': ['1']}, 'body': {'titulo': 'Hola'}
+        }
+    
+    @pytest.mark.unit
+    def test_requests_overlap_on_event_loop(self):
+        """Test: 50 requests lentos se atienden concurrentemente."""
+        async def _main():
+            server = await AsyncHTTPServer(self._echo_app, '127.0.0.1', 0).start()
+            raw = b'GET / HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n'
+            start = time.perf_counter()
+            responses = await asyncio.gather(
+                *[self._request(server.port, raw) for _ in range(50)]
+            )
+            elapsed = time.perf_counter() - start
+            server.close()
+            await server.wait_closed()
+            return responses, elapsed
+        
+        responses, elapsed = asyncio.run(_main())
+        
+        assert all(r.startswith(b'HTTP/1.1 200') for r in responses)
+        assert elapsed < 50 * 0.05 / 4
+    
+    @pytest.mark.unit
+    def test_keep_alive_serves_multiple_requests(self):
+        """Test: Dos requests por la misma conexión HTTP/1.1."""
+        async def _main():
+            server = await AsyncHTTPServer(self._echo_app, '127.0.0.1', 0).start()
+            raw = (b'GET /a HTTP/1.1\r\nHost: t\r\n\r\n'
+                   b'GET /b HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n')
+            data = await self._request(server.port, raw)
+            server.close()
+            await server.wait_closed()
+            return data
+        
+        data = asyncio.run(_main())
+        
+        assert data.count(b'HTTP/1.1 200') == 2
+    
+    @pytest.mark.unit
+    def test_not_modified_without_body(self):
+        """Test: Un 304 sale sin Content-Type/Length y la conexión sigue."""
+        async def _app(method, path, query, body, headers):
+            if headers.get('if-none-match'):
+                return 304, None, {'ETag': '"v1"'}
+            return 200, {'ok': True}, {'ETag': '"v1"'}
+        
+        async def _main():
+            server = await AsyncHTTPServer(_app, '127.0.0.1', 0).start()
+            raw = (b'GET /a HTTP/1.1\r\nHost: t\r\nIf-None-Match: "v1"\r\n\r\n'
+                   b'GET /b HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n')
+            data = await self._request(server.port, raw)
+            server.close()
+            await server.wait_closed()
+            return data
+        
+        data = asyncio.run(_main())
+        head_304, _, resto = data.partition(b'\r\n\r\n')
+        
+        assert head_304.startswith(b'HTTP/1.1 304')
+        assert b'Content-Length' not in head_304
+        assert b'ETag: "v1"' in head_304
+        assert resto.startswith(b'HTTP/1.1 200')
+
+    
+    @pytest.mark.unit
+    def test_max_requests_closes_connection(self):
+        """Test: Al llegar a max_requests se responde Connection: close."""
+        async def _main():
+            server = await AsyncHTTPServer(
+                self._echo_app, '127.0.0.1', 0, max_requests=1
+            ).start()
+            raw = (b'GET /a HTTP/1.1\r\nHost: t\r\n\r\n'
+                   b'GET /b HTTP/1.1\r\nHost: t\r\n\r\n')
+            data = await self._request(server.port, raw)
+            server.close()
+            await server.wait_closed()
+            return data
+        
+        data = asyncio.run(_main())
+        
+        assert data.count(b'HTTP/1.1 200') == 1
+        assert b'Connection: close' in data
+    
+    @pytest.mark.unit
+    def test_idle_connection_is_closed(self):
+        """Test: Una conexión sin requests se cierra tras idle_timeout."""
+        async def _main():
+            server = await AsyncHTTPServer(
+                self._echo_app, '127.0.0.1', 0, idle_timeout=0.1
+            ).start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            data = await asyncio.wait_for(reader.read(), 2)
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return data
+        
+        assert asyncio.run(_main()) == b''
+    
+    @pytest.mark.unit
+    def test_streaming_body_is_chunked(self):
+        """Test: Un StreamingBody sale con chunked y la conexión sigue viva."""
+        async def _bloques():
+            for i in range(3):
+                yield b''  # Los bloques vacíos no deben cerrar el body
+                yield f'{{"n": {i}}}\n'.encode()
+        
+        async def _app(method, path, query, body, headers):
+            if path == '/stream':
+                return 200, StreamingBody(_bloques(), 'application/x-ndjson')
+            return 200, {'path': path}
+        
+        async def _main():
+            server = await AsyncHTTPServer(_app, '127.0.0.1', 0).start()
+            raw = (b'GET /stream HTTP/1.1\r\nHost: t\r\n\r\n'
+                   b'GET /b HTTP/1.1\r\nHost: t\r\nConnection: close\r\n\r\n')
+            data = await self._request(server.port, raw)
+            server.close()
+            await server.wait_closed()
+            return data
+        
+        data = asyncio.run(_main())
+        head, _, rest = data.partition(b'\r\n\r\n')
+        
+        assert b'Transfer-Encoding: chunked' in head
+        assert b'Content-Length' not in head
+        assert rest.startswith(b'9\r\n{"n": 0}\n\r\n')
+        assert b'0\r\n\r\nHTTP/1.1 200' in rest
+    
+    @pytest.mark.unit
+    def test_streaming_http10_closes_without_chunked(self):
+        """Test: Cliente HTTP/1.0 recibe el body crudo y cierre de conexión."""
+        async def _app(method, path, query, body, headers):
+            return 200, StreamingBody(iter([b'a', b'b']), 'text/plain')
+        
+        async def _main():
+            server = await AsyncHTTPServer(_app, '127.0.0.1', 0).start()
+            raw = b'GET / HTTP/1.0\r\nConnection: keep-alive\r\n\r\n'
+            data = await self._request(server.port, raw)
+            server.close()
+            await server.wait_closed()
+            return data
+        
+        head, _, body = asyncio.run(_main()).partition(b'\r\n\r\n')
+        
+        assert b'Connection: close' in head
+        assert b'chunked' not in head
+        assert body == b'ab'
+
+# ============================================================================
+# TESTS: PREFORK
+# ============================================================================
+
+class TestPrefork:
+    """Tests para cpus_disponibles y PreforkServer."""
+    
+    @pytest.mark.unit
+    def test_cgroup_v2_quota(self, tmp_path):
+        """Test: cpu.max '150000 100000' equivale a 1.5 núcleos -> 2 CPUs."""
+        (tmp_path / 'cpu.max').write_text('150000 100000\n')
+        
+        assert cuota_cgroup(str(tmp_path)) == 1.5
+        assert cpus_disponibles(str(tmp_path)) <= 2
+    
+    @pytest.mark.unit
+    def test_cgroup_v2_unlimited(self, tmp_path):
+        """Test: cpu.max 'max' significa sin cuota."""
+        (tmp_path / 'cpu.max').write_text('max 100000\n')
+        
+        assert cuota_cgroup(str(tmp_path)) is None
+    
+    @pytest.mark.unit
+    def test_cgroup_v1_quota(self, tmp_path):
+        """Test: cgroup v1 con cuota de 1 núcleo."""
+        (tmp_path / 'cpu').mkdir()
+        (tmp_path / 'cpu' / 'cpu.cfs_quota_us').write_text('100000')
+        (tmp_path / 'cpu' / 'cpu.cfs_period_us').write_text('100000')
+        
+        assert cpus_disponibles(str(tmp_path)) == 1
+    
+    @pytest.mark.slow
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason="requiere os.fork")
+    def test_post_fork_runs_in_each_child_only(self, tmp_path):
+        """Test: post_fork corre en el hijo (otro pid), nunca en el padre."""
+        from http.server import HTTPServer
+        
+        def _factory(address, bind_and_activate=True):
+            _SlowHandler.delay = 0
+            return HTTPServer(address, _SlowHandler, bind_and_activate)
+        
+        def _post_fork():
+            (tmp_path / str(os.getpid())).write_text('ok')
+        
+        server = PreforkServer(('127.0.0.1', 0), _factory, processes=2, post_fork=_post_fork)
+        server.start()
+        try:
+            assert _get_when_ready(server.address[1]) == 200
+            deadline = time.monotonic() + 5
+            while len(list(tmp_path.iterdir())) < 2 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            
+            pids = sorted(int(f.name) for f in tmp_path.iterdir())
+            assert pids == sorted(server.worker_pids())
+            assert os.getpid() not in pids
+        finally:
+            server.stop()
+            _SlowHandler.delay = 0.2
+    
+    @pytest.mark.slow
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason="requiere os.fork")
+    def test_crashed_worker_is_restarted(self):
+        """Test: El supervisor relanza un worker muerto y sigue sirviendo."""
+        import signal
+        from http.server import HTTPServer
+        
+        def _factory(address, bind_and_activate=True):
+            _SlowHandler.delay = 0
+            return HTTPServer(address, _SlowHandler, bind_and_activate)
+        
+        warmed = []
+        server = PreforkServer(('127.0.0.1', 0), _factory, processes=1,
+                               warmup=lambda: warmed.append(True))
+        server.MIN_UPTIME = 0
+        server.start()
+        supervisor = threading.Thread(target=server.supervise, daemon=True)
+        supervisor.start()
+        try:
+            port = server.address[1]
+            assert warmed == [True]
+            assert _get_when_ready(port) == 200
+            
+            victim = server.worker_pids()[0]
+            os.kill(victim, signal.SIGKILL)
+            deadline = time.monotonic() + 5
+            while server.restarts == 0 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            
+            assert server.restarts == 1
+            assert victim not in server.worker_pids()
+            assert _get_when_ready(port) == 200
+        finally:
+            server.stop()
+            _SlowHandler.delay = 0.2
+
+
+# ============================================================================
+# EJECUCIÓN DIRECTA
+# ============================================================================
+
+if __name__ == "__main__":
+    pytest.main([__file__, '-v', '--tb=short'])
+
+
+# ============================================================================
+# TESTS: ROUTER
+# ============================================================================
+
+class TestRouter:
+    """Tests para Router (tabla de rutas compilada)."""
+    
+    @pytest.fixture
+    def router(self):
+        router = Router()
+        router.add('GET', '/api/notas', 'listar')
+        router.add('POST', '/api/notas', 'crear')
+        router.add('GET', '/api/notas/{id}', 'obtener')
+        router.add('DELETE', '/api/notas/{id}', 'eliminar')
+        return router
+    
+    @pytest.mark.unit
+    def test_static_route(self, router):
+        """Test: Ruta estática encontrada sin parámetros."""
+        match = router.match('POST', '/api/notas')
+        
+        assert match.target == 'crear'
+        assert match.params == {}
+    
+    @pytest.mark.unit
+    def test_path_param(self, router):
+        """Test: {id} se extrae del path (con o sin barra final)."""
+        assert router.match('DELETE', '/api/notas/abc').params == {'id': 'abc'}
+        assert router.match('GET', '/api/notas/abc/').target == 'obtener'
+    
+    @pytest.mark.unit
+    def test_unknown_path_is_404(self, router):
+        """Test: Path inexistente -> sin destino y sin Allow."""
+        match = router.match('GET', '/api/notas/abc/extra')
+        
+        assert match.target is None
+        assert match.allow == ()
+    
+    @pytest.mark.unit
+    def test_wrong_method_is_405(self, router):
+        """Test: Path existente con otro método -> Allow con los válidos."""
+        assert router.match('PUT', '/api/notas').allow == ('GET', 'POST')
+        assert router.match('PUT', '/api/notas/1').allow == ('DELETE', 'GET')
+    
+    @pytest.mark.unit
+    def test_duplicate_route_raises(self, router):
+        """Test: Registrar dos veces la misma ruta es un error."""
+        with pytest.raises(ValueError):
+            router.add('GET', '/api/notas/', 'otra')
+        with pytest.raises(ValueError):
+            router.add('PUT', '/api/notas/{nota_id}', 'otra')
+
+
+class TestEtag:
+    """Tests para etag_notas / coincide (GET condicional)."""
+    
+    @staticmethod
+    def _nota(**cambios):
+        from src.models.nota import Nota
+        fila = {'id': 'n1', 'user_id': 'u1', 'title': 'A',
+                'updated_at': '2025-12-24T15:30:00Z', **cambios}
+        return Nota.from_dict(fila)
+    
+    @pytest.mark.unit
+    def test_depends_on_updated_at_and_membership(self):
+        """Test: Mismas notas -> mismo ETag; editar, agregar o reordenar lo cambia."""
+        base = etag_notas([self._nota()], None)
+        
+        assert base == etag_notas([self._nota()], None)
+        assert base.startswith('"') and base.endswith('"')
+        assert base != etag_notas([self._nota(updated_at='2025-12-24T15:30:01Z')], None)
+        assert base != etag_notas([self._nota(), self._nota(id='n2')], None)
+        assert etag_notas([self._nota(), self._nota(id='n2')], None) != \
+            etag_notas([self._nota(id='n2'), self._nota()], None)
+        assert base != etag_notas([self._nota()], 'cursor')
+    
+    @pytest.mark.unit
+    def test_partial_without_updated_at_uses_content(self):
+        """Test: Una NotaParcial sin updated_at aporta sus campos (sin cargar nada)."""
+        from src.models.nota import NotaParcial
+        
+        a = etag_notas([NotaParcial({'id': 'n1', 'title': 'A'})], 'id,title')
+        b = etag_notas([NotaParcial({'id': 'n1', 'title': 'B'})], 'id,title')
+        
+        assert a != b
+    
+    @pytest.mark.unit
+    def test_if_none_match_parsing(self):
+        """Test: Lista, W/ y * coinciden; otro ETag o vacío no."""
+        assert coincide('"a"', '"a"')
+        assert coincide('"x", W/"a"', '"a"')
+        assert coincide('*', '"a"')
+        assert not coincide('"b"', '"a"')
+        assert not coincide(None, '"a"')
+        assert not coincide('', '"a"')
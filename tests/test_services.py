@@ -21,7 +21,7 @@ SEGURIDAD:
 import sys
 import os
 from datetime import datetime, timezone, timedelta
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
 
 import pytest
 
@@ -218,6 +218,71 @@ class TestSessionManager:
         
         # Debe haber reseteado
         assert remaining_after > remaining_before
+    
+    @pytest.mark.unit
+    def test_request_context_overrides_singleton(self, mock_env_vars, sample_user_data):
+        """Test: Con ContextoAuth responde el usuario del request, sin tocar el global."""
+        import time
+        from src.services.session_manager import SessionManager
+        from src.models.user import User
+        from src.models.contexto import ContextoAuth, usar_contexto
+        
+        session = SessionManager()
+        session.set_session(user=User.from_dict(sample_user_data), access_token='cli-token')
+        actividad = session._last_activity
+        contexto = ContextoAuth(User(id='u-api', email='api@test.com'), 'jwt-api', time.time() + 60)
+        
+        with usar_contexto(contexto):
+            session.require_auth()
+            session.update_activity()
+            assert session.get_user_id() == 'u-api'
+            assert session.access_token == 'jwt-api'
+        
+        assert session.get_user_id() == sample_user_data['id']
+        assert session._last_activity == actividad
+    
+    @pytest.mark.unit
+    def test_request_context_session_inactivity_and_logout(self, mock_env_vars):
+        """Test: Con session_id rige el timeout de inactividad y el logout."""
+        import time
+        from src.services.session_manager import SessionManager
+        from src.services.tabla_sesiones import TablaSesiones
+        from src.models.user import User
+        from src.models.contexto import ContextoAuth, usar_contexto
+        
+        session = SessionManager()
+        ahora = [0.0]
+        session._sesiones = TablaSesiones(60, reloj=lambda: ahora[0])
+        user = User(id='u-api', email='')
+        contexto = ContextoAuth(user, 'jwt', time.time() + 3600, session_id='s1')
+        
+        with usar_contexto(contexto):
+            session.require_auth()
+            assert session.get_remaining_time() == 60
+            ahora[0] = 61
+            assert not session.is_session_valid()
+            with pytest.raises(PermissionError, match='inactividad'):
+                session.require_auth()
+        
+        otro = ContextoAuth(user, 'jwt-2', time.time() + 3600, session_id='s2')
+        with usar_contexto(otro):
+            session.require_auth()
+            session.clear()
+            with pytest.raises(PermissionError):
+                session.require_auth()
+    
+    @pytest.mark.unit
+    def test_expired_request_context_raises(self, mock_env_vars):
+        """Test: Un contexto con exp pasado no autentica."""
+        import time
+        from src.services.session_manager import SessionManager
+        from src.models.user import User
+        from src.models.contexto import ContextoAuth, usar_contexto
+        
+        vencido = ContextoAuth(User(id='u', email=''), 'jwt', time.time() - 1)
+        
+        with usar_contexto(vencido), pytest.raises(PermissionError, match='expirada'):
+            SessionManager().require_auth()
 
 
 # ============================================================================
@@ -316,6 +381,1076 @@ class TestAuthService:
         assert not session.is_authenticated()
 
 
+class TestTablaSesiones:
+    """Tests para TablaSesiones (shards + rueda de tiempos)."""
+    
+    @staticmethod
+    def _tabla(**kwargs):
+        from src.services.tabla_sesiones import TablaSesiones
+        ahora = [1000.0]
+        return TablaSesiones(timeout=900, reloj=lambda: ahora[0], **kwargs), ahora
+    
+    @pytest.mark.unit
+    def test_inactivity_timeout_and_activity_renewal(self):
+        """Test: La actividad renueva; 900s sin actividad cierran la sesión."""
+        tabla, ahora = self._tabla()
+        assert tabla.restante('s1') is None
+        assert tabla.tocar('s1', 'u1', vida=3600)
+        
+        ahora[0] += 899
+        assert tabla.tocar('s1', 'u1', vida=3600)
+        assert tabla.restante('s1') == 900
+        ahora[0] += 900
+        
+        assert tabla.restante('s1') == 0
+        assert not tabla.tocar('s1', 'u1', vida=3600)
+        assert tabla.stats()['expired'] == 1
+    
+    @pytest.mark.unit
+    def test_activity_writes_are_coalesced(self):
+        """Test: Actividades dentro de la resolución no escriben."""
+        tabla, ahora = self._tabla(resolucion=5)
+        tabla.tocar('s1', 'u1', vida=3600)
+        
+        for _ in range(3):
+            ahora[0] += 1
+            tabla.tocar('s1', 'u1', vida=3600)
+        
+        assert tabla.stats()['coalesced'] == 3
+        assert tabla.restante('s1') == 897
+    
+    @pytest.mark.unit
+    def test_closed_session_stays_closed_until_token_expires(self):
+        """Test: Logout deja una lápida hasta el exp; después se olvida."""
+        tabla, ahora = self._tabla()
+        tabla.tocar('s1', 'u1', vida=3600)
+        tabla.cerrar('s1')
+        
+        assert not tabla.tocar('s1', 'u1', vida=3600)
+        assert not tabla.tocar('s1', 'otro', vida=3600)
+        
+        ahora[0] += 3601
+        tabla.purgar()
+        assert len(tabla) == 0
+        assert tabla.tocar('s1', 'u1', vida=3600)  # Token nuevo con el mismo id
+    
+    @pytest.mark.unit
+    def test_wheel_frees_idle_sessions_across_rounds(self):
+        """Test: La rueda (pocas ranuras, varias vueltas) libera lo vencido."""
+        tabla, ahora = self._tabla(shards=4, ranuras=8)
+        for i in range(100):
+            tabla.tocar(f's{i}', f'u{i}', vida=1200)
+        
+        for _ in range(90):  # Ticks de 10s: la rueda da varias vueltas
+            ahora[0] += 10
+            tabla.tocar('activa', 'u', vida=10_000)
+            tabla.purgar()
+        assert len(tabla) == 101
+        
+        ahora[0] += 400
+        tabla.purgar()
+        assert len(tabla) == 1
+        assert tabla.restante('activa') > 0
+        assert tabla.stats()['expired'] == 100
+    
+    @pytest.mark.unit
+    def test_concurrent_sessions_from_many_threads(self):
+        """Test: Hilos concurrentes, cada uno con sus sesiones."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.services.tabla_sesiones import TablaSesiones
+        tabla = TablaSesiones(timeout=900)
+        
+        def _usuario(n):
+            return all(tabla.tocar(f's{n}-{i}', f'u{n}', vida=3600) for i in range(500))
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert all(pool.map(_usuario, range(8)))
+        assert len(tabla) == 4000
+
+
+# ============================================================================
+# TESTS: JWT POR REQUEST
+# ============================================================================
+
+class TestVerificadorJWT:
+    """Tests para VerificadorJWT (firma, exp, aud, caché de tokens)."""
+    
+    SECRETO = 'secreto-de-prueba-con-al-menos-32-bytes!'
+    
+    @classmethod
+    def _token(cls, secreto=None, algoritmo='HS256', **claims):
+        import time
+        import jwt
+        datos = {'sub': 'u-1', 'email': 'ana@test.com', 'aud': 'authenticated',
+                 'exp': int(time.time()) + 60, **claims}
+        return jwt.encode(datos, secreto or cls.SECRETO, algorithm=algoritmo)
+    
+    @pytest.mark.unit
+    def test_valid_hs256_token_and_cache(self):
+        """Test: Token válido -> ContextoAuth; el segundo uso sale de la caché."""
+        from src.services.jwt_verifier import VerificadorJWT
+        verificador = VerificadorJWT(secreto=self.SECRETO)
+        token = self._token()
+        
+        contexto = verificador.verificar(token)
+        
+        assert contexto.user.id == 'u-1'
+        assert contexto.user.email == 'ana@test.com'
+        assert contexto.access_token == token
+        assert verificador.verificar(token) is contexto
+        assert verificador.stats() == {'hits': 1, 'misses': 1, 'tokens': 1}
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize('cambios', [
+        {'secreto': 'otro-secreto-de-prueba-de-32-bytes!!'},
+        {'aud': 'anon'},
+        {'exp': 1},
+    ])
+    def test_rejects_bad_signature_audience_and_expiry(self, cambios):
+        """Test: Firma ajena, aud distinto o exp pasado -> PermissionError."""
+        from src.services.jwt_verifier import VerificadorJWT
+        
+        with pytest.raises(PermissionError):
+            VerificadorJWT(secreto=self.SECRETO).verificar(self._token(**cambios))
+    
+    @pytest.mark.unit
+    def test_hs256_without_secret_is_rejected(self):
+        """Test: Sin SUPABASE_JWT_SECRET no se acepta HS256 (ni basura)."""
+        from src.services.jwt_verifier import VerificadorJWT
+        verificador = VerificadorJWT()
+        
+        with pytest.raises(PermissionError):
+            verificador.verificar(self._token())
+        with pytest.raises(PermissionError):
+            verificador.verificar('no-es-un-jwt')
+    
+    @pytest.mark.unit
+    def test_cached_token_expires_and_cache_is_bounded(self):
+        """Test: Un token cacheado vence con su exp; la caché es LRU acotada."""
+        import time
+        from src.services.jwt_verifier import VerificadorJWT
+        ahora = [time.time()]
+        verificador = VerificadorJWT(secreto=self.SECRETO, max_tokens=2, reloj=lambda: ahora[0])
+        tokens = [self._token(sub=f'u-{i}', exp=int(ahora[0]) + 30) for i in range(3)]
+        for token in tokens:
+            verificador.verificar(token)
+        
+        assert verificador.stats()['tokens'] == 2
+        
+        misses = verificador.stats()['misses']
+        ahora[0] += 60
+        verificador.verificar(tokens[2])  # Pasó su exp: no sale de la caché
+        assert verificador.stats()['misses'] == misses + 1
+    
+    @pytest.mark.unit
+    def test_es256_uses_jwks_signing_key(self):
+        """Test: Tokens asimétricos se verifican con la clave del JWKS (cacheada)."""
+        import jwt
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from src.services.jwt_verifier import VerificadorJWT
+        privada = ec.generate_private_key(ec.SECP256R1())
+        verificador = VerificadorJWT()
+        verificador._jwks = Mock()
+        verificador._jwks.get_signing_key_from_jwt.return_value = Mock(key=privada.public_key())
+        
+        contexto = verificador.verificar(self._token(secreto=privada, algoritmo='ES256'))
+        
+        assert contexto.user.id == 'u-1'
+        with pytest.raises(PermissionError):
+            otra = ec.generate_private_key(ec.SECP256R1())
+            verificador.verificar(self._token(secreto=otra, algoritmo='ES256'))
+
+
+class TestContextoAuth:
+    """Tests para el contexto por request (ContextVar)."""
+    
+    @staticmethod
+    def _contexto(user_id='u-1'):
+        import time
+        from src.models.user import User
+        from src.models.contexto import ContextoAuth
+        return ContextoAuth(User(id=user_id, email=''), f'jwt-{user_id}', time.time() + 60)
+    
+    @pytest.mark.unit
+    def test_table_sends_request_token(self, mock_env_vars):
+        """Test: SupabaseClient.table usa el JWT del request, sin tocar el cliente."""
+        from src.config.settings import Settings
+        from src.repositories.supabase_client import SupabaseClient
+        from src.models.contexto import usar_contexto
+        Settings._instance, Settings._initialized = None, False
+        SupabaseClient._instance, SupabaseClient._initialized = None, False
+        try:
+            cliente = SupabaseClient()
+            with usar_contexto(self._contexto()):
+                builder = cliente.table('notas').select('*')
+                cliente.table('notas')
+            global_auth = cliente.client.postgrest.headers['Authorization']
+            pool = cliente.pool.stats()
+        finally:
+            SupabaseClient._instance, SupabaseClient._initialized = None, False
+            Settings._instance, Settings._initialized = None, False
+        
+        assert builder.request.headers['Authorization'] == 'Bearer jwt-u-1'
+        assert global_auth != 'Bearer jwt-u-1'
+        assert (pool['clients'], pool['hits'], pool['misses']) == (1, 1, 1)
+    
+    @pytest.mark.unit
+    def test_stream_chunks_run_in_context(self):
+        """Test: iterar_en_contexto fija el contexto en cada next()."""
+        from src.models.contexto import contexto_actual, iterar_en_contexto
+        contexto = self._contexto()
+        
+        def _paginas():
+            for _ in range(2):
+                yield contexto_actual()
+        
+        assert list(iterar_en_contexto(contexto, _paginas())) == [contexto, contexto]
+        assert contexto_actual() is None
+
+
+class TestPoolPostgrest:
+    """Tests para PoolPostgrest (clientes por token, LRU + inactividad)."""
+    
+    @staticmethod
+    def _pool(**kwargs):
+        from src.repositories.pool_postgrest import PoolPostgrest
+        ahora = [0.0]
+        creados = []
+        pool = PoolPostgrest(lambda token: creados.append(token) or Mock(token=token),
+                             reloj=lambda: ahora[0], **kwargs)
+        return pool, ahora, creados
+    
+    @pytest.mark.unit
+    def test_one_client_per_token_with_lru_bound(self):
+        """Test: Mismo token -> mismo cliente; el menos usado sale primero."""
+        pool, _, creados = self._pool(max_clientes=2)
+        
+        a = pool.obtener('a')
+        assert pool.obtener('a') is a
+        pool.obtener('b')
+        pool.obtener('a')
+        pool.obtener('c')  # Expulsa 'b' (el menos usado)
+        pool.obtener('a')
+        pool.obtener('b')
+        
+        assert creados == ['a', 'b', 'c', 'b']
+        assert pool.stats() == {'clients': 2, 'max_clients': 2, 'hits': 3, 'misses': 4,
+                                'evictions': 2, 'idle_evictions': 0}
+    
+    @pytest.mark.unit
+    def test_idle_clients_are_evicted(self):
+        """Test: Un cliente sin uso por `inactividad` segundos se descarta."""
+        pool, ahora, creados = self._pool(inactividad=60)
+        pool.obtener('a')
+        pool.obtener('b')
+        ahora[0] = 50
+        pool.obtener('b')
+        
+        ahora[0] = 70
+        assert pool.stats()['clients'] == 1
+        pool.obtener('a')
+        
+        assert creados == ['a', 'b', 'a']
+        assert pool.stats()['idle_evictions'] == 1
+    
+    @pytest.mark.unit
+    def test_disabled_pool_creates_every_time(self):
+        """Test: max_clientes=0 no guarda clientes."""
+        pool, _, creados = self._pool(max_clientes=0)
+        pool.obtener('a')
+        pool.obtener('a')
+        
+        assert creados == ['a', 'a']
+        assert pool.stats()['clients'] == 0
+    
+    @pytest.mark.unit
+    @pytest.mark.parametrize('nombre', ['SyncPostgrestClient', 'AsyncPostgrestClient'])
+    def test_user_client_shares_http_pool(self, nombre):
+        """Test: El cliente del usuario usa el http_client del compartido."""
+        import postgrest
+        from src.repositories.pool_postgrest import cliente_de_usuario
+        base = getattr(postgrest, nombre)(
+            'https://test.supabase.co/rest/v1',
+            headers={'apikey': 'anon', 'Authorization': 'Bearer anon'}
+        )
+        
+        cliente = cliente_de_usuario(base, 'jwt-u')
+        
+        assert type(cliente) is type(base)
+        assert cliente.session is base.session
+        assert cliente.headers.get_list('Authorization') == ['Bearer jwt-u']
+        assert cliente.headers['apikey'] == 'anon'
+        assert base.headers['Authorization'] == 'Bearer anon'
+
+
+class TestHttpPool:
+    """Tests para el pool HTTP compartido (http_pool.py)."""
+    
+    @pytest.fixture
+    def servidor(self):
+        """Servidor HTTP/1.1 local con keep-alive; retorna la URL base."""
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        
+        class _Ok(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Ok)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f'http://127.0.0.1:{server.server_address[1]}/'
+        server.shutdown()
+        server.server_close()
+    
+    @pytest.mark.unit
+    def test_requests_reuse_one_connection(self, mock_env_vars, servidor):
+        """Test: Requests seguidos usan una sola conexión keep-alive."""
+        from src.repositories.http_pool import (
+            EstadisticasHTTP, crear_cliente_http, estadisticas_pool
+        )
+        estadisticas = EstadisticasHTTP()
+        
+        with crear_cliente_http(estadisticas) as cliente:
+            for _ in range(5):
+                assert cliente.get(servidor).text == 'ok'
+            datos = estadisticas_pool(cliente, estadisticas)
+        
+        assert datos['requests'] == 5
+        assert datos['connections_opened'] == 1
+        assert (datos['open_connections'], datos['idle_connections']) == (1, 1)
+    
+    @pytest.mark.unit
+    def test_async_client_counts_connections(self, mock_env_vars, servidor):
+        """Test: El AsyncClient compartido también cuenta conexiones."""
+        import asyncio
+        from src.repositories.http_pool import EstadisticasHTTP, crear_cliente_http_async
+        estadisticas = EstadisticasHTTP()
+        
+        async def _main():
+            async with crear_cliente_http_async(estadisticas) as cliente:
+                for _ in range(3):
+                    await cliente.get(servidor)
+        
+        asyncio.run(_main())
+        
+        assert (estadisticas.requests, estadisticas.conexiones) == (3, 1)
+    
+    @pytest.mark.unit
+    def test_limits_come_from_settings(self, mock_env_vars, monkeypatch):
+        """Test: SUPABASE_HTTP_* configuran el pool."""
+        from src.config.settings import Settings
+        from src.repositories.http_pool import EstadisticasHTTP, crear_cliente_http
+        monkeypatch.setenv('SUPABASE_HTTP_MAX_CONNECTIONS', '7')
+        monkeypatch.setenv('SUPABASE_HTTP_KEEPALIVE_EXPIRY', '12')
+        Settings._instance, Settings._initialized = None, False
+        try:
+            with crear_cliente_http(EstadisticasHTTP()) as cliente:
+                pool = cliente._transport._pool
+                assert pool._max_connections == 7
+                assert pool._keepalive_expiry == 12
+        finally:
+            Settings._instance, Settings._initialized = None, False
+    
+    @pytest.mark.unit
+    def test_warmup_leaves_pooled_connection(self, mock_env_vars, servidor, monkeypatch):
+        """Test: precalentar() abre una conexión que la siguiente reutiliza."""
+        from src.config.settings import Settings
+        from src.repositories.supabase_client import SupabaseClient
+        monkeypatch.setenv('SUPABASE_URL', servidor)
+        Settings._instance, Settings._initialized = None, False
+        SupabaseClient._instance, SupabaseClient._initialized = None, False
+        try:
+            cliente = SupabaseClient()
+            primero = cliente.precalentar()
+            cliente.precalentar()
+            datos = cliente.estadisticas_http()
+        finally:
+            SupabaseClient._instance, SupabaseClient._initialized = None, False
+            Settings._instance, Settings._initialized = None, False
+        
+        assert (primero['ok'], primero['status']) == (True, 200)
+        assert (datos['requests'], datos['connections_opened']) == (2, 1)
+    
+    @pytest.mark.unit
+    def test_concurrent_first_use_creates_one_pool(self, mock_env_vars):
+        """Test: N hilos creando SupabaseClient a la vez = un solo httpx.Client."""
+        import threading
+        import time
+        from src.config.settings import Settings
+        from src.repositories import supabase_client as modulo
+        from src.repositories.supabase_client import SupabaseClient
+        crear = modulo.crear_cliente_http
+        creados = []
+        
+        def _crear_lento(estadisticas):
+            time.sleep(0.05)  # Ensancha la ventana de carrera
+            cliente = crear(estadisticas)
+            creados.append(cliente)
+            return cliente
+        
+        Settings._instance, Settings._initialized = None, False
+        SupabaseClient._instance, SupabaseClient._initialized = None, False
+        barrera = threading.Barrier(8)
+        instancias = []
+        
+        def _usar():
+            barrera.wait()
+            instancias.append(SupabaseClient())
+        
+        try:
+            with patch.object(modulo, 'crear_cliente_http', _crear_lento):
+                hilos = [threading.Thread(target=_usar) for _ in range(8)]
+                for hilo in hilos:
+                    hilo.start()
+                for hilo in hilos:
+                    hilo.join()
+            
+            assert len(creados) == 1
+            assert all(i is instancias[0] for i in instancias)
+            assert instancias[0]._http is creados[0]
+        finally:
+            for cliente in creados:
+                cliente.close()
+            SupabaseClient._instance, SupabaseClient._initialized = None, False
+            Settings._instance, Settings._initialized = None, False
+    
+    @pytest.mark.unit
+    def test_supabase_subclients_share_http_client(self, mock_env_vars):
+        """Test: PostgREST, Auth y los clientes por usuario comparten el pool."""
+        from src.config.settings import Settings
+        from src.repositories.supabase_client import SupabaseClient
+        Settings._instance, Settings._initialized = None, False
+        SupabaseClient._instance, SupabaseClient._initialized = None, False
+        try:
+            cliente = SupabaseClient()
+            http = cliente._http
+            assert cliente.client.postgrest.session is http
+            assert cliente.client.auth._http_client is http
+            assert cliente.pool.obtener('jwt').session is http
+            assert cliente.estadisticas_http()['requests'] == 0
+        finally:
+            SupabaseClient._instance, SupabaseClient._initialized = None, False
+            Settings._instance, Settings._initialized = None, False
+
+
+class TestSupabaseLite:
+    """Tests para el cliente mínimo PostgREST + GoTrue (supabase_lite.py)."""
+    
+    @pytest.fixture
+    def servidor(self):
+        """
+        Supabase local: registra cada request y responde lo configurado.
+        
+        Retorna (url, recibidos, respuestas); respuestas[(método, ruta)] =
+        (status, body, headers) y por defecto 200 con [].
+        """
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import urlsplit, parse_qsl
+        
+        recibidos, respuestas = [], {}
+        
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def _responder(self):
+                largo = int(self.headers.get('Content-Length') or 0)
+                partes = urlsplit(self.path)
+                recibidos.append({
+                    'metodo': self.command,
+                    'ruta': partes.path,
+                    'params': parse_qsl(partes.query),
+                    'headers': dict(self.headers),
+                    'body': json.loads(self.rfile.read(largo)) if largo else None
+                })
+                status, body, headers = respuestas.get(
+                    (self.command, partes.path), (200, [], {})
+                )
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for clave, valor in headers.items():
+                    self.send_header(clave, valor)
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            do_GET = do_POST = do_PATCH = do_DELETE = _responder
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield f'http://127.0.0.1:{server.server_address[1]}', recibidos, respuestas
+        server.shutdown()
+        server.server_close()
+    
+    @staticmethod
+    def _cliente(url):
+        import httpx
+        from src.repositories.supabase_lite import ClienteLite
+        return ClienteLite(url, 'anon', httpx.Client())
+    
+    @pytest.mark.unit
+    def test_select_builds_postgrest_query(self, servidor):
+        """Test: Filtros, orden y límite con la sintaxis de postgrest-py."""
+        url, recibidos, _ = servidor
+        
+        (self._cliente(url).table('notas').select('id,title')
+         .in_('id', ['a', 'b,c']).or_('created_at.lt.x')
+         .order('created_at', desc=True).order('id', desc=True).limit(5).execute())
+        
+        request = recibidos[0]
+        assert (request['metodo'], request['ruta']) == ('GET', '/rest/v1/notas')
+        assert request['params'] == [
+            ('select', 'id,title'), ('id', 'in.(a,"b,c")'), ('or', '(created_at.lt.x)'),
+            ('order', 'created_at.desc,id.desc'), ('limit', '5')
+        ]
+        assert request['headers']['apikey'] == 'anon'
+        assert request['headers']['Authorization'] == 'Bearer anon'
+    
+    @pytest.mark.unit
+    def test_count_comes_from_content_range(self, servidor):
+        """Test: count='exact' pide el total y lo lee de Content-Range."""
+        url, recibidos, respuestas = servidor
+        respuestas[('GET', '/rest/v1/notas')] = (200, [{'id': 'a'}], {'Content-Range': '0-0/42'})
+        
+        response = self._cliente(url).table('notas').select('id', count='exact').execute()
+        
+        assert response.count == 42
+        assert response.data == [{'id': 'a'}]
+        assert recibidos[0]['headers']['Prefer'] == 'count=exact'
+    
+    @pytest.mark.unit
+    def test_mutations_return_representation(self, servidor):
+        """Test: insert/update/delete piden las filas afectadas."""
+        url, recibidos, _ = servidor
+        cliente = self._cliente(url)
+        
+        cliente.table('notas').insert([{'title': 'A'}, {'title': 'B', 'content': 'x'}]).execute()
+        cliente.table('notas').update({'title': 'C'}).eq('id', 'n1').execute()
+        cliente.table('notas').delete().eq('id', 'n1').execute()
+        
+        assert [r['metodo'] for r in recibidos] == ['POST', 'PATCH', 'DELETE']
+        assert all(r['headers']['Prefer'] == 'return=representation' for r in recibidos)
+        assert recibidos[0]['params'] == [('columns', '"content","title"')]
+        assert recibidos[1]['body'] == {'title': 'C'}
+        assert recibidos[2]['params'] == [('id', 'eq.n1')]
+    
+    @pytest.mark.unit
+    def test_error_raises_api_error(self, servidor):
+        """Test: Un 4xx de PostgREST lanza ErrorAPI con code y message."""
+        from src.repositories.supabase_lite import ErrorAPI
+        url, _, respuestas = servidor
+        respuestas[('GET', '/rest/v1/notas')] = (
+            400, {'message': 'invalid input syntax for type uuid', 'code': '22P02'}, {}
+        )
+        
+        with pytest.raises(ErrorAPI) as error:
+            self._cliente(url).table('notas').select('*').eq('id', 'x').execute()
+        
+        assert error.value.code == '22P02'
+        assert error.value.status == 400
+    
+    @pytest.mark.unit
+    def test_sign_in_authenticates_postgrest(self, servidor):
+        """Test: Tras el login las consultas llevan el JWT; tras el logout, la anon key."""
+        url, recibidos, respuestas = servidor
+        respuestas[('POST', '/auth/v1/token')] = (200, {
+            'access_token': 'jwt-u', 'refresh_token': 'r', 'expires_in': 3600,
+            'user': {'id': 'u1', 'email': 'u@x.com', 'created_at': '2025-01-01T00:00:00Z'}
+        }, {})
+        cliente = self._cliente(url)
+        
+        response = cliente.auth.sign_in_with_password({'email': 'u@x.com', 'password': 'p'})
+        cliente.table('notas').select('*').execute()
+        cliente.auth.sign_out()
+        cliente.table('notas').select('*').execute()
+        
+        assert (response.user.id, response.session.access_token) == ('u1', 'jwt-u')
+        assert recibidos[0]['params'] == [('grant_type', 'password')]
+        assert recibidos[1]['headers']['Authorization'] == 'Bearer jwt-u'
+        assert (recibidos[2]['ruta'], recibidos[2]['headers']['Authorization']) == (
+            '/auth/v1/logout', 'Bearer jwt-u'
+        )
+        assert recibidos[3]['headers']['Authorization'] == 'Bearer anon'
+    
+    @pytest.mark.unit
+    def test_sign_in_error_maps_to_login_error(self, servidor):
+        """Test: El mensaje de GoTrue llega a mapear_error_login."""
+        from src.services.auth_service import mapear_error_login
+        url, _, respuestas = servidor
+        respuestas[('POST', '/auth/v1/token')] = (
+            400, {'error': 'invalid_grant', 'error_description': 'Invalid login credentials'}, {}
+        )
+        
+        with pytest.raises(Exception) as error:
+            self._cliente(url).auth.sign_in_with_password({'email': 'u@x.com', 'password': 'mal'})
+        
+        assert 'Credenciales' in str(mapear_error_login(error.value))
+    
+    @pytest.mark.unit
+    def test_sign_up_without_session(self, servidor):
+        """Test: Registro que requiere confirmar email: user sin session."""
+        url, _, respuestas = servidor
+        respuestas[('POST', '/auth/v1/signup')] = (
+            200, {'id': 'u2', 'email': 'n@x.com', 'created_at': '2025-01-01T00:00:00Z'}, {}
+        )
+        
+        response = self._cliente(url).auth.sign_up({'email': 'n@x.com', 'password': 'p'})
+        
+        assert response.user.id == 'u2'
+        assert response.session is None
+    
+    @pytest.mark.unit
+    def test_backend_lite_does_not_import_sdk(self, mock_env_vars):
+        """Test: SUPABASE_BACKEND=lite arma ClienteLite sin cargar supabase."""
+        import subprocess
+        import sys
+        codigo = (
+            "import sys; from src.repositories.supabase_client import SupabaseClient; "
+            "c = SupabaseClient(); "
+            "print(type(c.client).__name__, c.pool.obtener('jwt').session is c._http, "
+            "'supabase' in sys.modules, 'postgrest' in sys.modules)"
+        )
+        entorno = {**os.environ, 'SUPABASE_BACKEND': 'lite'}
+        salida = subprocess.run(
+            [sys.executable, '-c', codigo], capture_output=True, text=True,
+            env=entorno, cwd=_root_dir, check=True
+        ).stdout.split()
+        
+        assert salida == ['ClienteLite', 'True', 'False', 'False']
+    
+    @pytest.mark.unit
+    def test_invalid_backend_fails_fast(self, mock_env_vars, monkeypatch):
+        """Test: Un SUPABASE_BACKEND desconocido falla al cargar Settings."""
+        from src.config.settings import Settings
+        monkeypatch.setenv('SUPABASE_BACKEND', 'grpc')
+        Settings._instance, Settings._initialized = None, False
+        try:
+            with pytest.raises(ValueError, match='SUPABASE_BACKEND'):
+                Settings()
+        finally:
+            Settings._instance, Settings._initialized = None, False
+
+
+# ============================================================================
+# TESTS: CACHE DE NOTAS
+# ============================================================================
+
+class TestCacheNotas:
+    """Tests para CacheNotas (TTL, LRU por bytes, invalidación)."""
+    
+    @staticmethod
+    def _cache(max_bytes=1000):
+        from src.services.cache import CacheNotas
+        ahora = [0.0]
+        return CacheNotas(ttl=10, max_bytes=max_bytes, reloj=lambda: ahora[0]), ahora
+    
+    @pytest.mark.unit
+    def test_hit_miss_y_ttl(self):
+        """Test: Hit dentro del TTL, miss al vencer; lista vacía es hit."""
+        cache, ahora = self._cache()
+        cache.guardar('u1', ('listar', '*'), [])
+        
+        assert cache.obtener('u1', ('listar', '*')) == []
+        assert cache.obtener('u2', ('listar', '*')) is None
+        ahora[0] = 10
+        assert cache.obtener('u1', ('listar', '*')) is None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+        assert cache.stats()['entries'] == 0
+    
+    @pytest.mark.unit
+    def test_lru_por_bytes(self):
+        """Test: Al superar max_bytes se expulsa lo menos usado."""
+        cache, _ = self._cache(max_bytes=80)
+        for clave in ('a', 'b'):
+            cache.guardar('u1', ('nota', clave, '*'), [{'id': clave, 'title': 'x' * 10}])
+        cache.obtener('u1', ('nota', 'a', '*'))  # 'a' pasa a ser la más reciente
+        cache.guardar('u1', ('nota', 'c', '*'), [{'id': 'c', 'title': 'x' * 10}])
+        
+        assert cache.obtener('u1', ('nota', 'b', '*')) is None
+        assert cache.obtener('u1', ('nota', 'a', '*')) is not None
+        assert cache.stats()["bytes"] <= 80
+        assert cache.stats()['evictions'] == 1
+    
+    @pytest.mark.unit
+    def test_invalidar_listas_y_notas_del_usuario(self):
+        """Test: Invalida listas + notas indicadas, solo de ese usuario."""
+        cache, _ = self._cache()
+        for user in ('u1', 'u2'):
+            cache.guardar(user, ('listar', '*'), [{'id': 'a'}])
+            cache.guardar(user, ('nota', 'a', '*'), [{'id': 'a'}])
+            cache.guardar(user, ('nota', 'a', 'id,title'), [{'id': 'a'}])
+            cache.guardar(user, ('nota', 'b', '*'), [{'id': 'b'}])
+        
+        cache.invalidar('u1', ['a'])
+        
+        assert cache.obtener('u1', ('listar', '*')) is None
+        assert cache.obtener('u1', ('nota', 'a', 'id,title')) is None
+        assert cache.obtener('u1', ('nota', 'b', '*')) is not None
+        assert cache.obtener('u2', ('listar', '*')) is not None
+    
+    @pytest.mark.unit
+    def test_gracia_stale_while_revalidate(self):
+        """Test: Vencida dentro de la gracia solo si se acepta; después, miss."""
+        from src.services.cache import CacheNotas
+        ahora = [0.0]
+        cache = CacheNotas(ttl=10, max_bytes=1000, gracia=5, reloj=lambda: ahora[0])
+        cache.guardar('u1', ('listar', '*'), ['fila'])
+        ahora[0] = 12
+        
+        assert cache.obtener('u1', ('listar', '*')) is None
+        lectura = cache.leer('u1', ('listar', '*'), aceptar_vencida=True)
+        assert lectura.valor == ['fila'] and lectura.vencida and lectura.edad == 12
+        ahora[0] = 15
+        assert cache.leer('u1', ('listar', '*'), aceptar_vencida=True) is None
+        assert cache.stats()['entries'] == 0
+        assert cache.stats()['stale_hits'] == 1
+    
+    @pytest.mark.unit
+    def test_lectura_anterior_a_una_escritura_no_se_guarda(self):
+        """Test: Con la generación de antes de leer, un valor viejo se descarta."""
+        cache, _ = self._cache()
+        generacion = cache.generacion('u1')
+        cache.invalidar('u1')  # Escritura mientras la lectura viajaba
+        cache.guardar('u1', ('listar', '*'), [{'id': 'viejo'}], generacion)
+        
+        assert cache.obtener('u1', ('listar', '*')) is None
+
+
+# ============================================================================
+# TESTS: CACHÉ EN DISCO (SEGUNDO NIVEL)
+# ============================================================================
+
+class TestCacheDisco:
+    """Tests para CacheDisco (SQLite en /tmp) y su uso como segundo nivel."""
+    
+    @staticmethod
+    def _disco(tmp_path, max_bytes=10_000):
+        from src.services.cache_disco import CacheDisco
+        ahora = [1000.0]
+        return CacheDisco(str(tmp_path / 'cache' / 'c.sqlite3'), max_bytes,
+                          reloj=lambda: ahora[0]), ahora
+    
+    @pytest.mark.unit
+    def test_sobrevive_a_otra_instancia_y_vence(self, tmp_path):
+        """Test: Otra instancia (bridge reconstruido) lee lo guardado hasta el TTL."""
+        disco, ahora = self._disco(tmp_path)
+        disco.guardar('notas', 'k', [{'id': 'a'}], ttl=30, usuario='u1')
+        otra, _ = self._disco(tmp_path)
+        otra._reloj = lambda: ahora[0]
+        
+        ahora[0] += 5
+        assert otra.obtener('notas', 'k') == ([{'id': 'a'}], 5.0)
+        ahora[0] += 30
+        assert otra.obtener('notas', 'k') is None
+        assert otra.stats()['entries'] == 0
+        disco.cerrar()
+        otra.cerrar()
+    
+    @pytest.mark.unit
+    def test_tope_de_bytes_expulsa_las_proximas_a_vencer(self, tmp_path):
+        """Test: Al pasar el tope se borran primero las que vencen antes."""
+        disco, _ = self._disco(tmp_path, max_bytes=100)
+        disco.guardar('notas', 'larga', 'x' * 40, ttl=300)
+        disco.guardar('notas', 'corta', 'x' * 40, ttl=10)
+        disco.guardar('notas', 'nueva', 'x' * 40, ttl=60)
+        disco.guardar('notas', 'enorme', 'x' * 200, ttl=60)  # No entra: se ignora
+        
+        assert disco.obtener('notas', 'corta') is None
+        assert disco.obtener('notas', 'larga') is not None
+        assert disco.obtener('notas', 'enorme') is None
+        assert disco.stats()['bytes'] <= 100
+        assert disco.stats()['evictions'] == 1
+        disco.cerrar()
+    
+    @pytest.mark.unit
+    def test_invalidar_por_usuario_y_nota(self, tmp_path):
+        """Test: Invalida listas + notas indicadas, solo de ese usuario."""
+        disco, _ = self._disco(tmp_path)
+        for user in ('u1', 'u2'):
+            disco.guardar('notas', f'{user}-lista', [], ttl=30, usuario=user)
+            disco.guardar('notas', f'{user}-a', [], ttl=30, usuario=user, nota_id='a')
+            disco.guardar('notas', f'{user}-b', [], ttl=30, usuario=user, nota_id='b')
+        
+        disco.invalidar('notas', 'u1', ['a'])
+        
+        assert disco.obtener('notas', 'u1-lista') is None
+        assert disco.obtener('notas', 'u1-a') is None
+        assert disco.obtener('notas', 'u1-b') is not None
+        assert disco.obtener('notas', 'u2-lista') is not None
+        disco.cerrar()
+    
+    @pytest.mark.unit
+    def test_archivo_corrupto_se_recrea(self, tmp_path):
+        """Test: Basura en el archivo = miss; la caché se recrea y sigue andando."""
+        disco, _ = self._disco(tmp_path)
+        disco.guardar('notas', 'k', [1], ttl=30)
+        disco.cerrar()
+        with open(disco.ruta, 'wb') as f:
+            f.write(b'esto no es SQLite' * 200)
+        
+        assert disco.obtener('notas', 'k') is None
+        disco.guardar('notas', 'k', [2], ttl=30)
+        assert disco.obtener('notas', 'k') == ([2], 0.0)
+        assert disco.stats()['resets'] == 1
+        disco.cerrar()
+    
+    @pytest.mark.unit
+    def test_guardar_tras_una_invalidacion_de_otro_proceso_no_inserta(self, tmp_path):
+        """Test: Con la generación de antes de consultar, un valor viejo no llega al disco."""
+        disco, _ = self._disco(tmp_path)
+        otra, _ = self._disco(tmp_path)
+        generacion = disco.generacion('notas', 'u1')
+        
+        otra.invalidar('notas', 'u1')  # Escritura en otro proceso mientras se consultaba
+        disco.guardar('notas', 'k', [{'id': 'viejo'}], ttl=30, usuario='u1',
+                      generacion=generacion)
+        
+        assert otra.obtener('notas', 'k') is None
+        disco.guardar('notas', 'k', [{'id': 'nuevo'}], ttl=30, usuario='u1',
+                      generacion=disco.generacion('notas', 'u1'))
+        assert otra.obtener('notas', 'k')[0] == [{'id': 'nuevo'}]
+        disco.cerrar()
+        otra.cerrar()
+    
+    @pytest.mark.unit
+    def test_invalidacion_en_el_hueco_de_cache_notas(self, tmp_path):
+        """Test: Una escritura entre la memoria y el disco no deja la lista vieja en disco."""
+        from src.services.cache import CacheNotas
+        disco, _ = self._disco(tmp_path)
+        cache = CacheNotas(ttl=30, max_bytes=1000, disco=disco)
+        generacion = cache.generacion('u1')
+        guardar = disco.guardar
+        
+        def guardar_tras_escritura(*args, **kwargs):
+            cache.invalidar('u1')  # Otro hilo escribe justo en el hueco
+            guardar(*args, **kwargs)
+        
+        disco.guardar = guardar_tras_escritura
+        cache.guardar('u1', ('listar', '*'), [{'id': 'viejo'}], generacion)
+        disco.guardar = guardar
+        
+        assert cache.obtener('u1', ('listar', '*')) is None
+        assert CacheNotas(ttl=30, max_bytes=1000, disco=disco).obtener('u1', ('listar', '*')) is None
+        disco.cerrar()
+    
+    @pytest.mark.unit
+    def test_invalidacion_con_lock_ocupado_falla_cerrada(self, tmp_path):
+        """Test: Si no se puede borrar, ningún proceso sirve la fila vieja."""
+        import sqlite3
+        disco, _ = self._disco(tmp_path)
+        disco.espera_invalidacion = 0.1
+        otra, _ = self._disco(tmp_path)
+        disco.guardar('notas', 'lista', [{'id': 'viejo'}], ttl=30, usuario='u1')
+        assert otra.obtener('notas', 'lista') is not None  # Otro proceso ya la leyó
+        bloqueo = sqlite3.connect(disco.ruta, isolation_level=None)
+        bloqueo.execute('BEGIN IMMEDIATE')  # Otro escritor retiene el lock
+        try:
+            disco.invalidar('notas', 'u1')
+            
+            assert disco.obtener('notas', 'lista') is None
+            assert otra.obtener('notas', 'lista') is None
+            assert disco.stats()['discards'] == 1
+        finally:
+            bloqueo.execute('ROLLBACK')
+            bloqueo.close()
+        disco.cerrar()
+        otra.cerrar()
+    
+    @pytest.mark.unit
+    @pytest.mark.skipif(not hasattr(os, 'getuid'), reason="Permisos POSIX")
+    def test_directorio_compartido_la_desactiva(self, tmp_path):
+        """Test: Un directorio que otros pueden escribir no se usa."""
+        (tmp_path / 'cache').mkdir()
+        (tmp_path / 'cache').chmod(0o777)
+        disco, _ = self._disco(tmp_path)
+        
+        disco.guardar('notas', 'k', [1], ttl=30)
+        
+        assert disco.obtener('notas', 'k') is None
+        assert disco.stats()['enabled'] is False
+        assert not (tmp_path / 'cache' / 'c.sqlite3').exists()
+    
+    @pytest.mark.unit
+    def test_compartida_por_defecto_solo_en_vercel(self, mock_env_vars, monkeypatch, tmp_path):
+        """Test: Sin VERCEL ni CACHE_DISCO_PATH no hay segundo nivel."""
+        from src.config.settings import Settings
+        from src.services.cache_disco import CacheDisco
+        monkeypatch.delenv('VERCEL', raising=False)
+        monkeypatch.delenv('CACHE_DISCO_PATH', raising=False)
+        Settings._instance, Settings._initialized = None, False
+        CacheDisco._compartida = None
+        assert CacheDisco.compartida() is None
+        
+        monkeypatch.setenv('CACHE_DISCO_PATH', str(tmp_path / 'c.sqlite3'))
+        Settings._instance, Settings._initialized = None, False
+        try:
+            assert CacheDisco.compartida() is CacheDisco.compartida()
+            assert CacheDisco.compartida().ruta == str(tmp_path / 'c.sqlite3')
+        finally:
+            Settings._instance, Settings._initialized = None, False
+            CacheDisco._compartida = None
+    
+    @pytest.mark.unit
+    def test_cache_notas_reconstruida_lee_del_disco(self, tmp_path):
+        """Test: Un CacheNotas nuevo (servicio reconstruido) sirve desde disco."""
+        from src.services.cache import CacheNotas
+        disco, ahora = self._disco(tmp_path)
+        antes = CacheNotas(ttl=30, max_bytes=1000, disco=disco)
+        antes.guardar('u1', ('listar', '*'), [{'id': 'a'}])
+        antes.guardar('u1', ('nota', 'b', '*'), [{'id': 'b'}])
+        
+        despues = CacheNotas(ttl=30, max_bytes=1000, disco=disco)
+        ahora[0] += 4
+        lectura = despues.leer('u1', ('listar', '*'))
+        
+        assert lectura.valor == [{'id': 'a'}] and lectura.edad == 4 and not lectura.vencida
+        assert despues.obtener('u2', ('listar', '*')) is None
+        assert despues.stats()['disk_hits'] == 1
+        assert despues.stats()['entries'] == 1  # Promovida a memoria
+        despues.invalidar('u1', ['b'])
+        assert CacheNotas(ttl=30, max_bytes=1000, disco=disco).obtener(
+            'u1', ('nota', 'b', '*')) is None
+        disco.cerrar()
+    
+    @pytest.mark.unit
+    def test_token_verificado_desde_disco(self, tmp_path):
+        """Test: Otro verificador reusa los claims del disco (sin el token en claro)."""
+        import time
+        import jwt
+        from src.services.jwt_verifier import VerificadorJWT
+        from src.services.cache_disco import CacheDisco
+        secreto = TestVerificadorJWT.SECRETO
+        disco = CacheDisco(str(tmp_path / 'c.sqlite3'), 10_000)
+        token = jwt.encode({'sub': 'u-1', 'email': 'ana@test.com', 'aud': 'authenticated',
+                            'exp': int(time.time()) + 60}, secreto, algorithm='HS256')
+        VerificadorJWT(secreto=secreto, disco=disco).verificar(token)
+        
+        nuevo = VerificadorJWT(secreto='', disco=disco)  # No podría verificar HS256
+        contexto = nuevo.verificar(token)
+        
+        assert contexto.user.id == 'u-1' and contexto.access_token == token
+        assert nuevo.stats()['disk_hits'] == 1
+        disco.cerrar()
+        assert token.encode() not in (tmp_path / 'c.sqlite3').read_bytes()
+        with pytest.raises(PermissionError):
+            nuevo.verificar(jwt.encode({'sub': 'u-1', 'aud': 'authenticated',
+                                        'exp': int(time.time()) + 60},
+                                       secreto, algorithm='HS256'))
+
+
+# ============================================================================
+# TESTS: SINGLE-FLIGHT
+# ============================================================================
+
+class TestSingleFlight:
+    """Tests para SingleFlight (hilos) y AsyncSingleFlight (asyncio)."""
+    
+    @pytest.mark.unit
+    def test_hilos_comparten_una_llamada(self):
+        """Test: 5 hilos con la misma clave = 1 llamada, mismo resultado."""
+        import threading
+        import time
+        from src.services.single_flight import SingleFlight
+        vuelos = SingleFlight()
+        liberar = threading.Event()
+        llamadas = []
+        
+        def consultar():
+            llamadas.append(1)
+            liberar.wait(5)
+            return ['fila']
+        
+        resultados = []
+        hilos = [threading.Thread(target=lambda: resultados.append(vuelos.hacer('k', consultar)))
+                 for _ in range(5)]
+        for hilo in hilos:
+            hilo.start()
+        limite = time.monotonic() + 5
+        while vuelos.compartidas < 4 and time.monotonic() < limite:
+            time.sleep(0.001)
+        liberar.set()
+        for hilo in hilos:
+            hilo.join(5)
+        
+        assert len(llamadas) == 1
+        assert len(resultados) == 5
+        assert all(r is resultados[0] for r in resultados)
+        assert vuelos.hacer('k', lambda: ['nueva']) == ['nueva']  # Clave liberada
+    
+    @pytest.mark.unit
+    def test_error_llega_a_todos_y_libera_la_clave(self):
+        """Test: La excepción se propaga y la siguiente llamada reintenta."""
+        from src.services.single_flight import SingleFlight
+        vuelos = SingleFlight()
+        
+        def fallar():
+            raise RuntimeError('timeout')
+        
+        with pytest.raises(RuntimeError):
+            vuelos.hacer('k', fallar)
+        assert vuelos.hacer('k', lambda: 1) == 1
+    
+    @pytest.mark.unit
+    def test_tareas_asyncio_comparten_una_llamada(self):
+        """Test: gather de 5 tareas = 1 llamada; claves distintas no se mezclan."""
+        import asyncio
+        from src.services.single_flight import AsyncSingleFlight
+        vuelos = AsyncSingleFlight()
+        llamadas = []
+        
+        async def consultar(valor):
+            llamadas.append(valor)
+            await asyncio.sleep(0.01)
+            return [valor]
+        
+        async def _main():
+            return await asyncio.gather(
+                *(vuelos.hacer('a', lambda: consultar('a')) for _ in range(5)),
+                vuelos.hacer('b', lambda: consultar('b'))
+            )
+        
+        resultados = asyncio.run(_main())
+        
+        assert sorted(llamadas) == ['a', 'b']
+        assert resultados == [['a']] * 5 + [['b']]
+        assert vuelos.compartidas == 4
+    
+    @pytest.mark.unit
+    def test_cancelar_al_lider_no_cancela_a_los_demas(self):
+        """Test: Si se cancela quien inició el vuelo, el resto recibe el resultado."""
+        import asyncio
+        from src.services.single_flight import AsyncSingleFlight
+        vuelos = AsyncSingleFlight()
+        
+        async def consultar():
+            await asyncio.sleep(0.01)
+            return 'ok'
+        
+        async def _main():
+            lider = asyncio.ensure_future(vuelos.hacer('k', consultar))
+            await asyncio.sleep(0)
+            seguidor = asyncio.ensure_future(vuelos.hacer('k', consultar))
+            await asyncio.sleep(0)
+            lider.cancel()
+            return await seguidor
+        
+        assert asyncio.run(_main()) == 'ok'
+
+
 # ============================================================================
 # TESTS: NOTAS SERVICE (con Mocks)
 # ============================================================================
@@ -388,6 +1523,533 @@ class TestNotasService:
         
         with pytest.raises(PermissionError):
             notas.eliminar('nota-id')
+    
+    @staticmethod
+    def _notas_con_query(query):
+        """NotasService con sesión activa y table() apuntando a `query`."""
+        from src.services.notas_service import NotasService
+        from src.services.session_manager import SessionManager
+        from src.models.user import User
+        
+        SessionManager().set_session(User(id='user-1', email='a@b.com'), 'token')
+        notas = NotasService()
+        notas._supabase._client = MagicMock()
+        notas._supabase._client.table.return_value = query
+        return notas
+    
+    @staticmethod
+    def _query_mock(rows, mock_supabase_response):
+        query = MagicMock()
+        for method in ('select', 'order', 'limit', 'or_'):
+            getattr(query, method).return_value = query
+        query.execute.return_value = mock_supabase_response(rows)
+        return query
+    
+    @pytest.mark.unit
+    def test_listar_pagina_pide_una_fila_extra(self, mock_env_vars, mock_supabase_response):
+        """Test: Pide limite+1 filas y arma next_cursor con la última visible."""
+        from src.models.pagina import decodificar_cursor
+        rows = [
+            {'id': f'n{i}', 'user_id': 'user-1', 'title': f'T{i}',
+             'created_at': f'2025-12-2{4 - i}T10:00:00+00:00'}
+            for i in range(3)
+        ]
+        query = self._query_mock(rows, mock_supabase_response)
+        notas = self._notas_con_query(query)
+        
+        pagina = notas.listar_pagina(limite=2)
+        
+        query.limit.assert_called_once_with(3)
+        assert [n.id for n in pagina.items] == ['n0', 'n1']
+        assert decodificar_cursor(pagina.next_cursor) == ('2025-12-23T10:00:00+00:00', 'n1')
+        query.or_.assert_not_called()
+    
+    @pytest.mark.unit
+    def test_listar_pagina_con_cursor_filtra_keyset(self, mock_env_vars, mock_supabase_response):
+        """Test: El cursor se traduce a (created_at, id) < (c, id)."""
+        from src.models.pagina import codificar_cursor
+        query = self._query_mock([], mock_supabase_response)
+        notas = self._notas_con_query(query)
+        
+        pagina = notas.listar_pagina(limite=5, cursor=codificar_cursor('2025-12-24T10:00:00+00:00', 'n9'))
+        
+        filtro = query.or_.call_args[0][0]
+        assert 'created_at.lt."2025-12-24T10:00:00+00:00"' in filtro
+        assert 'id.lt."n9"' in filtro
+        assert pagina.next_cursor is None
+    
+    @pytest.mark.unit
+    def test_listar_pagina_con_campos_proyecta_columnas(self, mock_env_vars, mock_supabase_response):
+        """Test: ?fields= se traduce a select() (+ created_at para el cursor)."""
+        from src.models.nota import NotaParcial
+        query = self._query_mock(
+            [{'id': 'n1', 'title': 'T', 'created_at': '2025-12-24T10:00:00+00:00'}],
+            mock_supabase_response
+        )
+        notas = self._notas_con_query(query)
+        
+        pagina = notas.listar_pagina(campos='title')
+        
+        query.select.assert_called_once_with('id,title,created_at')
+        assert isinstance(pagina.items[0], NotaParcial)
+        assert pagina.items[0].to_dict() == {
+            'title': 'T', 'created_at': '2025-12-24T10:00:00+00:00', 'id': 'n1'
+        }
+    
+    @pytest.mark.unit
+    def test_iterar_paginas_sigue_los_cursores(self, mock_env_vars, mock_supabase_response):
+        """Test: iterar_paginas pide páginas hasta que next_cursor es None."""
+        rows = [
+            {'id': f'n{i}', 'user_id': 'user-1', 'title': f'T{i}',
+             'created_at': f'2025-12-2{4 - i}T10:00:00+00:00'}
+            for i in range(3)
+        ]
+        query = self._query_mock([], mock_supabase_response)
+        query.execute.side_effect = [
+            mock_supabase_response(rows[:3]),
+            mock_supabase_response(rows[2:]),
+        ]
+        notas = self._notas_con_query(query)
+        
+        paginas = notas.iterar_paginas(limite=2)
+        query.execute.assert_not_called()  # Generador: nada hasta el primer next()
+        
+        assert [[n.id for n in p.items] for p in paginas] == [['n0', 'n1'], ['n2']]
+        assert query.execute.call_count == 2
+        assert query.or_.call_count == 1
+    
+    @pytest.mark.unit
+    def test_ejecutar_lote_una_llamada_por_grupo(self, mock_env_vars, mock_supabase_response):
+        """Test: 2 creates + 2 deletes = 2 llamadas a PostgREST, resultados en orden."""
+        query = self._query_mock([], mock_supabase_response)
+        for method in ('insert', 'delete', 'in_'):
+            getattr(query, method).return_value = query
+        query.execute.side_effect = [
+            mock_supabase_response([
+                {'id': 'a', 'user_id': 'user-1', 'title': 'A'},
+                {'id': 'b', 'user_id': 'user-1', 'title': 'B'},
+            ]),
+            mock_supabase_response([{'id': 'n1', 'user_id': 'user-1', 'title': 'T'}]),
+        ]
+        notas = self._notas_con_query(query)
+        
+        resultados = notas.ejecutar_lote([
+            {'op': 'create', 'title': 'A'},
+            {'op': 'create', 'title': 'B', 'content': 'x'},
+            {'op': 'delete', 'id': 'n1'},
+            {'op': 'delete', 'id': 'n2'},
+            {'op': 'borrar'},
+        ])
+        
+        assert query.execute.call_count == 2
+        filas = query.insert.call_args[0][0]
+        assert [f['title'] for f in filas] == ['A', 'B']
+        assert all(f['user_id'] == 'user-1' for f in filas)
+        query.in_.assert_called_once_with('id', ['n1', 'n2'])
+        assert [r.status for r in resultados] == [201, 201, 200, 404, 400]
+    
+    @pytest.mark.unit
+    def test_ejecutar_lote_grupo_fallido_no_corta_el_resto(
+        self, mock_env_vars, mock_supabase_response
+    ):
+        """Test: Si un grupo falla, sus operaciones dan 500 y el resto sigue."""
+        query = self._query_mock([], mock_supabase_response)
+        query.insert.return_value = query
+        query.in_.return_value = query
+        query.execute.side_effect = [
+            RuntimeError('timeout'),
+            mock_supabase_response([{'id': 'n1', 'user_id': 'user-1', 'title': 'T'}]),
+        ]
+        notas = self._notas_con_query(query)
+        
+        resultados = notas.ejecutar_lote([
+            {'op': 'create', 'title': 'A'},
+            {'op': 'get', 'id': 'n1'},
+        ])
+        
+        assert [r.status for r in resultados] == [500, 200]
+        assert 'timeout' in resultados[0].error
+    
+    @pytest.mark.unit
+    def test_crear_muchos_inserta_por_trozos(self, mock_env_vars, mock_supabase_response):
+        """Test: 5 notas válidas en trozos de 2 = 3 INSERTs; la inválida no viaja."""
+        query = self._query_mock([], mock_supabase_response)
+        query.insert.return_value = query
+        query.execute.side_effect = lambda: mock_supabase_response([
+            {'id': f"id-{f['title']}", **f} for f in query.insert.call_args[0][0]
+        ])
+        notas = self._notas_con_query(query)
+        
+        resultados = notas.crear_muchos(
+            [{'title': f'T{i}'} for i in range(3)] + [{'title': ''}]
+            + [{'title': f'T{i}'} for i in range(3, 5)],
+            tamano_lote=2
+        )
+        
+        assert query.insert.call_count == 3
+        assert [len(c[0][0]) for c in query.insert.call_args_list] == [2, 2, 1]
+        assert [r.status for r in resultados] == [201, 201, 201, 400, 201, 201]
+        assert resultados[5].id == 'id-T4'
+    
+    @pytest.mark.unit
+    def test_crear_muchos_respeta_maximo(self, mock_env_vars):
+        """Test: Más de NOTAS_BULK_MAX notas lanza ValueError sin enviar nada."""
+        from src.config.settings import Settings
+        query = MagicMock()
+        notas = self._notas_con_query(query)
+        maximo = Settings().notas_bulk_max
+        
+        with pytest.raises(ValueError):
+            notas.crear_muchos([{'title': 'T'}] * (maximo + 1))
+        query.insert.assert_not_called()
+    
+    @pytest.mark.unit
+    def test_obtener_muchos_una_consulta_en_orden(self, mock_env_vars, mock_supabase_response):
+        """Test: Un solo SELECT ... in.(...); respeta el orden pedido y reporta faltantes."""
+        query = self._query_mock([
+            {'id': 'n3', 'user_id': 'user-1', 'title': 'C'},
+            {'id': 'n1', 'user_id': 'user-1', 'title': 'A'},
+        ], mock_supabase_response)
+        query.in_.return_value = query
+        notas = self._notas_con_query(query)
+        
+        encontradas, faltantes = notas.obtener_muchos(['n1', 'n2', 'n3', 'n1'])
+        
+        query.in_.assert_called_once_with('id', ['n1', 'n2', 'n3'])
+        query.select.assert_called_once_with('*')
+        assert [n.title for n in encontradas] == ['A', 'C']
+        assert faltantes == ['n2']
+    
+    @pytest.mark.unit
+    def test_listar_repetido_usa_la_cache(self, mock_env_vars, mock_supabase_response, monkeypatch):
+        """Test: Dos listar() seguidos = un solo request a Supabase."""
+        from src.config.settings import Settings
+        monkeypatch.setattr(Settings(), 'notas_cache_ttl', 30)  # Opt-in
+        query = self._query_mock(
+            [{'id': 'n1', 'user_id': 'user-1', 'title': 'T'}], mock_supabase_response
+        )
+        notas = self._notas_con_query(query)
+        
+        primera = notas.listar()
+        segunda = notas.listar()
+        
+        assert query.execute.call_count == 1
+        assert [n.id for n in segunda] == [n.id for n in primera]
+        assert segunda[0] is not primera[0]  # Entidades nuevas en cada lectura
+        assert notas.estadisticas_cache()['hits'] == 1
+    
+    @pytest.mark.unit
+    def test_crear_invalida_listas_y_recuerda_la_nota(self, mock_env_vars, mock_supabase_response, monkeypatch):
+        """Test: Tras crear, listar vuelve a la red y obtener(nuevo_id) no."""
+        from src.config.settings import Settings
+        monkeypatch.setattr(Settings(), 'notas_cache_ttl', 30)  # Opt-in
+        query = self._query_mock([], mock_supabase_response)
+        query.insert.return_value = query
+        notas = self._notas_con_query(query)
+        notas.listar()
+        query.execute.return_value = mock_supabase_response(
+            [{'id': 'nueva', 'user_id': 'user-1', 'title': 'Nueva'}]
+        )
+        
+        notas.crear('Nueva')
+        llamadas = query.execute.call_count
+        assert notas.obtener('nueva').title == 'Nueva'
+        assert query.execute.call_count == llamadas
+        notas.listar()
+        assert query.execute.call_count == llamadas + 1
+    
+    @pytest.mark.unit
+    def test_eliminar_descarta_la_nota_cacheada(self, mock_env_vars, mock_supabase_response, monkeypatch):
+        """Test: obtener() después de eliminar() vuelve a consultar."""
+        from src.config.settings import Settings
+        monkeypatch.setattr(Settings(), 'notas_cache_ttl', 30)  # Opt-in
+        query = self._query_mock(
+            [{'id': 'n1', 'user_id': 'user-1', 'title': 'T'}], mock_supabase_response
+        )
+        for method in ('eq', 'delete'):
+            getattr(query, method).return_value = query
+        notas = self._notas_con_query(query)
+        notas.obtener('n1')
+        
+        notas.eliminar('n1')
+        query.execute.return_value = mock_supabase_response([])
+        
+        assert notas.obtener('n1') is None
+        assert query.execute.call_count == 3
+    
+    @pytest.mark.unit
+    def test_listar_vencido_responde_ya_y_refresca_aparte(
+        self, mock_env_vars, mock_supabase_response
+    ):
+        """Test: Dentro de la gracia, listar() da lo viejo y un hilo lo refresca."""
+        import time
+        from src.services.cache import CacheNotas
+        query = self._query_mock(
+            [{'id': 'viejo', 'user_id': 'user-1', 'title': 'V'}], mock_supabase_response
+        )
+        notas = self._notas_con_query(query)
+        ahora = [0.0]
+        notas._cache = CacheNotas(ttl=10, max_bytes=10_000, gracia=60, reloj=lambda: ahora[0])
+        notas.listar()
+        assert notas.ultima_lectura() is None  # Fue a la red
+        
+        ahora[0] = 12
+        query.execute.return_value = mock_supabase_response(
+            [{'id': 'nuevo', 'user_id': 'user-1', 'title': 'N'}]
+        )
+        stale = notas.listar()
+        
+        assert [n.id for n in stale] == ['viejo']
+        assert notas.ultima_lectura().vencida
+        limite = time.monotonic() + 5
+        while notas._cache.leer('user-1', ('listar', '*')) is None and time.monotonic() < limite:
+            time.sleep(0.001)
+        assert [n.id for n in notas.listar()] == ['nuevo']
+        assert not notas.ultima_lectura().vencida
+        assert query.execute.call_count == 2
+    
+    @pytest.mark.unit
+    def test_obtener_no_usa_stale(self, mock_env_vars, mock_supabase_response):
+        """Test: Una nota suelta vencida va a la red aunque haya gracia."""
+        from src.services.cache import CacheNotas
+        query = self._query_mock(
+            [{'id': 'n1', 'user_id': 'user-1', 'title': 'T'}], mock_supabase_response
+        )
+        query.eq.return_value = query
+        notas = self._notas_con_query(query)
+        ahora = [0.0]
+        notas._cache = CacheNotas(ttl=10, max_bytes=10_000, gracia=60, reloj=lambda: ahora[0])
+        notas.obtener('n1')
+        ahora[0] = 12
+        
+        notas.obtener('n1')
+        
+        assert query.execute.call_count == 2
+        assert notas.ultima_lectura() is None
+    
+    @pytest.mark.unit
+    def test_cache_desactivada_por_defecto(self, mock_env_vars, mock_supabase_response, monkeypatch):
+        """Test: Sin NOTAS_CACHE_TTL (default 0) cada lectura viaja."""
+        from src.config.settings import Settings
+        monkeypatch.delenv('NOTAS_CACHE_TTL', raising=False)
+        Settings._instance, Settings._initialized = None, False
+        assert Settings().notas_cache_ttl == 0
+        query = self._query_mock([], mock_supabase_response)
+        notas = self._notas_con_query(query)
+        
+        notas.listar()
+        notas.listar()
+        
+        assert query.execute.call_count == 2
+    
+    @pytest.mark.unit
+    def test_eliminar_muchos_parte_por_largo_de_url(
+        self, mock_env_vars, mock_supabase_response, monkeypatch
+    ):
+        """Test: Con NOTAS_IN_MAX_LENGTH chico, 5 ids viajan en 3 DELETE ... in.(...)."""
+        from src.config.settings import Settings
+        query = self._query_mock([], mock_supabase_response)
+        query.delete.return_value = query
+        query.in_.return_value = query
+        query.execute.side_effect = lambda: mock_supabase_response([
+            {'id': i} for i in query.in_.call_args[0][1] if i != 'n3'
+        ])
+        notas = self._notas_con_query(query)
+        monkeypatch.setattr(Settings(), 'notas_in_max_length', 10)  # 2 ids de 2 chars (+3)
+        
+        resultado = notas.eliminar_muchos(['n0', 'n1', 'n2', 'n3', 'n4', 'n1'])
+        
+        assert [c[0][1] for c in query.in_.call_args_list] == [['n0', 'n1'], ['n2', 'n3'], ['n4']]
+        assert resultado.afectados == ['n0', 'n1', 'n2', 'n4']
+        assert resultado.no_encontrados == ['n3']
+    
+    @pytest.mark.unit
+    def test_actualizar_muchos_trozo_fallido_va_a_fallidos(
+        self, mock_env_vars, mock_supabase_response, monkeypatch
+    ):
+        """Test: Un trozo que falla no corta el resto; sus ids quedan en fallidos."""
+        from src.config.settings import Settings
+        query = self._query_mock([], mock_supabase_response)
+        query.update.return_value = query
+        query.in_.return_value = query
+        query.execute.side_effect = [
+            RuntimeError('timeout'),
+            mock_supabase_response([{'id': 'n2'}]),
+        ]
+        notas = self._notas_con_query(query)
+        monkeypatch.setattr(Settings(), 'notas_in_max_length', 10)
+        
+        resultado = notas.actualizar_muchos(['n0', 'n1', 'n2'], {'title': 'Nuevo'})
+        
+        query.update.assert_called_with({'title': 'Nuevo'})
+        assert resultado.fallidos == ['n0', 'n1']
+        assert resultado.afectados == ['n2']
+        assert resultado.error == 'timeout'
+    
+    @pytest.mark.unit
+    def test_actualizar_muchos_sin_cambios_es_value_error(self, mock_env_vars):
+        """Test: Sin title/content válidos no se envía nada."""
+        query = MagicMock()
+        notas = self._notas_con_query(query)
+        
+        with pytest.raises(ValueError):
+            notas.actualizar_muchos(['n1'], {})
+        query.update.assert_not_called()
+    
+    @pytest.mark.unit
+    def test_obtener_parcial_carga_lazy(self, mock_env_vars, mock_supabase_response):
+        """Test: Los campos faltantes se traen con un segundo select."""
+        query = self._query_mock([], mock_supabase_response)
+        query.eq.return_value = query
+        query.execute.side_effect = [
+            mock_supabase_response([{'id': 'n1', 'title': 'T'}]),
+            mock_supabase_response([{'content': 'Texto largo'}]),
+        ]
+        notas = self._notas_con_query(query)
+        
+        nota = notas.obtener('n1', campos=['title'])
+        assert query.select.call_args[0][0] == 'id,title'
+        
+        assert nota.content == 'Texto largo'
+        assert query.select.call_args[0][0] == 'user_id,content,created_at,updated_at'
+    
+    @pytest.mark.unit
+    def test_listar_pagina_valida_limite_y_cursor(self, mock_env_vars, mock_supabase_response):
+        """Test: limite < 1 o cursor corrupto -> ValueError; limite se acota."""
+        query = self._query_mock([], mock_supabase_response)
+        notas = self._notas_con_query(query)
+        
+        with pytest.raises(ValueError):
+            notas.listar_pagina(limite=0)
+        with pytest.raises(ValueError):
+            notas.listar_pagina(cursor='basura')
+        
+        notas.listar_pagina(limite=10_000)
+        query.limit.assert_called_with(201)
+
+
+# ============================================================================
+# TESTS: SERVICIOS ASÍNCRONOS
+# ============================================================================
+
+@requires_supabase
+class TestAsyncServices:
+    """Tests para AsyncNotasService y AsyncAuthService."""
+    
+    @pytest.fixture(autouse=True)
+    def reset_singletons(self, mock_env_vars):
+        """Reset de singletons antes y después de cada test."""
+        from src.services.session_manager import SessionManager
+        from src.repositories.async_supabase_client import AsyncSupabaseClient
+        from src.config.settings import Settings
+        
+        for cls in (SessionManager, AsyncSupabaseClient, Settings):
+            cls._instance = None
+            cls._initialized = False
+        
+        yield
+        
+        for cls in (SessionManager, AsyncSupabaseClient, Settings):
+            cls._instance = None
+            cls._initialized = False
+    
+    @pytest.mark.unit
+    def test_async_listar_requires_auth(self, mock_env_vars):
+        """Test: listar asíncrono requiere autenticación."""
+        import asyncio
+        from src.services.async_notas_service import AsyncNotasService
+        
+        notas = AsyncNotasService()
+        
+        with pytest.raises(PermissionError):
+            asyncio.run(notas.listar())
+    
+    @pytest.mark.unit
+    def test_async_crear_uses_session_user(self, mock_env_vars, mock_supabase_response):
+        """Test: crear asíncrono inserta con el user_id de la sesión."""
+        import asyncio
+        from src.services.async_notas_service import AsyncNotasService
+        from src.services.session_manager import SessionManager
+        from src.models.user import User
+        
+        SessionManager().set_session(User(id='user-1', email='a@b.com'), 'token')
+        
+        query = MagicMock()
+        query.insert.return_value = query
+        query.execute = AsyncMock(return_value=mock_supabase_response(
+            [{'id': 'n1', 'user_id': 'user-1', 'title': 'Hola'}]
+        ))
+        notas = AsyncNotasService()
+        notas._supabase._client = MagicMock()
+        notas._supabase._client.table.return_value = query
+        
+        nota = asyncio.run(notas.crear('Hola'))
+        
+        assert nota.id == 'n1'
+        assert query.insert.call_args[0][0]['user_id'] == 'user-1'
+    
+    @pytest.mark.unit
+    def test_async_listar_concurrente_una_consulta(self, mock_env_vars, mock_supabase_response):
+        """Test: 5 listar() concurrentes (sin caché) = 1 consulta a Supabase."""
+        import asyncio
+        from src.config.settings import Settings
+        from src.services.async_notas_service import AsyncNotasService
+        from src.services.session_manager import SessionManager
+        from src.models.user import User
+        
+        SessionManager().set_session(User(id='user-1', email='a@b.com'), 'token')
+        Settings().notas_cache_ttl = 0  # Solo single-flight
+        
+        async def execute():
+            await asyncio.sleep(0.01)
+            return mock_supabase_response([{'id': 'n1', 'user_id': 'user-1', 'title': 'T'}])
+        
+        query = MagicMock()
+        for method in ('select', 'order'):
+            getattr(query, method).return_value = query
+        query.execute = AsyncMock(side_effect=execute)
+        notas = AsyncNotasService()
+        notas._supabase._client = MagicMock()
+        notas._supabase._client.table.return_value = query
+        
+        async def _main():
+            return await asyncio.gather(*(notas.listar() for _ in range(5)))
+        
+        listas = asyncio.run(_main())
+        
+        assert query.execute.await_count == 1
+        assert all(lista[0].id == 'n1' for lista in listas)
+        assert listas[0][0] is not listas[1][0]  # Cada uno arma sus Nota
+        assert notas.estadisticas_cache()['coalesced'] == 4
+    
+    @pytest.mark.unit
+    def test_async_login_validation(self, mock_env_vars):
+        """Test: login asíncrono valida antes de llamar a Supabase."""
+        import asyncio
+        from src.services.async_auth_service import AsyncAuthService
+        
+        auth = AsyncAuthService()
+        
+        with pytest.raises(ValueError):
+            asyncio.run(auth.login('', 'password123'))
+    
+    @pytest.mark.unit
+    def test_async_logout_clears_session(self, mock_env_vars):
+        """Test: logout asíncrono limpia la sesión aunque Supabase falle."""
+        import asyncio
+        from src.services.async_auth_service import AsyncAuthService
+        from src.services.session_manager import SessionManager
+        from src.models.user import User
+        
+        session = SessionManager()
+        session.set_session(User(id='user-1', email='a@b.com'), 'token')
+        auth = AsyncAuthService()
+        auth._supabase._client = MagicMock()
+        auth._supabase._client.auth.sign_out = AsyncMock(side_effect=Exception('red'))
+        
+        asyncio.run(auth.logout())
+        
+        assert not session.is_authenticated()
 
 
 # ============================================================================